@@ -3,8 +3,9 @@
 import argparse
 import importlib
 
-#from src.optimizer import run_optimizer
+from src.optimizer import run_optimizer
 from src.runs.sim import flightsim
+from src.runs.studies import grid_designs, run_study
 
 
 def main():
@@ -21,7 +22,8 @@ def main():
 
     print("\nSelect run mode:")
     print("1 --> Single Run")
-    print("2 --> Optimization")
+    print("2 --> Design Study")
+    print("3 --> Optimization")
     user_input = input("Enter number: ")
 
     if user_input == "1":
@@ -30,12 +32,28 @@ def main():
         print(results)
 
     elif user_input == "2":
-        program_input.desvars, program_input.mission
-        """
-        results = run_optimizer(config, program_input.constraints)
-        print("Optimization finished. Best result:")
+        # Design sweep: input file defines study_axes = {field: [values, ...]}
+        designs = grid_designs(program_input.desvars, **program_input.study_axes)
+        results = run_study(
+            designs,
+            program_input.mission_reqs,
+            path=f"{args.input_file}_study.npz",
+        )
+        print("Study finished. Results:")
         print(results)
-        """
+
+    elif user_input == "3":
+        # Input file defines opt_bounds = {field: (low, high)}, objective, constraints
+        results = run_optimizer(
+            program_input.desvars,
+            program_input.mission_reqs,
+            program_input.opt_bounds,
+            program_input.objective,
+            program_input.constraints,
+        )
+        print(f"Optimization finished after {results.n_flights} flights. Best result:")
+        print(results.desvars)
+        print(results.row)
 
     else:
         print("Invalid selection.")
@@ -1 +1,53 @@
-#TODO:
\ No newline at end of file
+"""
+Constraints on flight results. A "row" is the dict of scalars returned by
+src.runs.studies.evaluate_design (apogee, out_of_rail_velocity, ...), along
+with the error message of failed designs.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass
+class Constraint:
+    column: str
+    lower: float | None = None
+    upper: float | None = None
+
+    def violation(self, row):
+        """
+        How far row[column] sits outside [lower, upper], relative to the
+        bound (0 when satisfied) so constraints in different units add up.
+        A missing/nan value counts as infinitely violated.
+        """
+        value = row.get(self.column, np.nan)
+        if not np.isfinite(value):
+            return np.inf
+        v = 0.0
+        if self.lower is not None and value < self.lower:
+            v += (self.lower - value) / max(abs(self.lower), 1.0)
+        if self.upper is not None and value > self.upper:
+            v += (value - self.upper) / max(abs(self.upper), 1.0)
+        return v
+
+
+def total_violation(row, constraints):
+    return sum(c.violation(row) for c in constraints)
+
+
+def is_feasible(row, constraints):
+    return total_violation(row, constraints) == 0.0
+
+
+def mission_constraints(min_rail_exit_velocity=30.0, min_stability=1.5,
+                        max_stability=None, max_mach=None):
+    """Typical launch-competition constraints (velocities in m/s, margins in cal)."""
+    constraints = [
+        Constraint("out_of_rail_velocity", lower=min_rail_exit_velocity),
+        Constraint("out_of_rail_stability_margin", lower=min_stability,
+                   upper=max_stability),
+    ]
+    if max_mach is not None:
+        constraints.append(Constraint("max_mach_number", upper=max_mach))
+    return constraints
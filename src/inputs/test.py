@@ -3,6 +3,8 @@ from dataclasses import asdict
 from src.design.desvar_misreqs import DesignVariables, MissionRequirements
 from src.utils.constants import NoseconeType, Material, TubeDiameter, FinAirfoil, TailType
 from src.motors.motors import Motor
+from src.design.constraints import mission_constraints
+from src.optimizer import Objective
 
 # ----------------------------
 # Mission requirements
@@ -59,6 +61,28 @@ desvars = DesignVariables(
     motor_type = Motor.M1790,
 )
 
+# ----------------------------
+# Study axes (run mode 2): full grid around desvars
+# ----------------------------
+study_axes = dict(
+    fin_num = [3, 4],
+    fin_area_total = [0.018, 0.024, 0.030],
+    nosecone_length = [0.45, 0.55, 0.65],
+    motor_type = [Motor.M1790, Motor.M1450],
+)
+
+# ----------------------------
+# Optimization (run mode 3)
+# ----------------------------
+opt_bounds = dict(
+    fin_area_total = (0.015, 0.040),
+    fin_aspect_ratio = (1.0, 3.5),
+    nosecone_length = (0.40, 0.80),
+    upper_fuselage_length = (0.80, 1.40),
+)
+objective = Objective("apogee", target=3048.0)   # 10k ft
+constraints = mission_constraints(min_rail_exit_velocity=30.0, min_stability=1.5)
+
 # Quick print for debugging
 print("Mission requirements:")
 for k,v in asdict(mission_reqs).items():
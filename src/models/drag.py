@@ -1,105 +1,299 @@
+import functools
+
 import numpy as np
+from uvicrocketpy import Function
+
+from src.utils.constants import NoseconeType
+
 #using mach number, find drag coefficents using barrowman method.
-#depending on mach num, select appropiate drag model. this is, for now, barrowman supersonic and barrowman subsonic. 
-def barrowman_drag(mach_num):
+#every term is evaluated on whole arrays (Mach x altitude grid) in one call,
+#so a design gets a geometry-consistent 2-D Cd(Mach, altitude) Function
+#instead of the static powerOn/powerOff csv curves.
+
+R_s = 0.2 / 1000 #surface roughness height. Assumed to be 0.2mm, converted into meters
+
+DEFAULT_MACH = np.linspace(0.01, 3.0, 60)
+DEFAULT_ALTITUDE = np.linspace(0.0, 15000.0, 16) #[m] ASL
+
+# Per-process cache size, in geometries: a long sweep keeps the Functions of
+# its most recent designs only
+DRAG_CACHE_SIZE = 256
+
+
+# -------------------------
+# Atmosphere (ISA, vectorized)
+# -------------------------
+
+def isa_atmosphere(altitude):
+    """
+    Standard atmosphere up to 20 km.
+    Returns density [kg/m^3], dynamic viscosity [Pa s], speed of sound [m/s].
+    """
+    h = np.asarray(altitude, dtype=float)
+    T = np.where(h < 11000, 288.15 - 0.0065 * h, 216.65)
+    p = np.where(
+        h < 11000,
+        101325 * (T / 288.15) ** 5.25588,
+        22632.1 * np.exp(-9.80665 * (h - 11000) / (287.05 * 216.65)),
+    )
+    rho = p / (287.05 * T)
+    mu = 1.458e-6 * T**1.5 / (T + 110.4) #sutherland
+    a = np.sqrt(1.4 * 287.05 * T)
+    return rho, mu, a
+
+
+# -------------------------
+# Barrowman terms, all elementwise over Ma/Re arrays
+# -------------------------
+
+def skin_friction(Ma, Re, ref_l):
+    """Compressible skin friction coefficient Cf_c (Barrowman ch. 4)."""
+    #Re_cr is the Reynolds number at which skin friction does not matter. This is the threshold between what is considered smooth and rough.
+    Re_cr = 51 * (R_s / ref_l) ** -1.039
+    laminar = Re <= 500000
+    rough = Re > Re_cr
+
+    #incompressible laminar / turbulent / rough
+    Cf = np.where(
+        laminar,
+        1.328 / np.sqrt(Re),
+        np.where(
+            rough,
+            0.032 * (R_s / ref_l) ** 0.2,
+            (1 / (3.45 * np.log10(Re) - 5.6) ** 2) - (1700 / Re),
+        ),
+    )
+
+    #compressible subsonic variation, smooth vs rough
+    Cf_sub = np.where(rough, Cf * (1 - 0.12 * Ma**2), Cf * (1 - 0.09 * Ma**2))
+
+    #supersonic: laminar, smooth (k=0.15 no heat transfer, Equ. 4-12), rough
+    k = 0.15
+    Cf_smooth_sup = Cf / ((1 + k * Ma**2) ** 0.58)
+    #roughness is never allowed below the smooth value
+    Cf_rough_sup = np.maximum(Cf / (1 + 0.18 * Ma**2), Cf_smooth_sup)
+    Cf_sup = np.where(
+        laminar,
+        Cf / ((1 + 0.045 * Ma**2) ** 0.25),
+        np.where(rough, Cf_rough_sup, Cf_smooth_sup),
+    )
+
+    return np.where(Ma < 0.3, Cf, np.where(Ma < 1, Cf_sub, Cf_sup)), Cf
+
+
+def leading_edge_factor(Ma):
+    """DeltaCd factor for fin leading edge drag. Pg. 50 Barrowman's"""
+    Ma = np.asarray(Ma, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sub = ((1 - np.minimum(Ma, 0.9) ** 2) ** -0.417) - 1
+        sup = 1.214 - 0.502 / Ma**2 + 0.1095 / Ma**4 + 0.0231 / Ma**6
+    return np.where(Ma < 0.9, sub, np.where(Ma <= 1, 1 - 1.5 * (Ma - 0.9), sup))
+
+
+def nose_profile(nose_type, length, radius, power=None, n=2001):
+    """
+    Radius of the nosecone profile at n stations from the tip (x=0) to the
+    shoulder (x=length), with the same shapes as RocketPy's NoseCone.
+    """
+    x = np.linspace(0.0, length, n)
+    u = x / length
+    if nose_type == NoseconeType.CONICAL:
+        return x, radius * u
+    if nose_type == NoseconeType.OGIVE: #tangent ogive
+        rho = (radius**2 + length**2) / (2 * radius)
+        return x, np.sqrt(rho**2 - (x - length) ** 2) + radius - rho
+    if nose_type in (NoseconeType.VON_KARMAN, NoseconeType.LV_HAACK):
+        C = 1 / 3 if nose_type == NoseconeType.LV_HAACK else 0.0
+        theta = np.arccos(1 - 2 * u)
+        return x, radius * np.sqrt(
+            (theta - np.sin(2 * theta) / 2 + C * np.sin(theta) ** 3) / np.pi
+        )
+    if nose_type == NoseconeType.POWER_SERIES:
+        return x, radius * u**power
+    raise ValueError(f"Unsupported nosecone type: {nose_type}")
+
+
+def nose_wetted_area(nose_type, length, radius, power=None):
+    """Wetted area of the nosecone profile, summed over frustum strips."""
+    x, r = nose_profile(nose_type, length, radius, power)
+    ds = np.hypot(np.diff(x), np.diff(r))
+    return float(np.sum(np.pi * (r[1:] + r[:-1]) * ds))
+
+
+def nose_pressure_drag(Ma, nose_half_angle):
+    """
+    Forebody pressure/wave drag from the cone half angle; blended linearly
+    through the transonic gap (0.8 < Ma < 1.3).
+
+    Limitation: these are cone relations and every nosecone type is given
+    the drag of the cone of the same fineness (length and base radius).
+    That overestimates the drag of ogive, von Karman and LV-Haack noses,
+    whose tangent shoulders have little subsonic pressure drag and lower
+    wave drag, and underestimates blunt power series (power < 1) noses.
+    Only the wetted area used for skin friction follows the actual profile.
+    """
+    s = np.sin(nose_half_angle)
+    sub = 0.8 * s**2
+
+    def sup(M):
+        return 2.1 * s**2 + 0.5 * s / np.sqrt(M**2 - 1)
+
+    blend = np.clip((Ma - 0.8) / 0.5, 0.0, 1.0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        transonic = (1 - blend) * sub + blend * sup(1.3)
+        supersonic = sup(np.maximum(Ma, 1.3))
+    return np.where(Ma <= 0.8, sub, np.where(Ma < 1.3, transonic, supersonic))
+
+
+def base_drag(Ma):
+    """Base drag coefficient on the base area (subsonic / supersonic)."""
+    with np.errstate(divide="ignore"):
+        return np.where(Ma < 1, 0.12 + 0.13 * Ma**2, 0.25 / Ma)
+
+
+# -------------------------
+# Whole vehicle
+# -------------------------
+
+def _geometry(config):
+    """Everything the drag model reads from Config, as plain floats."""
+    r = config.tube.radius
+    has_tail = config.boattail_length > 0
+    motor = config.motor_type.value
+    return dict(
+        radius=r,
+        nose_len=config.nosecone_length,
+        nose_area=nose_wetted_area(
+            config.nosecone_type, config.nosecone_length, r, config.nosecone_power
+        ),
+        L=(config.nosecone_length + config.upper_fuselage_length
+           + config.lower_fuselage_length + config.boattail_length),
+        boattail_len=config.boattail_length,
+        base_radius=config.boattail_bot_radius if has_tail else r,
+        fin_num=config.fin_num,
+        fin_span=config.fin_span,
+        fin_root_chord=config.fin_root_chord,
+        fin_tip_chord=config.fin_tip_chord,
+        fin_sweep_length=config.fin_sweep_length,
+        fin_thickness=config.fin_thickness,
+        nozzle_radius=motor["nozzle_radius"],
+    )
+
+
+def barrowman_drag(config, mach, altitude):
+    """
+    Power-off and power-on Cd for every (mach, altitude) pair.
+
+    mach and altitude broadcast against each other, so passing
+    mach[:, None] and altitude[None, :] gives the full grid at once.
+    Returns (cd_power_off, cd_power_on) with the broadcast shape.
+    """
+    return _barrowman_drag(_geometry(config), mach, altitude)
+
+
+def _barrowman_drag(g, mach, altitude):
+    Ma, h = np.broadcast_arrays(np.asarray(mach, float), np.asarray(altitude, float))
+    rho, mu, a = isa_atmosphere(h)
+
+    r, L = g["radius"], g["L"]
+    D = 2 * r
+    ref_l = L #length of vehicle from tip to tail
+    Ar = np.pi * r**2 #reference area
+    u = Ma * a #flow velocity
+    Re = np.maximum(rho * u * ref_l / mu, 1e3) #Reynolds number, floored to keep Ma->0 finite
+
+    Cf_c, Cf = skin_friction(Ma, Re, ref_l)
+
     #SKIN DRAG SECTION
-    Cd=None #coefficent of drag for entire vehicle
-    Cf=None #incompressible skin friction coefficent
-    Cf_c = None #compressible skin finction coefficent
-    R_s = 0.2 / 1000 #surface roughness height. Assumed to be 0.2mm, converted into meters
-    ref_l = None #length of vehicle from tip to tail
-    mu = None #dynamic viscosity of air - atm model based.
-    rho = None #density of air - atm model based.
-    u = None #flow velocity - atm model based.
-    Re = rho*u*ref_l/mu #Reynolds number
-    a= None #Speed of sound - atm model based.
-    Ma = u/a #Mach number 
-    L = None #tip to tail length
-    D = None #fuselage OD
- 
-    #incompressible fluid between Mach 0.0 and 0.3
-    if (Ma > 0 and Ma<0.3):
-        #incompressible laminar flow
-        if (Re<=500000): 
-            Cf=1.328/np.sqrt(Re)
-        #incompressible turbulent flow
-        else:
-            #Re_cr is the Reynolds number at which skin friction does not matter. This is the threshold between what is considered smooth and rough.
-            Re_cr=51*(R_s/ref_l)**-1.039
-            if Re>Re_cr:
-                Cf=0.032(R_s/ref_l)**0.2
-            else:
-                Cf = (1/(3.45*np.log10(Re)-5.6)**2)-(1700/Re)
-    #compressible subsonic variation
-    elif (Ma>=0.3 and Ma<1): 
-        #checking smooth vs rough cases (Re_cr comparison)
-        if (Re_cr>Re): 
-            Cf_c = Cf(1-0.9*Ma**2)
-        else:
-            Cf_c = Cf(1-0.12*Ma**2)
-    else:
-        #if laminar
-        if (Re<=500000):
-            Cf_c=Cf/((1+0.045*Ma**2)**0.25)
-        else:
-            #if smooth
-            if (Re_cr>Re):
-                #k is defined as the coefficent for the no heat transfer case. This is reccomended from the man himself. Equ. 4-12
-                k=0.15
-                Cf_c=Cf/((1+k*Ma**2)**0.58)
-            else:
-                Cf_c=Cf/(1+0.18*Ma**2)
-                #handling a case where roughness is less than smoothness value. this should NEVER be the case. if so, set value to smooth value regardless. 
-                if(Cf_c<Cf/((1+k*Ma**2)**0.58)):
-                    Cf_c=Cf/((1+k*Ma**2)**0.58)
-
-    #Defining skin friction drag coefficent of the tail section
-    Ar = None #reference area
-    AT = None #planform area of fins
-    AwB = None #wetted area of body
-    N = None #Fin qty. 
-    fB= L/D #body fineness ratio. basically L/D ignoring finspan
-    Cd_fT = 2*N*Cf_c*(AT/Ar) #skin friction coefficent of drag for fins
-    Cd_fB = (1+0.5/fB)*Cf_c*AwB/Ar #skin friction coefficent of drag for body
+    N = g["fin_num"] #Fin qty.
+    S = g["fin_span"] #exposed fin semispan measured from root chord
+    Cr, Ct = g["fin_root_chord"], g["fin_tip_chord"]
+    AT = 0.5 * (Cr + Ct) * S #planform area of one fin
+    AwB = g["nose_area"] + 2 * np.pi * r * (L - g["nose_len"]) #wetted area of body (nose profile + tube)
+    fB = L / D #body fineness ratio. basically L/D ignoring finspan
+    Cd_fT = 2 * N * Cf_c * (AT / Ar) #skin friction coefficent of drag for fins
+    Cd_fB = (1 + 0.5 / fB) * Cf_c * AwB / Ar #skin friction coefficent of drag for body
 
     #PRESSURE DRAG SECTION
-    #Tail Pressure Drag
-    S = None #exposed fin semispan measured from root chord. basically perpendicular distance from fuselage to outside edge of fin.
-    Ar_fins = None 
-    DeltaCd = None
-    rL = None #this is the radius of the leading edge of the fins
-    GammaL = None #leading edge sweep angle in degrees
-
-#determining the DeltaCd factor based on Mach number. Pg. 50 Barrowman's
-    if (Ma<0.9):
-        DeltaCd = ((1-Ma**2)**-0.417)-1
-    elif (Ma>=0.9 and Ma<=1):
-        DeltaCd = 1-1.5(Ma-0.9)
-    else:
-        DeltaCd = 1.214 - 0.502/Ma**2 + 0.1095/Ma**4 + 0.0231/Ma**6
-
-#total leading drag edge of N amount of fins
-    Cd_LTail=2*N*(S*rL/Ar_fins)*(np.cos(np.deg2rad(GammaL))**2)*DeltaCd
-
-#trailing edge drag for subsonic incompressible flow
-
-    Cd_BTail=None
-    Cr = None #fin root chord length
-    hr = None #fin trailing edge thickness
-    ABf = None #base area of one fin
-    CfB = 2*Cf_c*(Cr/hr) #Compressible skin friction coefficent for the body
-    tr = None #Max thickness of fin
-
-    if (Ma > 0 and Ma<0.3):
-        CfB=2*Cf*(Cr/hr)
-        Cd_BTail = 0.135/(CfB**(1/3))
-    #trailing edge drag for subsonic compressible flow
-    elif (Ma>=0.3 and Ma<1):
-        K_prandtl_correction = np.cos(np.deg2rad(GammaL))**2 + ((0.223+4.02*Cf_c*(tr/hr))**2/(Cf_c*Cr/hr)**(2/3))
-        Cd_BTail = (0.135*N*(ABf/Ar_fins))/((CfB**(1/3))*(K_prandtl_correction-np.cos(np.deg2rad(GammaL))**2*Ma**2)**0.5)
-    #trailing edge drag for supersonic compressible flow
-    else:
-        Cd_BTail = (N*(1-0.52*Ma**-1.19))*(ABf/Ar_fins)/((1+18*Cf_c*(tr/hr)**2)*Ma**2)
-    
-# 
+    #Tail Pressure Drag: flat plate fins, so LE radius and TE thickness come from fin thickness
+    tr = g["fin_thickness"] #Max thickness of fin
+    hr = tr #fin trailing edge thickness
+    rL = tr / 2 #this is the radius of the leading edge of the fins
+    GammaL = np.arctan2(g["fin_sweep_length"], S) #leading edge sweep angle
+    cos2 = np.cos(GammaL) ** 2
+    ABf = hr * S #base area of one fin
+
+    #total leading drag edge of N amount of fins
+    Cd_LTail = 2 * N * (S * rL / Ar) * cos2 * leading_edge_factor(Ma)
+
+    #trailing edge drag: incompressible / subsonic compressible / supersonic
+    CfB = 2 * Cf_c * (Cr / hr)
+    K_prandtl_correction = cos2 + ((0.223 + 4.02 * Cf_c * (tr / hr)) ** 2 / (Cf_c * Cr / hr) ** (2 / 3))
+    with np.errstate(invalid="ignore"):
+        Cd_BTail_inc = 0.135 * N * (ABf / Ar) / ((2 * Cf * (Cr / hr)) ** (1 / 3))
+        Cd_BTail_sub = (0.135 * N * (ABf / Ar)) / (
+            (CfB ** (1 / 3)) * np.sqrt(np.maximum(K_prandtl_correction - cos2 * Ma**2, 1e-6))
+        )
+        Cd_BTail_sup = (N * (1 - 0.52 * Ma**-1.19)) * (ABf / Ar) / ((1 + 18 * Cf_c * (tr / hr) ** 2) * Ma**2)
+    Cd_BTail = np.where(Ma < 0.3, Cd_BTail_inc, np.where(Ma < 1, Cd_BTail_sub, Cd_BTail_sup))
+
+    #Nosecone pressure drag: cone of the same fineness for every nose type
+    Cd_nose = nose_pressure_drag(Ma, np.arctan2(r, g["nose_len"]))
+
+    #Base drag: motor exhaust fills the nozzle exit while burning
+    A_base = np.pi * g["base_radius"] ** 2
+    A_base_on = max(A_base - np.pi * g["nozzle_radius"] ** 2, 0.0)
+    Cd_base = base_drag(Ma)
+
+    Cd_common = Cd_fT + Cd_fB + Cd_LTail + Cd_BTail + Cd_nose
+    cd_power_off = Cd_common + Cd_base * A_base / Ar
+    cd_power_on = Cd_common + Cd_base * A_base_on / Ar
+    return cd_power_off, cd_power_on
+
+
+def _grid_function(mach, altitude, cd, title):
+    M, H = np.meshgrid(mach, altitude, indexing="ij")
+    source = np.column_stack((M.ravel(), H.ravel(), cd.ravel()))
+    return Function(source, ["Mach Number", "Altitude [m]"], title, "linear", "constant")
+
+
+def csv_drag_model(power_on_path, power_off_path, altitude=(DEFAULT_ALTITUDE[0], DEFAULT_ALTITUDE[-1])):
+    """
+    Static Cd(Mach) curves from "mach,cd" csv files, as the 2-D Cd(Mach,
+    altitude) Functions Rocket takes, constant with altitude.
+    Returns (cd_power_on, cd_power_off) like build_drag_model.
+    """
+    altitude = np.asarray(altitude, dtype=float)
+    curves = []
+    for path, title in ((power_on_path, "Drag Coefficient with Power On"),
+                        (power_off_path, "Drag Coefficient with Power Off")):
+        mach, cd = np.loadtxt(path, delimiter=",", unpack=True)
+        cd = np.repeat(cd[:, None], len(altitude), axis=1)
+        curves.append(_grid_function(mach, altitude, cd, title))
+    return tuple(curves)
+
+
+def build_drag_model(config, mach=DEFAULT_MACH, altitude=DEFAULT_ALTITUDE):
+    """
+    2-D Cd(Mach, altitude) Functions for Rocket(power_on_drag, power_off_drag).
+    Returns (cd_power_on, cd_power_off), cached per process by geometry (for
+    the last DRAG_CACHE_SIZE geometries) so repeated designs in a sweep reuse
+    the same Functions.
+    """
+    return _drag_model(
+        tuple(sorted(_geometry(config).items())),
+        tuple(np.asarray(mach, dtype=float).tolist()),
+        tuple(np.asarray(altitude, dtype=float).tolist()),
+    )
+
 
+@functools.lru_cache(maxsize=DRAG_CACHE_SIZE)
+def _drag_model(geometry, mach, altitude):
+    # Hashable arguments: the _geometry items and the grids as tuples
+    mach = np.array(mach)
+    altitude = np.array(altitude)
+    cd_off, cd_on = _barrowman_drag(dict(geometry), mach[:, None], altitude[None, :])
+    return (
+        _grid_function(mach, altitude, cd_on, "Drag Coefficient with Power On"),
+        _grid_function(mach, altitude, cd_off, "Drag Coefficient with Power Off"),
+    )
@@ -591,4 +591,212 @@ class MassModel:
             m_obj.mass,
             tuple(float(x) for x in m_obj.inertia.diagonal()),  # force scalars,
             float(m_obj.cg[0])  # single float, not list
-        )
\ No newline at end of file
+        )
+
+
+# -------------------------
+# Vectorized (struct-of-arrays) mass model
+# -------------------------
+
+_NOSE_CODES = {t: i for i, t in enumerate(NoseconeType)}
+
+
+def _diag3(Ixx, Iyy, Izz):
+    """Stack per-design principal moments (N,) into (N,3,3) diagonal tensors."""
+    I = np.zeros(np.shape(Ixx) + (3, 3))
+    I[..., 0, 0], I[..., 1, 1], I[..., 2, 2] = Ixx, Iyy, Izz
+    return I
+
+
+def _axial_cg(x_cg):
+    cg = np.zeros(np.shape(x_cg) + (3,))
+    cg[..., 0] = x_cg
+    return cg
+
+
+class MassModelBatch:
+    """
+    Struct-of-arrays counterpart to MassModel for N designs at once.
+
+    Every attribute is a length-N array (one entry per design) and each part
+    is computed for all designs with NumPy broadcasting, then combined with a
+    single vectorized parallel-axis pass. Results match MassModel design by
+    design. Use it to screen sweeps on mass/CG before running any Flight.
+    """
+
+    # Config fields read by the model, in the same units as Config
+    FIELDS = (
+        "radius", "nosecone_length", "nosecone_thickness", "nosecone_power",
+        "upper_fuselage_length", "upper_fuselage_thickness",
+        "lower_fuselage_length", "lower_fuselage_thickness",
+        "fin_span", "fin_root_chord", "fin_tip_chord", "fin_thickness",
+        "fin_num", "distance_to_fin",
+        "boattail_bot_radius", "boattail_length", "boattail_thickness",
+        "payload_mass", "payload_volume", "recovery_mass", "recovery_volume",
+        "propulsion_struct_mass", "coupler_mass",
+    )
+    MATERIALS = (
+        "nosecone_material", "upper_fuselage_material",
+        "lower_fuselage_material", "fin_material", "boattail_material",
+    )
+
+    def __init__(self, nose_code, **arrays):
+        """
+        nose_code : (N,) int array, index of each design's NoseconeType.
+        arrays : every name in FIELDS as an (N,) array, plus every name in
+            MATERIALS as an (N,) array of densities [kg/m^3].
+        Prefer from_configs unless the arrays already exist.
+        """
+        self.nose_code = np.asarray(nose_code, dtype=int)
+        for name in self.FIELDS + self.MATERIALS:
+            setattr(self, name, np.asarray(arrays[name], dtype=float))
+        self.n = len(self.nose_code)
+        self._assemble()
+
+    @classmethod
+    def from_configs(cls, configs):
+        """Pack a list of Config objects into one batch."""
+        arrays = {name: [getattr(c, name) for c in configs] for name in cls.FIELDS}
+        arrays["nosecone_power"] = [
+            np.nan if c.nosecone_power is None else c.nosecone_power for c in configs
+        ]
+        for name in cls.MATERIALS:
+            arrays[name] = [getattr(c, name).rho for c in configs]
+        nose_code = [_NOSE_CODES[c.nosecone_type] for c in configs]
+        return cls(nose_code, **arrays)
+
+    @classmethod
+    def from_designs(cls, designs, missionreqs):
+        """Batch straight from DesignVariables (via build_config)."""
+        from src.utils.build_config import build_config
+        return cls.from_configs([build_config(d, missionreqs) for d in designs])
+
+    # -------------------------
+    # Parts, all (N,) / (N,3) / (N,3,3)
+    # -------------------------
+
+    def _nosecone(self, total_len):
+        R_o, L = self.radius, self.nosecone_length
+        R_i = R_o - self.nosecone_thickness
+        shell = R_o**2 - R_i**2
+        p = self.nosecone_power
+        code = self.nose_code
+        known = np.isin(code, [_NOSE_CODES[t] for t in NoseconeType])
+        if not known.all():
+            raise ValueError(f"Unsupported nosecone type code(s): {np.unique(code[~known])}")
+
+        is_ogive = code == _NOSE_CODES[NoseconeType.OGIVE]
+        is_power = code == _NOSE_CODES[NoseconeType.POWER_SERIES]
+        with np.errstate(invalid="ignore"):
+            V = np.where(
+                is_ogive, (np.pi * L / 6) * (3 * shell + L**2 / 4),
+                np.where(is_power, np.pi * shell * L / (2 * p + 1),
+                         (1/3) * np.pi * shell * L)
+            )
+            cg_ratio = np.select(
+                [code == _NOSE_CODES[NoseconeType.LV_HAACK],
+                 code == _NOSE_CODES[NoseconeType.CONICAL],
+                 is_power],
+                [0.437, 0.75, (2 * p + 1) / (2 * p + 3)],
+                default=0.466,  # von Karman and ogive
+            )
+        m = V * self.nosecone_material
+        return m, _axial_cg(total_len - L + cg_ratio * L), np.zeros((self.n, 3, 3))
+
+    def _tube(self, rho, thickness, L, x0):
+        R_o = self.radius
+        R_i = R_o - thickness
+        m = np.pi * (R_o**2 - R_i**2) * L * rho
+        Ixx = 0.5 * m * (R_o**2 + R_i**2)
+        Iyy = (1/12) * m * (3 * (R_o**2 + R_i**2) + L**2)
+        return m, _axial_cg(x0 + 0.5 * L), _diag3(Ixx, Iyy, Iyy)
+
+    def _fins(self):
+        """One entry per fin slot: (N,K), (N,K,3), (N,K,3,3); unused slots are massless."""
+        cr, ct, s, t = self.fin_root_chord, self.fin_tip_chord, self.fin_span, self.fin_thickness
+        n_fins = self.fin_num.astype(int)
+        k = np.arange(max(int(n_fins.max()), 1))
+        used = k[None, :] < n_fins[:, None]
+
+        m_fin = 0.5 * (cr + ct) * s * t * self.fin_material
+        c_avg = 0.5 * (cr + ct)
+        Ixx = (1/12) * m_fin * (s**2 + t**2)
+        Iyy = (1/12) * m_fin * (c_avg**2 + t**2)
+        Izz = (1/12) * m_fin * (s**2 + c_avg**2)
+
+        theta = 2 * np.pi * k[None, :] / np.maximum(n_fins, 1)[:, None]
+        c, sn = np.cos(theta), np.sin(theta)
+        r = (self.radius + t / 2)[:, None]
+
+        m = np.where(used, m_fin[:, None], 0.0)
+        cg = np.stack([np.broadcast_to((self.distance_to_fin + 0.5 * cr)[:, None], c.shape),
+                       r * c, r * sn], axis=-1)
+
+        # R diag(Ixx,Iyy,Izz) R^T for a rotation theta about x, written out
+        Iyy_, Izz_ = Iyy[:, None], Izz[:, None]
+        I = np.zeros(m.shape + (3, 3))
+        I[..., 0, 0] = Ixx[:, None]
+        I[..., 1, 1] = Iyy_ * c**2 + Izz_ * sn**2
+        I[..., 2, 2] = Iyy_ * sn**2 + Izz_ * c**2
+        I[..., 1, 2] = I[..., 2, 1] = (Iyy_ - Izz_) * sn * c
+        I *= used[..., None, None]
+        return m, cg, I
+
+    def _boattail(self):
+        L, t = self.boattail_length, self.boattail_thickness
+        Rt, Rb = self.radius, self.boattail_bot_radius
+        Rti, Rbi = Rt - t, Rb - t
+        den = (Rt**2 + Rt*Rb + Rb**2) - (Rti**2 + Rti*Rbi + Rbi**2)
+        num = (Rt**2 + 2*Rt*Rb + 3*Rb**2) - (Rti**2 + 2*Rti*Rbi + 3*Rbi**2)
+        has_tail = L > 0
+        m = np.where(has_tail, (np.pi * L / 3.0) * den * self.boattail_material, 0.0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            x_cg = np.where(has_tail, L * num / (4 * den), 0.0)
+        return m, _axial_cg(x_cg), np.zeros((self.n, 3, 3))
+
+    def _point(self, m, x_cg):
+        return np.broadcast_to(m, (self.n,)), _axial_cg(x_cg), np.zeros((self.n, 3, 3))
+
+    def _assemble(self):
+        bt = self.boattail_length
+        lower = self.lower_fuselage_length
+        total_len = self.nosecone_length + self.upper_fuselage_length + lower + bt
+        A_tube = np.pi * self.radius**2
+        L_recovery = self.recovery_volume / A_tube
+        L_payload = self.payload_volume / A_tube
+
+        parts = [
+            self._nosecone(total_len),
+            self._tube(self.upper_fuselage_material, self.upper_fuselage_thickness,
+                       self.upper_fuselage_length, bt + lower),
+            self._tube(self.lower_fuselage_material, self.lower_fuselage_thickness,
+                       lower, bt),
+            self._boattail(),
+            self._point(self.recovery_mass,
+                        total_len - self.nosecone_length - 0.5 * L_recovery),
+            # Same TODO as MassModel: prop struct length is the lower fuselage
+            self._point(self.propulsion_struct_mass, 0.5 * lower),
+            self._point(self.coupler_mass, bt + lower),
+            self._point(self.payload_mass,
+                        total_len - self.nosecone_length - L_recovery - 0.5 * L_payload),
+        ]
+        m_fins, cg_fins, I_fins = self._fins()
+
+        # (N,P) masses, (N,P,3) cgs, (N,P,3,3) inertias for P parts
+        m = np.concatenate([np.stack([p[0] for p in parts], axis=1), m_fins], axis=1)
+        cg = np.concatenate([np.stack([p[1] for p in parts], axis=1), cg_fins], axis=1)
+        I = np.concatenate([np.stack([p[2] for p in parts], axis=1), I_fins], axis=1)
+
+        # Vectorized parallel_axis over every part of every design
+        self.mass = m.sum(axis=1)
+        self.cg = np.einsum("np,npi->ni", m, cg) / self.mass[:, None]
+        d = cg - self.cg[:, None, :]
+        d2 = np.einsum("npi,npi->np", d, d)
+        shift = d2[..., None, None] * np.eye(3) - d[..., :, None] * d[..., None, :]
+        self.inertia = (I + m[..., None, None] * shift).sum(axis=1)
+
+    def rocketpy_arrays(self):
+        """
+        Batched rocketpy_tuple: (mass (N,), (Ixx, Iyy, Izz) as (N,3), cg_x (N,)).
+        """
+        return self.mass, np.diagonal(self.inertia, axis1=1, axis2=2).copy(), self.cg[:, 0]
@@ -0,0 +1,92 @@
+"""
+Disk cache for SolidMotor's derived grain geometry.
+
+The slow part of building a SolidMotor is evaluate_geometry(): a tight
+tolerance LSODA solve for grain inner radius/height vs time. Its result only
+depends on the .eng contents and the constructor args, so it is stored as
+.npz keyed on a hash of both and reloaded on later builds.
+"""
+
+import hashlib
+import json
+import os
+
+import numpy as np
+from uvicrocketpy import SolidMotor
+from uvicrocketpy.mathutils.function import Function, reset_funcified_methods
+
+CACHE_VERSION = 1
+CACHE_DIR = os.environ.get(
+    "UVR_MOTOR_CACHE", os.path.join(os.path.dirname(__file__), ".cache")
+)
+
+
+def motor_cache_key(**kwargs):
+    """sha256 of the thrust curve file contents + every other constructor arg."""
+    h = hashlib.sha256(f"v{CACHE_VERSION}".encode())
+    with open(kwargs["thrust_source"], "rb") as f:
+        h.update(f.read())
+    args = {k: v for k, v in kwargs.items() if k != "thrust_source"}
+    h.update(json.dumps(args, sort_keys=True, default=str).encode())
+    return h.hexdigest()
+
+
+class CachedSolidMotor(SolidMotor):
+    """
+    SolidMotor that reads its grain geometry from cache_path when present and
+    writes it there after solving otherwise. Any later evaluate_geometry()
+    call (e.g. a new mass_flow_rate) solves normally.
+    """
+
+    def __init__(self, *args, cache_path=None, **kwargs):
+        self._cache_path = cache_path
+        super().__init__(*args, **kwargs)
+        self._cache_path = None
+
+    def evaluate_geometry(self):
+        path = getattr(self, "_cache_path", None)
+        if path is None:
+            super().evaluate_geometry()
+        elif os.path.exists(path):
+            self._load_geometry(path)
+        else:
+            super().evaluate_geometry()
+            self._save_geometry(path)
+
+    def _load_geometry(self, path):
+        with np.load(path) as data:
+            t, inner_radius, height = data["t"], data["inner_radius"], data["height"]
+            self.grain_burn_out = float(data["burn_out"])
+        self.grain_inner_radius = Function(
+            np.column_stack((t, inner_radius)).tolist(),
+            "Time (s)",
+            "Grain Inner Radius (m)",
+            self.interpolate,
+            "constant",
+        )
+        self.grain_height = Function(
+            np.column_stack((t, height)).tolist(),
+            "Time (s)",
+            "Grain Height (m)",
+            self.interpolate,
+            "constant",
+        )
+        reset_funcified_methods(self)
+
+    def _save_geometry(self, path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path[: -len(".npz")] + f".{os.getpid()}.tmp.npz"
+        np.savez(
+            tmp,
+            t=self.grain_inner_radius.x_array,
+            inner_radius=self.grain_inner_radius.y_array,
+            height=self.grain_height.y_array,
+            burn_out=self.grain_burn_out,
+        )
+        # Atomic so parallel workers building the same motor never see half a file
+        os.replace(tmp, path)
+
+
+def build_cached_motor(**kwargs):
+    path = os.path.join(CACHE_DIR, f"{motor_cache_key(**kwargs)}.npz")
+    return CachedSolidMotor(cache_path=path, **kwargs)
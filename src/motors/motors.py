@@ -1,17 +1,21 @@
 from enum import Enum
-from uvicrocketpy import SolidMotor
+from functools import lru_cache
 
 ### NOTE: Assumptions:
 # grain_initial_inner_radius=throat_radius
 # grains_center_of_mass_position=center_of_dry_mass_position
 # all grain density and grain height same as M1790
 
+# NOTE: members hold the SolidMotor kwargs, not the motor itself. The
+# SolidMotor is built on first use of Motor.X.motor (once per process) and its
+# grain geometry is cached on disk, see src/motors/cached_motor.py.
+
 class Motor(Enum):
     """
     CTI M1790:
     https://pro38.com/products/p98-4g/8088m1790-p/
     """
-    M1790 = SolidMotor(
+    M1790 = dict(
         thrust_source="./src/motors/Cesaroni_8088M1790-P.eng",
         dry_mass=3.0238,
         dry_inertia=(0.00564,0.21170,0.21170),
@@ -34,7 +38,7 @@ class Motor(Enum):
     CTI M1450:
     https://pro38.com/products/p98-4g/9955m1450-p/
     """
-    M1450 = SolidMotor(
+    M1450 = dict(
         thrust_source="./src/motors/Cesaroni_9955M1450-P.eng",
         dry_mass=3.0238,
         dry_inertia=(0.00564,0.21170,0.21170),
@@ -57,7 +61,7 @@ class Motor(Enum):
     CTI M3400:
     https://pro38.com/products/p98-4g/9994M3400-p/
     """
-    M3400 = SolidMotor(
+    M3400 = dict(
         thrust_source="./src/motors/Cesaroni_9994M3400-P.eng",
         dry_mass=3.0238,
         dry_inertia=(0.00564,0.21170,0.21170),
@@ -80,7 +84,7 @@ class Motor(Enum):
     CTI M795:
     https://pro38.com/products/p98-4g/10133M795-p/
     """
-    M795 = SolidMotor(
+    M795 = dict(
         thrust_source="./src/motors/Cesaroni_10133M795-P.eng",
         dry_mass=3.0238,
         dry_inertia=(0.00564,0.21170,0.21170),
@@ -104,7 +108,7 @@ class Motor(Enum):
     N3400
     https://pro38.com/products/p98-6gxl/14263n3400-p/
     """
-    N3400 = SolidMotor(
+    N3400 = dict(
         thrust_source="./src/motors/Cesaroni_14263N3400-P.eng",
         dry_mass=4.3985,
         dry_inertia=(0.00876,0.8265,0.8265),
@@ -127,7 +131,7 @@ class Motor(Enum):
     N2540:
     https://pro38.com/products/p98-6gxl/17907n2540-p/
     """
-    N2540 = SolidMotor(
+    N2540 = dict(
         thrust_source="./src/motors/Cesaroni_17907N2540-P.eng",
         dry_mass=4.3985,
         dry_inertia=(0.00876,0.8265,0.8265),
@@ -150,7 +154,7 @@ class Motor(Enum):
     O3400:
     https://pro38.com44/products/p98-6gxl/21062o3400-p/
     """
-    O3400 = SolidMotor(
+    O3400 = dict(
         thrust_source="./src/motors/Cesaroni_21062O3400-P.eng",
         dry_mass=4.3985,
         dry_inertia=(0.00876,0.8265,0.8265),
@@ -168,3 +172,16 @@ class Motor(Enum):
         throat_radius=0.013195,
         coordinate_system_orientation="nozzle_to_combustion_chamber",
     )
+
+    @property
+    def motor(self):
+        """SolidMotor for this member, built on first access."""
+        return _build_motor(self.name)
+
+
+@lru_cache(maxsize=None)
+def _build_motor(name):
+    # Deferred so importing this module (and every src.inputs file) stays cheap
+    from src.motors.cached_motor import build_cached_motor
+    return build_cached_motor(**Motor[name].value)
+
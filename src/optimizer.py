@@ -0,0 +1,192 @@
+"""
+Surrogate-assisted trust-region optimizer over continuous DesignVariables.
+
+Every iteration fits an RBF surrogate (the same scipy RBFInterpolator that
+Function's "rbf" interpolation uses) to the penalized objective of all
+flights run so far, then picks a batch inside a trust region around the
+incumbent: the gradient-based (L-BFGS-B) minimum of the surrogate plus the
+best-predicted, well spread random candidates. The batch runs in parallel.
+The region grows after improvements and shrinks after misses; the run stops
+when it collapses or the flight budget is spent.
+"""
+
+from dataclasses import dataclass, replace
+
+import numpy as np
+from scipy.interpolate import RBFInterpolator
+from scipy.optimize import minimize
+
+from src.design.constraints import total_violation
+from src.runs.studies import STATUS_OK, check_fields, evaluate_designs, make_pool
+
+
+@dataclass
+class Objective:
+    column: str
+    sense: str = "min"              # "min" or "max"
+    target: float | None = None     # if set, minimize |column - target|
+
+    def value(self, row):
+        v = row.get(self.column, np.nan)
+        if self.target is not None:
+            return abs(v - self.target)
+        return -v if self.sense == "max" else v
+
+
+@dataclass
+class OptimizerResult:
+    desvars: object
+    row: dict
+    objective: float
+    violation: float
+    n_flights: int
+    history: list                   # (desvars, status, row) per flight
+
+
+# -------------------------
+# Helpers
+# -------------------------
+
+def _latin_hypercube(n, d, rng):
+    cuts = (np.arange(n)[:, None] + rng.random((n, d))) / n
+    for j in range(d):
+        cuts[:, j] = cuts[rng.permutation(n), j]
+    return cuts
+
+
+def _merit(objectives, violations, failed):
+    """Penalized objective; infeasible/failed points rank behind feasible ones."""
+    ok = ~failed
+    if not ok.any():
+        return np.zeros(len(objectives))
+    f = np.where(ok, objectives, np.nan)
+    spread = np.nanmax(f) - np.nanmin(f)
+    penalty = 10.0 * max(spread, 1e-9)
+    v = np.where(np.isfinite(violations), violations, 0.0)
+    merit = f + penalty * v
+    worst = np.nanmax(merit) + penalty
+    return np.where(ok & np.isfinite(violations), merit, worst)
+
+
+def _improves(new, old, rtol=1e-3):
+    """
+    Whether point new beats the incumbent old, both (objective, violation,
+    failed). Compared on the raw values: the merit's penalty is rescaled
+    every iteration, so merits from different iterations don't compare.
+    """
+    f_new, v_new, failed_new = new
+    f_old, v_old, failed_old = old
+    if failed_new or not np.isfinite(v_new):
+        return False
+    if failed_old or not np.isfinite(v_old):
+        return True
+    if v_old > 0 or v_new > 0:
+        return v_new < v_old - rtol * v_old
+    return f_new < f_old - rtol * abs(f_old)
+
+
+def _pick_batch(surrogate, center, radius, x_seen, batch_size, rng):
+    d = len(center)
+    lo = np.clip(center - radius, 0.0, 1.0)
+    hi = np.clip(center + radius, 0.0, 1.0)
+
+    picks = []
+    # Gradient step on the surrogate inside the trust region
+    res = minimize(lambda x: float(surrogate(x[None, :])[0]), center,
+                   method="L-BFGS-B", bounds=list(zip(lo, hi)))
+    picks.append(res.x)
+
+    # Screen random candidates, keep the best predicted that are spread out
+    candidates = lo + (hi - lo) * rng.random((max(200 * d, 500), d))
+    order = np.argsort(surrogate(candidates))
+    min_dist = radius / 10
+    for x in candidates[order]:
+        if len(picks) >= batch_size:
+            break
+        taken = np.vstack([x_seen, picks])
+        if np.min(np.linalg.norm(taken - x, axis=1)) > min_dist:
+            picks.append(x)
+    return np.array(picks)
+
+
+# -------------------------
+# Driver
+# -------------------------
+
+def run_optimizer(desvars, missionreqs, bounds, objective, constraints=(),
+                  budget=40, batch_size=None, n_init=None, n_workers=None,
+                  seed=None, radius=0.2, min_radius=1e-3):
+    """
+    Optimize the continuous DesignVariables named in bounds ({field: (low, high)}),
+    holding every other field (motor, materials, fin count, ...) at desvars.
+    budget caps the number of full Flight runs.
+    """
+    check_fields(desvars, bounds)
+    names = list(bounds)
+    lows = np.array([bounds[n][0] for n in names], dtype=float)
+    highs = np.array([bounds[n][1] for n in names], dtype=float)
+    d = len(names)
+    rng = np.random.default_rng(seed)
+    batch_size = batch_size or max(2, min(d + 1, 8))
+    n_init = n_init or 2 * d + 1
+
+    def to_design(x):
+        values = lows + x * (highs - lows)
+        return replace(desvars, **{n: float(v) for n, v in zip(names, values)})
+
+    xs, objectives, violations, failed, history = [], [], [], [], []
+
+    def point(i):
+        return objectives[i], violations[i], failed[i]
+
+    def run_batch(batch, pool):
+        designs = [to_design(x) for x in batch]
+        for x, dv, (status, row) in zip(batch, designs,
+                                        evaluate_designs(designs, missionreqs, pool)):
+            xs.append(x)
+            objectives.append(objective.value(row))
+            violations.append(total_violation(row, constraints))
+            failed.append(status != STATUS_OK or not np.isfinite(objectives[-1]))
+            history.append((dv, status, row))
+
+    pool = make_pool(n_workers) if n_workers != 1 else None
+    try:
+        run_batch(_latin_hypercube(n_init, d, rng), pool)
+        successes = misses = 0
+        merit = _merit(np.array(objectives), np.array(violations), np.array(failed))
+        best = int(np.argmin(merit))
+
+        while len(xs) < budget and radius >= min_radius:
+            x_seen = np.array(xs)
+            scale = merit.std() or 1.0
+            surrogate = RBFInterpolator(x_seen, (merit - merit.mean()) / scale,
+                                        kernel="thin_plate_spline", smoothing=1e-8)
+            size = min(batch_size, budget - len(xs))
+            run_batch(_pick_batch(surrogate, x_seen[best], radius, x_seen, size, rng), pool)
+
+            previous = best
+            merit = _merit(np.array(objectives), np.array(violations), np.array(failed))
+            best = int(np.argmin(merit))
+            if _improves(point(best), point(previous)):
+                successes, misses = successes + 1, 0
+            else:
+                successes, misses = 0, misses + 1
+            if successes >= 2:
+                radius, successes = min(2 * radius, 0.5), 0
+            elif misses >= 3:
+                radius, misses = radius / 2, 0
+            print(f"Optimizer: {len(xs)} flights, best merit {merit[best]:.4g}, "
+                  f"trust radius {radius:.3g}")
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    dv, _, row = history[best]
+    return OptimizerResult(
+        desvars=dv,
+        row=row,
+        objective=objectives[best],
+        violation=violations[best],
+        n_flights=len(xs),
+        history=history,
+    )
@@ -5,9 +5,16 @@ from src.utils.build_config import build_config
 from src.utils.build_rocket import build_rocket
 from src.models.aero_bending import aero_bending
 
-# Atmosphere and launch environment
-def flightsim(desvars, missionreqs):
-    env = build_env()
+
+def run_flight(desvars, missionreqs, env=None, **flight_kwargs):
+    """
+    Build config + rocket from design vars and run one Flight.
+    Pass a prebuilt env to skip rebuilding the atmosphere every call
+    (used by the batched runners in src/runs/studies.py). Extra kwargs go
+    to Flight, e.g. equations_of_motion="kernel" for the fast RHS.
+    """
+    if env is None:
+        env = build_env()
     config = build_config(desvars, missionreqs)
 
     # Build rocket from design vars
@@ -19,8 +26,15 @@ def flightsim(desvars, missionreqs):
         environment=env,
         rail_length=missionreqs.rail_length,
         inclination=85,
-        heading=0
+        heading=0,
+        **flight_kwargs
     )
+    return flight, mm
+
+
+# Atmosphere and launch environment
+def flightsim(desvars, missionreqs):
+    flight, mm = run_flight(desvars, missionreqs)
 
     #TODO:
     # Check Aero Loads Constraint
@@ -0,0 +1,296 @@
+"""
+Batched design studies: build_config -> build_rocket -> Flight over many
+DesignVariables, spread across a process pool.
+"""
+
+import hashlib
+import itertools
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import fields, replace
+from enum import Enum
+
+import numpy as np
+
+from src.models.env import build_env
+from src.runs.sim import run_flight
+
+# Scalars pulled off every Flight, one column each in the result store
+FLIGHT_OUTPUTS = (
+    "apogee",
+    "max_speed",
+    "max_mach_number",
+    "out_of_rail_velocity",
+    "out_of_rail_stability_margin",
+    "max_dynamic_pressure",
+)
+RESULT_COLUMNS = FLIGHT_OUTPUTS + ("wet_mass",)
+# Message of the exception a failed design raised, "" for the others
+ERROR_COLUMN = "error"
+
+STATUS_OK = 0
+STATUS_FAILED = 1
+
+
+# -------------------------
+# Design generation
+# -------------------------
+
+def grid_designs(base, **axes):
+    """
+    Full factorial sweep around a base DesignVariables.
+
+    Every keyword is a DesignVariables field mapped to the list of values to
+    sweep, e.g. grid_designs(desvars, fin_num=[3, 4], motor_type=list(Motor)).
+    Fields not named keep the base value.
+    """
+    check_fields(base, axes)
+    names = list(axes)
+    for combo in itertools.product(*(axes[n] for n in names)):
+        yield replace(base, **dict(zip(names, combo)))
+
+
+def sample_designs(base, n, bounds, seed=None):
+    """
+    Random sweep around a base DesignVariables.
+
+    bounds maps a field to either a (low, high) tuple, sampled uniformly, or a
+    list of choices (enums, fin counts, ...), sampled with equal weight.
+    """
+    check_fields(base, bounds)
+    rng = np.random.default_rng(seed)
+    for _ in range(n):
+        changes = {}
+        for name, bound in bounds.items():
+            if isinstance(bound, tuple):
+                changes[name] = float(rng.uniform(bound[0], bound[1]))
+            else:
+                changes[name] = bound[rng.integers(len(bound))]
+        yield replace(base, **changes)
+
+
+def check_fields(base, names):
+    """Raise ValueError if any of names is not a DesignVariables field."""
+    valid = {f.name for f in fields(base)}
+    unknown = set(names) - valid
+    if unknown:
+        raise ValueError(f"Unknown design variables: {sorted(unknown)}")
+
+
+# -------------------------
+# Worker side
+# -------------------------
+
+# One per process: the Environment is rebuilt once per worker instead of
+# once per design. Motors are memoized per process by Motor.X.motor, so each
+# worker only builds the motors its designs use (geometry comes off disk).
+_WORKER_CACHE = {}
+
+
+def _init_worker():
+    _WORKER_CACHE["env"] = build_env()
+
+
+def _worker_env():
+    if "env" not in _WORKER_CACHE:
+        _init_worker()
+    return _WORKER_CACHE["env"]
+
+
+def evaluate_design(desvars, missionreqs, env=None):
+    """
+    Run one design, returning (status, {column: value}). The row of a failed
+    design holds NaN outputs and the exception in its ERROR_COLUMN.
+    """
+    env = env if env is not None else _worker_env()
+    # Only the simulation may fail for a given design; errors in the
+    # bookkeeping below are bugs and propagate instead of failing every row
+    try:
+        flight, mm = run_flight(desvars, missionreqs, env=env)
+        row = {name: float(getattr(flight, name)) for name in FLIGHT_OUTPUTS}
+    except Exception as e:  # pylint: disable=broad-except
+        row = {name: np.nan for name in RESULT_COLUMNS}
+        row[ERROR_COLUMN] = f"{type(e).__name__}: {e}"
+        return STATUS_FAILED, row
+    row["wet_mass"] = float(mm.wet_mass().mass)
+    row[ERROR_COLUMN] = ""
+    return STATUS_OK, row
+
+
+def _run_chunk(chunk, missionreqs):
+    env = _worker_env()
+    return [(i, *evaluate_design(d, missionreqs, env)) for i, d in chunk]
+
+
+def make_pool(n_workers=None):
+    """Process pool whose workers build their Environment once at startup."""
+    return ProcessPoolExecutor(max_workers=n_workers, initializer=_init_worker)
+
+
+def evaluate_designs(designs, missionreqs, pool=None):
+    """
+    Evaluate a batch of designs, returning [(status, row), ...] in order.
+    Without a pool the batch runs in this process. Keep one pool alive across
+    batches (e.g. optimizer iterations) so the worker caches stay warm.
+    """
+    designs = list(designs)
+    if pool is None:
+        env = _worker_env()
+        return [evaluate_design(d, missionreqs, env) for d in designs]
+    futures = [pool.submit(evaluate_design, d, missionreqs) for d in designs]
+    return [f.result() for f in futures]
+
+
+# -------------------------
+# Result store
+# -------------------------
+
+def _design_value(value):
+    # Enums go in as their member name and unset values as NaN so the file
+    # loads without pickle
+    if isinstance(value, Enum):
+        return value.name
+    if value is None:
+        return np.nan
+    return value
+
+
+def designs_hash(designs):
+    """sha256 of every field of every design, in order."""
+    h = hashlib.sha256()
+    for desvars in designs:
+        values = [(f.name, _design_value(getattr(desvars, f.name)))
+                  for f in fields(desvars)]
+        h.update(repr(values).encode())
+    return h.hexdigest()
+
+
+class StudyResults:
+    """
+    Columnar, resumable result store backed by a single .npz file.
+
+    One array per column: "index" (position in the design list), "status",
+    every RESULT_COLUMNS output, ERROR_COLUMN and every DesignVariables field.
+    The file is rewritten atomically on flush, so an interrupted study loses
+    at most the rows since the last flush and picks up from there on the next
+    run. It also holds the hash of the design list, and refuses to resume a
+    study of other designs.
+    """
+
+    METADATA = ("n_designs", "designs_hash")
+
+    def __init__(self, path, designs):
+        self.path = path
+        self.n_designs = len(designs)
+        self.designs_hash = designs_hash(designs)
+        self.columns = {}
+        if os.path.exists(path):
+            self._load()
+
+    def _load(self):
+        with np.load(self.path) as data:
+            stored_n = int(data["n_designs"])
+            if stored_n != self.n_designs:
+                raise ValueError(
+                    f"{self.path} holds a study of {stored_n} designs, "
+                    f"not {self.n_designs}. Use a new results path."
+                )
+            stored_hash = str(data["designs_hash"]) if "designs_hash" in data else None
+            if stored_hash != self.designs_hash:
+                raise ValueError(
+                    f"{self.path} holds a study of other designs than the ones "
+                    "given. Use a new results path."
+                )
+            self.columns = {
+                k: data[k].tolist() for k in data.files if k not in self.METADATA
+            }
+
+    @property
+    def completed(self):
+        return set(self.columns.get("index", []))
+
+    def append(self, index, status, row, desvars):
+        record = {"index": index, "status": status, **row}
+        for f in fields(desvars):
+            record[f.name] = _design_value(getattr(desvars, f.name))
+        for key, value in record.items():
+            self.columns.setdefault(key, []).append(value)
+
+    def flush(self):
+        # np.savez appends .npz to names without it, so keep the suffix on tmp
+        tmp = self.path[: -len(".npz")] + ".tmp.npz"
+        arrays = {k: np.asarray(v) for k, v in self.columns.items()}
+        # Object columns would need pickle to load back, which np.load refuses
+        objects = [k for k, v in arrays.items() if v.dtype == object]
+        if objects:
+            raise TypeError(
+                f"Columns {objects} hold values that cannot be stored without "
+                "pickle. Store numbers, strings or Enum members."
+            )
+        np.savez(tmp, n_designs=self.n_designs, designs_hash=self.designs_hash,
+                 **arrays)
+        os.replace(tmp, self.path)
+
+    def as_arrays(self):
+        """Columns as arrays, sorted by design index."""
+        if not self.columns:
+            return {}
+        order = np.argsort(self.columns["index"])
+        return {k: np.asarray(v)[order] for k, v in self.columns.items()}
+
+
+# -------------------------
+# Scheduler
+# -------------------------
+
+def run_study(designs, missionreqs, path="study_results.npz", n_workers=None,
+              chunk_size=None):
+    """
+    Run every design and store the results in a columnar .npz at path.
+
+    Designs are split into chunks so each task carries enough flights to hide
+    the process round trip, and each finished chunk is flushed to disk.
+    Re-running with the same design list skips the designs already stored.
+    Failed designs are stored with their status and error message.
+    n_workers=1 runs in this process (handy for debugging).
+    """
+    if not path.endswith(".npz"):
+        path += ".npz"
+    designs = list(designs)
+    store = StudyResults(path, designs)
+    done = store.completed
+    pending = [(i, d) for i, d in enumerate(designs) if i not in done]
+
+    print(f"Study: {len(designs)} designs, {len(done)} already done, "
+          f"{len(pending)} to run")
+    if not pending:
+        return store.as_arrays()
+
+    n_workers = n_workers or os.cpu_count() or 1
+    if chunk_size is None:
+        # ~4 chunks per worker balances load without tiny tasks
+        chunk_size = max(1, math.ceil(len(pending) / (4 * n_workers)))
+    chunks = [pending[i:i + chunk_size] for i in range(0, len(pending), chunk_size)]
+    by_index = dict(pending)
+
+    def _store_chunk(results):
+        for index, status, row in results:
+            store.append(index, status, row, by_index[index])
+        store.flush()
+
+    if n_workers == 1:
+        for chunk in chunks:
+            _store_chunk(_run_chunk(chunk, missionreqs))
+    else:
+        with make_pool(n_workers) as pool:
+            futures = [pool.submit(_run_chunk, c, missionreqs) for c in chunks]
+            for finished, future in enumerate(as_completed(futures), 1):
+                _store_chunk(future.result())
+                print(f"Chunk {finished}/{len(chunks)} done")
+
+    results = store.as_arrays()
+    n_failed = int(np.sum(results["status"] != STATUS_OK))
+    if n_failed:
+        print(f"{n_failed} designs failed, see the {ERROR_COLUMN!r} column")
+    return results
@@ -2,9 +2,13 @@ import numpy as np
 from uvicrocketpy import Rocket
 from src.utils.constants import *
 from src.models.mass import MassModel
-#from src.models.drag import build_drag_model
+from src.models.drag import build_drag_model, csv_drag_model
 
-def build_rocket(config):
+# Static curves kept for comparison runs: build_rocket(config, drag_model="csv")
+CSV_POWER_ON_DRAG = "src/models/powerOnDragCurve.csv"
+CSV_POWER_OFF_DRAG = "src/models/powerOffDragCurve.csv"
+
+def build_rocket(config, drag_model="barrowman"):
     
     mm = MassModel(config)
     rp_mass, rp_inertia, rp_cm = mm.rocketpy_tuple()
@@ -12,9 +16,12 @@ def build_rocket(config):
     print("mm out: ", rp_mass, rp_inertia, rp_cm)
 
 
-    #cd_power_on, cd_power_off = build_drag_model(config)
-    cd_power_on="src/models/powerOnDragCurve.csv"
-    cd_power_off="src/models/powerOffDragCurve.csv"
+    if drag_model == "barrowman":
+        cd_power_on, cd_power_off = build_drag_model(config)
+    elif drag_model == "csv":
+        cd_power_on, cd_power_off = csv_drag_model(CSV_POWER_ON_DRAG, CSV_POWER_OFF_DRAG)
+    else:
+        raise ValueError(f"Unknown drag model: {drag_model}")
 
 
     # From mass model assembly everything according to rocketpy
@@ -66,6 +73,6 @@ def build_rocket(config):
     )
 
     #rocket.add_motor(config.motor_type, config.motor_pos)
-    rocket.add_motor(config.motor_type.value, 0.0)
+    rocket.add_motor(config.motor_type.motor, 0.0)
                                         #NOTE: is this just 0 ???
     return rocket, mm
@@ -0,0 +1,146 @@
+"""Calisto fixtures, as in the RocketPy examples, built from the data files at
+the root of the repository. The ``make_*`` builders are also imported by the
+worker processes of the Monte Carlo tests."""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from uvicrocketpy import Environment, Flight, MonteCarlo, Rocket, SolidMotor
+from uvicrocketpy.stochastic import (
+    StochasticEnvironment,
+    StochasticFlight,
+    StochasticRocket,
+    StochasticSolidMotor,
+)
+
+DATA = Path(__file__).resolve().parents[1]
+
+
+def _drag_curve(filename):
+    """Cd(Mach) curve of a csv file, as the Cd(Mach, altitude) source Rocket
+    takes, constant with altitude."""
+    mach, cd = np.loadtxt(DATA / filename, delimiter=",", unpack=True)
+    altitude = np.array([0.0, 30000.0])
+    M, H = np.meshgrid(mach, altitude, indexing="ij")
+    return np.column_stack((M.ravel(), H.ravel(), np.repeat(cd, len(altitude))))
+
+
+def make_example_env():
+    """Standard atmosphere at Spaceport America."""
+    return Environment(latitude=32.990254, longitude=-106.974998, elevation=1400)
+
+
+def make_cesaroni_m1670():
+    """Cesaroni Pro75 M1670 solid motor."""
+    return SolidMotor(
+        thrust_source=str(DATA / "engine.eng"),
+        dry_mass=1.815,
+        dry_inertia=(0.125, 0.125, 0.002),
+        nozzle_radius=33 / 1000,
+        grain_number=5,
+        grain_density=1815,
+        grain_outer_radius=33 / 1000,
+        grain_initial_inner_radius=15 / 1000,
+        grain_initial_height=120 / 1000,
+        grain_separation=5 / 1000,
+        grains_center_of_mass_position=0.397,
+        center_of_dry_mass_position=0.317,
+        nozzle_position=0,
+        burn_time=3.9,
+        throat_radius=11 / 1000,
+        coordinate_system_orientation="nozzle_to_combustion_chamber",
+    )
+
+
+def make_calisto(cesaroni_m1670):
+    """Calisto with its motor, nose cone, fins, tail and rail buttons."""
+    rocket = Rocket(
+        radius=127 / 2000,
+        mass=14.426,
+        inertia=(6.321, 6.321, 0.034),
+        power_off_drag=_drag_curve("powerOffDragCurve.csv"),
+        power_on_drag=_drag_curve("powerOnDragCurve.csv"),
+        center_of_mass_without_motor=0,
+        coordinate_system_orientation="tail_to_nose",
+    )
+    rocket.add_motor(cesaroni_m1670, position=-1.255)
+    rocket.set_rail_buttons(
+        upper_button_position=0.0818,
+        lower_button_position=-0.6182,
+        angular_position=45,
+    )
+    rocket.add_nose(length=0.55829, kind="vonKarman", position=1.278)
+    rocket.add_trapezoidal_fins(
+        n=4,
+        root_chord=0.120,
+        tip_chord=0.060,
+        span=0.110,
+        position=-1.04956,
+        cant_angle=0.5,
+    )
+    rocket.add_tail(
+        top_radius=0.0635, bottom_radius=0.0435, length=0.060, position=-1.194656
+    )
+    return rocket
+
+
+def make_monte_carlo(filename, **kwargs):
+    """Monte Carlo campaign of Calisto flights to apogee, with dispersed
+    motor impulse, rocket mass and rail inclination and heading. ``kwargs``
+    are passed to ``MonteCarlo``."""
+    environment = make_example_env()
+    motor = make_cesaroni_m1670()
+    rocket = make_calisto(motor)
+    flight = Flight(
+        rocket=rocket,
+        environment=environment,
+        rail_length=5.2,
+        inclination=85,
+        heading=0,
+        terminate_on_apogee=True,
+    )
+    stochastic_motor = StochasticSolidMotor(motor, total_impulse=(6500, 200))
+    stochastic_rocket = StochasticRocket(rocket, mass=(14.426, 0.5))
+    stochastic_rocket.add_motor(stochastic_motor, position=[-1.255])
+    kwargs.setdefault(
+        "export_list", ["apogee", "apogee_time", "apogee_x", "apogee_y"]
+    )
+    return MonteCarlo(
+        filename,
+        StochasticEnvironment(environment),
+        stochastic_rocket,
+        StochasticFlight(flight, inclination=(85, 1), heading=(0, 2)),
+        **kwargs,
+    )
+
+
+@pytest.fixture
+def example_env():
+    """Standard atmosphere at Spaceport America."""
+    return make_example_env()
+
+
+@pytest.fixture
+def cesaroni_m1670():
+    """Cesaroni Pro75 M1670 solid motor."""
+    return make_cesaroni_m1670()
+
+
+@pytest.fixture
+def calisto(cesaroni_m1670):
+    """Calisto with its motor, nose cone, fins, tail and rail buttons."""
+    return make_calisto(cesaroni_m1670)
+
+
+@pytest.fixture
+def calisto_robust(calisto):
+    """Calisto with a drogue deployed at apogee and a main at 800 m."""
+    calisto.add_parachute(
+        "Main", cd_s=10.0, trigger=800, sampling_rate=105, lag=1.5
+    )
+    calisto.add_parachute(
+        "Drogue", cd_s=1.0, trigger="apogee", sampling_rate=105, lag=1.5
+    )
+    return calisto
@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+from uvicrocketpy import Flight
+from uvicrocketpy.simulation.ensemble_flight import EnsembleFlight
+
+
+def test_two_parachutes_match_flight(calisto_robust, example_env):
+    """Members deploy a drogue and a main parachute under the default
+    unbounded step, as Flight does."""
+    flight = Flight(
+        rocket=calisto_robust,
+        environment=example_env,
+        rail_length=5.2,
+        inclination=85,
+        heading=0,
+    )
+    ensemble = EnsembleFlight(
+        calisto_robust, example_env, rail_length=[5.2, 5.2], inclination=85, heading=0
+    )
+
+    assert np.all(ensemble.n_parachute_events == 2)
+    for name in ("out_of_rail_time", "apogee", "apogee_time"):
+        assert getattr(ensemble, name) == pytest.approx(
+            getattr(flight, name), rel=1e-3
+        )
+    for name in ("t_final", "impact_velocity"):
+        assert getattr(ensemble, name) == pytest.approx(
+            getattr(flight, name), rel=1e-2
+        )
+    drift = np.hypot(flight.x_impact, flight.y_impact)
+    impact_error = np.hypot(
+        ensemble.x_impact - flight.x_impact, ensemble.y_impact - flight.y_impact
+    )
+    assert np.all(impact_error < 0.02 * drift)
@@ -0,0 +1,18 @@
+import numpy as np
+import pytest
+
+from uvicrocketpy.simulation.flight_events import FlightEvent, FlightEventSet
+
+
+def test_event_off_the_dense_output_is_interpolated_linearly():
+    """An event whose sign change the dense output misses is placed at the
+    root of the line between the step's ends, with a warning."""
+    event = FlightEvent("apogee", lambda t, y: y[0], action=lambda *args: True)
+    events = FlightEventSet([event])
+    events.reset(0.0, np.array([1.0]))
+
+    # The interpolant never crosses zero, unlike the steps
+    with pytest.warns(RuntimeWarning, match="apogee"):
+        found = events.check(2.0, np.array([-3.0]), lambda: lambda t: np.array([1.0]))
+
+    assert [(t, located) for t, _, located in found] == [(0.5, event)]
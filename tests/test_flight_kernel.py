@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from uvicrocketpy import Flight
+from uvicrocketpy.simulation.flight_tables import altitude_grid, drag_tables
+
+
+def test_kernel_matches_u_dot(calisto, example_env):
+    """The tables of the kernel reproduce ``Flight.u_dot`` along a flight."""
+    flight = Flight(
+        rocket=calisto,
+        environment=example_env,
+        rail_length=5.2,
+        inclination=85,
+        heading=0,
+        terminate_on_apogee=True,
+        equations_of_motion="kernel",
+    )
+    solution = np.array(flight.solution)
+    steps = solution[solution[:, 0] > flight.out_of_rail_time]
+
+    derivatives = np.array([flight._kernel.u_dot(s[0], s[1:]) for s in steps])
+    expected = np.array([flight.u_dot(s[0], s[1:]) for s in steps])
+    scale = np.abs(expected).max(axis=0)
+    assert np.all(np.abs(derivatives - expected).max(axis=0) <= 1e-3 * scale + 1e-9)
+
+
+def test_point_mass_tracks_standard_flight(calisto, example_env):
+    """The 3-DOF equations keep the attitude and reach the 6-DOF apogee."""
+    kwargs = {
+        "rocket": calisto,
+        "environment": example_env,
+        "rail_length": 5.2,
+        "inclination": 85,
+        "heading": 0,
+        "terminate_on_apogee": True,
+    }
+    standard = Flight(**kwargs)
+    point_mass = Flight(equations_of_motion="3dof", **kwargs)
+
+    solution = np.array(point_mass.solution)
+    free = solution[solution[:, 0] > point_mass.out_of_rail_time]
+    assert np.all(free[:, 7:14] == free[0, 7:14])
+    assert abs(point_mass.apogee - standard.apogee) < 0.01 * standard.apogee
+    assert abs(point_mass.apogee_time - standard.apogee_time) < 0.5
+
+
+def test_tables_follow_functions_modified_in_place(calisto, example_env):
+    """Tables sampled from a Function are rebuilt once it is modified."""
+    z = altitude_grid(example_env)
+    _, _, _, power_off = drag_tables(calisto, z)
+    assert drag_tables(calisto, z)[3] is power_off
+
+    source = calisto.power_off_drag.get_source().copy()
+    source[:, -1] *= 2
+    calisto.power_off_drag.set_source(source)
+
+    np.testing.assert_allclose(drag_tables(calisto, z)[3], 2 * power_off)
+
+
+def test_point_mass_warns_about_air_brakes(calisto, example_env):
+    """The 3-DOF equations do not model air brakes, and say so."""
+    def controller(time, rate, state, history, observed, air_brakes):
+        air_brakes.deployment_level = 0.5
+
+    calisto.add_air_brakes(
+        drag_coefficient_curve=lambda deployment_level, mach: 0.5,
+        controller_function=controller,
+        sampling_rate=10,
+    )
+    with pytest.warns(RuntimeWarning, match="3dof"):
+        Flight(
+            rocket=calisto,
+            environment=example_env,
+            rail_length=5.2,
+            inclination=85,
+            heading=0,
+            terminate_on_apogee=True,
+            equations_of_motion="3dof",
+        )
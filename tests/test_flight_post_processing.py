@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+from uvicrocketpy import Flight
+from uvicrocketpy.simulation.flight_post_processing import FlightPostProcessor
+
+
+def test_u_dot_generalized_matches_flight(calisto_robust, example_env):
+    """The array counterpart of ``Flight.u_dot_generalized`` matches the
+    derivative evaluated step by step, also when the Euler parameters are
+    not of unit norm."""
+    flight = Flight(
+        rocket=calisto_robust,
+        environment=example_env,
+        rail_length=5.2,
+        inclination=85,
+        heading=0,
+        terminate_on_apogee=True,
+    )
+    solution = np.array(flight.solution)
+    steps = solution[solution[:, 0] > flight.out_of_rail_time]
+    scaled = steps.copy()
+    scaled[:, 7:11] *= 1.05
+    steps = np.concatenate([steps, scaled])
+
+    rows = FlightPostProcessor(flight).evaluate(flight.u_dot_generalized, steps)
+
+    flight._Flight__post_processed_variables = []
+    for step in steps:
+        flight.u_dot_generalized(step[0], step[1:], post_processing=True)
+    expected = np.array(flight._Flight__post_processed_variables)
+    assert rows == pytest.approx(expected, rel=1e-6, abs=1e-6)
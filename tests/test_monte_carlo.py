@@ -0,0 +1,82 @@
+import os
+
+import numpy as np
+import pytest
+from conftest import make_monte_carlo
+
+from uvicrocketpy.simulation.shared_arrays import SharedArray, SharedArrays
+
+
+def test_resumed_campaign_reproduces_uninterrupted_one(tmp_path):
+    """Simulation ``i`` is seeded from the campaign entropy and ``i``, so
+    a campaign extended with ``append=True`` matches one run at once."""
+    uninterrupted = make_monte_carlo(tmp_path / "uninterrupted")
+    uninterrupted.simulate(6, seed=42)
+    resumed = make_monte_carlo(tmp_path / "resumed")
+    resumed.simulate(3, seed=42)
+    resumed = make_monte_carlo(tmp_path / "resumed")
+    resumed.simulate(6, append=True)
+
+    assert list(resumed.results["index"]) == list(range(6))
+    assert len(set(uninterrupted.results["apogee"])) == 6
+    np.testing.assert_array_equal(
+        resumed.results["apogee"], uninterrupted.results["apogee"]
+    )
+
+
+def test_parallel_campaign_matches_serial(tmp_path):
+    """The single writer of the parallel mode stores the same records as a
+    serial run, whatever the worker that ran each simulation."""
+    pytest.importorskip("multiprocess")
+    if os.cpu_count() < 2:
+        pytest.skip("The parallel mode needs at least 2 CPUs.")
+    serial = make_monte_carlo(tmp_path / "serial")
+    serial.simulate(6, seed=42)
+    parallel = make_monte_carlo(tmp_path / "parallel", storage="columnar")
+    parallel.simulate(6, seed=42, parallel=True, n_workers=2, batch_size=2)
+
+    order = np.argsort(parallel.results["index"])
+    assert list(np.asarray(parallel.results["index"])[order]) == list(range(6))
+    np.testing.assert_array_equal(
+        np.asarray(parallel.results["apogee"])[order], serial.results["apogee"]
+    )
+
+
+def test_shared_arrays_round_trip_gives_identical_flights(tmp_path):
+    """Models whose arrays were published to shared memory, as sent to the
+    workers, simulate the same flights as the original models."""
+    dill = pytest.importorskip("dill")
+    reference = make_monte_carlo(tmp_path / "reference")
+    reference.simulate(3, seed=42)
+
+    monte_carlo = make_monte_carlo(tmp_path / "shared")
+    shared = SharedArrays(min_bytes=1024)
+    try:
+        assert shared.publish(
+            monte_carlo.environment, monte_carlo.rocket, monte_carlo.flight
+        )
+        models = dill.loads(
+            dill.dumps(
+                (monte_carlo.environment, monte_carlo.rocket, monte_carlo.flight)
+            )
+        )
+        monte_carlo.environment, monte_carlo.rocket, monte_carlo.flight = models
+        drag = monte_carlo.rocket.obj.power_off_drag.source
+        assert isinstance(drag, SharedArray) and not drag.flags.writeable
+        monte_carlo.simulate(3, seed=42)
+    finally:
+        shared.close()
+
+    np.testing.assert_array_equal(
+        monte_carlo.results["apogee"], reference.results["apogee"]
+    )
+
+
+def test_tolerances_stop_the_campaign_early(tmp_path):
+    """The campaign stops once the mean apogee is known within the
+    tolerance, before ``number_of_simulations``."""
+    monte_carlo = make_monte_carlo(tmp_path / "campaign")
+    monte_carlo.simulate(50, seed=42, tolerances={"apogee": 100.0}, min_simulations=5)
+
+    assert 5 <= monte_carlo.num_of_loaded_sims < 50
+    assert monte_carlo.statistics.confidence_half_width("apogee") <= 100.0
@@ -0,0 +1,49 @@
+import socket
+import subprocess
+import sys
+from pathlib import Path
+
+from conftest import make_monte_carlo
+
+WORKER = """
+import sys
+import warnings
+
+sys.path.insert(0, sys.argv[1])
+warnings.simplefilter("ignore")
+from conftest import make_monte_carlo
+
+make_monte_carlo(sys.argv[2]).run_worker(("127.0.0.1", int(sys.argv[3])))
+"""
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_broker_stores_every_range_before_returning(tmp_path, capsys):
+    """The broker only returns once the last range submitted by a worker
+    process is stored, so the printed and stored counts agree."""
+    port = _free_port()
+    worker = subprocess.Popen(
+        [
+            sys.executable,
+            "-c",
+            WORKER,
+            str(Path(__file__).parent),
+            str(tmp_path / "worker"),
+            str(port),
+        ]
+    )
+    try:
+        monte_carlo = make_monte_carlo(tmp_path / "broker")
+        monte_carlo.simulate_distributed(8, port=port, range_size=3, seed=42)
+    finally:
+        assert worker.wait(timeout=120) == 0
+
+    assert monte_carlo.num_of_loaded_sims == 8
+    assert sorted(monte_carlo.results["index"]) == list(range(8))
+    printed = capsys.readouterr().out
+    assert "Completed 8 iterations. In total, 8 simulations" in printed
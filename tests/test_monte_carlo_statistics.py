@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+from conftest import make_monte_carlo
+
+from uvicrocketpy.simulation.monte_carlo_statistics import MonteCarloStatistics
+
+
+def _numpy_statistics(values):
+    return (
+        np.mean(values),
+        np.median(values),
+        np.std(values),
+        np.quantile(values, 0.025),
+        np.quantile(values, 0.975),
+    )
+
+
+def test_processed_results_match_numpy(tmp_path):
+    """After a campaign, the processed results are the numpy statistics of
+    the results."""
+    monte_carlo = make_monte_carlo(tmp_path / "campaign")
+    monte_carlo.simulate(8, seed=42)
+
+    for key in monte_carlo.export_list:
+        assert monte_carlo.processed_results[key] == pytest.approx(
+            _numpy_statistics(monte_carlo.results[key]), rel=1e-12
+        )
+
+
+def test_streaming_statistics_approach_numpy():
+    """Records added one by one give exact moments and P² quantile
+    estimates close to the numpy quantiles."""
+    values = np.random.default_rng(0).normal(100.0, 10.0, 4000)
+    statistics = MonteCarloStatistics()
+    statistics.update([{"apogee": value} for value in values])
+
+    mean, median, std, pi_low, pi_high = statistics.processed_results()["apogee"]
+    expected = _numpy_statistics(values)
+    assert (mean, std) == pytest.approx((expected[0], expected[2]), rel=1e-12)
+    assert (median, pi_low, pi_high) == pytest.approx(
+        (expected[1], expected[3], expected[4]), abs=0.5
+    )
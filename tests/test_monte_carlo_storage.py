@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+from conftest import make_monte_carlo
+
+from uvicrocketpy.simulation.monte_carlo_storage import ColumnarStorage
+from uvicrocketpy.tools import load_monte_carlo_data
+
+STORAGES = ["txt", "columnar", "parquet"]
+
+
+@pytest.fixture(params=STORAGES)
+def storage(request):
+    if request.param == "parquet":
+        pytest.importorskip("pyarrow")
+    return request.param
+
+
+def test_storages_store_the_same_results(tmp_path, storage):
+    """A seeded campaign gives the same outputs, and integer indices, with
+    every storage."""
+    reference = make_monte_carlo(tmp_path / "txt")
+    reference.simulate(4, seed=42)
+    monte_carlo = make_monte_carlo(tmp_path / storage, storage=storage)
+    monte_carlo.simulate(4, seed=42)
+
+    assert list(monte_carlo.results["index"]) == [0, 1, 2, 3]
+    assert all(isinstance(i, (int, np.integer)) for i in monte_carlo.results["index"])
+    for key in reference.export_list:
+        np.testing.assert_array_equal(monte_carlo.results[key], reference.results[key])
+
+
+def test_columnar_write_drops_uncommitted_rows(tmp_path):
+    """Rows of an interrupted write, not counted by the schema, are dropped
+    before the next write, so the columns stay aligned."""
+    storage = ColumnarStorage(tmp_path / "campaign")
+    path = storage.path("outputs")
+    storage.create(path)
+    storage.write(path, [{"index": 0, "apogee": 1.0, "name": "a"}])
+    with open(path / "apogee.f64", "ab") as f:
+        np.array([99.0]).tofile(f)
+    with open(path / "name.jsonl", "ab") as f:
+        f.write(b'"partial')
+
+    storage.write(path, [{"index": 1, "apogee": 2.0, "name": "b"}])
+
+    columns = storage.read_columns(path)
+    assert list(columns["index"]) == [0, 1]
+    assert list(columns["apogee"]) == [1.0, 2.0]
+    assert columns["name"] == ["a", "b"]
+
+
+def test_load_monte_carlo_data_reads_the_same_matrices(tmp_path, storage):
+    """``load_monte_carlo_data`` returns the same matrices from the text files
+    and from a binary storage of the same seeded campaign."""
+    parameters = ["mass", "inclination", "heading", "motors_total_impulse", "index"]
+    targets = ["apogee", "apogee_time"]
+    matrices = {}
+    for name in ("txt", storage):
+        monte_carlo = make_monte_carlo(tmp_path / name, storage=name)
+        monte_carlo.simulate(4, seed=42)
+        matrices[name] = load_monte_carlo_data(
+            monte_carlo.storage.path("inputs"),
+            monte_carlo.storage.path("outputs"),
+            parameters,
+            targets,
+            chunk_size=3,
+        )
+
+    for reference, matrix in zip(matrices["txt"], matrices[storage]):
+        assert len(reference) == 4
+        np.testing.assert_array_equal(matrix, reference)
@@ -0,0 +1,31 @@
+import numpy as np
+from conftest import make_monte_carlo
+
+from uvicrocketpy.stochastic.qmc_sampler import QMCSampler
+
+
+def test_constant_attributes_take_no_dimension(tmp_path):
+    """Only the varying attributes of a model get a coordinate of the design:
+    the mass of the rocket and the total impulse of its motor."""
+    rocket = make_monte_carlo(tmp_path / "campaign").rocket
+    sampler = QMCSampler("sobol")
+    sampler.attach(rocket)
+    sampler.generate(8, rocket.create_object, seed=42)
+
+    assert sampler.dimension == 2
+
+
+def test_constant_draws_do_not_advance_the_point():
+    """One element lists and tuples of zero scale or width return their value
+    without using a coordinate of the point."""
+    normal = np.random.default_rng(42).normal
+    uniform = np.random.default_rng(42).uniform
+    sampler = QMCSampler("sobol")
+    sampler.points = np.array([[0.25, 0.75]])
+    sampler.set_sample(0)
+
+    assert sampler.draw([3.0]) == (True, 3.0)
+    assert sampler.draw((2.0, 0, normal)) == (True, 2.0)
+    assert sampler.draw((1.0, 1.0, uniform)) == (True, 1.0)
+    assert sampler.draw((0.0, 4.0, uniform)) == (True, 1.0)
+    assert sampler.draw(["a", "b"]) == (True, "b")
@@ -42,9 +42,16 @@ from .rocket import (
 )
 from .sensitivity import SensitivityModel
 from .sensors import Accelerometer, Barometer, GnssReceiver, Gyroscope
-from .simulation import Flight, MonteCarlo, MultivariateRejectionSampler
+from .simulation import (
+    EnsembleFlight,
+    Flight,
+    MonteCarlo,
+    MultilevelMonteCarlo,
+    MultivariateRejectionSampler,
+)
 from .stochastic import (
     CustomSampler,
+    QMCSampler,
     StochasticAirBrakes,
     StochasticEllipticalFins,
     StochasticEnvironment,
@@ -39,12 +39,12 @@ class _Controller:
                function is called, measured in Hertz (Hz).
             3. `state` (list): The state vector of the simulation, structured as
                `[x, y, z, vx, vy, vz, e0, e1, e2, e3, wx, wy, wz]`.
-            4. `state_history` (list): A record of the rocket's state at each
-               step throughout the simulation. The state_history is organized as
-               a list of lists, with each sublist containing a state vector. The
-               last item in the list always corresponds to the previous state
-               vector, providing a chronological sequence of the rocket's
-               evolving states.
+            4. `state_history` (SolutionBuffer): A record of the rocket's
+               state at each step throughout the simulation, the
+               ``Flight.solution``. It holds one row per step, each row
+               containing the time and the state vector, ordered from oldest
+               to newest. The last row always corresponds to the previous
+               step, and the history is indexed like a list of lists.
             5. `observed_variables` (list): A list containing the variables that
                the controller function returns. The return of each controller
                function call is appended to the observed_variables list. The
@@ -144,11 +144,11 @@ class _Controller:
             The state vector of the simulation, which is defined as:
 
             `[x, y, z, vx, vy, vz, e0, e1, e2, e3, wx, wy, wz]`.
-        state_history : list
-            A list containing the state history of the simulation. The state
-            history is a list of every state vector of every step of the
-            simulation. The state history is a list of lists, where each
-            sublist is a state vector and is ordered from oldest to newest.
+        state_history : SolutionBuffer
+            The state history of the simulation, ``Flight.solution``. It
+            holds the time and state vector of every step of the simulation,
+            one row per step, ordered from oldest to newest, and is indexed
+            like a list of lists.
         sensors : list
             A list of sensors that are attached to the rocket. The most recent
             measurements of the sensors are provided with the
@@ -7,10 +7,11 @@ carefully as it may impact all the rest of the project.
 
 import operator
 import warnings
-from bisect import bisect_left
+from bisect import bisect_left, bisect_right
 from collections.abc import Iterable
 from copy import deepcopy
 from functools import cached_property
+from itertools import product
 from inspect import signature
 from pathlib import Path
 from enum import Enum
@@ -65,6 +66,8 @@ class Function:  # pylint: disable=too-many-public-methods
 
     # Arithmetic priority
     __array_ufunc__ = None
+    # Incremented whenever the values change, e.g. to resample cached tables
+    _version = 0
 
     def __init__(
         self,
@@ -271,9 +274,14 @@ class Function:  # pylint: disable=too-many-public-methods
                 self.y_initial, self.y_final = self.y_array[0], self.y_array[-1]
                 self.z_array = source[:, 2]
                 self.z_initial, self.z_final = self.z_array[0], self.z_array[-1]
+                # Precomputed once, used by every N-D evaluation
+                self._domain_min = self._domain.min(axis=0)
+                self._domain_max = self._domain.max(axis=0)
+                self._regular_grid = _regular_grid(self._domain, self._image)
                 self.get_value_opt = self.__get_value_opt_nd
 
         self.source = source
+        self._version += 1
         self.set_interpolation(self.__interpolation__)
         self.set_extrapolation(self.__extrapolation__)
         return self
@@ -321,6 +329,7 @@ class Function:  # pylint: disable=too-many-public-methods
             self.__interpolation__ = self.__validate_interpolation(method)
             self.__update_interpolation_coefficients(self.__interpolation__)
             self.__set_interpolation_func()
+            self._version += 1
         return self
 
     def __update_interpolation_coefficients(self, method):
@@ -363,6 +372,7 @@ class Function:  # pylint: disable=too-many-public-methods
         if self._source_type is SourceType.ARRAY:
             self.__extrapolation__ = self.__validate_extrapolation(method)
             self.__set_extrapolation_func()
+            self._version += 1
         return self
 
     def __set_interpolation_func(self):  # pylint: disable=too-many-statements
@@ -381,6 +391,12 @@ class Function:  # pylint: disable=too-many-public-methods
                     dy = float(y_data[x_interval] - y_left)
                     return (x - x_left) * (dy / dx) + y_left
 
+            elif self._regular_grid is not None:
+                axes, values = self._regular_grid
+
+                def linear_interpolation(x, x_min, x_max, x_data, y_data, coeffs):  # pylint: disable=unused-argument
+                    return _multilinear(x, axes, values)
+
             else:
                 interpolator = LinearNDInterpolator(self._domain, self._image)
 
@@ -449,6 +465,8 @@ class Function:  # pylint: disable=too-many-public-methods
 
             self._interpolation_func = rbf_interpolation
 
+        self.__set_nd_scalar_func()
+
     def __set_extrapolation_func(self):  # pylint: disable=too-many-statements
         """Defines extrapolation function used by the Function. Each
         extrapolation method has its own function. The function is stored in
@@ -539,6 +557,14 @@ class Function:  # pylint: disable=too-many-public-methods
                 def constant_extrapolation(x, x_min, x_max, x_data, y_data, coeffs):  # pylint: disable=unused-argument
                     return y_data[0] if x < x_min else y_data[-1]
 
+            elif self._regular_grid is not None and interpolation == 0:
+                axes, values = self._regular_grid
+
+                def constant_extrapolation(x, x_min, x_max, x_data, y_data, coeffs):
+                    # pylint: disable=unused-argument
+                    # _multilinear clamps to the grid edges
+                    return _multilinear(x, axes, values)
+
             else:
                 extrapolator = NearestNDInterpolator(self._domain, self._image)
 
@@ -548,6 +574,45 @@ class Function:  # pylint: disable=too-many-public-methods
 
             self._extrapolation_func = constant_extrapolation
 
+        self.__set_nd_scalar_func()
+
+    def __set_nd_scalar_func(self):
+        """Defines ``_nd_scalar_func``, a pure Python bilinear evaluation for
+        2-D linear Functions on a regular grid, used by ``get_value_opt`` for
+        scalar queries. It returns None for points it does not cover (outside
+        the grid unless extrapolation is constant), which then take the
+        general path. None when the Function has no such fast path."""
+        self._nd_scalar_func = None
+        if (
+            self.__dom_dim__ != 2
+            or self._regular_grid is None
+            or self.__interpolation__ != "linear"
+        ):
+            return
+
+        (xs, ys), values = self._regular_grid
+        xs, ys, table = xs.tolist(), ys.tolist(), values.tolist()
+        x_lo, x_hi, y_lo, y_hi = xs[0], xs[-1], ys[0], ys[-1]
+        nx, ny = len(xs), len(ys)
+        clamp = self.__extrapolation__ == "constant"
+
+        def bilinear(x, y):
+            if clamp:
+                x = min(max(x, x_lo), x_hi)
+                y = min(max(y, y_lo), y_hi)
+            elif not (x_lo <= x <= x_hi and y_lo <= y <= y_hi):
+                return None
+            i = min(max(bisect_right(xs, x) - 1, 0), nx - 2)
+            j = min(max(bisect_right(ys, y) - 1, 0), ny - 2)
+            tx = (x - xs[i]) / (xs[i + 1] - xs[i])
+            ty = (y - ys[j]) / (ys[j + 1] - ys[j])
+            row, next_row = table[i], table[i + 1]
+            return (1 - tx) * ((1 - ty) * row[j] + ty * row[j + 1]) + tx * (
+                (1 - ty) * next_row[j] + ty * next_row[j + 1]
+            )
+
+        self._nd_scalar_func = bilinear
+
     def set_get_value_opt(self):
         """Defines a method that evaluates interpolations.
 
@@ -590,6 +655,9 @@ class Function:  # pylint: disable=too-many-public-methods
 
     def __get_value_opt_nd(self, *args):
         """Evaluate the Function in a vectorized fashion for N-D domains.
+        Scalar queries on 2-D linear Functions over a regular grid take a
+        pure Python bilinear path; everything else goes through
+        ``__get_value_opt_nd_batch``.
 
         Parameters
         ----------
@@ -601,12 +669,39 @@ class Function:  # pylint: disable=too-many-public-methods
         result : scalar, ndarray
             Value of the Function at the specified points.
         """
+        scalar_func = self._nd_scalar_func
+        if (
+            scalar_func is not None
+            and len(args) == 2
+            and isinstance(args[0], (float, int))
+            and isinstance(args[1], (float, int))
+        ):
+            result = scalar_func(args[0], args[1])
+            if result is not None:
+                return result
+        return self.__get_value_opt_nd_batch(*args)
+
+    def __get_value_opt_nd_batch(self, *args):
+        """Evaluate the Function at many N-D points at once.
+
+        Parameters
+        ----------
+        args : tuple
+            Values where the Function is to be evaluated, one scalar or
+            array per input.
+
+        Returns
+        -------
+        result : scalar, ndarray
+            Value of the Function at the specified points. A float when a
+            single point is given.
+        """
         args = np.column_stack(args)
         arg_qty = len(args)
         result = np.empty(arg_qty)
 
-        min_domain = self._domain.T.min(axis=1)
-        max_domain = self._domain.T.max(axis=1)
+        min_domain = self._domain_min
+        max_domain = self._domain_max
 
         lower, upper = args < min_domain, args > max_domain
         extrap = np.logical_or(lower.any(axis=1), upper.any(axis=1))
@@ -669,6 +764,8 @@ class Function:  # pylint: disable=too-many-public-methods
         one_by_one : boolean, optional
             If True, evaluate Function in each sample point separately. If
             False, evaluates Function in vectorized form. Default is True.
+            Results of the arithmetic between Functions are always evaluated
+            with ``Function.evaluate_many``.
         mutate_self : boolean, optional
             If True, the original Function object source will be replaced by
             the new one. If False, the original Function object source will
@@ -690,7 +787,12 @@ class Function:  # pylint: disable=too-many-public-methods
 
         if func.__dom_dim__ == 1:
             xs = np.linspace(lower, upper, samples)
-            ys = func.get_value(xs.tolist()) if one_by_one else func.get_value(xs)
+            if _ArithmeticNode.of(func.source) is not None:
+                ys = func.evaluate_many(xs)
+            elif one_by_one:
+                ys = func.get_value(xs.tolist())
+            else:
+                ys = func.get_value(xs)
             func.__interpolation__ = interpolation
             func.__extrapolation__ = extrapolation
             func.set_source(np.column_stack((xs, ys)))
@@ -703,7 +805,10 @@ class Function:  # pylint: disable=too-many-public-methods
             ys = np.linspace(lower[1], upper[1], sam[1])
             xs, ys = np.array(np.meshgrid(xs, ys)).reshape(2, xs.size * ys.size)
             # Evaluate function at all mesh nodes and convert it to matrix
-            zs = np.array(func.get_value(xs, ys))
+            if _ArithmeticNode.of(func.source) is not None:
+                zs = func.evaluate_many(np.column_stack((xs, ys)))
+            else:
+                zs = np.array(func.get_value(xs, ys))
             func.set_source(np.concatenate(([xs], [ys], [zs])).transpose())
             func.__interpolation__ = "shepard"
             func.__extrapolation__ = "natural"
@@ -738,6 +843,8 @@ class Function:  # pylint: disable=too-many-public-methods
         one_by_one : boolean, optional
             If True, evaluate Function in each sample point separately. If
             False, evaluates Function in vectorized form. Default is True.
+            Results of the arithmetic between Functions are always evaluated
+            with ``Function.evaluate_many``.
         keep_self : boolean, optional
             If True, the original Function interpolation and extrapolation
             methods will be kept. If False, those are substituted by the ones
@@ -810,14 +917,22 @@ class Function:  # pylint: disable=too-many-public-methods
 
         if func.__dom_dim__ == 1:
             xs = model_function.source[:, 0]
-            ys = func.get_value(xs.tolist()) if one_by_one else func.get_value(xs)
+            if _ArithmeticNode.of(func.source) is not None:
+                ys = func.evaluate_many(xs)
+            elif one_by_one:
+                ys = func.get_value(xs.tolist())
+            else:
+                ys = func.get_value(xs)
             func.set_source(np.concatenate(([xs], [ys])).transpose())
         elif func.__dom_dim__ == 2:
             # Create nodes to evaluate function
             xs = model_function.source[:, 0]
             ys = model_function.source[:, 1]
             # Evaluate function at all mesh nodes and convert it to matrix
-            zs = np.array(func.get_value(xs, ys))
+            if _ArithmeticNode.of(func.source) is not None:
+                zs = func.evaluate_many(np.column_stack((xs, ys)))
+            else:
+                zs = np.array(func.get_value(xs, ys))
             func.set_source(np.concatenate(([xs], [ys], [zs])).transpose())
         else:
             raise ValueError(
@@ -1032,6 +1147,8 @@ class Function:  # pylint: disable=too-many-public-methods
         else:  # interpolation is "polynomial", "spline", "akima" or "linear"
             if isinstance(args[0], NUMERICAL_TYPES):
                 args = [list(args)]
+            elif isinstance(args[0], np.ndarray) and args[0].ndim == 1:
+                return self.evaluate_many(args[0])
 
         x = list(args[0])
         x = list(map(self.get_value_opt, x))
@@ -1040,6 +1157,106 @@ class Function:  # pylint: disable=too-many-public-methods
         else:
             return x if len(x) > 1 else x[0]
 
+    def evaluate_many(self, x, out=None):
+        """Evaluates the Function at many points at once.
+
+        Array sources are evaluated with array operations for every
+        interpolation and extrapolation method: one ``np.searchsorted`` call
+        locates all points in the data (it is fastest for sorted inputs) and
+        the coefficients of every interval are gathered at once. Values
+        equal those of ``get_value_opt`` at each point. Results of the
+        arithmetic between Functions evaluate each array Function they
+        depend on this way, other callable sources are evaluated point by
+        point.
+
+        Parameters
+        ----------
+        x : array_like
+            Points where the Function is evaluated. An array of any shape
+            for 1-D Functions, of shape ``(..., N)`` for N-D Functions.
+        out : np.ndarray, optional
+            Array in which the values are stored, of shape ``x.shape`` for
+            1-D Functions and ``x.shape[:-1]`` for N-D Functions, e.g. a
+            buffer reused at every call. Default is None, which returns a
+            new array.
+
+        Returns
+        -------
+        np.ndarray
+            Value of the Function at each point, ``out`` if given.
+
+        Examples
+        --------
+        >>> import numpy as np
+        >>> from rocketpy import Function
+        >>> f = Function([(0, 0), (1, 1), (2, 4)], interpolation="linear")
+        >>> f.evaluate_many(np.array([0.5, 1.5, 3]))
+        array([0.5, 2.5, 4. ])
+        >>> out = np.empty(2)
+        >>> f.evaluate_many([0.25, -1], out=out) is out
+        True
+        >>> out
+        array([0.25, 0.  ])
+        """
+        x = np.asarray(x, dtype=float)
+        dim = self.__dom_dim__
+        shape = x.shape if dim == 1 else x.shape[:-1]
+        points = x.reshape(-1) if dim == 1 else x.reshape(-1, dim)
+
+        if not len(points):
+            values = np.empty(0)
+        elif _ArithmeticNode.of(self.source) is not None:
+            args = (points,) if dim == 1 else tuple(points.T)
+            values = _ArithmeticNode.of(self.source).evaluate(args)
+            values = np.full(len(points), values, dtype=float)
+        elif self._source_type is SourceType.CALLABLE:
+            source = self.source
+            if dim == 1:
+                values = np.array([source(point) for point in points], dtype=float)
+            else:
+                values = np.array([source(*point) for point in points], dtype=float)
+        elif dim == 1:
+            values = self.__evaluate_many_1d(points)
+        else:
+            values = np.atleast_1d(self.__get_value_opt_nd_batch(*points.T))
+
+        if out is None:
+            return values.reshape(shape)
+        out[...] = values.reshape(shape)
+        return out
+
+    def __evaluate_many_1d(self, x):
+        """Array version of ``__get_value_opt_1d``, see ``evaluate_many``."""
+        x_data, y_data = self.x_array, self.y_array
+        if len(x_data) < 2:
+            return np.array([self.get_value_opt(xi) for xi in x], dtype=float)
+        coeffs = self._coeffs
+        # Right end of the interval of each point. Points outside the domain
+        # take the first or last interval, as the natural extrapolation
+        i = np.clip(np.searchsorted(x_data, x, side="left"), 1, len(x_data) - 1)
+
+        interpolation = self.__interpolation__
+        if interpolation == "linear":
+            x_left, y_left = x_data[i - 1], y_data[i - 1]
+            y = (x - x_left) * ((y_data[i] - y_left) / (x_data[i] - x_left)) + y_left
+        elif interpolation == "polynomial":
+            y = np.sum(coeffs * x[:, None] ** np.arange(len(coeffs)), axis=1)
+        elif interpolation == "akima":
+            a = np.reshape(coeffs, (-1, 4))[i - 1].T
+            y = a[3] * x**3 + a[2] * x**2 + a[1] * x + a[0]
+        else:  # spline
+            a = coeffs[:, i - 1]
+            dx = x - x_data[i - 1]
+            y = a[3] * dx**3 + a[2] * dx**2 + a[1] * dx + a[0]
+
+        extrapolation = self.__extrapolation__
+        if extrapolation == "constant":
+            y[x < self.x_initial] = y_data[0]
+            y[x > self.x_final] = y_data[-1]
+        elif extrapolation == "zero":
+            y[(x < self.x_initial) | (x > self.x_final)] = 0
+        return y
+
     def __getitem__(self, args):
         """Returns item of the Function source. If the source is not an array,
         an error will result.
@@ -3637,33 +3854,16 @@ class Function:  # pylint: disable=too-many-public-methods
         reverse : bool, optional
             If True, the order of the functions is reversed in
             the operation. The default is False.
-        """
-        if func_dim == 1 and other_dim == 1:
-            # Use of python lambda for speed
-            if reverse:
-                return lambda x: operator(other(x), func(x))
-            else:
-                return lambda x: operator(func(x), other(x))
-
-        max_dim = max(func_dim, other_dim)
-        params = [f"x{i}" for i in range(max_dim)]
-        param_str = ", ".join(params)
 
-        if other_dim == 0:
-            if reverse:
-                expr = f"lambda {param_str}: operator(other, func({param_str}))"
-            else:
-                expr = f"lambda {param_str}: operator(func({param_str}), other)"
-        else:
-            func_args = ", ".join(params[:func_dim])
-            other_args = ", ".join(params[:other_dim])
-            if reverse:
-                expr = f"lambda {param_str}: operator(other({other_args}), func({func_args}))"
-            else:
-                expr = f"lambda {param_str}: operator(func({func_args}), other({other_args}))"
-
-        # pylint: disable=eval-used
-        return eval(expr, {"func": func, "other": other, "operator": operator})
+        Returns
+        -------
+        function
+            Lambda of the operation. Operations between Functions that are
+            themselves results of arithmetic are fused into it, see
+            ``_ArithmeticNode``.
+        """
+        node = _ArithmeticNode(operator, func, other, func_dim, other_dim, reverse)
+        return node.compile()
 
 
 def funcify_method(*args, **kwargs):  # pylint: disable=too-many-statements
@@ -3812,6 +4012,248 @@ def reset_funcified_methods(instance):
             instance.__dict__.pop(key)
 
 
+def _regular_grid(domain, image):
+    """Detects N-D data given on a full regular grid.
+
+    Parameters
+    ----------
+    domain : np.ndarray
+        Points, one row per point.
+    image : np.ndarray
+        Value at each point.
+
+    Returns
+    -------
+    tuple or None
+        ``(axes, values)``, where ``axes`` is the sorted unique coordinates
+        along each dimension and ``values[i, j, ...]`` the value at
+        ``(axes[0][i], axes[1][j], ...)``. None when the points do not cover
+        every node of such a grid exactly once.
+    """
+    axes = [np.unique(column) for column in domain.T]
+    shape = tuple(len(axis) for axis in axes)
+    if min(shape) < 2 or np.prod(shape) != len(domain):
+        return None
+    index = tuple(np.searchsorted(a, c) for a, c in zip(axes, domain.T))
+    filled = np.zeros(shape, dtype=bool)
+    filled[index] = True
+    if not filled.all():  # repeated points leave nodes empty
+        return None
+    values = np.empty(shape)
+    values[index] = image
+    return axes, values
+
+
+def _multilinear(x, axes, values):
+    """Multilinear interpolation on a regular grid, clamped to its edges.
+
+    Parameters
+    ----------
+    x : np.ndarray
+        Query points, shape (n_points, n_dimensions).
+    axes, values : sequence of np.ndarray, np.ndarray
+        Grid as returned by ``_regular_grid``.
+
+    Returns
+    -------
+    np.ndarray
+        Interpolated value at each query point.
+    """
+    index, weight = [], []
+    for k, axis in enumerate(axes):
+        xk = np.clip(x[:, k], axis[0], axis[-1])
+        i = np.clip(np.searchsorted(axis, xk, side="right") - 1, 0, len(axis) - 2)
+        index.append(i)
+        weight.append((xk - axis[i]) / (axis[i + 1] - axis[i]))
+
+    result = np.zeros(len(x))
+    for corner in product((0, 1), repeat=len(axes)):
+        w = np.ones(len(x))
+        for k, bit in enumerate(corner):
+            w *= weight[k] if bit else 1 - weight[k]
+        result += w * values[tuple(i + bit for i, bit in zip(index, corner))]
+    return result
+
+
+# Operators written inline when an arithmetic graph is fused into one lambda
+_INFIX_OPERATORS = {
+    operator.add: "+",
+    operator.sub: "-",
+    operator.mul: "*",
+    operator.truediv: "/",
+    operator.pow: "**",
+    operator.mod: "%",
+}
+# Nesting depth past which subexpressions are called instead of inlined, well
+# below the limit of nested parentheses of the Python parser
+_MAX_FUSED_DEPTH = 32
+
+
+class _ArithmeticNode:
+    """Node of the expression graph built by the arithmetic between
+    Functions, ``operator(func(x), other(x))`` with the operands swapped if
+    ``reverse``.
+
+    Operands are the ``get_value_opt`` of array Functions, other callables,
+    constants (of dimension 0) or the sources of Functions that are nodes
+    themselves. The graph is fused in two ways:
+
+    - ``compile`` writes the whole graph as one lambda, so evaluating a chain
+      of operations (e.g. ``Rocket.total_mass``) is a single Python call
+      instead of a stack of nested lambdas. It is written on the first call,
+      so the intermediate results of a chain are never written;
+    - ``evaluate`` computes it at arrays of points, with one
+      ``Function.evaluate_many`` per array Function, as
+      ``Function.set_discrete`` does to resample the graph into one array.
+
+    Both evaluate a subexpression repeated in the graph only once.
+
+    Parameters
+    ----------
+    operator : callable
+        Operation between the values of the operands.
+    func, other : callable, scalar
+        Operands.
+    func_dim, other_dim : int
+        Number of inputs of each operand, 0 for a constant.
+    reverse : bool
+        If True, ``other`` is the first operand.
+    """
+
+    __slots__ = ("operator", "func", "other", "func_dim", "other_dim", "reverse")
+
+    def __init__(self, operator, func, other, func_dim, other_dim, reverse):
+        self.operator = operator
+        self.func = func
+        self.other = other
+        self.func_dim = func_dim
+        self.other_dim = other_dim
+        self.reverse = reverse
+
+    @staticmethod
+    def of(operand):
+        """Node of the graph an operand computes, None for leaves."""
+        node = getattr(operand, "_expression", None)
+        return node if isinstance(node, _ArithmeticNode) else None
+
+    @property
+    def dim(self):
+        """Number of inputs of the node."""
+        return max(self.func_dim, self.other_dim)
+
+    def operands(self):
+        """``(operand, dim)`` pairs, in the order they are evaluated."""
+        pairs = ((self.func, self.func_dim), (self.other, self.other_dim))
+        return pairs[::-1] if self.reverse else pairs
+
+    def compile(self):
+        """Lambda of ``dim`` inputs, whose ``_expression`` attribute is this
+        node, that fuses the graph into its own body when first called."""
+        params = ", ".join(f"x{i}" for i in range(self.dim))
+        namespace = {"node": self}
+        # pylint: disable=eval-used
+        fused = eval(f"lambda {params}: node.fuse(fused)({params})", namespace)
+        namespace["fused"] = fused
+        fused._expression = self
+        return fused
+
+    def fuse(self, fused):
+        """Writes the graph into the body of the ``fused`` lambda made by
+        ``compile`` and returns it."""
+        params = [f"x{i}" for i in range(self.dim)]
+        counts = {}
+        self.__count(counts, 0)
+        namespace, assigned = fused.__globals__, {}
+        body = self.__write(params, counts, namespace, assigned, 0)
+        # pylint: disable=eval-used
+        fused.__code__ = eval(f"lambda {', '.join(params)}: {body}", namespace).__code__
+        return fused
+
+    def __count(self, counts, depth):
+        for operand, dim in self.operands():
+            if dim == 0:
+                continue
+            key = (id(operand), dim)
+            counts[key] = counts.get(key, 0) + 1
+            node = _ArithmeticNode.of(operand)
+            if counts[key] == 1 and node is not None and depth < _MAX_FUSED_DEPTH:
+                node.__count(counts, depth + 1)
+
+    def __write(self, params, counts, namespace, assigned, depth):
+        def name_of(value, prefix):
+            name = f"{prefix}{len(namespace)}"
+            namespace[name] = value
+            return name
+
+        terms = []
+        for operand, dim in self.operands():
+            if dim == 0:
+                terms.append(name_of(operand, "c"))
+                continue
+            key = (id(operand), dim)
+            if key in assigned:
+                terms.append(assigned[key])
+                continue
+            node = _ArithmeticNode.of(operand)
+            if node is not None and depth < _MAX_FUSED_DEPTH:
+                term = node.__write(params, counts, namespace, assigned, depth + 1)
+            else:
+                term = f"{name_of(operand, 'f')}({', '.join(params[:dim])})"
+            if counts[key] > 1:
+                # Evaluated once, then reused by the later occurrences
+                assigned[key] = f"t{len(assigned)}"
+                term = f"({assigned[key]} := {term})"
+            terms.append(term)
+
+        symbol = _INFIX_OPERATORS.get(self.operator)
+        if symbol is None:
+            return f"{name_of(self.operator, 'op')}({terms[0]}, {terms[1]})"
+        return f"({terms[0]} {symbol} {terms[1]})"
+
+    def evaluate(self, args, cache=None):
+        """Values of the graph at arrays of points.
+
+        Parameters
+        ----------
+        args : sequence of np.ndarray
+            Values of each input, of the same shape.
+        cache : dict, optional
+            Values of the operands already evaluated at ``args``. Default is
+            None, which starts a new evaluation.
+
+        Returns
+        -------
+        np.ndarray
+            Value of the graph at each point.
+        """
+        cache = {} if cache is None else cache
+        values = []
+        for operand, dim in self.operands():
+            if dim == 0:
+                values.append(operand)
+                continue
+            key = (id(operand), dim)
+            if key not in cache:
+                cache[key] = self.__evaluate_operand(operand, args[:dim], cache)
+            values.append(cache[key])
+        return self.operator(*values)
+
+    @staticmethod
+    def __evaluate_operand(operand, args, cache):
+        node = _ArithmeticNode.of(operand)
+        if node is not None:
+            return node.evaluate(args, cache)
+        owner = getattr(operand, "__self__", None)
+        if (
+            isinstance(owner, Function)
+            and owner._source_type is SourceType.ARRAY
+            and operand == owner.get_value_opt
+        ):
+            points = args[0] if len(args) == 1 else np.stack(args, axis=-1)
+            return owner.evaluate_many(points)
+        return np.array([operand(*point) for point in zip(*args)], dtype=float)
+
+
 if __name__ == "__main__":  # pragma: no cover
     import doctest
 
@@ -1,4 +1,13 @@
+from .ensemble_flight import EnsembleFlight
 from .flight import Flight
 from .flight_data_importer import FlightDataImporter
 from .monte_carlo import MonteCarlo
+from .monte_carlo_statistics import MonteCarloStatistics
+from .monte_carlo_storage import (
+    ColumnarStorage,
+    JSONLinesStorage,
+    MonteCarloStorage,
+    ParquetStorage,
+)
+from .multilevel_monte_carlo import MultilevelMonteCarlo
 from .multivariate_rejection_sampler import MultivariateRejectionSampler
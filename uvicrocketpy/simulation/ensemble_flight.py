@@ -0,0 +1,1083 @@
+"""Lockstep integration of many solid propulsion flights as one vectorized
+ODE. See ``EnsembleFlight``."""
+
+import numpy as np
+
+from ..tools import euler313_to_quaternions
+from .flight_tables import (
+    AREA,
+    BURN_OUT,
+    BURN_START,
+    CP_ECC_X,
+    CP_ECC_Y,
+    DENSITY,
+    DRY_I_11,
+    DRY_I_33,
+    DRY_MASS,
+    GRAVITY,
+    NOZZLE_AREA,
+    NOZZLE_RADIUS,
+    PRESSURE,
+    PROPELLANT_MASS,
+    REF_PRESSURE,
+    SPEED_OF_SOUND,
+    THRUST,
+    THRUST_ECC_X,
+    THRUST_ECC_Y,
+    WIND_X,
+    WIND_Y,
+    B,
+    C,
+    MotorTables,
+    env_table,
+    is_lowerable,
+    rocket_constants,
+    sample,
+    surface_tables,
+)
+
+# Member phases
+RAIL, FREE_FLIGHT, PARACHUTE, DONE = range(4)
+
+# Parachute trigger kinds
+_APOGEE_TRIGGER, _HEIGHT_TRIGGER, _CALLABLE_TRIGGER = range(3)
+
+# Grid sizes for the motor curves, which also get the thrust curve nodes as
+# in ``MotorTables``, and for the uniform drag altitude axis
+MOTOR_POINTS = 2001
+DRAG_ALTITUDE_POINTS = 41
+
+# Same per-variable absolute tolerances as Flight
+_ATOL = np.array([1e-3] * 3 + [1e-4] * 3 + [1e-6] * 4 + [1e-3] * 3)
+
+# Dormand-Prince 5(4) tableau
+_C_DP = np.array([0, 1 / 5, 3 / 10, 4 / 5, 8 / 9, 1, 1])
+_A_DP = [
+    [],
+    [1 / 5],
+    [3 / 40, 9 / 40],
+    [44 / 45, -56 / 15, 32 / 9],
+    [19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729],
+    [9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656],
+    [35 / 384, 0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84],
+]
+_E_DP = np.array(
+    [-71 / 57600, 0, 71 / 16695, -71 / 1920, 17253 / 339200, -22 / 525, 1 / 40]
+)
+
+
+def _interp_uniform(x, x0, dx, table, rows):
+    """Linear interpolation of ``table[..., rows, :]`` (one uniformly spaced
+    row per member, optionally several stacked tables) at ``x``, clamped to
+    the end points."""
+    n = table.shape[-1]
+    s = np.clip((x - x0) / dx, 0.0, n - 1)
+    i = np.minimum(s.astype(np.intp), n - 2)
+    f = s - i
+    return table[..., rows, i] * (1 - f) + table[..., rows, i + 1] * f
+
+
+def _interp_grid(x, y, axes, table, rows):
+    """Bilinear interpolation of ``table[rows]`` over the uniform grid
+    ``axes = (x0, dx, y0, dy)``, clamped to the grid edges."""
+    x0, dx, y0, dy = axes
+    nx, ny = table.shape[1:]
+    sx = np.clip((x - x0) / dx, 0.0, nx - 1)
+    sy = np.clip((y - y0) / dy, 0.0, ny - 1)
+    i = np.minimum(sx.astype(np.intp), nx - 2)
+    j = np.minimum(sy.astype(np.intp), ny - 2)
+    fx, fy = sx - i, sy - j
+    return (
+        table[rows, i, j] * (1 - fx) * (1 - fy)
+        + table[rows, i + 1, j] * fx * (1 - fy)
+        + table[rows, i, j + 1] * (1 - fx) * fy
+        + table[rows, i + 1, j + 1] * fx * fy
+    )
+
+
+def _hermite(theta, y0, f0, y1, f1, h):
+    """Cubic Hermite state at fraction ``theta`` of a step of size ``h``."""
+    th = theta[:, None]
+    h = np.reshape(h, (-1, 1)) if np.ndim(h) else h
+    th2, th3 = th**2, th**3
+    return (
+        (2 * th3 - 3 * th2 + 1) * y0
+        + (th3 - 2 * th2 + th) * h * f0
+        + (-2 * th3 + 3 * th2) * y1
+        + (th3 - th2) * h * f1
+    )
+
+
+def _locate(g, y0, f0, y1, f1, h, iterations=40):
+    """Bisection on the Hermite interpolant for the step fraction at which
+    ``g(state)`` changes sign. Returns ``(theta, state)``."""
+    lo = np.zeros(len(y0))
+    hi = np.ones(len(y0))
+    g_lo = g(y0)
+    for _ in range(iterations):
+        mid = 0.5 * (lo + hi)
+        g_mid = g(_hermite(mid, y0, f0, y1, f1, h))
+        same = np.sign(g_mid) == np.sign(g_lo)
+        lo = np.where(same, mid, lo)
+        g_lo = np.where(same, g_mid, g_lo)
+        hi = np.where(same, hi, mid)
+    return hi, _hermite(hi, y0, f0, y1, f1, h)
+
+
+def _event_tolerance(t):
+    """Time within which a scheduled event counts as reached at ``t``."""
+    return 1e-9 * max(1.0, abs(t))
+
+
+def _effective_1rl(rocket, rail_length):
+    """Same as ``Flight.effective_1rl``."""
+    nozzle = rocket.nozzle_position
+    try:
+        rail_buttons = rocket.rail_buttons[0]
+        upper_r_button = (
+            rail_buttons.component.buttons_distance * rocket._csys
+            + rail_buttons.position.z
+        )
+    except IndexError:
+        upper_r_button = nozzle
+    return rail_length - abs(nozzle - upper_r_button)
+
+
+def _initial_attitude(rocket, inclination, heading):
+    """Same initial quaternion as ``Flight`` for a rail launch."""
+    psi = np.radians(-heading)
+    theta = np.radians(inclination - 90)
+    phi = 0
+    try:
+        phi += (
+            rocket.rail_buttons[0].component.angular_position_rad
+            if rocket._csys == 1
+            else 2 * np.pi - rocket.rail_buttons[0].component.angular_position_rad
+        )
+    except IndexError:
+        pass
+    return euler313_to_quaternions(phi, theta, psi)
+
+
+class _EnsembleTables:
+    """Every member's rocket and environment lowered onto grids and stacked
+    along a leading member axis. Motors are kept once per distinct motor,
+    on grids that keep the thrust curve nodes, and members point to theirs
+    through ``motor_index``; the other grids are uniform."""
+
+    def __init__(self, rockets, environments, grids):
+        mach_grid, z_grid, motor_points, drag_z_points = grids
+        n = len(rockets)
+        self.z0, self.dz = z_grid[0], z_grid[1] - z_grid[0]
+        self.mach0, self.dmach = mach_grid[0], mach_grid[1] - mach_grid[0]
+        drag_z = np.linspace(z_grid[0], z_grid[-1], drag_z_points)
+        self.drag_axes = (self.mach0, self.dmach, drag_z[0], drag_z[1] - drag_z[0])
+
+        # Members often share rockets or environments, lower each once
+        rocket_data, env_data = {}, {}
+        for rocket in rockets:
+            if id(rocket) not in rocket_data:
+                rocket_data[id(rocket)] = self._lower_rocket(
+                    rocket, mach_grid, drag_z, motor_points
+                )
+        for env in environments:
+            if id(env) not in env_data:
+                env_data[id(env)] = env_table(env, z_grid)
+
+        n_surfaces = max(len(r.aerodynamic_surfaces) for r in rockets)
+        n_mach = len(mach_grid)
+        self.constants = np.stack([rocket_data[id(r)]["constants"] for r in rockets])
+        # Motor grids differ per motor, each is searched once per lookup
+        motors = {}
+        for rocket in rockets:
+            motors.setdefault(id(rocket.motor), (len(motors), rocket))
+        self.motor_index = np.array([motors[id(r.motor)][0] for r in rockets])
+        self.motor_time = [
+            rocket_data[id(r)]["motor_time"] for _, r in motors.values()
+        ]
+        self.motor = [rocket_data[id(r)]["motor"] for _, r in motors.values()]
+        self.drag_on = np.stack([rocket_data[id(r)]["drag_on"] for r in rockets])
+        self.drag_off = np.stack([rocket_data[id(r)]["drag_off"] for r in rockets])
+        self.env = np.stack([env_data[id(e)] for e in environments], axis=1)
+        self.wind = self.env[[WIND_X, WIND_Y]]
+
+        # Surfaces are padded to the longest list, empty slots have zero area
+        self.cp = np.zeros((n, n_surfaces, 3))
+        self.ref_area = np.zeros((n, n_surfaces))
+        self.ref_len = np.zeros((n, n_surfaces))
+        self.clalpha = np.zeros((n, n_surfaces, n_mach))
+        self.clf_delta = np.zeros((n, n_surfaces, n_mach))
+        self.cld_omega = np.zeros((n, n_surfaces, n_mach))
+        self.cant = np.zeros((n, n_surfaces))
+        self.has_roll = np.zeros((n, n_surfaces), dtype=bool)
+        for i, rocket in enumerate(rockets):
+            surfaces = rocket_data[id(rocket)]["surfaces"]
+            k = len(surfaces[0])
+            for array, values in zip(
+                (
+                    self.cp,
+                    self.ref_area,
+                    self.ref_len,
+                    self.clalpha,
+                    self.clf_delta,
+                    self.cld_omega,
+                    self.cant,
+                    self.has_roll,
+                ),
+                surfaces,
+            ):
+                array[i, :k] = values
+
+    @staticmethod
+    def _lower_rocket(rocket, mach_grid, drag_z, motor_points):
+        # Same node-inclusive grid as FlightKernel, so thrust peaks are kept
+        tables = MotorTables(rocket.motor, motor_points)
+        return {
+            "constants": rocket_constants(rocket),
+            "motor_time": np.asarray(tables.time),
+            "motor": tables.rows(),
+            "drag_on": sample(rocket.power_on_drag, mach_grid, drag_z),
+            "drag_off": sample(rocket.power_off_drag, mach_grid, drag_z),
+            "surfaces": surface_tables(rocket, mach_grid),
+        }
+
+
+class _EnsembleChunk:  # pylint: disable=too-many-instance-attributes
+    """Integrator state for one chunk of ensemble members."""
+
+    def __init__(self, ensemble, members):
+        self.ensemble = ensemble
+        rockets = [ensemble.rockets[i] for i in members]
+        envs = [ensemble.environments[i] for i in members]
+        self.tables = _EnsembleTables(rockets, envs, ensemble._grids)
+        n = len(members)
+        self.n = n
+
+        self.elevation = np.array([env.elevation for env in envs])
+        self.rail_1rl = np.array(
+            [
+                _effective_1rl(rocket, ensemble.rail_length[i])
+                for rocket, i in zip(rockets, members)
+            ]
+        )
+        self.y = np.zeros((n, 13))
+        self.y[:, 2] = self.elevation
+        self.y[:, 6:10] = [
+            _initial_attitude(
+                rocket, ensemble.inclination[i], ensemble.heading[i]
+            )
+            for rocket, i in zip(rockets, members)
+        ]
+        self.phase = np.full(n, RAIL)
+
+        # Parachutes padded to the longest list
+        n_chutes = max([len(r.parachutes) for r in rockets] + [0])
+        self.chutes = [list(r.parachutes) for r in rockets]
+        self.chute_pending = np.zeros((n, n_chutes), dtype=bool)
+        self.chute_kind = np.zeros((n, n_chutes), dtype=np.intp)
+        self.chute_height = np.zeros((n, n_chutes))
+        self.chute_lag = np.zeros((n, n_chutes))
+        self.chute_cd_s = np.zeros((n, n_chutes))
+        self.chute_interval = np.ones((n, n_chutes))
+        for i, chutes in enumerate(self.chutes):
+            for p, chute in enumerate(chutes):
+                self.chute_pending[i, p] = True
+                self.chute_lag[i, p] = chute.lag
+                self.chute_interval[i, p] = 1 / chute.sampling_rate
+                self.chute_cd_s[i, p] = chute.cd_s
+                if callable(chute.trigger):
+                    self.chute_kind[i, p] = _CALLABLE_TRIGGER
+                elif isinstance(chute.trigger, (int, float)):
+                    self.chute_kind[i, p] = _HEIGHT_TRIGGER
+                    self.chute_height[i, p] = chute.trigger
+                else:
+                    self.chute_kind[i, p] = _APOGEE_TRIGGER
+        self.cd_s = np.zeros(n)
+        self.deploy_time = np.full(n, np.inf)
+        self.rail_exit_time = np.full(n, np.inf)
+        self.deploy_cd_s = np.zeros(n)
+
+        nan = np.full(n, np.nan)
+        self.results = {
+            name: nan.copy()
+            for name in (
+                "out_of_rail_time",
+                "out_of_rail_velocity",
+                "apogee_time",
+                "apogee",
+                "apogee_x",
+                "apogee_y",
+                "t_final",
+                "x_impact",
+                "y_impact",
+                "impact_velocity",
+            )
+        }
+        self.results["max_speed"] = np.zeros(n)
+        self.results["max_mach_number"] = np.zeros(n)
+        self.results["n_parachute_events"] = np.zeros(n, dtype=np.intp)
+
+    # -------------------------------------------------------------------
+    # Right-hand sides, evaluated for the members in rows
+    # -------------------------------------------------------------------
+
+    def _env(self, row, z, rows):
+        tab = self.tables
+        return _interp_uniform(z, tab.z0, tab.dz, tab.env[row], rows)
+
+    def _environment(self, z, rows):
+        """Every environment table row at ``z``, as a ``(6, len(rows))``
+        array, with a single search of the altitude grid."""
+        tab = self.tables
+        return _interp_uniform(z, tab.z0, tab.dz, tab.env, rows)
+
+    def _wind(self, z, rows):
+        """Wind velocity components at ``z``, as a ``(2, len(rows))`` array."""
+        tab = self.tables
+        return _interp_uniform(z, tab.z0, tab.dz, tab.wind, rows)
+
+    def _motor(self, t, rows, burning):
+        """Motor table rows (``I_11``, ..., ``THRUST``) at times ``t`` of the
+        members ``rows``, zero for the members that are not ``burning``. Each
+        distinct motor grid is searched once, for its burning members only."""
+        tab = self.tables
+        values = np.zeros((THRUST + 1, len(rows)))
+        index = tab.motor_index[rows]
+        for m in np.unique(index[burning]):
+            sel = np.flatnonzero(burning & (index == m))
+            grid, table = tab.motor_time[m], tab.motor[m]
+            t_sel = t[sel]
+            i = np.searchsorted(grid, t_sel, side="right") - 1
+            i = np.clip(i, 0, len(grid) - 2)
+            f = np.clip((t_sel - grid[i]) / (grid[i + 1] - grid[i]), 0.0, 1.0)
+            values[:, sel] = table[:, i] * (1 - f) + table[:, i + 1] * f
+        return values
+
+    def _net_thrust(self, rows, burning, thrust, pressure):
+        c = self.tables.constants[rows]
+        pressure_thrust = np.where(
+            np.isnan(c[:, REF_PRESSURE]),
+            0.0,
+            (c[:, REF_PRESSURE] - pressure) * c[:, NOZZLE_AREA],
+        )
+        return np.where(burning, np.maximum(thrust + pressure_thrust, 0.0), 0.0)
+
+    def _u_dot_rail(self, t, u, rows):
+        """Vectorized ``Flight.udot_rail1``."""
+        tab = self.tables
+        c = tab.constants[rows]
+        z, vx, vy, vz = u[:, 2], u[:, 3], u[:, 4], u[:, 5]
+        e0, e1, e2, e3 = u[:, 6], u[:, 7], u[:, 8], u[:, 9]
+        burning = (c[:, BURN_START] < t) & (t < c[:, BURN_OUT])
+        motor = self._motor(t, rows, burning)
+        total_mass = c[:, DRY_MASS] + motor[PROPELLANT_MASS]
+        env = self._environment(z, rows)
+
+        free_stream_speed = np.sqrt(
+            (env[WIND_X] - vx) ** 2 + (env[WIND_Y] - vy) ** 2 + vz**2
+        )
+        free_stream_mach = free_stream_speed / env[SPEED_OF_SOUND]
+        drag_coeff = _interp_grid(
+            free_stream_mach, z, tab.drag_axes, tab.drag_on, rows
+        )
+        net_thrust = self._net_thrust(rows, burning, motor[THRUST], env[PRESSURE])
+        rho = env[DENSITY]
+        R3 = -0.5 * rho * free_stream_speed**2 * c[:, AREA] * drag_coeff
+
+        a3 = (R3 + net_thrust) / total_mass - (
+            e0**2 - e1**2 - e2**2 + e3**2
+        ) * env[GRAVITY]
+        a3 = np.maximum(a3, 0.0)
+        out = np.zeros_like(u)
+        out[:, 0:3] = u[:, 3:6]
+        out[:, 3] = 2 * (e1 * e3 + e0 * e2) * a3
+        out[:, 4] = 2 * (e2 * e3 - e0 * e1) * a3
+        out[:, 5] = (1 - 2 * (e1**2 + e2**2)) * a3
+        return out
+
+    def _u_dot_parachute(self, t, u, rows):  # pylint: disable=unused-argument
+        """Vectorized ``Flight.u_dot_parachute``."""
+        z, vx, vy, vz = u[:, 2], u[:, 3], u[:, 4], u[:, 5]
+        env = self._environment(z, rows)
+        rho = env[DENSITY]
+        mp = self.tables.constants[rows, DRY_MASS]
+        ka = 1
+        R = 1.5
+        ma = ka * rho * (4 / 3) * np.pi * R**3
+        freestream_x = vx - env[WIND_X]
+        freestream_y = vy - env[WIND_Y]
+        free_stream_speed = np.sqrt(freestream_x**2 + freestream_y**2 + vz**2)
+        pseudo_drag = -0.5 * rho * self.cd_s[rows] * free_stream_speed
+        out = np.zeros_like(u)
+        out[:, 0:3] = u[:, 3:6]
+        out[:, 3] = pseudo_drag * freestream_x / (mp + ma)
+        out[:, 4] = pseudo_drag * freestream_y / (mp + ma)
+        out[:, 5] = (pseudo_drag * vz - 9.8 * mp) / (mp + ma)
+        return out
+
+    # pylint: disable=too-many-locals,too-many-statements
+    def _u_dot_free(self, t, u, rows):
+        """Vectorized ``FlightKernel.u_dot``."""
+        tab = self.tables
+        c = tab.constants[rows]
+        z = u[:, 2]
+        vx, vy, vz = u[:, 3], u[:, 4], u[:, 5]
+        e0, e1, e2, e3 = u[:, 6], u[:, 7], u[:, 8], u[:, 9]
+        omega1, omega2, omega3 = u[:, 10], u[:, 11], u[:, 12]
+
+        burning = (c[:, BURN_START] < t) & (t < c[:, BURN_OUT])
+        (
+            motor_I_11_at_t,
+            motor_I_33_at_t,
+            motor_I_11_derivative_at_t,
+            motor_I_33_derivative_at_t,
+            mass_flow_rate_at_t,
+            propellant_mass_at_t,
+            thrust,
+        ) = self._motor(t, rows, burning)
+        env = self._environment(z, rows)
+        net_thrust = self._net_thrust(rows, burning, thrust, env[PRESSURE])
+        R1 = np.zeros(len(rows))
+        R2 = np.zeros(len(rows))
+        M1 = c[:, THRUST_ECC_Y] * net_thrust
+        M2 = -c[:, THRUST_ECC_X] * net_thrust
+        M3 = np.zeros(len(rows))
+
+        rocket_dry_I_11 = c[:, DRY_I_11]
+        rocket_dry_I_33 = c[:, DRY_I_33]
+        rocket_dry_mass = c[:, DRY_MASS]
+        total_mass_at_t = propellant_mass_at_t + rocket_dry_mass
+        mu = (propellant_mass_at_t * rocket_dry_mass) / total_mass_at_t
+        b = c[:, B]
+        cc = c[:, C]
+        nozzle_radius = c[:, NOZZLE_RADIUS]
+
+        a11 = 1 - 2 * (e2**2 + e3**2)
+        a12 = 2 * (e1 * e2 - e0 * e3)
+        a13 = 2 * (e1 * e3 + e0 * e2)
+        a21 = 2 * (e1 * e2 + e0 * e3)
+        a22 = 1 - 2 * (e1**2 + e3**2)
+        a23 = 2 * (e2 * e3 - e0 * e1)
+        a31 = 2 * (e1 * e3 - e0 * e2)
+        a32 = 2 * (e2 * e3 + e0 * e1)
+        a33 = 1 - 2 * (e1**2 + e2**2)
+
+        wind_velocity_x = env[WIND_X]
+        wind_velocity_y = env[WIND_Y]
+        speed_of_sound = env[SPEED_OF_SOUND]
+        free_stream_speed = np.sqrt(
+            (wind_velocity_x - vx) ** 2 + (wind_velocity_y - vy) ** 2 + vz**2
+        )
+        free_stream_mach = free_stream_speed / speed_of_sound
+        # Power on drag applies until burn out, before ignition too
+        drag_coeff = np.where(
+            t < c[:, BURN_OUT],
+            _interp_grid(free_stream_mach, z, tab.drag_axes, tab.drag_on, rows),
+            _interp_grid(free_stream_mach, z, tab.drag_axes, tab.drag_off, rows),
+        )
+        rho = env[DENSITY]
+        R3 = -0.5 * rho * free_stream_speed**2 * c[:, AREA] * drag_coeff
+        M1 += c[:, CP_ECC_Y] * R3
+        M2 -= c[:, CP_ECC_X] * R3
+
+        vx_b = a11 * vx + a21 * vy + a31 * vz
+        vy_b = a12 * vx + a22 * vy + a32 * vz
+        vz_b = a13 * vx + a23 * vy + a33 * vz
+
+        for k in range(tab.cp.shape[1]):
+            cpx, cpy, cpz = tab.cp[rows, k, 0], tab.cp[rows, k, 1], tab.cp[rows, k, 2]
+            ref_area = tab.ref_area[rows, k]
+            ref_len = tab.ref_len[rows, k]
+            comp_vx = vx_b + omega2 * cpz - omega3 * cpy
+            comp_vy = vy_b + omega3 * cpx - omega1 * cpz
+            comp_vz = vz_b + omega1 * cpy - omega2 * cpx
+            comp_z = z + a31 * cpx + a32 * cpy + a33 * cpz
+            comp_wind_vx, comp_wind_vy = self._wind(comp_z, rows)
+            stream_vx = a11 * comp_wind_vx + a21 * comp_wind_vy - comp_vx
+            stream_vy = a12 * comp_wind_vx + a22 * comp_wind_vy - comp_vy
+            stream_vz = a13 * comp_wind_vx + a23 * comp_wind_vy - comp_vz
+            stream_speed = np.sqrt(stream_vx**2 + stream_vy**2 + stream_vz**2)
+            stream_mach = stream_speed / speed_of_sound
+
+            lift_dir_norm2 = stream_vx**2 + stream_vy**2
+            with np.errstate(divide="ignore", invalid="ignore"):
+                stream_vzn = stream_vz / stream_speed
+            has_lift = (lift_dir_norm2 != 0) & (-stream_vzn < 1)
+            attack_angle = np.arccos(np.clip(-stream_vzn, -1.0, 1.0))
+            clalpha = _interp_uniform(
+                stream_mach, tab.mach0, tab.dmach, tab.clalpha[:, k], rows
+            )
+            lift = np.where(
+                has_lift,
+                0.5 * rho * stream_speed**2 * ref_area * attack_angle * clalpha,
+                0.0,
+            )
+            lift_dir_norm = np.where(has_lift, np.sqrt(lift_dir_norm2), 1.0)
+            lift_xb = lift * (stream_vx / lift_dir_norm)
+            lift_yb = lift * (stream_vy / lift_dir_norm)
+            R1 += lift_xb
+            R2 += lift_yb
+            M1 -= cpz * lift_yb
+            M2 += cpz * lift_xb
+
+            clf_delta = _interp_uniform(
+                stream_mach, tab.mach0, tab.dmach, tab.clf_delta[:, k], rows
+            )
+            cld_omega = _interp_uniform(
+                stream_mach, tab.mach0, tab.dmach, tab.cld_omega[:, k], rows
+            )
+            M3_forcing = (
+                (0.5 * rho * stream_speed**2)
+                * ref_area
+                * ref_len
+                * clf_delta
+                * tab.cant[rows, k]
+            )
+            M3_damping = (
+                (0.5 * rho * stream_speed)
+                * ref_area
+                * ref_len**2
+                * cld_omega
+                * omega3
+                / 2
+            )
+            M3 += np.where(tab.has_roll[rows, k], M3_forcing - M3_damping, 0.0)
+
+        M3 += c[:, CP_ECC_X] * R2 - c[:, CP_ECC_Y] * R1
+
+        inertia_11 = rocket_dry_I_11 + motor_I_11_at_t + mu * b**2
+        mass_flow_term = (
+            motor_I_11_derivative_at_t
+            + mass_flow_rate_at_t * (rocket_dry_mass - 1) * (b / total_mass_at_t) ** 2
+        ) - mass_flow_rate_at_t * (
+            (nozzle_radius / 2) ** 2 + (cc - b * mu / rocket_dry_mass) ** 2
+        )
+        inertia_diff = rocket_dry_I_33 + motor_I_33_at_t - inertia_11
+        alpha1 = (
+            M1 - (omega2 * omega3 * inertia_diff + omega1 * mass_flow_term)
+        ) / inertia_11
+        alpha2 = (
+            M2 - (-omega1 * omega3 * inertia_diff + omega2 * mass_flow_term)
+        ) / inertia_11
+        alpha3 = (
+            M3
+            - omega3
+            * (
+                motor_I_33_derivative_at_t
+                - mass_flow_rate_at_t * nozzle_radius**2 / 2
+            )
+        ) / (rocket_dry_I_33 + motor_I_33_at_t)
+
+        L1 = (
+            R1
+            - b * propellant_mass_at_t * (omega2**2 + omega3**2)
+            - 2 * cc * mass_flow_rate_at_t * omega2
+        ) / total_mass_at_t
+        L2 = (
+            R2
+            + b * propellant_mass_at_t * (alpha3 + omega1 * omega2)
+            + 2 * cc * mass_flow_rate_at_t * omega1
+        ) / total_mass_at_t
+        L3 = (
+            R3 - b * propellant_mass_at_t * (alpha2 - omega1 * omega3) + net_thrust
+        ) / total_mass_at_t
+
+        out = np.empty_like(u)
+        out[:, 0:3] = u[:, 3:6]
+        out[:, 3] = a11 * L1 + a12 * L2 + a13 * L3
+        out[:, 4] = a21 * L1 + a22 * L2 + a23 * L3
+        out[:, 5] = a31 * L1 + a32 * L2 + a33 * L3 - env[GRAVITY]
+        out[:, 6] = 0.5 * (-omega1 * e1 - omega2 * e2 - omega3 * e3)
+        out[:, 7] = 0.5 * (omega1 * e0 + omega3 * e2 - omega2 * e3)
+        out[:, 8] = 0.5 * (omega2 * e0 - omega3 * e1 + omega1 * e3)
+        out[:, 9] = 0.5 * (omega3 * e0 + omega2 * e1 - omega1 * e2)
+        out[:, 10], out[:, 11], out[:, 12] = alpha1, alpha2, alpha3
+        return out
+
+    def _u_dot(self, t, u, rows):
+        """Derivative for members ``rows``, each with its own phase."""
+        t = np.broadcast_to(np.asarray(t, dtype=float), (len(rows),))
+        out = np.zeros_like(u)
+        phase = self.phase[rows]
+        for value, func in (
+            (RAIL, self._u_dot_rail),
+            (FREE_FLIGHT, self._u_dot_free),
+            (PARACHUTE, self._u_dot_parachute),
+        ):
+            mask = phase == value
+            if mask.all():
+                return func(t, u, rows)
+            if mask.any():
+                out[mask] = func(t[mask], u[mask], rows[mask])
+        return out
+
+    def _step(self, t, y, f, h, rows):
+        """One Dormand-Prince step. Returns ``(y_new, f_new, error)``."""
+        h_col = np.reshape(h, (-1, 1)) if np.ndim(h) else h
+        k = [f]
+        for i in range(1, 7):
+            y_i = y + h_col * sum(a * k_j for a, k_j in zip(_A_DP[i], k) if a)
+            k.append(self._u_dot(t + _C_DP[i] * h, y_i, rows))
+        error = h_col * sum(e * k_j for e, k_j in zip(_E_DP, k) if e)
+        return y_i, k[6], error
+
+    # -------------------------------------------------------------------
+    # Events
+    # -------------------------------------------------------------------
+
+    def _rail_exit_step(self, t, h, rows, y0, f0, y1, f1):
+        """Step size ending at the earliest rail exit inside the step, ``h``
+        if there is none before its end. The exit times found are kept in
+        ``rail_exit_time``."""
+        mask = (self.phase[rows] == RAIL) & (
+            y1[:, 0] ** 2
+            + y1[:, 1] ** 2
+            + (y1[:, 2] - self.elevation[rows]) ** 2
+            >= self.rail_1rl[rows] ** 2
+        )
+        if not mask.any():
+            return h
+        sel = rows[mask]
+
+        def g_rail(u):
+            return (
+                u[:, 0] ** 2
+                + u[:, 1] ** 2
+                + (u[:, 2] - self.elevation[sel]) ** 2
+                - self.rail_1rl[sel] ** 2
+            )
+
+        theta, _ = _locate(g_rail, y0[mask], f0[mask], y1[mask], f1[mask], h)
+        exit_time = t + theta * h
+        self.rail_exit_time[sel] = np.minimum(self.rail_exit_time[sel], exit_time)
+        if exit_time.min() >= t + h - _event_tolerance(t + h):
+            return h
+        return exit_time.min() - t
+
+    def _trigger_condition(self, p, sel, u):
+        """Whether the height or apogee trigger of parachute ``p`` holds for
+        the members ``sel`` at states ``u``."""
+        descending = u[:, 5] < 0
+        height = u[:, 2] - self.elevation[sel]
+        kind = self.chute_kind[sel, p]
+        return descending & (
+            (kind == _APOGEE_TRIGGER) | (height < self.chute_height[sel, p])
+        )
+
+    def _armed(self, rows):
+        phase = self.phase[rows]
+        return ((phase == FREE_FLIGHT) | (phase == PARACHUTE)) & np.isinf(
+            self.deploy_time[rows]
+        )
+
+    def _trigger_step(self, t, h, rows, y0, f0, y1, f1):
+        """Step size ending at the earliest parachute sampling time, inside
+        the step, at which a height or apogee trigger holds; ``h`` if there
+        is none before its end. As in ``Flight``, those triggers are only
+        checked at multiples of ``1 / sampling_rate``."""
+        if not self.chute_pending.any():
+            return h
+        t_end = t + h
+        armed = self._armed(rows)
+        t_fire = np.inf
+        for p in range(self.chute_pending.shape[1]):
+            candidates = (
+                armed
+                & self.chute_pending[rows, p]
+                & (self.chute_kind[rows, p] != _CALLABLE_TRIGGER)
+            )
+            if not candidates.any():
+                continue
+            index = np.flatnonzero(candidates)
+            index = index[self._trigger_condition(p, rows[index], y1[index])]
+            if len(index) == 0:
+                continue
+            sel = rows[index]
+            t_cross = np.full(len(index), t)
+            crossing = ~self._trigger_condition(p, sel, y0[index])
+            if crossing.any():
+                cross = index[crossing]
+                theta, _ = _locate(
+                    lambda u, s=sel[crossing]: np.where(
+                        self._trigger_condition(p, s, u), 1.0, -1.0
+                    ),
+                    y0[cross],
+                    f0[cross],
+                    y1[cross],
+                    f1[cross],
+                    h,
+                )
+                t_cross[crossing] = t + theta * h
+            # First sampling time at or after the trigger holds, after t
+            interval = self.chute_interval[sel, p]
+            t_node = np.ceil(t_cross / interval - 1e-9) * interval
+            t_node = np.where(
+                t_node <= t + _event_tolerance(t), t_node + interval, t_node
+            )
+            t_fire = min(t_fire, t_node.min())
+        if t_fire < t_end - _event_tolerance(t_end):
+            return t_fire - t
+        return h
+
+    def _apply_switches(self, t, rows, y):
+        """Moves the members whose rail exit or parachute inflation is due at
+        the end ``t`` of the step into their next phase."""
+        due_time = t + _event_tolerance(t)
+        due = self.rail_exit_time[rows] <= due_time
+        if due.any():
+            sel = rows[due]
+            self.results["out_of_rail_time"][sel] = t
+            self.results["out_of_rail_velocity"][sel] = np.linalg.norm(
+                y[due, 3:6], axis=1
+            )
+            self.rail_exit_time[sel] = np.inf
+            self.phase[sel] = FREE_FLIGHT
+        due = self.deploy_time[rows] <= due_time
+        if due.any():
+            sel = rows[due]
+            self.cd_s[sel] = self.deploy_cd_s[sel]
+            self.deploy_time[sel] = np.inf
+            self.phase[sel] = PARACHUTE
+
+    # pylint: disable=too-many-locals,too-many-statements
+    def _handle_events(self, t, h, rows, y0, f0, y1, f1):
+        res = self.results
+        t1 = t + h
+
+        # Apogee
+        phase = self.phase[rows]
+        mask = np.isnan(res["apogee_time"][rows]) & (phase != RAIL) & (y1[:, 5] < 0)
+        if mask.any():
+            sel = rows[mask]
+            theta, y_event = _locate(
+                lambda u: u[:, 5], y0[mask], f0[mask], y1[mask], f1[mask], h
+            )
+            res["apogee_time"][sel] = t + theta * h
+            res["apogee_x"][sel] = y_event[:, 0]
+            res["apogee_y"][sel] = y_event[:, 1]
+            res["apogee"][sel] = y_event[:, 2]
+            if self.ensemble.terminate_on_apogee:
+                y1[mask] = y_event
+                res["t_final"][sel] = t + theta * h
+                self.phase[sel] = DONE
+
+        self._check_triggers(t1, rows, y1)
+
+        # Impact
+        phase = self.phase[rows]
+        mask = (phase != DONE) & (y1[:, 2] < self.elevation[rows])
+        if mask.any():
+            sel = rows[mask]
+            theta, y_event = _locate(
+                lambda u: u[:, 2] - self.elevation[sel],
+                y0[mask],
+                f0[mask],
+                y1[mask],
+                f1[mask],
+                h,
+            )
+            y1[mask] = y_event
+            res["t_final"][sel] = t + theta * h
+            res["x_impact"][sel] = y_event[:, 0]
+            res["y_impact"][sel] = y_event[:, 1]
+            res["impact_velocity"][sel] = y_event[:, 5]
+            self.phase[sel] = DONE
+
+    def _check_triggers(self, t, rows, y):
+        """Evaluates pending parachute triggers at the end of the step. Height
+        and apogee triggers are vectorized and fire only at their sampling
+        times (see ``_trigger_step``), callables are called per member with
+        the clean pressure and height above ground level."""
+        if not self.chute_pending.any():
+            return
+        armed = self._armed(rows)
+        height = y[:, 2] - self.elevation[rows]
+        for p in range(self.chute_pending.shape[1]):
+            candidates = armed & self.chute_pending[rows, p]
+            if not candidates.any():
+                continue
+            kind = self.chute_kind[rows, p]
+            interval = self.chute_interval[rows, p]
+            sampled = np.abs(t - np.round(t / interval) * interval) <= (
+                _event_tolerance(t)
+            )
+            fired = (
+                candidates
+                & (kind != _CALLABLE_TRIGGER)
+                & sampled
+                & self._trigger_condition(p, rows, y)
+            )
+            for j in np.flatnonzero(candidates & (kind == _CALLABLE_TRIGGER)):
+                i = rows[j]
+                pressure = self._env(PRESSURE, y[j : j + 1, 2], rows[j : j + 1])[0]
+                fired[j] = bool(
+                    self.chutes[i][p].triggerfunc(pressure, height[j], y[j], [])
+                )
+            if not fired.any():
+                continue
+            sel = rows[fired]
+            self.chute_pending[sel, p] = False
+            self.results["n_parachute_events"][sel] += 1
+            self.deploy_time[sel] = t + self.chute_lag[sel, p]
+            self.deploy_cd_s[sel] = self.chute_cd_s[sel, p]
+            armed &= ~fired
+            # No lag: inflates now, at the end of this step
+            now = sel[self.chute_lag[sel, p] == 0]
+            self.cd_s[now] = self.deploy_cd_s[now]
+            self.deploy_time[now] = np.inf
+            self.phase[now] = PARACHUTE
+
+    # -------------------------------------------------------------------
+    # Integration
+    # -------------------------------------------------------------------
+
+    def run(self):
+        ens = self.ensemble
+        res = self.results
+        t = 0.0
+        h = min(1e-3, ens.max_time_step)
+        f = np.zeros_like(self.y)
+        active = np.flatnonzero(self.phase != DONE)
+        f[active] = self._u_dot(t, self.y[active], active)
+
+        while t < ens.max_time:
+            rows = np.flatnonzero(self.phase != DONE)
+            if len(rows) == 0:
+                break
+            # Steps end at the rail exits and parachute inflations due
+            next_switch = min(
+                self.rail_exit_time[rows].min(), self.deploy_time[rows].min()
+            )
+            h = min(h, ens.max_time_step, ens.max_time - t, next_switch - t)
+            y0, f0 = self.y[rows], f[rows]
+            y1, f1, error = self._step(t, y0, f0, h, rows)
+            scale = _ATOL + ens.rtol * np.maximum(np.abs(y0), np.abs(y1))
+            # Members share the step, so the worst one sets its size
+            worst = np.sqrt(np.mean((error / scale) ** 2, axis=1)).max()
+            if not np.isfinite(worst):
+                # Never accepted, whatever the minimum step
+                if h <= _event_tolerance(t):
+                    raise RuntimeError(
+                        f"EnsembleFlight: non-finite state at t = {t} s."
+                    )
+                h *= 0.2
+                continue
+            if worst > 1 and h > ens.min_time_step:
+                h = max(h * max(0.2, 0.9 * worst**-0.2), ens.min_time_step)
+                continue
+            # Rail exits end the step, so that each phase is integrated
+            # under its own dynamics with error control
+            h_exit = self._rail_exit_step(t, h, rows, y0, f0, y1, f1)
+            if h_exit < h:
+                h = h_exit
+                continue
+            # Height and apogee triggers end the step at their sampling time
+            h_trigger = self._trigger_step(t, h, rows, y0, f0, y1, f1)
+            if h_trigger < h:
+                h = h_trigger
+                continue
+
+            phase = self.phase[rows]
+            self._apply_switches(t + h, rows, y1)
+            self._handle_events(t, h, rows, y0, f0, y1, f1)
+            # Members in a new phase start the next step from its dynamics
+            switched = (self.phase[rows] != phase) & (self.phase[rows] != DONE)
+            if switched.any():
+                f1[switched] = self._u_dot(t + h, y1[switched], rows[switched])
+            self.y[rows], f[rows] = y1, f1
+            t += h
+            self.ensemble.steps += 1
+
+            z = y1[:, 2]
+            speed = np.linalg.norm(y1[:, 3:6], axis=1)
+            env = self._environment(z, rows)
+            free_stream_speed = np.sqrt(
+                (env[WIND_X] - y1[:, 3]) ** 2
+                + (env[WIND_Y] - y1[:, 4]) ** 2
+                + y1[:, 5] ** 2
+            )
+            mach = free_stream_speed / env[SPEED_OF_SOUND]
+            res["max_speed"][rows] = np.maximum(res["max_speed"][rows], speed)
+            res["max_mach_number"][rows] = np.maximum(
+                res["max_mach_number"][rows], mach
+            )
+            h *= 5.0 if worst == 0 else min(5.0, 0.9 * worst**-0.2)
+
+        unfinished = self.phase != DONE
+        res["t_final"][unfinished] = t
+        res["final_state"] = self.y
+        return res
+
+
+class EnsembleFlight:  # pylint: disable=too-many-instance-attributes
+    """Integrates many rail launched solid motor flights in lockstep.
+
+    The state of every member is one row of an ``(N, 13)`` array and the
+    equations of motion (the same as ``Flight(equations_of_motion=
+    "solid_propulsion")``) are evaluated for all members at once with NumPy.
+    Rockets, motors and environments are lowered onto grids first (uniform
+    ones, except the motor curves, which keep their thrust curve nodes as
+    ``FlightKernel`` does), so each right-hand side evaluation is a handful
+    of gathers and array operations regardless of N. Members share the
+    adaptive Dormand-Prince step, whose size is set by the member with the
+    largest error, and each member is retired individually at its own
+    events: rail exit, apogee, parachute deployment and impact.
+
+    Parameters
+    ----------
+    rockets : Rocket or list of Rocket
+        One rocket per member, or a single rocket shared by every member.
+    environments : Environment or list of Environment
+        One environment per member, or a single shared environment.
+    rail_length : float or array_like
+        Rail length of each member, in meters.
+    inclination : float or array_like, optional
+        Rail inclination of each member, in degrees. Default is 80.
+    heading : float or array_like, optional
+        Heading of each member, in degrees. Default is 90.
+    terminate_on_apogee : bool, optional
+        Retires each member at its apogee. Default is False.
+    max_time : float, optional
+        Simulation time limit, in seconds. Default is 600.
+    max_time_step : float, optional
+        Largest allowed step, in seconds. Default is ``np.inf``.
+    min_time_step : float, optional
+        Smallest allowed step, in seconds. Default is 0.
+    rtol : float, optional
+        Relative tolerance of the step size control. Default is 1e-6.
+    chunk_size : int, optional
+        Members integrated together. Lowered tables take a few hundred
+        kilobytes per member, so large ensembles run chunk by chunk.
+        Default is 512.
+    mach_points : int, optional
+        Points of the Mach grid (0 to 5) for drag and lift tables.
+        Default is 201.
+    altitude_points : int, optional
+        Points of the altitude grid for environment profiles. Default is
+        1001.
+
+    Attributes
+    ----------
+    EnsembleFlight.n : int
+        Number of members.
+    EnsembleFlight.steps : int
+        Accepted lockstep steps over all chunks.
+    EnsembleFlight.apogee, EnsembleFlight.apogee_time : numpy.ndarray
+        Apogee altitude above sea level and its time, per member.
+    EnsembleFlight.apogee_x, EnsembleFlight.apogee_y : numpy.ndarray
+        Apogee position, per member.
+    EnsembleFlight.out_of_rail_time : numpy.ndarray
+        Rail exit time, per member.
+    EnsembleFlight.out_of_rail_velocity : numpy.ndarray
+        Speed at rail exit, per member.
+    EnsembleFlight.x_impact, EnsembleFlight.y_impact : numpy.ndarray
+        Impact position, per member. NaN when not reached.
+    EnsembleFlight.impact_velocity : numpy.ndarray
+        Vertical velocity at impact, per member.
+    EnsembleFlight.t_final : numpy.ndarray
+        Time at which each member was retired.
+    EnsembleFlight.max_speed, EnsembleFlight.max_mach_number : numpy.ndarray
+        Largest speed and free stream Mach number over the accepted steps.
+    EnsembleFlight.n_parachute_events : numpy.ndarray
+        Number of parachutes triggered, per member.
+    EnsembleFlight.final_state : numpy.ndarray
+        ``(N, 13)`` state of each member when it was retired.
+
+    Notes
+    -----
+    Rockets with air brakes, controllers, sensors or generic surfaces are
+    not supported. Height and apogee parachute triggers are checked at the
+    parachute's sampling times, as ``Flight`` does, and steps end at the
+    first one that fires. Triggers given as callables are evaluated per
+    member at the end of each step and receive the clean pressure (no
+    noise) and the geometric height above ground level.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        rockets,
+        environments,
+        rail_length,
+        inclination=80.0,
+        heading=90.0,
+        terminate_on_apogee=False,
+        max_time=600,
+        max_time_step=np.inf,
+        min_time_step=0,
+        rtol=1e-6,
+        chunk_size=512,
+        mach_points=201,
+        altitude_points=1001,
+    ):
+        rockets = rockets if isinstance(rockets, (list, tuple)) else [rockets]
+        environments = (
+            environments
+            if isinstance(environments, (list, tuple))
+            else [environments]
+        )
+        n = max(
+            len(rockets),
+            len(environments),
+            np.size(rail_length),
+            np.size(inclination),
+            np.size(heading),
+        )
+        self.n = n
+        self.rockets = self._broadcast_list(rockets, n, "rockets")
+        self.environments = self._broadcast_list(environments, n, "environments")
+        self.rail_length = np.broadcast_to(np.asarray(rail_length, float), (n,))
+        self.inclination = np.broadcast_to(np.asarray(inclination, float), (n,))
+        self.heading = np.broadcast_to(np.asarray(heading, float), (n,))
+        self.terminate_on_apogee = terminate_on_apogee
+        self.max_time = max_time
+        self.max_time_step = max_time_step
+        self.min_time_step = min_time_step
+        self.rtol = rtol
+        self.chunk_size = chunk_size
+        self.steps = 0
+
+        for rocket in {id(r): r for r in self.rockets}.values():
+            if rocket._controllers or rocket.sensors.get_components():
+                raise ValueError(
+                    "EnsembleFlight does not support rockets with controllers "
+                    "or sensors. Use Flight instead."
+                )
+            if not is_lowerable(rocket):
+                raise ValueError(
+                    "EnsembleFlight does not support rockets with air brakes, "
+                    "generic surfaces or non-linear lift. Use Flight instead."
+                )
+
+        z_low = min(env.elevation for env in self.environments) - 500.0
+        z_high = max(env.max_expected_height for env in self.environments)
+        self._grids = (
+            np.linspace(0.0, 5.0, mach_points),
+            np.linspace(min(z_low, 0.0), z_high, altitude_points),
+            MOTOR_POINTS,
+            DRAG_ALTITUDE_POINTS,
+        )
+        self.__simulate()
+
+    @staticmethod
+    def _broadcast_list(values, n, name):
+        if len(values) == 1:
+            return list(values) * n
+        if len(values) != n:
+            raise ValueError(f"Expected 1 or {n} {name}, got {len(values)}.")
+        return list(values)
+
+    def __simulate(self):
+        results = {}
+        for start in range(0, self.n, self.chunk_size):
+            members = range(start, min(start + self.chunk_size, self.n))
+            chunk_results = _EnsembleChunk(self, members).run()
+            for name, values in chunk_results.items():
+                results.setdefault(name, []).append(values)
+        for name, values in results.items():
+            setattr(self, name, np.concatenate(values))
+
+    def __len__(self):
+        return self.n
+
+    def __repr__(self):
+        return f"<EnsembleFlight of {self.n} members, {self.steps} steps>"
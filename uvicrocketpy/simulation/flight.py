@@ -14,15 +14,18 @@ from ..mathutils.vector_matrix import Matrix, Vector
 from ..plots.flight_plots import _FlightPlots
 from ..prints.flight_prints import _FlightPrints
 from ..tools import (
-    calculate_cubic_hermite_coefficients,
     euler313_to_quaternions,
     find_closest,
-    find_root_linear_interpolation,
-    find_roots_cubic_function,
     quaternions_to_nutation,
     quaternions_to_precession,
     quaternions_to_spin,
 )
+from .flight_events import FlightEvent, FlightEventSet
+from .flight_jit import PointMassKernel, build_jit_kernel
+from .flight_kernel import FlightKernel
+from .flight_outputs import FlightOutputs, StreamingSolution
+from .flight_post_processing import FlightPostProcessor
+from .flight_solution import SolutionBuffer
 
 ODE_SOLVER_MAP = {
     "RK23": RK23,
@@ -148,9 +151,11 @@ class Flight:
         e2_init, e3_init, w1_init, w2_init, w3_init]
     Flight.t_initial : int, float
         Initial simulation time in seconds. Usually 0.
-    Flight.solution : list
-        Solution array which keeps results from each numerical
-        integration.
+    Flight.solution : SolutionBuffer
+        Growable array which keeps results from each numerical
+        integration, one ``[t, *state]`` row per step. Use
+        ``Flight.solution.compact(np.float32)`` to halve its memory for
+        archival.
     Flight.t : float
         Current integration time.
     Flight.y : list
@@ -199,6 +204,9 @@ class Flight:
         impacts the ground.
     Flight.parachute_events : array
         List that stores parachute events triggered during flight.
+    Flight.event_log : list
+        List of [time, name] of every event located by root finding during
+        the simulation: "rail_exit", "burn_out", "apogee" and "impact".
     Flight.function_evaluations : array
         List that stores number of derivative function evaluations
         during numerical integration in cumulative manner.
@@ -492,6 +500,7 @@ class Flight:
         name="Flight",
         equations_of_motion="standard",
         ode_solver="LSODA",
+        outputs=None,
     ):
         """Run a trajectory simulation.
 
@@ -562,11 +571,30 @@ class Flight:
         name : str, optional
             Name of the flight. Default is "Flight".
         equations_of_motion : str, optional
-            Type of equations of motion to use. Can be "standard" or
-            "solid_propulsion". Default is "standard". Solid propulsion is a
-            more restricted set of equations of motion that only works for
-            solid propulsion rockets. Such equations were used in RocketPy v0
-            and are kept here for backwards compatibility.
+            Type of equations of motion to use. Can be "standard",
+            "solid_propulsion", "kernel", "jit" or "3dof". Default is
+            "standard". Solid propulsion is a more restricted set of equations
+            of motion that only works for solid propulsion rockets. Such
+            equations were used in RocketPy v0 and are kept here for backwards
+            compatibility.
+            "kernel" evaluates the same equations as "solid_propulsion"
+            through a precomputed kernel (see ``FlightKernel``): constant
+            rocket data and tables of the motor curves, environment
+            profiles, drag and surface coefficients are built once, and each
+            call interpolates them with plain floats only.
+            "jit" lowers environment profiles, motor curves, drag and lift
+            coefficients to flat arrays and evaluates the same equations in
+            a numba compiled function (see ``JitFlightKernel``), which also
+            samples parachutes with a height or apogee trigger. Falls back
+            to "kernel" with a warning when numba is not installed or the
+            rocket has air brakes or generic surfaces.
+            "3dof" integrates a point mass on the same tables (see
+            ``PointMassKernel``): thrust and drag act along the velocity
+            relative to the air and the attitude stays at its rail exit
+            value. Much cheaper, e.g. as the coarse level of
+            ``MultilevelMonteCarlo``, but attitude, angle of attack and
+            surface loads are not modeled, and neither are air brakes (with
+            a warning when the rocket has them or other controllers).
         ode_solver : str, ``scipy.integrate.OdeSolver``, optional
             Integration method to use to solve the equations of motion ODE.
             Available options are: 'RK23', 'RK45', 'DOP853', 'Radau', 'BDF',
@@ -575,6 +603,18 @@ class Flight:
             A custom ``scipy.integrate.OdeSolver`` can be passed as well.
             For more information on the integration methods, see the scipy
             documentation [1]_.
+        outputs : list, optional
+            Names of the only outputs needed from the flight, e.g.
+            ``["apogee", "max_mach_number", "x_impact", "y_impact"]``. The
+            flight then keeps only the last steps of its solution and reduces
+            the older ones to these outputs as it integrates, so its memory
+            does not grow with the flight duration. Event values and the
+            maxima of speed, Mach number, dynamic pressure, Reynolds number
+            and total pressure are supported (see
+            ``flight_outputs.STREAMING_OUTPUTS``). The trajectory and the
+            Functions of time are not available. Controllers receive only
+            the last steps as state history. Default is None, which keeps
+            the whole trajectory.
 
 
         Returns
@@ -605,6 +645,7 @@ class Flight:
         self.name = name
         self.equations_of_motion = equations_of_motion
         self.ode_solver = ode_solver
+        self.outputs = None if outputs is None else tuple(outputs)
 
         # Controller initialization
         self.__init_controllers()
@@ -613,6 +654,7 @@ class Flight:
         self.__init_solution_monitors()
         self.__init_equations_of_motion()
         self.__init_solver_monitors()
+        self.__init_events()
 
         # Create known flight phases
         self.flight_phases = self.FlightPhases()
@@ -663,6 +705,8 @@ class Flight:
                 min_step=self.min_time_step,
             )
 
+            self._events.reset(phase.t, self.y_sol)
+
             # Initialize phase time nodes
             phase.time_nodes = self.TimeNodes()
             # Add first time node to the time_nodes list
@@ -787,7 +831,7 @@ class Flight:
                 while phase.solver.status == "running":
                     # Execute solver step, log solution and function evaluations
                     phase.solver.step()
-                    self.solution += [[phase.solver.t, *phase.solver.y]]
+                    self.solution.append_state(phase.solver.t, phase.solver.y)
                     self.function_evaluations.append(phase.solver.nfev)
 
                     # Update time and state
@@ -796,160 +840,22 @@ class Flight:
                     if verbose:
                         print(f"Current Simulation Time: {self.t:3.4f} s", end="\r")
 
-                    # Check for first out of rail event
-                    if len(self.out_of_rail_state) == 1 and (
-                        self.y_sol[0] ** 2
-                        + self.y_sol[1] ** 2
-                        + (self.y_sol[2] - self.env.elevation) ** 2
-                        >= self.effective_1rl**2
+                    # Locate rail exit, burn out, apogee and impact events
+                    for t_event, y_event, event in self._events.check(
+                        self.t, self.y_sol, phase.solver.dense_output
                     ):
-                        # Check exactly when it went out using root finding
-                        # Disconsider elevation
-                        self.solution[-2][3] -= self.env.elevation
-                        self.solution[-1][3] -= self.env.elevation
-                        # Get points
-                        y0 = (
-                            sum(self.solution[-2][i] ** 2 for i in [1, 2, 3])
-                            - self.effective_1rl**2
-                        )
-                        yp0 = 2 * sum(
-                            self.solution[-2][i] * self.solution[-2][i + 3]
-                            for i in [1, 2, 3]
-                        )
-                        t1 = self.solution[-1][0] - self.solution[-2][0]
-                        y1 = (
-                            sum(self.solution[-1][i] ** 2 for i in [1, 2, 3])
-                            - self.effective_1rl**2
-                        )
-                        yp1 = 2 * sum(
-                            self.solution[-1][i] * self.solution[-1][i + 3]
-                            for i in [1, 2, 3]
-                        )
-                        # Put elevation back
-                        self.solution[-2][3] += self.env.elevation
-                        self.solution[-1][3] += self.env.elevation
-                        # Cubic Hermite interpolation (ax**3 + bx**2 + cx + d)
-                        a, b, c, d = calculate_cubic_hermite_coefficients(
-                            0,
-                            float(phase.solver.step_size),
-                            y0,
-                            yp0,
-                            y1,
-                            yp1,
-                        )
-                        a += 1e-5  # TODO: why??
-                        # Find roots
-                        t_roots = find_roots_cubic_function(a, b, c, d)
-                        # Find correct root
-                        valid_t_root = [
-                            t_root.real
-                            for t_root in t_roots
-                            if 0 < t_root.real < t1 and abs(t_root.imag) < 0.001
-                        ]
-                        if len(valid_t_root) > 1:  # pragma: no cover
-                            raise ValueError(
-                                "Multiple roots found when solving for rail exit time."
-                            )
-                        if len(valid_t_root) == 0:  # pragma: no cover
-                            raise ValueError(
-                                "No valid roots found when solving for rail exit time."
-                            )
-                        # Determine final state when upper button is going out of rail
-                        self.t = valid_t_root[0] + self.solution[-2][0]
-                        interpolator = phase.solver.dense_output()
-                        self.y_sol = interpolator(self.t)
-                        self.solution[-1] = [self.t, *self.y_sol]
-                        self.out_of_rail_time = self.t
-                        self.out_of_rail_time_index = len(self.solution) - 1
-                        self.out_of_rail_state = self.y_sol
-                        # Create new flight phase
-                        self.flight_phases.add_phase(
-                            self.t,
-                            self.u_dot_generalized,
-                            index=phase_index + 1,
-                        )
-                        # Prepare to leave loops and start new flight phase
-                        phase.time_nodes.flush_after(node_index)
-                        phase.time_nodes.add_node(self.t, [], [], [])
-                        phase.solver.status = "finished"
-
-                    # Check for apogee event
-                    # TODO: negative vz doesn't really mean apogee. Improve this.
-                    if len(self.apogee_state) == 1 and self.y_sol[5] < 0:
-                        # Assume linear vz(t) to detect when vz = 0
-                        t0, vz0 = self.solution[-2][0], self.solution[-2][6]
-                        t1, vz1 = self.solution[-1][0], self.solution[-1][6]
-                        t_root = find_root_linear_interpolation(t0, t1, vz0, vz1, 0)
-                        # Fetch state at t_root
-                        interpolator = phase.solver.dense_output()
-                        self.apogee_state = interpolator(t_root)
-                        # Store apogee data
-                        self.apogee_time = t_root
-                        self.apogee_x = self.apogee_state[0]
-                        self.apogee_y = self.apogee_state[1]
-                        self.apogee = self.apogee_state[2]
-
-                        if self.terminate_on_apogee:
-                            self.t = self.t_final = t_root
-                            # Roll back solution
-                            self.solution[-1] = [self.t, *self.apogee_state]
-                            # Set last flight phase
-                            self.flight_phases.flush_after(phase_index)
-                            self.flight_phases.add_phase(self.t)
-                            # Prepare to leave loops and start new flight phase
-                            phase.time_nodes.flush_after(node_index)
-                            phase.time_nodes.add_node(self.t, [], [], [])
-                            phase.solver.status = "finished"
-                        elif len(self.solution) > 2:
-                            # adding the apogee state to solution increases accuracy
-                            # we can only do this if the apogee is not the first state
-                            self.solution.insert(-1, [t_root, *self.apogee_state])
-                    # Check for impact event
-                    if self.y_sol[2] < self.env.elevation:
-                        # Check exactly when it happened using root finding
-                        # Cubic Hermite interpolation (ax**3 + bx**2 + cx + d)
-                        a, b, c, d = calculate_cubic_hermite_coefficients(
-                            x0=0,  # t0
-                            x1=float(phase.solver.step_size),  # t1 - t0
-                            y0=float(self.solution[-2][3] - self.env.elevation),  # z0
-                            yp0=float(self.solution[-2][6]),  # vz0
-                            y1=float(self.solution[-1][3] - self.env.elevation),  # z1
-                            yp1=float(self.solution[-1][6]),  # vz1
-                        )
-                        # Find roots
-                        t_roots = find_roots_cubic_function(a, b, c, d)
-                        # Find correct root
-                        t1 = self.solution[-1][0] - self.solution[-2][0]
-                        valid_t_root = [
-                            t_root.real
-                            for t_root in t_roots
-                            if abs(t_root.imag) < 0.001 and 0 < t_root.real < t1
-                        ]
-                        if len(valid_t_root) > 1:  # pragma: no cover
-                            raise ValueError(
-                                "Multiple roots found when solving for impact time."
-                            )
-                        # Determine impact state at t_root
-                        self.t = self.t_final = valid_t_root[0] + self.solution[-2][0]
-                        interpolator = phase.solver.dense_output()
-                        self.y_sol = self.impact_state = interpolator(self.t)
-                        # Roll back solution
-                        self.solution[-1] = [self.t, *self.y_sol]
-                        # Save impact state
-                        self.x_impact = self.impact_state[0]
-                        self.y_impact = self.impact_state[1]
-                        self.z_impact = self.impact_state[2]
-                        self.impact_velocity = self.impact_state[5]
-                        # Set last flight phase
-                        self.flight_phases.flush_after(phase_index)
-                        self.flight_phases.add_phase(self.t)
-                        # Prepare to leave loops and start new flight phase
-                        phase.time_nodes.flush_after(node_index)
-                        phase.time_nodes.add_node(self.t, [], [], [])
-                        phase.solver.status = "finished"
+                        if event.once:
+                            event.enabled = False
+                        self.event_log.append([t_event, event.name])
+                        if event.action(
+                            t_event, y_event, phase, phase_index, node_index
+                        ):
+                            break
 
                     # List and feed overshootable time nodes
-                    if self.time_overshoot:
+                    if self.time_overshoot and not self.__sample_parachute_triggers(
+                        phase, phase_index, node_index
+                    ):
                         # Initialize phase overshootable time nodes
                         overshootable_nodes = self.TimeNodes()
                         # Add overshootable parachute time nodes
@@ -994,58 +900,28 @@ class Flight:
                                         overshootable_node.y_sol,
                                         self.sensors,
                                     ):
-                                        # Remove parachute from flight parachutes
-                                        self.parachutes.remove(parachute)
-                                        # Create phase for time after detection and
-                                        # before inflation
-                                        # Must only be created if parachute has any lag
-                                        i = 1
-                                        if parachute.lag != 0:
-                                            self.flight_phases.add_phase(
-                                                overshootable_node.t,
-                                                phase.derivative,
-                                                clear=True,
-                                                index=phase_index + i,
-                                            )
-                                            i += 1
-                                        # Create flight phase for time after inflation
-                                        callbacks = [
-                                            lambda self,
-                                            parachute_cd_s=parachute.cd_s: setattr(
-                                                self, "parachute_cd_s", parachute_cd_s
-                                            )
-                                        ]
-                                        self.flight_phases.add_phase(
-                                            overshootable_node.t + parachute.lag,
-                                            self.u_dot_parachute,
-                                            callbacks,
-                                            clear=False,
-                                            index=phase_index + i,
-                                        )
-                                        # Rollback history
-                                        self.t = overshootable_node.t
-                                        self.y_sol = overshootable_node.y_sol
-                                        self.solution[-1] = [
+                                        self.__deploy_overshot_parachute(
+                                            parachute,
                                             overshootable_node.t,
-                                            *overshootable_node.y_sol,
-                                        ]
-                                        # Prepare to leave loops and start new flight phase
+                                            overshootable_node.y_sol,
+                                            phase,
+                                            phase_index,
+                                            node_index,
+                                        )
+                                        # Prepare to leave loops
                                         overshootable_nodes.flush_after(
                                             overshootable_index
                                         )
-                                        phase.time_nodes.flush_after(node_index)
-                                        phase.time_nodes.add_node(self.t, [], [], [])
-                                        phase.solver.status = "finished"
-                                        # Save parachute event
-                                        self.parachute_events.append(
-                                            [self.t, parachute]
-                                        )
 
                     # If controlled flight, post process must be done on sim time
                     if self._controllers:
                         phase.derivative(self.t, self.y_sol, post_processing=True)
 
         self.t_final = self.t
+        if self.outputs is not None:
+            self.solution.finish()
+            # Values of the cached properties computed without the trajectory
+            self.__dict__.update(self._flight_outputs.values())
         self.__transform_pressure_signals_lists_to_functions()
         if self._controllers:
             # cache post process variables
@@ -1055,6 +931,237 @@ class Flight:
         if verbose:
             print(f"\n>>> Simulation Completed at Time: {self.t:3.4f} s")
 
+    def __init_events(self):
+        """Declares the events located by root finding after each solver
+        step (see ``FlightEventSet``)."""
+        elevation = self.env.elevation
+        burn_out_time = self.rocket.motor.burn_out_time
+        rail_length_squared = self.effective_1rl**2
+        self._events = FlightEventSet(
+            [
+                FlightEvent(
+                    "rail_exit",
+                    lambda t, y: (
+                        y[0] ** 2 + y[1] ** 2 + (y[2] - elevation) ** 2
+                        - rail_length_squared
+                    ),
+                    self.__on_rail_exit,
+                    direction=1,
+                ),
+                FlightEvent(
+                    "burn_out",
+                    lambda t, y: t - burn_out_time,
+                    lambda *_: False,
+                    direction=1,
+                ),
+                FlightEvent(
+                    "apogee",
+                    lambda t, y: y[5],
+                    self.__on_apogee,
+                    direction=-1,
+                    fire_if_past=True,
+                ),
+                FlightEvent(
+                    "impact",
+                    lambda t, y: y[2] - elevation,
+                    self.__on_impact,
+                    direction=-1,
+                ),
+            ]
+        )
+        # Flights started from a given state are already off the rail
+        self._events["rail_exit"].enabled = len(self.out_of_rail_state) == 1
+        self._events["burn_out"].enabled = self.t_initial < burn_out_time
+        self.event_log = []
+
+    @staticmethod
+    def __finish_phase(phase, node_index, t):
+        """Ends the current flight phase at time t."""
+        phase.time_nodes.flush_after(node_index)
+        phase.time_nodes.add_node(t, [], [], [])
+        phase.solver.status = "finished"
+
+    def __on_rail_exit(self, t, y, phase, phase_index, node_index):
+        """Upper rail button leaves the rail: start 6 DOF flight."""
+        self.t = t
+        self.y_sol = y
+        self.solution[-1] = [t, *y]
+        self.out_of_rail_time = t
+        self.out_of_rail_time_index = len(self.solution) - 1
+        self.out_of_rail_state = y
+        self.flight_phases.add_phase(t, self.u_dot_generalized, index=phase_index + 1)
+        self.__finish_phase(phase, node_index, t)
+        return True
+
+    def __on_apogee(self, t, y, phase, phase_index, node_index):
+        """Vertical velocity reaches zero."""
+        self.apogee_state = y
+        self.apogee_time = t
+        self.apogee_x = y[0]
+        self.apogee_y = y[1]
+        self.apogee = y[2]
+        if self.terminate_on_apogee:
+            self.t = self.t_final = t
+            # Roll back solution
+            self.solution[-1] = [t, *y]
+            # Set last flight phase
+            self.flight_phases.flush_after(phase_index)
+            self.flight_phases.add_phase(t)
+            self.__finish_phase(phase, node_index, t)
+            return True
+        if len(self.solution) > 2:
+            # adding the apogee state to solution increases accuracy
+            # we can only do this if the apogee is not the first state
+            self.solution.insert(-1, [t, *y])
+        return False
+
+    def __on_impact(self, t, y, phase, phase_index, node_index):
+        """Center of mass reaches ground elevation."""
+        self.t = self.t_final = t
+        self.y_sol = self.impact_state = y
+        # Roll back solution
+        self.solution[-1] = [t, *y]
+        self.x_impact = y[0]
+        self.y_impact = y[1]
+        self.z_impact = y[2]
+        self.impact_velocity = y[5]
+        # Set last flight phase
+        self.flight_phases.flush_after(phase_index)
+        self.flight_phases.add_phase(t)
+        self.__finish_phase(phase, node_index, t)
+        return True
+
+    def __deploy_overshot_parachute(
+        self, parachute, t, y_sol, phase, phase_index, node_index
+    ):
+        """Deploys a parachute triggered at an overshootable time node of
+        the last step, rolling the flight back to the node.
+
+        Parameters
+        ----------
+        parachute : Parachute
+            The triggered parachute.
+        t : float
+            Time of the time node.
+        y_sol : array
+            State of the rocket at the time node.
+        phase : FlightPhase
+            Current flight phase.
+        phase_index : int
+            Index of the current flight phase.
+        node_index : int
+            Index of the current time node of the phase.
+        """
+        # Remove parachute from flight parachutes
+        self.parachutes.remove(parachute)
+        # Create phase for time after detection and before inflation
+        # Must only be created if parachute has any lag
+        i = 1
+        if parachute.lag != 0:
+            self.flight_phases.add_phase(
+                t, phase.derivative, clear=True, index=phase_index + i
+            )
+            i += 1
+        # Create flight phase for time after inflation
+        callbacks = [
+            lambda self, parachute_cd_s=parachute.cd_s: setattr(
+                self, "parachute_cd_s", parachute_cd_s
+            )
+        ]
+        self.flight_phases.add_phase(
+            t + parachute.lag,
+            self.u_dot_parachute,
+            callbacks,
+            clear=False,
+            index=phase_index + i,
+        )
+        # Rollback history
+        self.t = t
+        self.y_sol = y_sol
+        self.solution[-1] = [t, *y_sol]
+        # Prepare to leave loops and start new flight phase
+        phase.time_nodes.flush_after(node_index)
+        phase.time_nodes.add_node(self.t, [], [], [])
+        phase.solver.status = "finished"
+        # Save parachute event
+        self.parachute_events.append([self.t, parachute])
+
+    def __sample_parachute_triggers(self, phase, phase_index, node_index):
+        """Feeds the overshootable parachute time nodes of the last step to
+        the compiled trigger sampler of ``equations_of_motion="jit"`` or
+        ``"3dof"``, if the flight has one and it models every parachute
+        trigger.
+
+        The sampling times, the clearing of a phase's first node and the
+        deployment of the earliest triggered parachute are those of the time
+        nodes; the noise of each parachute is drawn for the whole step at
+        once.
+
+        Parameters
+        ----------
+        phase : FlightPhase
+            Current flight phase.
+        phase_index : int
+            Index of the current flight phase.
+        node_index : int
+            Index of the current time node of the phase.
+
+        Returns
+        -------
+        bool
+            False if the time nodes must be fed one by one instead.
+        """
+        sampler = self._trigger_sampler
+        if sampler is None or not all(
+            sampler.samples_trigger(parachute) for parachute in self.parachutes
+        ):
+            return False
+        t_init, t_end = self.solution[-2][0], self.t
+        samples = []
+        for parachute in self.parachutes:
+            interval = 1 / parachute.sampling_rate
+            times = interval * np.arange(
+                math.ceil(t_init / interval), math.floor(t_end / interval) + 1
+            )
+            # Nodes merged with the end of the step are fed in the next one
+            keep = np.round(times, 7) != round(t_end, 7)
+            if phase.clear:
+                keep &= times != phase.t
+            if keep.any():
+                samples.append((parachute, times[keep]))
+        if not samples:
+            return True
+
+        interpolator = phase.solver.dense_output()
+        trigger_time = math.inf
+        sampled = []
+        for parachute, times in samples:
+            states = np.reshape(interpolator(times), (-1, len(times)))
+            index, clean, noise = sampler.sample_trigger(parachute, states)
+            if index >= 0:
+                trigger_time = min(trigger_time, times[index])
+            sampled.append((parachute, times, states, index, clean, noise))
+
+        for parachute, times, states, index, clean, noise in sampled:
+            # Nodes after a deployment are not fed
+            stop = min(len(clean), np.searchsorted(times, trigger_time, "right"))
+            parachute.clean_pressure_signal += np.column_stack(
+                [times[:stop], clean[:stop]]
+            ).tolist()
+            parachute.noise_signal += np.column_stack(
+                [times[:stop], noise[:stop]]
+            ).tolist()
+            if index >= 0 and times[index] == trigger_time:
+                self.__deploy_overshot_parachute(
+                    parachute,
+                    float(trigger_time),
+                    states[:, index],
+                    phase,
+                    phase_index,
+                    node_index,
+                )
+        return True
+
     def __calculate_and_save_pressure_signals(self, parachute, t, z):
         """Gets noise and pressure signals and saves them in the parachute
         object given the current time and altitude.
@@ -1158,7 +1265,7 @@ class Flight:
         elif isinstance(self.initial_solution, Flight):
             # Initialize time and state variables based on last solution of
             # previous flight
-            self.initial_solution = self.initial_solution.solution[-1]
+            self.initial_solution = list(self.initial_solution.solution[-1])
             # Set unused monitors
             self.out_of_rail_state = self.initial_solution[1:]
             self.out_of_rail_time = self.initial_solution[0]
@@ -1182,21 +1289,43 @@ class Flight:
         # Initialize solver monitors
         self.function_evaluations = []
         # Initialize solution state
-        self.solution = []
+        if self.outputs is None:
+            self.solution = SolutionBuffer()
+        else:
+            self._flight_outputs = FlightOutputs(self, self.outputs)
+            self.solution = StreamingSolution(self._flight_outputs.reduce)
         self.__init_flight_state()
 
         self.t_initial = self.initial_solution[0]
         self.solution.append(self.initial_solution)
         self.t = self.solution[-1][0]
-        self.y_sol = self.solution[-1][1:]
+        self.y_sol = self.solution[-1][1:].tolist()
 
         self.__set_ode_solver(self.ode_solver)
 
     def __init_equations_of_motion(self):
         """Initialize equations of motion."""
+        # Compiled sampler of the parachute triggers, with the jit kernel
+        self._trigger_sampler = None
         if self.equations_of_motion == "solid_propulsion":
             # NOTE: The u_dot is faster, but only works for solid propulsion
             self.u_dot_generalized = self.u_dot
+        elif self.equations_of_motion == "kernel":
+            self._kernel = FlightKernel(self)
+            self.u_dot_generalized = self.u_dot_kernel
+        elif self.equations_of_motion == "jit":
+            self._trigger_sampler = build_jit_kernel(self)
+            self._kernel = self._trigger_sampler or FlightKernel(self)
+            self.u_dot_generalized = self.u_dot_kernel
+        elif self.equations_of_motion == "3dof":
+            if self.rocket.air_brakes or self.rocket._controllers:
+                warnings.warn(
+                    "Rocket uses air brakes or controllers, whose effect on the "
+                    "flight equations_of_motion='3dof' does not model.",
+                    RuntimeWarning,
+                )
+            self._trigger_sampler = self._kernel = PointMassKernel(self)
+            self.u_dot_generalized = self.u_dot_kernel
 
     def __init_controllers(self):
         """Initialize controllers and sensors"""
@@ -1718,6 +1847,34 @@ class Flight:
 
         return u_dot
 
+    def u_dot_kernel(self, t, u, post_processing=False):
+        """Calculates derivative of u state vector with respect to time using
+        the precomputed ``FlightKernel`` (or ``JitFlightKernel``). Same
+        equations of motion as ``Flight.u_dot``, or the point mass equations
+        of ``PointMassKernel``; only used when ``equations_of_motion`` is
+        "kernel", "jit" or "3dof".
+
+        Parameters
+        ----------
+        t : float
+            Time in seconds
+        u : list
+            State vector defined by u = [x, y, z, vx, vy, vz, e0, e1,
+            e2, e3, omega1, omega2, omega3].
+        post_processing : bool, optional
+            If True, adds flight data information directly to self
+            variables such as self.angle_of_attack, by default False
+
+        Returns
+        -------
+        u_dot : list
+            State vector defined by u_dot = [vx, vy, vz, ax, ay, az,
+            e0dot, e1dot, e2dot, e3dot, alpha1, alpha2, alpha3].
+        """
+        return self._kernel.u_dot(
+            t, u, self.__post_processed_variables if post_processing else None
+        )
+
     def u_dot_generalized(self, t, u, post_processing=False):  # pylint: disable=too-many-locals,too-many-statements
         """Calculates derivative of u state vector with respect to time when the
         rocket is flying in 6 DOF motion in space and significant mass variation
@@ -2003,8 +2160,15 @@ class Flight:
 
     @cached_property
     def solution_array(self):
-        """Returns solution array of the rocket flight."""
-        return np.array(self.solution)
+        """Returns solution array of the rocket flight. For a simulated
+        flight, it is a read-only view of the solution buffer."""
+        if getattr(self, "outputs", None) is not None:
+            raise ValueError(
+                "This flight only kept the outputs "
+                f"{list(self.outputs)}, not its trajectory. Simulate it "
+                "without 'outputs' to access the trajectory."
+            )
+        return np.asarray(self.solution, dtype=float)
 
     @property
     def function_evaluations_per_time_step(self):
@@ -2349,7 +2513,7 @@ class Flight:
         """Rocket speed, or velocity magnitude, as a Function of time."""
         return (self.vx**2 + self.vy**2 + self.vz**2) ** 0.5
 
-    @property
+    @cached_property
     def out_of_rail_velocity(self):
         """Velocity at which the rocket leaves the launch rail."""
         return self.speed.get_value_opt(self.out_of_rail_time)
@@ -2598,7 +2762,7 @@ class Flight:
         """Minimum stability margin."""
         return self.stability_margin.get_value_opt(self.min_stability_margin_time)
 
-    @property
+    @cached_property
     def initial_stability_margin(self):
         """Stability margin at time 0.
 
@@ -2608,7 +2772,7 @@ class Flight:
         """
         return self.stability_margin.get_value_opt(self.time[0])
 
-    @property
+    @cached_property
     def out_of_rail_stability_margin(self):
         """Stability margin at the time the rocket leaves the rail.
 
@@ -3149,8 +3313,11 @@ class Flight:
 
     @cached_property
     def __evaluate_post_process(self):
-        """Evaluate all post-processing variables by running the simulation
-        again but with the post-processing flag set to True.
+        """Evaluate all post-processing variables at each stored time step.
+        The steps of each flight phase are found in a single pass over the
+        solution and evaluated at once by ``FlightPostProcessor``. Phases
+        whose derivative has no array counterpart are evaluated step by step
+        with the post-processing flag set to True.
 
         Returns
         -------
@@ -3159,20 +3326,34 @@ class Flight:
             time step. Each element of the array is a list containing:
             [t, ax, ay, az, alpha1, alpha2, alpha3, R1, R2, R3, M1, M2, M3, net_thrust]
         """
-        self.__post_processed_variables = []
+        solution = self.solution_array
+        times = solution[:, 0]
+        # Phases take the steps init_time < t <= final_time, so each one is
+        # a contiguous range of the steps sorted by time
+        order = np.argsort(times, kind="stable")
+        sorted_times = times[order]
+        post_processor = FlightPostProcessor(self)
+        post_processed_variables = []
         for phase_index, phase in self.time_iterator(self.flight_phases):
             init_time = phase.t
             final_time = self.flight_phases[phase_index + 1].t
             current_derivative = phase.derivative
             for callback in phase.callbacks:
                 callback(self)
-            for step in self.solution:
-                if init_time < step[0] <= final_time or (
-                    init_time == self.t_initial and step[0] == self.t_initial
-                ):
+            side = "left" if init_time == self.t_initial else "right"
+            start = np.searchsorted(sorted_times, init_time, side=side)
+            stop = np.searchsorted(sorted_times, final_time, side="right")
+            steps = solution[np.sort(order[start:stop])]
+            rows = post_processor.evaluate(current_derivative, steps)
+            if rows is None:
+                self.__post_processed_variables = []
+                for step in steps:
                     current_derivative(step[0], step[1:], post_processing=True)
+                rows = np.array(self.__post_processed_variables).reshape(-1, 14)
+            post_processed_variables.append(rows)
+        self.__post_processed_variables = []
 
-        return np.array(self.__post_processed_variables)
+        return np.concatenate(post_processed_variables)
 
     def post_process(self, interpolation="spline", extrapolation="natural"):
         """This method is **deprecated** and is only kept here for backwards
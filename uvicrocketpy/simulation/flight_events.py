@@ -0,0 +1,160 @@
+"""Root-finding events for ``Flight``. Events are declared once as scalar
+functions of time and state. After each solver step every enabled event is
+evaluated once, and those whose sign changed are located on the solver's
+dense output with Brent's method."""
+
+import math
+import warnings
+
+from scipy.optimize import brentq
+
+
+class FlightEvent:
+    """Event located as a sign change of ``function(t, y)``.
+
+    Parameters
+    ----------
+    name : str
+        Name of the event, used in ``Flight.event_log``.
+    function : callable
+        ``function(t, y) -> float``. The event happens where it crosses zero.
+    action : callable
+        Called by ``Flight`` as ``action(t, y, phase, phase_index,
+        node_index)`` at the located time and state. Returns True if the
+        current flight phase ends there (terminal event).
+    direction : int, optional
+        1 for crossings from negative to non-negative values, -1 from
+        non-negative to negative values, 0 for both. Default is 0.
+    once : bool, optional
+        If True the event is disabled after it happens. Default is True.
+    fire_if_past : bool, optional
+        If True and the event function is already past the crossing at the
+        start of a step, the event happens at the start of the step. Used
+        for flights started from a given state. Default is False.
+    """
+
+    def __init__(
+        self, name, function, action, direction=0, once=True, fire_if_past=False
+    ):
+        self.name = name
+        self.function = function
+        self.action = action
+        self.direction = direction
+        self.once = once
+        self.fire_if_past = fire_if_past
+        self.enabled = True
+
+    def crossed(self, g0, g1):
+        """Whether the event happened between values ``g0`` and ``g1``."""
+        if self.direction > 0:
+            return g0 < 0 <= g1
+        if self.direction < 0:
+            return g0 >= 0 > g1
+        return (g0 < 0) != (g1 < 0)
+
+    def is_past(self, g):
+        """Whether ``g`` is on the far side of the crossing."""
+        if self.direction > 0:
+            return g >= 0
+        if self.direction < 0:
+            return g < 0
+        return False
+
+    def __repr__(self):
+        return f"<FlightEvent '{self.name}' (enabled={self.enabled})>"
+
+
+class FlightEventSet:
+    """Declared events of a flight and their values at the last step.
+
+    Parameters
+    ----------
+    events : list of FlightEvent
+        Events to watch.
+    xtol : float, optional
+        Absolute time tolerance of the root finding, in seconds.
+        Default is 1e-10.
+    """
+
+    def __init__(self, events, xtol=1e-10):
+        self.events = list(events)
+        self.xtol = xtol
+        self._t = None
+        self._y = None
+        self._values = []
+
+    def __getitem__(self, name):
+        for event in self.events:
+            if event.name == name:
+                return event
+        raise KeyError(name)
+
+    def _evaluate(self, t, y):
+        return [
+            event.function(t, y) if event.enabled else math.nan
+            for event in self.events
+        ]
+
+    def reset(self, t, y):
+        """Sets the step start values, e.g. at the start of a flight phase."""
+        self._t, self._y = t, y
+        self._values = self._evaluate(t, y)
+
+    def check(self, t, y, dense_output):
+        """Evaluates every enabled event at the end of a step and locates the
+        ones that happened during it.
+
+        Parameters
+        ----------
+        t : float
+            Time at the end of the step.
+        y : array
+            State at the end of the step.
+        dense_output : callable
+            Returns the solver's interpolant for the step; only called when
+            some event changed sign.
+
+        Returns
+        -------
+        list
+            ``(t_event, y_event, event)`` tuples sorted by time.
+        """
+        t0, y0 = self._t, self._y
+        values = self._evaluate(t, y)
+        found = []
+        interpolant = None
+        for event, g0, g1 in zip(self.events, self._values, values):
+            if not event.enabled:
+                continue
+            if math.isnan(g0):  # enabled during this step
+                continue
+            if event.fire_if_past and event.is_past(g0):
+                found.append((t0, y0, event))
+            elif event.crossed(g0, g1):
+                if interpolant is None:
+                    interpolant = dense_output()
+                location = self._locate(event, interpolant, t0, t, g0, g1)
+                found.append((*location, event))
+        self._t, self._y, self._values = t, y, values
+        found.sort(key=lambda item: item[0])
+        return found
+
+    def _locate(self, event, interpolant, t0, t1, g0, g1):
+        """Time and state of the crossing of ``event`` during the step from
+        ``t0`` to ``t1``, where its function went from ``g0`` to ``g1``."""
+
+        def g(s):
+            return event.function(s, interpolant(s))
+
+        try:
+            t_event = brentq(g, t0, t1, xtol=self.xtol)
+        except ValueError:  # interpolant endpoints disagree with the steps
+            # Root of the line between the values at the ends of the step
+            t_event = t0 + (t1 - t0) * g0 / (g0 - g1) if g0 != g1 else t1
+            warnings.warn(
+                f"Event '{event.name}' could not be located on the dense "
+                f"output of the step from t={t0} s to t={t1} s, its function "
+                "was interpolated linearly between the step's ends.",
+                RuntimeWarning,
+            )
+        return t_event, interpolant(t_event)
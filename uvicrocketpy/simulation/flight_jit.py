@@ -0,0 +1,676 @@
+"""Numba compiled right-hand side for the solid propulsion equations of
+motion used by ``Flight``. See ``Flight(equations_of_motion="jit")``.
+
+Every quantity the equations need at run time is lowered to flat float
+arrays when the kernel is built: environment profiles on an altitude grid,
+motor curves (and inertia derivatives) on a burn time grid, drag
+coefficients on a Mach x altitude grid and each aerodynamic surface's lift
+and roll coefficient derivatives on a Mach grid. The compiled function only
+reads those arrays. Parachutes with a height or apogee trigger are sampled
+by a compiled function too, on the same environment tables. When numba is
+not installed, or the rocket uses features that cannot be lowered (generic
+surfaces, air brakes, lift that is not linear in the angle of attack),
+``build_jit_kernel`` returns ``None`` and ``Flight`` falls back to the pure
+Python ``FlightKernel``.
+
+The tables are cached per environment, motor and surface ``Function``
+objects (see ``flight_tables.lowered``). The compiled right-hand side is
+about 40 times faster than ``Flight.u_dot``, but the solver loop, events and
+parachute bookkeeping stay in Python. Measured with LSODA, a flight to
+apogee runs 8 to 12 times faster than with the standard equations (e.g.
+Calisto, 0.03 s instead of 0.38 s), and a full flight with two parachutes
+3 to 5 times faster.
+
+``PointMassKernel`` (``Flight(equations_of_motion="3dof")``) integrates a
+point mass on the same tables, without surfaces or attitude dynamics.
+"""
+
+import math
+import warnings
+
+import numpy as np
+
+from ..tools import import_optional_dependency
+from .flight_tables import (
+    AREA,
+    BURN_OUT,
+    BURN_START,
+    CP_ECC_X,
+    CP_ECC_Y,
+    DENSITY,
+    DRY_I_11,
+    DRY_I_33,
+    DRY_MASS,
+    GRAVITY,
+    I_11,
+    I_11_DOT,
+    I_33,
+    I_33_DOT,
+    JIT_MACH_GRID,
+    MASS_FLOW_RATE,
+    NOZZLE_AREA,
+    NOZZLE_RADIUS,
+    PRESSURE,
+    PROPELLANT_MASS,
+    REF_PRESSURE,
+    SPEED_OF_SOUND,
+    THRUST,
+    THRUST_ECC_X,
+    THRUST_ECC_Y,
+    WIND_X,
+    WIND_Y,
+    B,
+    C,
+    MotorTables,
+    altitude_grid,
+    drag_tables,
+    env_table,
+    is_lowerable,
+    lowered,
+    rocket_constants,
+    sample,
+    surface_tables,
+)
+
+try:
+    _numba = import_optional_dependency("numba")
+    NUMBA_AVAILABLE = True
+except ImportError:
+    _numba = None
+    NUMBA_AVAILABLE = False
+
+
+def _jit(func):
+    """``numba.njit`` when numba is installed, identity otherwise."""
+    if NUMBA_AVAILABLE:
+        return _numba.njit(cache=True)(func)
+    return func
+
+
+@_jit
+def _interp1(x, xs, ys):
+    n = xs.shape[0]
+    if x <= xs[0]:
+        return ys[0]
+    if x >= xs[n - 1]:
+        return ys[n - 1]
+    i = np.searchsorted(xs, x, side="right")
+    x0 = xs[i - 1]
+    y0 = ys[i - 1]
+    return y0 + (ys[i] - y0) * (x - x0) / (xs[i] - x0)
+
+
+@_jit
+def _interp2(x, y, xs, ys, table):
+    nx = xs.shape[0]
+    ny = ys.shape[0]
+    x = min(max(x, xs[0]), xs[nx - 1])
+    y = min(max(y, ys[0]), ys[ny - 1])
+    i = min(max(np.searchsorted(xs, x, side="right") - 1, 0), nx - 2)
+    j = min(max(np.searchsorted(ys, y, side="right") - 1, 0), ny - 2)
+    tx = (x - xs[i]) / (xs[i + 1] - xs[i])
+    ty = (y - ys[j]) / (ys[j + 1] - ys[j])
+    return (
+        (1 - tx) * (1 - ty) * table[i, j]
+        + tx * (1 - ty) * table[i + 1, j]
+        + (1 - tx) * ty * table[i, j + 1]
+        + tx * ty * table[i + 1, j + 1]
+    )
+
+
+# pylint: disable=too-many-arguments,too-many-locals,too-many-statements
+@_jit
+def _rhs(
+    t,
+    u,
+    c,
+    env_z,
+    env,
+    motor_t,
+    motor,
+    drag_mach,
+    drag_z,
+    drag_on,
+    drag_off,
+    aero_mach,
+    cp,
+    ref_area,
+    ref_len,
+    clalpha,
+    clf_delta,
+    cld_omega,
+    cant,
+    has_roll,
+    out,
+    post,
+):
+    """Same equations as ``FlightKernel.u_dot``. Writes the derivative into
+    ``out`` and the post processing row into ``post``."""
+    z = u[2]
+    vx, vy, vz = u[3], u[4], u[5]
+    e0, e1, e2, e3 = u[6], u[7], u[8], u[9]
+    omega1, omega2, omega3 = u[10], u[11], u[12]
+    R1 = R2 = M1 = M2 = M3 = 0.0
+    pressure = _interp1(z, env_z, env[PRESSURE])
+
+    burning = c[BURN_START] < t < c[BURN_OUT]
+    if burning:
+        motor_I_11_at_t = _interp1(t, motor_t, motor[I_11])
+        motor_I_33_at_t = _interp1(t, motor_t, motor[I_33])
+        motor_I_11_derivative_at_t = _interp1(t, motor_t, motor[I_11_DOT])
+        motor_I_33_derivative_at_t = _interp1(t, motor_t, motor[I_33_DOT])
+        mass_flow_rate_at_t = _interp1(t, motor_t, motor[MASS_FLOW_RATE])
+        propellant_mass_at_t = _interp1(t, motor_t, motor[PROPELLANT_MASS])
+        pressure_thrust = 0.0
+        if not math.isnan(c[REF_PRESSURE]):
+            pressure_thrust = (c[REF_PRESSURE] - pressure) * c[NOZZLE_AREA]
+        net_thrust = max(_interp1(t, motor_t, motor[THRUST]) + pressure_thrust, 0.0)
+        M1 += c[THRUST_ECC_Y] * net_thrust
+        M2 -= c[THRUST_ECC_X] * net_thrust
+    else:
+        motor_I_11_at_t = motor_I_33_at_t = 0.0
+        motor_I_11_derivative_at_t = motor_I_33_derivative_at_t = 0.0
+        mass_flow_rate_at_t = propellant_mass_at_t = 0.0
+        net_thrust = 0.0
+
+    rocket_dry_I_11 = c[DRY_I_11]
+    rocket_dry_I_33 = c[DRY_I_33]
+    rocket_dry_mass = c[DRY_MASS]
+    total_mass_at_t = propellant_mass_at_t + rocket_dry_mass
+    mu = (propellant_mass_at_t * rocket_dry_mass) / total_mass_at_t
+    b = c[B]
+    cc = c[C]
+    nozzle_radius = c[NOZZLE_RADIUS]
+
+    a11 = 1 - 2 * (e2**2 + e3**2)
+    a12 = 2 * (e1 * e2 - e0 * e3)
+    a13 = 2 * (e1 * e3 + e0 * e2)
+    a21 = 2 * (e1 * e2 + e0 * e3)
+    a22 = 1 - 2 * (e1**2 + e3**2)
+    a23 = 2 * (e2 * e3 - e0 * e1)
+    a31 = 2 * (e1 * e3 - e0 * e2)
+    a32 = 2 * (e2 * e3 + e0 * e1)
+    a33 = 1 - 2 * (e1**2 + e2**2)
+
+    wind_velocity_x = _interp1(z, env_z, env[WIND_X])
+    wind_velocity_y = _interp1(z, env_z, env[WIND_Y])
+    speed_of_sound = _interp1(z, env_z, env[SPEED_OF_SOUND])
+    free_stream_speed = math.sqrt(
+        (wind_velocity_x - vx) ** 2 + (wind_velocity_y - vy) ** 2 + vz**2
+    )
+    free_stream_mach = free_stream_speed / speed_of_sound
+    # Power on drag applies until burn out, before ignition too
+    if t < c[BURN_OUT]:
+        drag_coeff = _interp2(free_stream_mach, z, drag_mach, drag_z, drag_on)
+    else:
+        drag_coeff = _interp2(free_stream_mach, z, drag_mach, drag_z, drag_off)
+
+    rho = _interp1(z, env_z, env[DENSITY])
+    R3 = -0.5 * rho * free_stream_speed**2 * c[AREA] * drag_coeff
+    M1 += c[CP_ECC_Y] * R3
+    M2 -= c[CP_ECC_X] * R3
+
+    vx_b = a11 * vx + a21 * vy + a31 * vz
+    vy_b = a12 * vx + a22 * vy + a32 * vz
+    vz_b = a13 * vx + a23 * vy + a33 * vz
+
+    for k in range(cp.shape[0]):
+        cpx, cpy, cpz = cp[k, 0], cp[k, 1], cp[k, 2]
+        comp_vx = vx_b + omega2 * cpz - omega3 * cpy
+        comp_vy = vy_b + omega3 * cpx - omega1 * cpz
+        comp_vz = vz_b + omega1 * cpy - omega2 * cpx
+        comp_z = z + a31 * cpx + a32 * cpy + a33 * cpz
+        comp_wind_vx = _interp1(comp_z, env_z, env[WIND_X])
+        comp_wind_vy = _interp1(comp_z, env_z, env[WIND_Y])
+        stream_vx = a11 * comp_wind_vx + a21 * comp_wind_vy - comp_vx
+        stream_vy = a12 * comp_wind_vx + a22 * comp_wind_vy - comp_vy
+        stream_vz = a13 * comp_wind_vx + a23 * comp_wind_vy - comp_vz
+        stream_speed = math.sqrt(stream_vx**2 + stream_vy**2 + stream_vz**2)
+        stream_mach = stream_speed / speed_of_sound
+
+        lift_dir_norm2 = stream_vx**2 + stream_vy**2
+        if lift_dir_norm2 != 0:
+            stream_vzn = stream_vz / stream_speed
+            if -stream_vzn < 1:
+                attack_angle = math.acos(max(-stream_vzn, -1.0))
+                lift = (
+                    0.5
+                    * rho
+                    * stream_speed**2
+                    * ref_area[k]
+                    * attack_angle
+                    * _interp1(stream_mach, aero_mach, clalpha[k])
+                )
+                lift_dir_norm = math.sqrt(lift_dir_norm2)
+                lift_xb = lift * (stream_vx / lift_dir_norm)
+                lift_yb = lift * (stream_vy / lift_dir_norm)
+                R1 += lift_xb
+                R2 += lift_yb
+                M1 -= cpz * lift_yb
+                M2 += cpz * lift_xb
+        if has_roll[k]:
+            M3_forcing = (
+                (0.5 * rho * stream_speed**2)
+                * ref_area[k]
+                * ref_len[k]
+                * _interp1(stream_mach, aero_mach, clf_delta[k])
+                * cant[k]
+            )
+            M3_damping = (
+                (0.5 * rho * stream_speed)
+                * ref_area[k]
+                * ref_len[k] ** 2
+                * _interp1(stream_mach, aero_mach, cld_omega[k])
+                * omega3
+                / 2
+            )
+            M3 += M3_forcing - M3_damping
+
+    M3 += c[CP_ECC_X] * R2 - c[CP_ECC_Y] * R1
+
+    inertia_11 = rocket_dry_I_11 + motor_I_11_at_t + mu * b**2
+    mass_flow_term = (
+        motor_I_11_derivative_at_t
+        + mass_flow_rate_at_t * (rocket_dry_mass - 1) * (b / total_mass_at_t) ** 2
+    ) - mass_flow_rate_at_t * (
+        (nozzle_radius / 2) ** 2 + (cc - b * mu / rocket_dry_mass) ** 2
+    )
+    inertia_diff = rocket_dry_I_33 + motor_I_33_at_t - inertia_11
+    alpha1 = (
+        M1 - (omega2 * omega3 * inertia_diff + omega1 * mass_flow_term)
+    ) / inertia_11
+    alpha2 = (
+        M2 - (-omega1 * omega3 * inertia_diff + omega2 * mass_flow_term)
+    ) / inertia_11
+    alpha3 = (
+        M3
+        - omega3
+        * (motor_I_33_derivative_at_t - mass_flow_rate_at_t * nozzle_radius**2 / 2)
+    ) / (rocket_dry_I_33 + motor_I_33_at_t)
+
+    L1 = (
+        R1
+        - b * propellant_mass_at_t * (omega2**2 + omega3**2)
+        - 2 * cc * mass_flow_rate_at_t * omega2
+    ) / total_mass_at_t
+    L2 = (
+        R2
+        + b * propellant_mass_at_t * (alpha3 + omega1 * omega2)
+        + 2 * cc * mass_flow_rate_at_t * omega1
+    ) / total_mass_at_t
+    L3 = (
+        R3 - b * propellant_mass_at_t * (alpha2 - omega1 * omega3) + net_thrust
+    ) / total_mass_at_t
+    ax = a11 * L1 + a12 * L2 + a13 * L3
+    ay = a21 * L1 + a22 * L2 + a23 * L3
+    az = a31 * L1 + a32 * L2 + a33 * L3 - _interp1(z, env_z, env[GRAVITY])
+
+    out[0], out[1], out[2] = vx, vy, vz
+    out[3], out[4], out[5] = ax, ay, az
+    out[6] = 0.5 * (-omega1 * e1 - omega2 * e2 - omega3 * e3)
+    out[7] = 0.5 * (omega1 * e0 + omega3 * e2 - omega2 * e3)
+    out[8] = 0.5 * (omega2 * e0 - omega3 * e1 + omega1 * e3)
+    out[9] = 0.5 * (omega3 * e0 + omega2 * e1 - omega1 * e2)
+    out[10], out[11], out[12] = alpha1, alpha2, alpha3
+
+    post[0] = t
+    post[1], post[2], post[3] = ax, ay, az
+    post[4], post[5], post[6] = alpha1, alpha2, alpha3
+    post[7], post[8], post[9] = R1, R2, R3
+    post[10], post[11], post[12] = M1, M2, M3
+    post[13] = net_thrust
+
+
+# pylint: disable=too-many-arguments,too-many-locals
+@_jit
+def _rhs_point_mass(
+    t,
+    u,
+    c,
+    env_z,
+    env,
+    motor_t,
+    motor,
+    drag_mach,
+    drag_z,
+    drag_on,
+    drag_off,
+    out,
+    post,
+):
+    """Point mass (3-DOF) equations on the same tables as ``_rhs``. The
+    rocket is taken as aligned with the free stream, so thrust and drag act
+    along the velocity relative to the air, and its attitude is frozen.
+    Writes the derivative into ``out`` and the post processing row into
+    ``post``."""
+    z = u[2]
+    vx, vy, vz = u[3], u[4], u[5]
+    pressure = _interp1(z, env_z, env[PRESSURE])
+
+    if c[BURN_START] < t < c[BURN_OUT]:
+        propellant_mass_at_t = _interp1(t, motor_t, motor[PROPELLANT_MASS])
+        pressure_thrust = 0.0
+        if not math.isnan(c[REF_PRESSURE]):
+            pressure_thrust = (c[REF_PRESSURE] - pressure) * c[NOZZLE_AREA]
+        net_thrust = max(_interp1(t, motor_t, motor[THRUST]) + pressure_thrust, 0.0)
+    else:
+        propellant_mass_at_t = 0.0
+        net_thrust = 0.0
+    total_mass_at_t = propellant_mass_at_t + c[DRY_MASS]
+
+    stream_vx = vx - _interp1(z, env_z, env[WIND_X])
+    stream_vy = vy - _interp1(z, env_z, env[WIND_Y])
+    free_stream_speed = math.sqrt(stream_vx**2 + stream_vy**2 + vz**2)
+    free_stream_mach = free_stream_speed / _interp1(z, env_z, env[SPEED_OF_SOUND])
+    # Power on drag applies until burn out, before ignition too
+    if t < c[BURN_OUT]:
+        drag_coeff = _interp2(free_stream_mach, z, drag_mach, drag_z, drag_on)
+    else:
+        drag_coeff = _interp2(free_stream_mach, z, drag_mach, drag_z, drag_off)
+    rho = _interp1(z, env_z, env[DENSITY])
+    R3 = -0.5 * rho * free_stream_speed**2 * c[AREA] * drag_coeff
+
+    if free_stream_speed > 0:
+        dir_x = stream_vx / free_stream_speed
+        dir_y = stream_vy / free_stream_speed
+        dir_z = vz / free_stream_speed
+    else:
+        # At rest in the air, along the rocket's axis
+        e0, e1, e2, e3 = u[6], u[7], u[8], u[9]
+        dir_x = 2 * (e1 * e3 + e0 * e2)
+        dir_y = 2 * (e2 * e3 - e0 * e1)
+        dir_z = 1 - 2 * (e1**2 + e2**2)
+    L3 = (R3 + net_thrust) / total_mass_at_t
+    ax = L3 * dir_x
+    ay = L3 * dir_y
+    az = L3 * dir_z - _interp1(z, env_z, env[GRAVITY])
+
+    out[0], out[1], out[2] = vx, vy, vz
+    out[3], out[4], out[5] = ax, ay, az
+    for i in range(6, 13):
+        out[i] = 0.0
+
+    post[0] = t
+    post[1], post[2], post[3] = ax, ay, az
+    post[4] = post[5] = post[6] = 0.0
+    post[7] = post[8] = 0.0
+    post[9] = R3
+    post[10] = post[11] = post[12] = 0.0
+    post[13] = net_thrust
+
+
+# pylint: disable=too-many-arguments
+@_jit
+def _sample_trigger(
+    z,
+    vz,
+    env_z,
+    pressure,
+    baro_p,
+    baro_h,
+    elevation,
+    normals,
+    noise,
+    corr,
+    height,
+    clean,
+    noises,
+):
+    """Samples the pressure signal of a parachute at states of heights ``z``
+    and vertical velocities ``vz``, as ``Flight`` does at each sampling time
+    node. The noise continues from ``noise`` with the time correlation
+    ``corr = (alpha, beta)`` and the normal draws ``normals``. A nan
+    ``height`` is an apogee trigger.
+
+    The clean pressure and noise of each sample are written into ``clean``
+    and ``noises`` up to the first sample that triggers the parachute, whose
+    index is returned, or -1 if none does."""
+    for i in range(z.shape[0]):
+        clean[i] = _interp1(z[i], env_z, pressure)
+        noise = corr[0] * noise + corr[1] * normals[i]
+        noises[i] = noise
+        if vz[i] < 0:
+            if math.isnan(height):
+                return i
+            noisy_height = _interp1(clean[i] + noise, baro_p, baro_h) - elevation
+            if noisy_height < height:
+                return i
+    return -1
+
+
+def _trigger_height(parachute):
+    """Height above ground level of a parachute's trigger, nan for apogee,
+    or None for a trigger function, which is not compiled."""
+    trigger = parachute.trigger
+    if isinstance(trigger, str) and trigger.lower() == "apogee":
+        return math.nan
+    if isinstance(trigger, (int, float)):
+        return float(trigger)
+    return None
+
+
+class JitFlightKernel:
+    """Flat-array lowering of a ``Flight`` plus the compiled right-hand side.
+
+    Parameters
+    ----------
+    flight : Flight
+        Flight whose rocket and environment are lowered into the kernel.
+
+    Notes
+    -----
+    Use ``build_jit_kernel`` instead of instantiating directly, it checks
+    whether the rocket can be lowered and whether numba is available.
+    """
+
+    def __init__(self, flight):
+        rocket = flight.rocket
+        motor = rocket.motor
+        env = flight.env
+
+        self.constants = rocket_constants(rocket)
+
+        # Environment profiles
+        self.env_z = altitude_grid(env)
+        self.env = env_table(env, self.env_z)
+
+        # Motor curves
+        tables = MotorTables(motor)
+        self.motor_t = np.asarray(tables.time)
+        self.motor = tables.rows()
+
+        # Drag, on the drag curves' own grid when they share one
+        self.drag_mach, self.drag_z, self.drag_on, self.drag_off = drag_tables(
+            rocket, self.env_z
+        )
+
+        self._lower_surfaces(rocket)
+
+        # Barometric height, on the pressures of the environment table
+        self.baro_p = np.sort(self.env[PRESSURE])
+        self.baro_h = lowered(
+            "barometric height",
+            (env.barometric_height,),
+            (self.baro_p,),
+            lambda: sample(env.barometric_height, self.baro_p),
+        )
+        self.elevation = env.elevation
+
+        self._out = np.empty(13)
+        self.post = np.empty(14)
+
+    def _lower_surfaces(self, rocket):
+        """Lowers the aerodynamic surfaces' coefficients on a Mach grid."""
+        self.aero_mach = JIT_MACH_GRID
+        (
+            self.cp,
+            self.ref_area,
+            self.ref_len,
+            self.clalpha,
+            self.clf_delta,
+            self.cld_omega,
+            self.cant,
+            self.has_roll,
+        ) = surface_tables(rocket, JIT_MACH_GRID)
+
+    def u_dot(self, t, u, post_processed_variables=None):
+        """Evaluates the compiled right-hand side. Same interface as
+        ``FlightKernel.u_dot``."""
+        out = self._out
+        _rhs(
+            t,
+            np.asarray(u, dtype=float),
+            self.constants,
+            self.env_z,
+            self.env,
+            self.motor_t,
+            self.motor,
+            self.drag_mach,
+            self.drag_z,
+            self.drag_on,
+            self.drag_off,
+            self.aero_mach,
+            self.cp,
+            self.ref_area,
+            self.ref_len,
+            self.clalpha,
+            self.clf_delta,
+            self.cld_omega,
+            self.cant,
+            self.has_roll,
+            out,
+            self.post,
+        )
+        if post_processed_variables is not None:
+            post_processed_variables.append(self.post.tolist())
+        # The solver keeps references to returned derivatives
+        return out.copy()
+
+    @staticmethod
+    def samples_trigger(parachute):
+        """Whether ``sample_trigger`` models the parachute's trigger, i.e. a
+        height above ground level or apogee."""
+        return _trigger_height(parachute) is not None
+
+    def sample_trigger(self, parachute, states):
+        """Samples the noisy pressure signal of a parachute at some states,
+        in order, until its trigger fires. The normal draws of the noise are
+        taken for all the states at once, from the same ``np.random`` stream
+        as ``Parachute.noise_function``.
+
+        Parameters
+        ----------
+        parachute : Parachute
+            Parachute with a height or apogee trigger. Its signals are not
+            modified.
+        states : np.ndarray
+            ``(13, n)`` array of the states at the sampling times.
+
+        Returns
+        -------
+        tuple
+            ``(index, clean_pressure, noise)``: index of the first state that
+            triggers the parachute, or -1, and the clean pressure and noise of
+            the states up to it.
+        """
+        n = states.shape[1]
+        clean = np.zeros(n)
+        noise = np.zeros(n)
+        index = _sample_trigger(
+            np.ascontiguousarray(states[2], dtype=float),
+            np.ascontiguousarray(states[5], dtype=float),
+            self.env_z,
+            self.env[PRESSURE],
+            self.baro_p,
+            self.baro_h,
+            self.elevation,
+            np.random.normal(parachute.noise_bias, parachute.noise_deviation, n),
+            parachute.noise_signal[-1][1],
+            np.asarray(parachute.noise_corr, dtype=float),
+            _trigger_height(parachute),
+            clean,
+            noise,
+        )
+        stop = n if index < 0 else index + 1
+        return index, clean[:stop], noise[:stop]
+
+
+class PointMassKernel(JitFlightKernel):
+    """Point mass (3-DOF) equations of motion on the tables of
+    ``JitFlightKernel``. See ``Flight(equations_of_motion="3dof")``.
+
+    Only the translation is integrated: thrust and drag act along the
+    velocity relative to the air, the attitude and angular velocity stay at
+    their rail exit values and the aerodynamic surfaces are ignored, so no
+    air brakes or lift either. It has neither the surface tables nor the
+    stiff attitude dynamics of the 6-DOF equations, which makes it a cheap
+    coarse model of the trajectory (apogee, drift, impact). Parachute
+    triggers are sampled as with ``JitFlightKernel``.
+
+    Parameters
+    ----------
+    flight : Flight
+        Flight whose rocket and environment are lowered into the kernel.
+
+    Notes
+    -----
+    Without numba the same functions run in pure Python, which is correct
+    but slow.
+    """
+
+    def _lower_surfaces(self, rocket):
+        """The point mass model has no aerodynamic surfaces."""
+
+    def u_dot(self, t, u, post_processed_variables=None):
+        """Evaluates the point mass right-hand side. Same interface as
+        ``FlightKernel.u_dot``."""
+        out = self._out
+        _rhs_point_mass(
+            t,
+            np.asarray(u, dtype=float),
+            self.constants,
+            self.env_z,
+            self.env,
+            self.motor_t,
+            self.motor,
+            self.drag_mach,
+            self.drag_z,
+            self.drag_on,
+            self.drag_off,
+            out,
+            self.post,
+        )
+        if post_processed_variables is not None:
+            post_processed_variables.append(self.post.tolist())
+        # The solver keeps references to returned derivatives
+        return out.copy()
+
+
+def build_jit_kernel(flight):
+    """Returns a ``JitFlightKernel`` for the flight, or ``None`` (with a
+    warning) when numba is not installed or the rocket cannot be lowered.
+
+    Parameters
+    ----------
+    flight : Flight
+        Flight to be lowered.
+
+    Returns
+    -------
+    JitFlightKernel or None
+    """
+    if not NUMBA_AVAILABLE:
+        warnings.warn(
+            "numba is not installed, equations_of_motion='jit' falls back to "
+            "the pure Python kernel.",
+            RuntimeWarning,
+        )
+        return None
+    if not is_lowerable(flight.rocket):
+        warnings.warn(
+            "Rocket uses air brakes, generic surfaces or non-linear lift, "
+            "equations_of_motion='jit' falls back to the pure Python kernel.",
+            RuntimeWarning,
+        )
+        return None
+    return JitFlightKernel(flight)
@@ -0,0 +1,461 @@
+"""Precomputed right-hand side kernel for the solid propulsion equations of
+motion used by ``Flight``. See ``Flight(equations_of_motion="kernel")``."""
+
+from bisect import bisect_right
+from math import acos, sqrt
+
+import numpy as np
+
+from ..mathutils.vector_matrix import Vector
+from ..rocket.aero_surface.aero_surface import AeroSurface
+from .flight_tables import (
+    DENSITY,
+    GRAVITY,
+    MACH_GRID,
+    PRESSURE,
+    SPEED_OF_SOUND,
+    WIND_X,
+    WIND_Y,
+    MotorTables,
+    altitude_grid,
+    drag_tables,
+    env_table,
+    has_linear_lift,
+    surface_table,
+)
+
+
+def _interp(x, xs, ys):
+    """Linear interpolation of a table given as python lists, clamped to the
+    table ends. Faster than ``np.interp`` for scalar inputs."""
+    i = bisect_right(xs, x)
+    if i == 0:
+        return ys[0]
+    if i == len(xs):
+        return ys[-1]
+    x0 = xs[i - 1]
+    y0 = ys[i - 1]
+    return y0 + (ys[i] - y0) * (x - x0) / (xs[i] - x0)
+
+
+def _locate(x, x0, dx, n):
+    """Index and weight of ``x`` in the uniform grid ``x0 + dx * k`` of ``n``
+    points, clamped to the grid ends."""
+    position = (x - x0) / dx
+    if position <= 0:
+        return 0, 0.0
+    if position >= n - 1:
+        return n - 2, 1.0
+    i = int(position)
+    return i, position - i
+
+
+class _UniformTable:
+    """Rows of values sampled on a uniform grid, as python lists.
+
+    Parameters
+    ----------
+    grid : np.ndarray
+        Uniformly spaced grid.
+    rows : np.ndarray
+        Values on the grid, one row per quantity.
+    """
+
+    __slots__ = ("x0", "dx", "n", "rows")
+
+    def __init__(self, grid, rows):
+        self.x0 = float(grid[0])
+        self.dx = float(grid[1] - grid[0])
+        self.n = len(grid)
+        self.rows = np.asarray(rows, dtype=float).tolist()
+
+    def locate(self, x):
+        return _locate(x, self.x0, self.dx, self.n)
+
+    def value(self, row, i, w):
+        """Value of a row at the index and weight given by ``locate``."""
+        ys = self.rows[row]
+        return ys[i] + (ys[i + 1] - ys[i]) * w
+
+
+def _interp2(x, y, xs, ys, table):
+    """Bilinear interpolation of a table given as python lists of rows over
+    ``xs``, clamped to the table edges."""
+    i = min(max(bisect_right(xs, x) - 1, 0), len(xs) - 2)
+    j = min(max(bisect_right(ys, y) - 1, 0), len(ys) - 2)
+    tx = min(max((x - xs[i]) / (xs[i + 1] - xs[i]), 0.0), 1.0)
+    ty = min(max((y - ys[j]) / (ys[j + 1] - ys[j]), 0.0), 1.0)
+    row0, row1 = table[i], table[i + 1]
+    return (1 - tx) * ((1 - ty) * row0[j] + ty * row0[j + 1]) + tx * (
+        (1 - ty) * row1[j] + ty * row1[j + 1]
+    )
+
+
+# Rows of the surface coefficient tables
+_CLALPHA, _CLF_DELTA, _CLD_OMEGA = range(3)
+
+
+class _SurfaceConstants:
+    """Per aerodynamic surface constants: center of pressure relative to the
+    center of dry mass in the body frame, reference geometry and tables of
+    the lift (and roll) coefficient derivatives over ``MACH_GRID``. The lift
+    coefficient of surfaces whose lift is not linear in the angle of attack
+    is evaluated by its bound ``get_value_opt``. Surfaces that do not follow
+    the Barrowman lift model (e.g. generic surfaces) are flagged so the
+    kernel calls their own ``compute_forces_and_moments`` instead."""
+
+    __slots__ = (
+        "surface",
+        "cp",
+        "cpx",
+        "cpy",
+        "cpz",
+        "reference_area",
+        "reference_length",
+        "is_barrowman",
+        "coefficients",
+        "cl",
+        "has_roll",
+        "cant_angle_rad",
+    )
+
+    def __init__(self, surface, cp):
+        self.surface = surface
+        self.cp = cp
+        self.cpx, self.cpy, self.cpz = float(cp[0]), float(cp[1]), float(cp[2])
+        self.reference_length = surface.reference_length
+        self.is_barrowman = isinstance(surface, AeroSurface)
+        self.reference_area = getattr(surface, "reference_area", None)
+        self.coefficients = self.cl = None
+        self.has_roll = False
+        self.cant_angle_rad = 0
+        if self.is_barrowman:
+            (
+                clalpha,
+                clf_delta,
+                cld_omega,
+                self.cant_angle_rad,
+                self.has_roll,
+            ) = surface_table(surface, MACH_GRID)
+            self.coefficients = _UniformTable(
+                MACH_GRID, [clalpha, clf_delta, cld_omega]
+            )
+            if not has_linear_lift(surface):
+                self.cl = surface.cl.get_value_opt
+
+
+class FlightKernel:
+    """Allocation-free evaluation of ``Flight.u_dot``.
+
+    Everything that does not change during the flight is read once at
+    construction: rocket dry properties, and tables of the motor curves,
+    environment profiles, drag coefficients and per surface coefficients
+    (see ``flight_tables``). The right-hand side then interpolates those
+    tables with plain floats only, without evaluating ``Function`` objects
+    or building ``Vector`` or ``Matrix`` objects. Air brakes and surfaces
+    that are not lowered to tables keep their ``Function`` evaluations.
+
+    Parameters
+    ----------
+    flight : Flight
+        Flight whose rocket and environment are lowered into the kernel.
+    """
+
+    def __init__(self, flight):
+        rocket = flight.rocket
+        motor = rocket.motor
+        env = flight.env
+
+        self.rocket = rocket
+        self.motor_tables = MotorTables(motor)
+        self.burn_start_time = motor.burn_start_time
+        self.burn_out_time = motor.burn_out_time
+        self.reference_pressure = motor.reference_pressure
+        self.nozzle_area = motor.nozzle_area
+        self.nozzle_radius = motor.nozzle_radius
+
+        self.dry_I_11 = rocket.dry_I_11
+        self.dry_I_33 = rocket.dry_I_33
+        self.dry_mass = rocket.dry_mass
+        self.area = rocket.area
+        self.b = (
+            -(
+                rocket.center_of_propellant_position.get_value_opt(0)
+                - rocket.center_of_dry_mass_position
+            )
+            * rocket._csys
+        )
+        self.c = rocket.nozzle_to_cdm
+        self.cp_eccentricity_x = rocket.cp_eccentricity_x
+        self.cp_eccentricity_y = rocket.cp_eccentricity_y
+        self.thrust_eccentricity_x = rocket.thrust_eccentricity_x
+        self.thrust_eccentricity_y = rocket.thrust_eccentricity_y
+
+        z = altitude_grid(env)
+        self.env = _UniformTable(z, env_table(env, z))
+        # Only the forces of generic surfaces need the viscosity
+        self.dynamic_viscosity = env.dynamic_viscosity.get_value_opt
+
+        drag_mach, drag_z, power_on_drag, power_off_drag = drag_tables(rocket, z)
+        self.drag_mach, self.drag_z = drag_mach.tolist(), drag_z.tolist()
+        self.power_on_drag = power_on_drag.tolist()
+        self.power_off_drag = power_off_drag.tolist()
+        self.air_brakes = rocket.air_brakes
+
+        self.surfaces = [
+            _SurfaceConstants(surface, rocket.surfaces_cp_to_cdm[surface])
+            for surface, _ in rocket.aerodynamic_surfaces
+        ]
+
+    # pylint: disable=too-many-locals,too-many-statements
+    def u_dot(self, t, u, post_processed_variables=None):
+        """Same equations as ``Flight.u_dot``, evaluated with floats only.
+
+        Parameters
+        ----------
+        t : float
+            Time in seconds.
+        u : list
+            State vector [x, y, z, vx, vy, vz, e0, e1, e2, e3, omega1,
+            omega2, omega3].
+        post_processed_variables : list, optional
+            If given, the row [t, ax, ay, az, alpha1, alpha2, alpha3, R1, R2,
+            R3, M1, M2, M3, net_thrust] is appended to it.
+
+        Returns
+        -------
+        list
+            State vector derivative.
+        """
+        _, _, z, vx, vy, vz, e0, e1, e2, e3, omega1, omega2, omega3 = u
+        R1, R2, M1, M2, M3 = 0, 0, 0, 0, 0
+        env = self.env
+        i_z, w_z = env.locate(z)
+        pressure = env.value(PRESSURE, i_z, w_z)
+
+        if self.burn_start_time < t < self.burn_out_time:
+            tables = self.motor_tables
+            time = tables.time
+            motor_I_33_at_t = _interp(t, time, tables.I_33)
+            motor_I_11_at_t = _interp(t, time, tables.I_11)
+            motor_I_33_derivative_at_t = _interp(t, time, tables.I_33_dot)
+            motor_I_11_derivative_at_t = _interp(t, time, tables.I_11_dot)
+            mass_flow_rate_at_t = _interp(t, time, tables.mass_flow_rate)
+            propellant_mass_at_t = _interp(t, time, tables.propellant_mass)
+            pressure_thrust = (
+                0
+                if self.reference_pressure is None
+                else (self.reference_pressure - pressure) * self.nozzle_area
+            )
+            net_thrust = max(_interp(t, time, tables.thrust) + pressure_thrust, 0)
+            M1 += self.thrust_eccentricity_y * net_thrust
+            M2 -= self.thrust_eccentricity_x * net_thrust
+        else:
+            motor_I_33_at_t = motor_I_11_at_t = 0
+            motor_I_33_derivative_at_t = motor_I_11_derivative_at_t = 0
+            mass_flow_rate_at_t = propellant_mass_at_t = 0
+            net_thrust = 0
+        # Power on drag applies until burn out, before ignition too
+        drag = self.power_on_drag if t < self.burn_out_time else self.power_off_drag
+
+        rocket_dry_I_33 = self.dry_I_33
+        rocket_dry_I_11 = self.dry_I_11
+        rocket_dry_mass = self.dry_mass
+        total_mass_at_t = propellant_mass_at_t + rocket_dry_mass
+        mu = (propellant_mass_at_t * rocket_dry_mass) / total_mass_at_t
+        b = self.b
+        c = self.c
+        nozzle_radius = self.nozzle_radius
+
+        # Transformation matrix (123) -> (XYZ)
+        a11 = 1 - 2 * (e2**2 + e3**2)
+        a12 = 2 * (e1 * e2 - e0 * e3)
+        a13 = 2 * (e1 * e3 + e0 * e2)
+        a21 = 2 * (e1 * e2 + e0 * e3)
+        a22 = 1 - 2 * (e1**2 + e3**2)
+        a23 = 2 * (e2 * e3 - e0 * e1)
+        a31 = 2 * (e1 * e3 - e0 * e2)
+        a32 = 2 * (e2 * e3 + e0 * e1)
+        a33 = 1 - 2 * (e1**2 + e2**2)
+
+        wind_velocity_x = env.value(WIND_X, i_z, w_z)
+        wind_velocity_y = env.value(WIND_Y, i_z, w_z)
+        speed_of_sound = env.value(SPEED_OF_SOUND, i_z, w_z)
+        free_stream_speed = sqrt(
+            (wind_velocity_x - vx) ** 2 + (wind_velocity_y - vy) ** 2 + vz**2
+        )
+        free_stream_mach = free_stream_speed / speed_of_sound
+
+        rho = env.value(DENSITY, i_z, w_z)
+        drag_coeff = _interp2(free_stream_mach, z, self.drag_mach, self.drag_z, drag)
+        R3 = -0.5 * rho * free_stream_speed**2 * self.area * drag_coeff
+        for air_brakes in self.air_brakes:
+            if air_brakes.deployment_level > 0:
+                air_brakes_cd = air_brakes.drag_coefficient.get_value_opt(
+                    air_brakes.deployment_level, free_stream_mach
+                )
+                air_brakes_force = (
+                    -0.5
+                    * rho
+                    * (free_stream_speed**2)
+                    * air_brakes.reference_area
+                    * air_brakes_cd
+                )
+                if air_brakes.override_rocket_drag:
+                    R3 = air_brakes_force
+                else:
+                    R3 += air_brakes_force
+        M1 += self.cp_eccentricity_y * R3
+        M2 -= self.cp_eccentricity_x * R3
+
+        # Rocket velocity in body frame
+        vx_b = a11 * vx + a21 * vy + a31 * vz
+        vy_b = a12 * vx + a22 * vy + a32 * vz
+        vz_b = a13 * vx + a23 * vy + a33 * vz
+
+        for s in self.surfaces:
+            cpx, cpy, cpz = s.cpx, s.cpy, s.cpz
+            # Component absolute velocity in body frame: v_b + w x cp
+            comp_vx = vx_b + omega2 * cpz - omega3 * cpy
+            comp_vy = vy_b + omega3 * cpx - omega1 * cpz
+            comp_vz = vz_b + omega1 * cpy - omega2 * cpx
+            comp_z = z + a31 * cpx + a32 * cpy + a33 * cpz
+            i_comp, w_comp = env.locate(comp_z)
+            comp_wind_vx = env.value(WIND_X, i_comp, w_comp)
+            comp_wind_vy = env.value(WIND_Y, i_comp, w_comp)
+            # Component freestream velocity in body frame: Kt @ wind - comp_v
+            stream_vx = a11 * comp_wind_vx + a21 * comp_wind_vy - comp_vx
+            stream_vy = a12 * comp_wind_vx + a22 * comp_wind_vy - comp_vy
+            stream_vz = a13 * comp_wind_vx + a23 * comp_wind_vy - comp_vz
+            stream_speed = sqrt(stream_vx**2 + stream_vy**2 + stream_vz**2)
+            stream_mach = stream_speed / speed_of_sound
+
+            if not s.is_barrowman:
+                comp_reynolds = (
+                    env.value(DENSITY, i_comp, w_comp)
+                    * stream_speed
+                    * s.reference_length
+                    / self.dynamic_viscosity(comp_z)
+                )
+                X, Y, Z, M, N, L = s.surface.compute_forces_and_moments(
+                    Vector([stream_vx, stream_vy, stream_vz]),
+                    stream_speed,
+                    stream_mach,
+                    rho,
+                    s.cp,
+                    Vector([omega1, omega2, omega3]),
+                    comp_reynolds,
+                )
+                R1 += X
+                R2 += Y
+                R3 += Z
+                M1 += M
+                M2 += N
+                M3 += L
+                continue
+
+            # Barrowman lift, as in AeroSurface.compute_forces_and_moments
+            coefficients = s.coefficients
+            i_mach, w_mach = coefficients.locate(stream_mach)
+            lift_dir_norm2 = stream_vx**2 + stream_vy**2
+            if lift_dir_norm2 != 0:
+                stream_vzn = stream_vz / stream_speed
+                if -stream_vzn < 1:
+                    attack_angle = acos(max(-stream_vzn, -1.0))
+                    if s.cl is None:
+                        cl = attack_angle * coefficients.value(_CLALPHA, i_mach, w_mach)
+                    else:
+                        cl = s.cl(attack_angle, stream_mach)
+                    lift = 0.5 * rho * stream_speed**2 * s.reference_area * cl
+                    lift_dir_norm = sqrt(lift_dir_norm2)
+                    lift_xb = lift * (stream_vx / lift_dir_norm)
+                    lift_yb = lift * (stream_vy / lift_dir_norm)
+                    R1 += lift_xb
+                    R2 += lift_yb
+                    M1 -= cpz * lift_yb
+                    M2 += cpz * lift_xb
+            if s.has_roll:
+                M3_forcing = (
+                    (0.5 * rho * stream_speed**2)
+                    * s.reference_area
+                    * s.reference_length
+                    * coefficients.value(_CLF_DELTA, i_mach, w_mach)
+                    * s.cant_angle_rad
+                )
+                M3_damping = (
+                    (0.5 * rho * stream_speed)
+                    * s.reference_area
+                    * s.reference_length**2
+                    * coefficients.value(_CLD_OMEGA, i_mach, w_mach)
+                    * omega3
+                    / 2
+                )
+                M3 += M3_forcing - M3_damping
+
+        M3 += self.cp_eccentricity_x * R2 - self.cp_eccentricity_y * R1
+
+        # Angular acceleration
+        inertia_11 = rocket_dry_I_11 + motor_I_11_at_t + mu * b**2
+        mass_flow_term = (
+            motor_I_11_derivative_at_t
+            + mass_flow_rate_at_t * (rocket_dry_mass - 1) * (b / total_mass_at_t) ** 2
+        ) - mass_flow_rate_at_t * (
+            (nozzle_radius / 2) ** 2 + (c - b * mu / rocket_dry_mass) ** 2
+        )
+        inertia_diff = rocket_dry_I_33 + motor_I_33_at_t - inertia_11
+        alpha1 = (
+            M1 - (omega2 * omega3 * inertia_diff + omega1 * mass_flow_term)
+        ) / inertia_11
+        alpha2 = (
+            M2 - (-omega1 * omega3 * inertia_diff + omega2 * mass_flow_term)
+        ) / inertia_11
+        alpha3 = (
+            M3
+            - omega3
+            * (motor_I_33_derivative_at_t - mass_flow_rate_at_t * nozzle_radius**2 / 2)
+        ) / (rocket_dry_I_33 + motor_I_33_at_t)
+
+        # Euler parameters derivative
+        e0dot = 0.5 * (-omega1 * e1 - omega2 * e2 - omega3 * e3)
+        e1dot = 0.5 * (omega1 * e0 + omega3 * e2 - omega2 * e3)
+        e2dot = 0.5 * (omega2 * e0 - omega3 * e1 + omega1 * e3)
+        e3dot = 0.5 * (omega3 * e0 + omega2 * e1 - omega1 * e2)
+
+        # Linear acceleration in body frame, then rotated to inertial frame
+        L1 = (
+            R1
+            - b * propellant_mass_at_t * (omega2**2 + omega3**2)
+            - 2 * c * mass_flow_rate_at_t * omega2
+        ) / total_mass_at_t
+        L2 = (
+            R2
+            + b * propellant_mass_at_t * (alpha3 + omega1 * omega2)
+            + 2 * c * mass_flow_rate_at_t * omega1
+        ) / total_mass_at_t
+        L3 = (
+            R3 - b * propellant_mass_at_t * (alpha2 - omega1 * omega3) + net_thrust
+        ) / total_mass_at_t
+        ax = a11 * L1 + a12 * L2 + a13 * L3
+        ay = a21 * L1 + a22 * L2 + a23 * L3
+        az = a31 * L1 + a32 * L2 + a33 * L3 - env.value(GRAVITY, i_z, w_z)
+
+        if post_processed_variables is not None:
+            post_processed_variables.append(
+                [t, ax, ay, az, alpha1, alpha2, alpha3, R1, R2, R3, M1, M2, M3, net_thrust]
+            )
+
+        return [
+            vx,
+            vy,
+            vz,
+            ax,
+            ay,
+            az,
+            e0dot,
+            e1dot,
+            e2dot,
+            e3dot,
+            alpha1,
+            alpha2,
+            alpha3,
+        ]
@@ -0,0 +1,257 @@
+"""Streaming reductions of the outputs of a ``Flight`` that does not keep its
+trajectory. See ``Flight(outputs=...)``."""
+
+import numpy as np
+
+from .flight_post_processing import _evaluate
+from .flight_solution import SolutionBuffer
+
+# Outputs set by the flight events, or that do not depend on the trajectory
+EVENT_OUTPUTS = frozenset(
+    {
+        "inclination",
+        "heading",
+        "effective_1rl",
+        "effective_2rl",
+        "out_of_rail_time",
+        "out_of_rail_time_index",
+        "out_of_rail_state",
+        "apogee_state",
+        "apogee_time",
+        "apogee_x",
+        "apogee_y",
+        "apogee",
+        "x_impact",
+        "y_impact",
+        "z_impact",
+        "impact_velocity",
+        "impact_state",
+        "parachute_events",
+        "frontal_surface_wind",
+        "lateral_surface_wind",
+        "t_final",
+    }
+)
+# Outputs that are the maximum of a quantity over the stored steps, and the
+# time at which it is reached
+MAXIMUM_OUTPUTS = {
+    "max_speed": "speed",
+    "max_mach_number": "mach_number",
+    "max_dynamic_pressure": "dynamic_pressure",
+    "max_reynolds_number": "reynolds_number",
+    "max_total_pressure": "total_pressure",
+}
+# Outputs evaluated at a single state kept by the flight events
+STATE_OUTPUTS = frozenset(
+    {
+        "out_of_rail_velocity",
+        "initial_stability_margin",
+        "out_of_rail_stability_margin",
+        "apogee_freestream_speed",
+    }
+)
+STREAMING_OUTPUTS = (
+    EVENT_OUTPUTS
+    | STATE_OUTPUTS
+    | set(MAXIMUM_OUTPUTS)
+    | {f"{name}_time" for name in MAXIMUM_OUTPUTS}
+)
+
+
+class StreamingSolution(SolutionBuffer):
+    """``SolutionBuffer`` that only keeps the last rows of a flight solution.
+
+    When the buffer is full, all rows but the last ``keep`` are passed to
+    ``reduce`` and dropped. The last rows may still be replaced or have rows
+    inserted before them, as the flight events do, so they are only reduced
+    by ``finish``. ``len`` counts every row of the solution, while indices
+    refer to the kept rows, so negative indices work as for the full
+    solution.
+
+    Parameters
+    ----------
+    reduce : callable
+        Called with each ``(n_rows, n_columns)`` array of dropped rows.
+    capacity : int, optional
+        Number of rows kept before the oldest are reduced. Default is 128.
+    keep : int, optional
+        Number of last rows always kept. Default is 2.
+    n_columns : int, optional
+        Length of each row. Default is 14.
+    """
+
+    def __init__(self, reduce, capacity=128, keep=2, n_columns=14):
+        self.reduce = reduce
+        self.keep = keep
+        self.n_dropped = 0
+        self.finished = False
+        super().__init__(n_columns=n_columns, capacity=max(capacity, keep + 1))
+
+    def __repr__(self):
+        return (
+            f"StreamingSolution(n_rows={len(self)}, n_kept={self._size}, "
+            f"n_columns={self.n_columns}, dtype={self.dtype})"
+        )
+
+    def _reserve(self, n_rows):
+        n_drop = self._size - self.keep
+        if n_rows > len(self._data) and n_drop > 0:
+            self.reduce(self._data[:n_drop])
+            self._data[: self.keep] = self._data[n_drop : self._size].copy()
+            self._size = self.keep
+            self.n_dropped += n_drop
+            self._view = None
+            n_rows -= n_drop
+        super()._reserve(n_rows)
+
+    def __len__(self):
+        return self.n_dropped + self._size
+
+    def finish(self):
+        """Reduces the kept rows, once the solution is complete."""
+        self.reduce(self.array)
+        self.finished = True
+
+    def __getstate__(self):
+        state = super().__getstate__()
+        state.update(
+            keep=self.keep, n_dropped=self.n_dropped, finished=self.finished
+        )
+        # A finished solution reduces nothing else
+        state["reduce"] = None if self.finished else self.reduce
+        return state
+
+
+class FlightOutputs:
+    """Outputs of a flight computed without keeping its trajectory.
+
+    Maxima (e.g. ``max_mach_number``) are reduced block by block from the
+    rows dropped by a ``StreamingSolution``; outputs at a single state (e.g.
+    ``out_of_rail_velocity``) are computed from the states the flight events
+    keep. Values equal those of a flight keeping its trajectory, whose
+    maxima are also taken over the stored steps.
+
+    Parameters
+    ----------
+    flight : Flight
+        Flight whose outputs are computed.
+    names : iterable of str
+        Names of the outputs, Flight attributes in ``STREAMING_OUTPUTS``.
+    """
+
+    def __init__(self, flight, names):
+        names = tuple(names)
+        unsupported = sorted(set(names) - STREAMING_OUTPUTS)
+        if unsupported:
+            raise ValueError(
+                f"The outputs {unsupported} can not be computed without the "
+                "flight trajectory. Supported outputs are: "
+                f"{sorted(STREAMING_OUTPUTS)}."
+            )
+        self.flight = flight
+        self.names = names
+        self.quantities = {
+            quantity
+            for name, quantity in MAXIMUM_OUTPUTS.items()
+            if name in names or f"{name}_time" in names
+        }
+        # Maximum of each quantity and the time it is reached
+        self.maxima = {quantity: (-np.inf, None) for quantity in self.quantities}
+
+    def _free_stream(self, states):
+        """Free stream speed and Mach number at ``[x, y, z, vx, vy, vz, ...]``
+        states."""
+        env = self.flight.env
+        z, vx, vy, vz = states[:, 2], states[:, 3], states[:, 4], states[:, 5]
+        free_stream_speed = (
+            (_evaluate(env.wind_velocity_x, z) - vx) ** 2
+            + (_evaluate(env.wind_velocity_y, z) - vy) ** 2
+            + vz**2
+        ) ** 0.5
+        return free_stream_speed, free_stream_speed / _evaluate(
+            env.speed_of_sound, z
+        )
+
+    def _evaluate_quantities(self, states):
+        """Quantities of ``MAXIMUM_OUTPUTS`` needed at each state."""
+        env = self.flight.env
+        z = states[:, 2]
+        values = {}
+        if "speed" in self.quantities:
+            values["speed"] = np.linalg.norm(states[:, 3:6], axis=1)
+        if self.quantities - {"speed"}:
+            free_stream_speed, mach_number = self._free_stream(states)
+            values["mach_number"] = mach_number
+        if self.quantities & {"dynamic_pressure", "reynolds_number"}:
+            density = _evaluate(env.density, z)
+            values["dynamic_pressure"] = 0.5 * density * free_stream_speed**2
+            values["reynolds_number"] = (
+                density
+                * free_stream_speed
+                / _evaluate(env.dynamic_viscosity, z)
+                * (2 * self.flight.rocket.radius)
+            )
+        if "total_pressure" in self.quantities:
+            values["total_pressure"] = _evaluate(env.pressure, z) * (
+                1 + 0.2 * mach_number**2
+            ) ** (3.5)
+        return values
+
+    def reduce(self, rows):
+        """Updates the maxima with solution rows ``[t, x, y, z, ...]``."""
+        if not self.quantities or not len(rows):
+            return
+        values = self._evaluate_quantities(rows[:, 1:])
+        for quantity in self.quantities:
+            index = np.argmax(values[quantity])
+            # Ties keep the earliest time, as np.argmax over all steps
+            if values[quantity][index] > self.maxima[quantity][0]:
+                self.maxima[quantity] = (
+                    float(values[quantity][index]),
+                    float(rows[index, 0]),
+                )
+
+    @staticmethod
+    def _event_state(state, initial_state):
+        state = np.asarray(state, dtype=float)
+        return state if len(state) > 1 else initial_state
+
+    def values(self):
+        """Values of the requested outputs that are not attributes set by
+        the flight events.
+
+        Returns
+        -------
+        dict
+            Output names and values.
+        """
+        flight = self.flight
+        values = {}
+        for name, quantity in MAXIMUM_OUTPUTS.items():
+            if quantity in self.quantities:
+                values[name], values[f"{name}_time"] = self.maxima[quantity]
+
+        if set(self.names) & STATE_OUTPUTS:
+            initial_state = np.asarray(flight.initial_solution[1:], dtype=float)
+            # Events that did not happen leave a null state, as the time 0
+            # the attributes of a flight keeping its trajectory default to
+            rail_state = self._event_state(flight.out_of_rail_state, initial_state)
+            if "out_of_rail_velocity" in self.names:
+                values["out_of_rail_velocity"] = float(
+                    np.linalg.norm(rail_state[3:6])
+                )
+            if "initial_stability_margin" in self.names:
+                _, mach = self._free_stream(initial_state[None, :])
+                values["initial_stability_margin"] = flight.rocket.stability_margin(
+                    mach[0], flight.t_initial
+                )
+            if "out_of_rail_stability_margin" in self.names:
+                _, mach = self._free_stream(rail_state[None, :])
+                values["out_of_rail_stability_margin"] = (
+                    flight.rocket.stability_margin(mach[0], flight.out_of_rail_time)
+                )
+            if "apogee_freestream_speed" in self.names:
+                apogee_state = self._event_state(flight.apogee_state, initial_state)
+                speed, _ = self._free_stream(apogee_state[None, :])
+                values["apogee_freestream_speed"] = float(speed[0])
+        return values
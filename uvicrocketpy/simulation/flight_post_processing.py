@@ -0,0 +1,511 @@
+"""Vectorized evaluation of the variables ``Flight`` post processes at each
+stored step (accelerations, aerodynamic forces and moments, net thrust). See
+``Flight.__evaluate_post_process``."""
+
+import numpy as np
+
+from ..rocket.aero_surface.aero_surface import AeroSurface
+from ..rocket.aero_surface.fins.fins import Fins
+
+
+def _evaluate(func, *args):
+    """Evaluates a Function at arrays of points with
+    ``Function.evaluate_many``.
+
+    Parameters
+    ----------
+    func : Function
+        Function to evaluate.
+    args : scalar, np.ndarray
+        Values of each input, broadcast against each other.
+
+    Returns
+    -------
+    np.ndarray
+        Value of the Function at each point.
+    """
+    args = np.broadcast_arrays(*(np.asarray(arg, dtype=float) for arg in args))
+    if len(args) == 1:
+        return func.evaluate_many(args[0])
+    return func.evaluate_many(np.stack(args, axis=-1))
+
+
+def _differentiate_complex_step(func, t):
+    """``Function.differentiate_complex_step`` at each time of an array."""
+    return np.array([func.differentiate_complex_step(ti) for ti in t], dtype=float)
+
+
+def _cross(a, b):
+    return np.cross(a, b, axis=-1)
+
+
+class FlightPostProcessor:
+    """Evaluates the post processed variables of every step of a flight
+    phase in one array computation.
+
+    ``Flight.u_dot``, ``Flight.u_dot_generalized``, ``Flight.udot_rail1``
+    and ``Flight.u_dot_parachute`` have array counterparts here. Each row
+    is ``[t, ax, ay, az, alpha1, alpha2, alpha3, R1, R2, R3, M1, M2, M3,
+    net_thrust]``, as appended by the derivatives with
+    ``post_processing=True``. Rockets with surfaces that do not follow the
+    Barrowman lift model (e.g. generic surfaces) and other derivatives have
+    no array counterpart; ``evaluate`` then returns None.
+
+    Parameters
+    ----------
+    flight : Flight
+        Flight whose stored steps are post processed.
+    """
+
+    def __init__(self, flight):
+        self.flight = flight
+        self.rocket = flight.rocket
+        self.motor = flight.rocket.motor
+        self.env = flight.env
+        self.surfaces = [
+            (surface, np.asarray(self.rocket.surfaces_cp_to_cdm[surface], float))
+            for surface, _ in self.rocket.aerodynamic_surfaces
+        ]
+        self.is_vectorizable = all(
+            isinstance(surface, AeroSurface) for surface, _ in self.surfaces
+        )
+
+    def evaluate(self, derivative, steps):
+        """Post processed variables of the steps of one flight phase.
+
+        Parameters
+        ----------
+        derivative : callable
+            Derivative of the phase, a bound method of the flight.
+        steps : np.ndarray
+            Solution rows ``[t, x, y, z, vx, vy, vz, e0, e1, e2, e3, w1, w2,
+            w3]`` of the phase.
+
+        Returns
+        -------
+        np.ndarray, None
+            ``(len(steps), 14)`` array of post processed variables, or None
+            if the derivative has no array counterpart.
+        """
+        steps = np.asarray(steps, dtype=float).reshape(-1, 14)
+        if not len(steps):
+            return np.empty((0, 14))
+        t, u = steps[:, 0], steps[:, 1:]
+        method = self.__method(derivative)
+        if method == "u_dot_parachute":
+            return self.u_dot_parachute(t, u)
+        if not self.is_vectorizable:
+            return None
+        if method == "udot_rail1":
+            # The rail derivative post processes with u_dot_generalized
+            method = self.__method(self.flight.u_dot_generalized)
+            rows = self.__rows(method, t, u)
+            return None if rows is None else self.udot_rail1(t, u, rows)
+        return self.__rows(method, t, u)
+
+    def __method(self, derivative):
+        """Name of the Flight method a derivative is bound to, or None."""
+        func = getattr(derivative, "__func__", None)
+        if getattr(derivative, "__self__", None) is not self.flight:
+            return None
+        for name in ("u_dot", "u_dot_generalized", "udot_rail1", "u_dot_parachute"):
+            if func is getattr(type(self.flight), name):
+                return name
+        return None
+
+    def __rows(self, method, t, u):
+        if method == "u_dot":
+            return self.u_dot(t, u)
+        if method == "u_dot_generalized":
+            return self.u_dot_generalized(t, u)
+        return None
+
+    @staticmethod
+    def _attitude(u, normalize=False):
+        """Rows of the transformation matrix (123) -> (XYZ) at each step.
+
+        ``Flight.u_dot`` builds the matrix from the Euler parameters as they
+        are, while ``Flight.u_dot_generalized`` normalizes them first with
+        ``Matrix.transformation``; ``normalize`` selects the latter.
+        """
+        e0, e1, e2, e3 = u[:, 6], u[:, 7], u[:, 8], u[:, 9]
+        if normalize:
+            norm = np.sqrt(e0**2 + e1**2 + e2**2 + e3**2)
+            null = norm == 0
+            norm[null] = 1
+            e0, e1, e2, e3 = e0 / norm, e1 / norm, e2 / norm, e3 / norm
+            e0[null] = 1
+        K = np.empty((len(u), 3, 3))
+        K[:, 0, 0] = 1 - 2 * (e2**2 + e3**2)
+        K[:, 0, 1] = 2 * (e1 * e2 - e0 * e3)
+        K[:, 0, 2] = 2 * (e1 * e3 + e0 * e2)
+        K[:, 1, 0] = 2 * (e1 * e2 + e0 * e3)
+        K[:, 1, 1] = 1 - 2 * (e1**2 + e3**2)
+        K[:, 1, 2] = 2 * (e2 * e3 - e0 * e1)
+        K[:, 2, 0] = 2 * (e1 * e3 - e0 * e2)
+        K[:, 2, 1] = 2 * (e2 * e3 + e0 * e1)
+        K[:, 2, 2] = 1 - 2 * (e1**2 + e2**2)
+        return K
+
+    def _drag(self, z, power_on, speed, mach, rho):
+        """Axial drag force R3, with the air brakes."""
+        rocket = self.rocket
+        drag_coeff = np.empty(len(z))
+        drag_coeff[power_on] = _evaluate(rocket.power_on_drag, mach[power_on], z[power_on])
+        drag_coeff[~power_on] = _evaluate(
+            rocket.power_off_drag, mach[~power_on], z[~power_on]
+        )
+        R3 = -0.5 * rho * speed**2 * rocket.area * drag_coeff
+        for air_brakes in rocket.air_brakes:
+            if air_brakes.deployment_level > 0:
+                air_brakes_cd = _evaluate(
+                    air_brakes.drag_coefficient, air_brakes.deployment_level, mach
+                )
+                air_brakes_force = (
+                    -0.5 * rho * speed**2 * air_brakes.reference_area * air_brakes_cd
+                )
+                if air_brakes.override_rocket_drag:
+                    R3 = air_brakes_force
+                else:
+                    R3 = R3 + air_brakes_force
+        return R3
+
+    def _aerodynamics(self, u, K, speed_of_sound, rho):
+        """Forces and moments of the aerodynamic surfaces, as summed by
+        ``Flight.u_dot``, in the body frame."""
+        z = u[:, 2]
+        omega = u[:, 10:13]
+        n = len(u)
+        R1, R2, R3, M1, M2, M3 = (np.zeros(n) for _ in range(6))
+        # Rocket velocity in body frame: Kt @ v
+        velocity_in_body_frame = np.einsum("nji,nj->ni", K, u[:, 3:6])
+        for surface, cp in self.surfaces:
+            comp_vb = velocity_in_body_frame + _cross(omega, cp)
+            comp_z = z + K[:, 2, :] @ cp
+            comp_wind_vx = _evaluate(self.env.wind_velocity_x, comp_z)
+            comp_wind_vy = _evaluate(self.env.wind_velocity_y, comp_z)
+            comp_wind_vb = (
+                K[:, 0, :] * comp_wind_vx[:, None] + K[:, 1, :] * comp_wind_vy[:, None]
+            )
+            stream_vx, stream_vy, stream_vz = (comp_wind_vb - comp_vb).T
+            stream_speed = np.sqrt(stream_vx**2 + stream_vy**2 + stream_vz**2)
+            stream_mach = stream_speed / speed_of_sound
+
+            # Barrowman lift, as in AeroSurface.compute_forces_and_moments
+            lift_dir_norm2 = stream_vx**2 + stream_vy**2
+            lifting = lift_dir_norm2 != 0
+            stream_vzn = np.zeros(n)
+            stream_vzn[lifting] = stream_vz[lifting] / stream_speed[lifting]
+            lifting &= -stream_vzn < 1
+            if lifting.any():
+                attack_angle = np.arccos(-stream_vzn[lifting])
+                speed = stream_speed[lifting]
+                lift = (
+                    0.5
+                    * rho[lifting]
+                    * speed**2
+                    * surface.reference_area
+                    * _evaluate(surface.cl, attack_angle, stream_mach[lifting])
+                )
+                lift_dir_norm = lift_dir_norm2[lifting] ** 0.5
+                lift_xb = lift * (stream_vx[lifting] / lift_dir_norm)
+                lift_yb = lift * (stream_vy[lifting] / lift_dir_norm)
+                R1[lifting] += lift_xb
+                R2[lifting] += lift_yb
+                M1[lifting] -= cp[2] * lift_yb
+                M2[lifting] += cp[2] * lift_xb
+            if isinstance(surface, Fins):
+                clf_delta, cld_omega, cant_angle_rad = surface.roll_parameters
+                M3_forcing = (
+                    (1 / 2 * rho * stream_speed**2)
+                    * surface.reference_area
+                    * surface.reference_length
+                    * _evaluate(clf_delta, stream_mach)
+                    * cant_angle_rad
+                )
+                M3_damping = (
+                    (1 / 2 * rho * stream_speed)
+                    * surface.reference_area
+                    * (surface.reference_length) ** 2
+                    * _evaluate(cld_omega, stream_mach)
+                    * omega[:, 2]
+                    / 2
+                )
+                M3 += M3_forcing - M3_damping
+        return R1, R2, R3, M1, M2, M3
+
+    def _free_stream(self, u):
+        """Free stream speed, Mach number, speed of sound and density at the
+        center of dry mass."""
+        z, vx, vy, vz = u[:, 2], u[:, 3], u[:, 4], u[:, 5]
+        env = self.env
+        free_stream_speed = (
+            (_evaluate(env.wind_velocity_x, z) - vx) ** 2
+            + (_evaluate(env.wind_velocity_y, z) - vy) ** 2
+            + vz**2
+        ) ** 0.5
+        speed_of_sound = _evaluate(env.speed_of_sound, z)
+        rho = _evaluate(env.density, z)
+        return free_stream_speed, free_stream_speed / speed_of_sound, speed_of_sound, rho
+
+    def _net_thrust(self, t, pressure):
+        return np.maximum(
+            _evaluate(self.motor.thrust, t) + self.motor.pressure_thrust(pressure), 0
+        )
+
+    # pylint: disable=too-many-locals,too-many-statements
+    def u_dot(self, t, u):
+        """Array counterpart of ``Flight.u_dot``."""
+        rocket, motor, env = self.rocket, self.motor, self.env
+        n = len(t)
+        z = u[:, 2]
+        omega1, omega2, omega3 = u[:, 10], u[:, 11], u[:, 12]
+        R1, R2, M1, M2, M3 = (np.zeros(n) for _ in range(5))
+        pressure = _evaluate(env.pressure, z)
+
+        motor_I_33_at_t, motor_I_11_at_t = np.zeros(n), np.zeros(n)
+        motor_I_33_derivative_at_t = np.zeros(n)
+        motor_I_11_derivative_at_t = np.zeros(n)
+        mass_flow_rate_at_t, propellant_mass_at_t = np.zeros(n), np.zeros(n)
+        net_thrust = np.zeros(n)
+        burning = (motor.burn_start_time < t) & (t < motor.burn_out_time)
+        if burning.any():
+            tb, dx = t[burning], 1e-6
+            motor_I_33_at_t[burning] = _evaluate(motor.I_33, tb)
+            motor_I_11_at_t[burning] = _evaluate(motor.I_11, tb)
+            motor_I_33_derivative_at_t[burning] = (
+                _evaluate(motor.I_33, tb + dx) - _evaluate(motor.I_33, tb - dx)
+            ) / (2 * dx)
+            motor_I_11_derivative_at_t[burning] = (
+                _evaluate(motor.I_11, tb + dx) - _evaluate(motor.I_11, tb - dx)
+            ) / (2 * dx)
+            mass_flow_rate_at_t[burning] = _evaluate(motor.mass_flow_rate, tb)
+            propellant_mass_at_t[burning] = _evaluate(motor.propellant_mass, tb)
+            net_thrust[burning] = self._net_thrust(tb, pressure[burning])
+            M1 += rocket.thrust_eccentricity_y * net_thrust
+            M2 -= rocket.thrust_eccentricity_x * net_thrust
+
+        rocket_dry_I_33 = rocket.dry_I_33
+        rocket_dry_I_11 = rocket.dry_I_11
+        rocket_dry_mass = rocket.dry_mass
+        total_mass_at_t = propellant_mass_at_t + rocket_dry_mass
+        mu = (propellant_mass_at_t * rocket_dry_mass) / total_mass_at_t
+        b = (
+            -(
+                rocket.center_of_propellant_position.get_value_opt(0)
+                - rocket.center_of_dry_mass_position
+            )
+            * rocket._csys
+        )
+        c = rocket.nozzle_to_cdm
+        nozzle_radius = motor.nozzle_radius
+        K = self._attitude(u)
+
+        free_stream_speed, free_stream_mach, speed_of_sound, rho = self._free_stream(u)
+        R3 = self._drag(
+            z, t < motor.burn_out_time, free_stream_speed, free_stream_mach, rho
+        )
+        M1 += rocket.cp_eccentricity_y * R3
+        M2 -= rocket.cp_eccentricity_x * R3
+        X, Y, Z, M, N, L = self._aerodynamics(u, K, speed_of_sound, rho)
+        R1, R2, R3 = R1 + X, R2 + Y, R3 + Z
+        M1, M2, M3 = M1 + M, M2 + N, M3 + L
+        M3 += rocket.cp_eccentricity_x * R2 - rocket.cp_eccentricity_y * R1
+
+        inertia_11 = rocket_dry_I_11 + motor_I_11_at_t + mu * b**2
+        mass_flow_term = (
+            motor_I_11_derivative_at_t
+            + mass_flow_rate_at_t * (rocket_dry_mass - 1) * (b / total_mass_at_t) ** 2
+        ) - mass_flow_rate_at_t * (
+            (nozzle_radius / 2) ** 2 + (c - b * mu / rocket_dry_mass) ** 2
+        )
+        alpha1 = (
+            M1
+            - (
+                omega2
+                * omega3
+                * (rocket_dry_I_33 + motor_I_33_at_t - inertia_11)
+                + omega1 * mass_flow_term
+            )
+        ) / inertia_11
+        alpha2 = (
+            M2
+            - (
+                omega1
+                * omega3
+                * (inertia_11 - rocket_dry_I_33 - motor_I_33_at_t)
+                + omega2 * mass_flow_term
+            )
+        ) / inertia_11
+        alpha3 = (
+            M3
+            - omega3
+            * (motor_I_33_derivative_at_t - mass_flow_rate_at_t * (nozzle_radius**2) / 2)
+        ) / (rocket_dry_I_33 + motor_I_33_at_t)
+
+        linear_acceleration = np.column_stack(
+            [
+                (
+                    R1
+                    - b * propellant_mass_at_t * (omega2**2 + omega3**2)
+                    - 2 * c * mass_flow_rate_at_t * omega2
+                )
+                / total_mass_at_t,
+                (
+                    R2
+                    + b * propellant_mass_at_t * (alpha3 + omega1 * omega2)
+                    + 2 * c * mass_flow_rate_at_t * omega1
+                )
+                / total_mass_at_t,
+                (R3 - b * propellant_mass_at_t * (alpha2 - omega1 * omega3) + net_thrust)
+                / total_mass_at_t,
+            ]
+        )
+        ax, ay, az = np.einsum("nij,nj->ni", K, linear_acceleration).T
+        az = az - _evaluate(env.gravity, z)
+
+        return np.column_stack(
+            [t, ax, ay, az, alpha1, alpha2, alpha3, R1, R2, R3, M1, M2, M3, net_thrust]
+        )
+
+    def u_dot_generalized(self, t, u):
+        """Array counterpart of ``Flight.u_dot_generalized``."""
+        rocket, motor, env = self.rocket, self.motor, self.env
+        n = len(t)
+        z = u[:, 2]
+        w = u[:, 10:13]
+
+        total_mass = _evaluate(rocket.total_mass, t)
+        total_mass_dot = _evaluate(rocket.total_mass_flow_rate, t)
+        total_mass_ddot = _differentiate_complex_step(rocket.total_mass_flow_rate, t)
+        r_CM_z = rocket.com_to_cdm_function
+        r_CM = np.zeros((n, 3))
+        r_CM[:, 2] = _evaluate(r_CM_z, t)
+        r_CM_dot = _differentiate_complex_step(r_CM_z, t)
+        dx = 1e-6
+        r_CM_ddot = (
+            _evaluate(r_CM_z, t + dx) - 2 * r_CM[:, 2] + _evaluate(r_CM_z, t - dx)
+        ) / dx**2
+        r_NOZ = rocket.nozzle_to_cdm
+        S_nozzle = np.array(rocket.nozzle_gyration_tensor, dtype=float)
+        components = ("I_11", "I_12", "I_13", "I_22", "I_23", "I_33")
+        inertia_tensor = np.empty((n, 3, 3))
+        I_dot = np.empty((n, 3, 3))
+        for name, (i, j) in zip(
+            components, ((0, 0), (0, 1), (0, 2), (1, 1), (1, 2), (2, 2))
+        ):
+            func = getattr(rocket, name)
+            inertia_tensor[:, i, j] = inertia_tensor[:, j, i] = _evaluate(func, t)
+            I_dot[:, i, j] = I_dot[:, j, i] = _differentiate_complex_step(func, t)
+
+        # Inertia tensor relative to CM: r_CM is along the rocket axis
+        I_CM = inertia_tensor.copy()
+        I_CM[:, 0, 0] -= total_mass * r_CM[:, 2] ** 2
+        I_CM[:, 1, 1] -= total_mass * r_CM[:, 2] ** 2
+
+        K = self._attitude(u, normalize=True)
+        free_stream_speed, free_stream_mach, speed_of_sound, rho = self._free_stream(u)
+        burning = (motor.burn_start_time < t) & (t < motor.burn_out_time)
+        net_thrust = np.zeros(n)
+        if burning.any():
+            pressure = _evaluate(env.pressure, z[burning])
+            net_thrust[burning] = self._net_thrust(t[burning], pressure)
+        R3 = self._drag(z, burning, free_stream_speed, free_stream_mach, rho)
+        X, Y, Z, M, N, L = self._aerodynamics(u, K, speed_of_sound, rho)
+        R1, R2, R3 = X, Y, R3 + Z
+        M1 = M + rocket.cp_eccentricity_y * R3 + rocket.thrust_eccentricity_y * net_thrust
+        M2 = N - (
+            rocket.cp_eccentricity_x * R3 + rocket.thrust_eccentricity_x * net_thrust
+        )
+        M3 = L + rocket.cp_eccentricity_x * R2 - rocket.cp_eccentricity_y * R1
+
+        # Weight in body frame: Kt @ [0, 0, -m g]
+        weight_in_body_frame = K[:, 2, :] * (
+            -total_mass * _evaluate(env.gravity, z)
+        )[:, None]
+
+        T00 = total_mass[:, None] * r_CM
+        T03 = np.zeros((n, 3))
+        T03[:, 2] = (
+            2 * total_mass_dot * (r_NOZ - r_CM[:, 2]) - 2 * total_mass * r_CM_dot
+        )
+        T04 = np.zeros((n, 3))
+        T04[:, 2] = (
+            net_thrust
+            - total_mass * r_CM_ddot
+            - 2 * total_mass_dot * r_CM_dot
+            + total_mass_ddot * (r_NOZ - r_CM[:, 2])
+        )
+        T05 = total_mass_dot[:, None, None] * S_nozzle - I_dot
+
+        T20 = (
+            _cross(_cross(w, T00), w)
+            + _cross(w, T03)
+            + T04
+            + weight_in_body_frame
+            + np.column_stack([R1, R2, R3])
+        )
+        T21 = (
+            _cross(np.einsum("nij,nj->ni", inertia_tensor, w), w)
+            + np.einsum("nij,nj->ni", T05, w)
+            - _cross(weight_in_body_frame, r_CM)
+            + np.column_stack([M1, M2, M3])
+        )
+
+        w_dot = np.linalg.solve(I_CM, (T21 + _cross(T20, r_CM))[:, :, None])[:, :, 0]
+        v_dot = np.einsum(
+            "nij,nj->ni", K, T20 / total_mass[:, None] - _cross(r_CM, w_dot)
+        )
+
+        return np.column_stack(
+            [t, v_dot, w_dot, R1, R2, R3, M1, M2, M3, net_thrust]
+        )
+
+    def udot_rail1(self, t, u, rows):
+        """Array counterpart of ``Flight.udot_rail1``: the accelerations of
+        ``rows``, the forces and moments evaluated by the flight's
+        ``u_dot_generalized``, are replaced by the rail ones."""
+        rocket, env = self.rocket, self.env
+        z = u[:, 2]
+        e0, e1, e2, e3 = u[:, 6], u[:, 7], u[:, 8], u[:, 9]
+        total_mass_at_t = _evaluate(rocket.total_mass, t)
+        free_stream_speed, free_stream_mach, _, rho = self._free_stream(u)
+        drag_coeff = _evaluate(rocket.power_on_drag, free_stream_mach, z)
+        net_thrust = self._net_thrust(t, _evaluate(env.pressure, z))
+        R3 = -0.5 * rho * (free_stream_speed**2) * rocket.area * drag_coeff
+        a3 = (R3 + net_thrust) / total_mass_at_t - (
+            e0**2 - e1**2 - e2**2 + e3**2
+        ) * _evaluate(env.gravity, z)
+        a3 = np.where(a3 > 0, a3, 0)
+        rows[:, 1] = 2 * (e1 * e3 + e0 * e2) * a3
+        rows[:, 2] = 2 * (e2 * e3 - e0 * e1) * a3
+        rows[:, 3] = (1 - 2 * (e1**2 + e2**2)) * a3
+        rows[:, 4:7] = 0
+        return rows
+
+    def u_dot_parachute(self, t, u):
+        """Array counterpart of ``Flight.u_dot_parachute``."""
+        z, vx, vy, vz = u[:, 2], u[:, 3], u[:, 4], u[:, 5]
+        rho = _evaluate(self.env.density, z)
+        cd_s = self.flight.parachute_cd_s
+        mp = self.rocket.dry_mass
+        ka = 1
+        R = 1.5
+        ma = ka * rho * (4 / 3) * np.pi * R**3
+
+        freestream_x = vx - _evaluate(self.env.wind_velocity_x, z)
+        freestream_y = vy - _evaluate(self.env.wind_velocity_y, z)
+        freestream_z = vz
+        free_stream_speed = (freestream_x**2 + freestream_y**2 + freestream_z**2) ** 0.5
+
+        pseudo_drag = -0.5 * rho * cd_s * free_stream_speed
+        Dx = pseudo_drag * freestream_x
+        Dy = pseudo_drag * freestream_y
+        Dz = pseudo_drag * freestream_z
+        rows = np.zeros((len(t), 14))
+        rows[:, 0] = t
+        rows[:, 1] = Dx / (mp + ma)
+        rows[:, 2] = Dy / (mp + ma)
+        rows[:, 3] = (Dz - 9.8 * mp) / (mp + ma)
+        rows[:, 7], rows[:, 8], rows[:, 9] = Dx, Dy, Dz
+        return rows
@@ -0,0 +1,166 @@
+"""Defines the `SolutionBuffer` class, the growable array in which `Flight`
+stores the state of every integration step."""
+
+import numpy as np
+
+
+class SolutionBuffer:
+    """Rows ``[t, x, y, z, vx, vy, vz, e0, e1, e2, e3, w1, w2, w3]`` of a
+    flight solution, stored in one contiguous, preallocated array.
+
+    It behaves like the list of rows ``Flight.solution`` used to be: rows are
+    appended, replaced and inserted, ``len`` and iteration work, and indexing
+    returns rows as arrays. The capacity doubles when full, so appending a
+    step neither allocates a Python list nor copies the trajectory. ``array``
+    is a read-only view of the filled rows, cached until the next change, and
+    ``np.asarray(buffer)`` returns it without copying.
+
+    Parameters
+    ----------
+    rows : iterable, optional
+        Initial rows. Default is none.
+    n_columns : int, optional
+        Length of each row. Default is 14.
+    capacity : int, optional
+        Number of rows allocated upfront. Default is 1024.
+    dtype : data-type, optional
+        Data type of the stored values. Default is float64.
+    """
+
+    def __init__(self, rows=(), n_columns=14, capacity=1024, dtype=np.float64):
+        self._data = np.empty((max(capacity, 1), n_columns), dtype=dtype)
+        self._size = 0
+        self._view = None
+        self.extend(rows)
+
+    def __repr__(self):
+        return (
+            f"SolutionBuffer(n_rows={self._size}, n_columns={self.n_columns}, "
+            f"dtype={self.dtype})"
+        )
+
+    @property
+    def n_columns(self):
+        """Length of each row."""
+        return self._data.shape[1]
+
+    @property
+    def dtype(self):
+        """Data type of the stored values."""
+        return self._data.dtype
+
+    @property
+    def capacity(self):
+        """Number of rows allocated."""
+        return len(self._data)
+
+    @property
+    def array(self):
+        """Read-only ``(n_rows, n_columns)`` view of the rows."""
+        if self._view is None:
+            view = self._data[: self._size].view()
+            view.flags.writeable = False
+            self._view = view
+        return self._view
+
+    def _reserve(self, n_rows):
+        if n_rows > len(self._data):
+            data = np.empty(
+                (max(n_rows, 2 * len(self._data)), self.n_columns), dtype=self.dtype
+            )
+            data[: self._size] = self._data[: self._size]
+            self._data = data
+
+    def append(self, row):
+        """Appends one row."""
+        self._reserve(self._size + 1)
+        self._data[self._size] = row
+        self._size += 1
+        self._view = None
+
+    def append_state(self, t, y):
+        """Appends the row ``[t, *y]`` without building it."""
+        self._reserve(self._size + 1)
+        self._data[self._size, 0] = t
+        self._data[self._size, 1:] = y
+        self._size += 1
+        self._view = None
+
+    def extend(self, rows):
+        """Appends several rows."""
+        if isinstance(rows, (np.ndarray, SolutionBuffer)) and np.ndim(rows) == 2:
+            rows = np.asarray(rows)
+            self._reserve(self._size + len(rows))
+            self._data[self._size : self._size + len(rows)] = rows
+            self._size += len(rows)
+            self._view = None
+            return
+        for row in rows:
+            self.append(row)
+
+    def __iadd__(self, rows):
+        self.extend(rows)
+        return self
+
+    def insert(self, index, row):
+        """Inserts a row before ``index``, as ``list.insert``."""
+        self._reserve(self._size + 1)
+        if index < 0:
+            index = max(index + self._size, 0)
+        index = min(index, self._size)
+        data = self._data
+        data[index + 1 : self._size + 1] = data[index : self._size]
+        data[index] = row
+        self._size += 1
+        self._view = None
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        return iter(self.array)
+
+    def __getitem__(self, index):
+        return self.array[index]
+
+    def __setitem__(self, index, value):
+        self._data[: self._size][index] = value
+        self._view = None
+
+    def __array__(self, dtype=None, copy=None):
+        array = self.array
+        if dtype is not None and np.dtype(dtype) != array.dtype:
+            return array.astype(dtype)
+        if copy:
+            return array.copy()
+        return array
+
+    def tolist(self):
+        """Rows as a list of lists."""
+        return self.array.tolist()
+
+    def compact(self, dtype=None):
+        """Releases the spare capacity and optionally changes the data type.
+
+        With ``dtype=np.float32``, the solution takes half the memory, e.g.
+        to archive or send many flights. Times and states then keep about 7
+        significant digits. Functions built from the solution afterwards use
+        the compacted values.
+
+        Parameters
+        ----------
+        dtype : data-type, optional
+            New data type of the stored values. Default keeps the current one.
+
+        Returns
+        -------
+        SolutionBuffer
+            This buffer.
+        """
+        self._data = self._data[: self._size].astype(dtype or self.dtype)
+        self._view = None
+        return self
+
+    def __getstate__(self):
+        # The spare capacity is not pickled
+        return {"_data": self.array.copy(), "_size": self._size, "_view": None}
@@ -0,0 +1,402 @@
+"""Tables of the motor, environment, drag and aerodynamic surface data read
+by the precomputed equations of motion of ``Flight`` (``FlightKernel`` and
+``JitFlightKernel``) and by ``EnsembleFlight``.
+
+Each quantity is sampled once on a fixed grid, and then interpolated
+linearly instead of evaluating its ``Function``: motor curves on a burn time
+grid, environment profiles on an altitude grid, drag coefficients on a Mach
+x altitude grid and the lift and roll coefficient derivatives of each
+aerodynamic surface on a Mach grid. Scalar rocket and motor data are laid
+out in a flat constants array (``rocket_constants``).
+
+Sampled tables are cached per set of ``Function`` objects and grid (see
+``lowered``), so flights sharing an environment, motor or aerodynamic
+surface only sample them once, until one of the Functions is modified.
+"""
+
+import hashlib
+import weakref
+
+import numpy as np
+
+from ..mathutils.function import SourceType
+from ..rocket.aero_surface.aero_surface import AeroSurface
+from ..rocket.aero_surface.fins.fins import Fins
+
+MACH_GRID = np.linspace(0.0, 5.0, 1001)
+# Coarser, non-uniform Mach grid of ``JitFlightKernel``, which searches its
+# tables instead of indexing them. It has a node on each side of the jump of
+# the Prandtl-Glauert factor at Mach 1.1 (see ``AeroSurface._beta``)
+JIT_MACH_GRID = np.union1d(np.linspace(0.0, 5.0, 201), [1.1 - 1e-9])
+ALTITUDE_POINTS = 4001
+DRAG_ALTITUDE_POINTS = 161
+# Environment profiles that only take floats (e.g. the density of the
+# standard atmosphere) are evaluated on every PROFILE_STRIDE-th altitude
+PROFILE_STRIDE = 10
+
+# Tables sampled from each Function, kept while the Function is alive
+_LOWERED = weakref.WeakKeyDictionary()
+
+# Rows of the environment table
+PRESSURE, DENSITY, SPEED_OF_SOUND, WIND_X, WIND_Y, GRAVITY = range(6)
+
+# Rows of the motor table
+I_11, I_33, I_11_DOT, I_33_DOT, MASS_FLOW_RATE, PROPELLANT_MASS, THRUST = range(7)
+
+# Layout of the rocket constants array (``rocket_constants``)
+(
+    BURN_START,
+    BURN_OUT,
+    REF_PRESSURE,
+    NOZZLE_AREA,
+    NOZZLE_RADIUS,
+    DRY_I_11,
+    DRY_I_33,
+    DRY_MASS,
+    AREA,
+    B,
+    C,
+    CP_ECC_X,
+    CP_ECC_Y,
+    THRUST_ECC_X,
+    THRUST_ECC_Y,
+    N_CONSTANTS,
+) = range(16)
+
+
+def _grid_key(*grids):
+    return hashlib.sha1(
+        b"".join(np.ascontiguousarray(g, dtype=float).tobytes() for g in grids)
+    ).digest()
+
+
+def lowered(name, functions, grids, build):
+    """Returns ``build()``, sampled once per table ``name``, ``functions`` and
+    ``grids``.
+
+    The result is cached on the first Function, and reused while the other
+    ones are still the same objects and none of them was modified since (by
+    ``set_source``, ``set_interpolation`` or ``set_extrapolation``, which
+    increment ``Function._version``). Arrays of the result are made
+    read-only, since they are shared.
+    """
+    head, *others = functions
+    key = (name, _grid_key(*grids))
+    versions = [f._version for f in functions]
+    entries = _LOWERED.setdefault(head, {})
+    entry = entries.get(key)
+    if (
+        entry is not None
+        and entry[1] == versions
+        and all(ref() is f for ref, f in zip(entry[0], others))
+    ):
+        return entry[2]
+    value = build()
+    for item in value if isinstance(value, tuple) else (value,):
+        if isinstance(item, np.ndarray):
+            item.flags.writeable = False
+    entries[key] = ([weakref.ref(f) for f in others], versions, value)
+    return value
+
+
+def _motor_rows(motor, grid, dx=1e-6):
+    def derivative(func):
+        return (func.evaluate_many(grid + dx) - func.evaluate_many(grid - dx)) / (
+            2 * dx
+        )
+
+    return np.array(
+        [
+            motor.I_11.evaluate_many(grid),
+            motor.I_33.evaluate_many(grid),
+            derivative(motor.I_11),
+            derivative(motor.I_33),
+            motor.mass_flow_rate.evaluate_many(grid),
+            motor.propellant_mass.evaluate_many(grid),
+            motor.thrust.evaluate_many(grid),
+        ],
+        dtype=float,
+    )
+
+
+class MotorTables:
+    """Motor quantities sampled on a time grid covering the burn, including
+    the finite difference derivatives of the inertias that ``Flight.u_dot``
+    would otherwise compute at every call.
+
+    Parameters
+    ----------
+    motor : Motor
+        The rocket's motor.
+    n_points : int, optional
+        Number of uniformly spaced samples over the burn. The thrust curve
+        data points are always added to the grid, so the thrust itself is
+        reproduced exactly. Default is 2001.
+    """
+
+    def __init__(self, motor, n_points=2001):
+        t0, t1 = motor.burn_start_time, motor.burn_out_time
+        grid = np.linspace(t0, t1, n_points)
+        thrust_source = motor.thrust.get_source()
+        if isinstance(thrust_source, np.ndarray):
+            nodes = thrust_source[:, 0]
+            grid = np.union1d(grid, nodes[(nodes >= t0) & (nodes <= t1)])
+        functions = (
+            motor.thrust,
+            motor.I_11,
+            motor.I_33,
+            motor.mass_flow_rate,
+            motor.propellant_mass,
+        )
+        rows = lowered("motor", functions, (grid,), lambda: _motor_rows(motor, grid))
+
+        self.time = grid.tolist()
+        (
+            self.I_11,
+            self.I_33,
+            self.I_11_dot,
+            self.I_33_dot,
+            self.mass_flow_rate,
+            self.propellant_mass,
+            self.thrust,
+        ) = rows.tolist()
+
+    def rows(self):
+        """Motor table as a float array, one row per motor table row
+        (``I_11``, ..., ``THRUST``) and one column per time of ``time``."""
+        return np.array(
+            [
+                self.I_11,
+                self.I_33,
+                self.I_11_dot,
+                self.I_33_dot,
+                self.mass_flow_rate,
+                self.propellant_mass,
+                self.thrust,
+            ],
+            dtype=float,
+        )
+
+
+def sample(func, *grids, stride=1):
+    """Evaluates a Function on the cartesian product of ``grids``, returning
+    an array of shape ``(len(grid_0), len(grid_1), ...)``.
+
+    A callable that does not take arrays is evaluated point by point; on a
+    single grid, only every ``stride``-th point (and the last one) is then
+    evaluated and the others are interpolated linearly."""
+    mesh = np.meshgrid(*grids, indexing="ij")
+    if func._source_type is SourceType.ARRAY:
+        return func.evaluate_many(np.stack(mesh, axis=-1) if len(mesh) > 1 else mesh[0])
+    points = [m.ravel() for m in mesh]
+    try:
+        values = np.asarray(func.get_value_opt(*points), dtype=float)
+    except (TypeError, ValueError):
+        values = None
+    if values is None or values.size != points[0].size:
+        if stride > 1 and len(grids) == 1:
+            xs = np.union1d(grids[0][::stride], grids[0][-1:])
+            values = np.interp(grids[0], xs, [func.get_value_opt(x) for x in xs])
+        else:
+            values = np.array([func.get_value_opt(*p) for p in zip(*points)], float)
+    return values.reshape(mesh[0].shape)
+
+
+def regular_axes(func):
+    """Axes of a 2-D array Function defined on a full regular grid, or
+    ``None`` if its points are scattered."""
+    source = func.get_source()
+    if not isinstance(source, np.ndarray) or source.shape[1] != 3:
+        return None
+    xs, ys = np.unique(source[:, 0]), np.unique(source[:, 1])
+    if len(xs) * len(ys) != len(source) or len(xs) < 2 or len(ys) < 2:
+        return None
+    return xs, ys
+
+
+def altitude_grid(env, n_points=ALTITUDE_POINTS):
+    """Uniform altitude grid from below the launch site (or sea level) to
+    the environment's maximum expected height."""
+    z_low = min(env.elevation, 0.0) - 500.0
+    return np.linspace(z_low, env.max_expected_height, n_points)
+
+
+def env_table(env, z):
+    """Environment profiles over altitudes ``z``, one row per environment
+    table row."""
+    functions = (
+        env.pressure,
+        env.density,
+        env.speed_of_sound,
+        env.wind_velocity_x,
+        env.wind_velocity_y,
+        env.gravity,
+    )
+    return lowered(
+        "environment",
+        functions,
+        (z,),
+        lambda: np.vstack(
+            [sample(func, z, stride=PROFILE_STRIDE) for func in functions]
+        ),
+    )
+
+
+def drag_tables(rocket, z):
+    """Power on and power off drag coefficients of a rocket.
+
+    Both are sampled on the drag curves' own grid when they share a regular
+    one, otherwise on ``MACH_GRID`` and ``DRAG_ALTITUDE_POINTS`` altitudes
+    spanning ``z``.
+
+    Returns
+    -------
+    tuple
+        ``(mach, altitude, power_on, power_off)``, where the coefficient
+        tables have shape ``(len(mach), len(altitude))``.
+    """
+    axes = regular_axes(rocket.power_off_drag)
+    on_axes = regular_axes(rocket.power_on_drag)
+    if (
+        axes is None
+        or on_axes is None
+        or not all(np.array_equal(a, b) for a, b in zip(axes, on_axes))
+    ):
+        axes = (MACH_GRID, np.linspace(z[0], z[-1], DRAG_ALTITUDE_POINTS))
+    return lowered(
+        "drag",
+        (rocket.power_on_drag, rocket.power_off_drag),
+        axes,
+        lambda: (
+            *axes,
+            sample(rocket.power_on_drag, *axes),
+            sample(rocket.power_off_drag, *axes),
+        ),
+    )
+
+
+def has_linear_lift(surface):
+    """Whether a surface follows the Barrowman lift model with a lift
+    coefficient linear in the angle of attack, so that it is described by
+    ``surface_table``."""
+    if not isinstance(surface, AeroSurface):
+        return False
+    for mach in (0.3, 0.9, 2.0):
+        cl_1 = surface.cl.get_value_opt(1.0, mach)
+        cl_03 = surface.cl.get_value_opt(0.3, mach)
+        if not np.isclose(cl_03, 0.3 * cl_1, rtol=1e-9, atol=1e-12):
+            return False
+    return True
+
+
+def surface_table(surface, mach_grid):
+    """Lift and roll coefficient derivatives of a Barrowman surface over
+    ``mach_grid``. The lift derivative is the lift coefficient at an angle of
+    attack of one radian, which describes the lift if ``has_linear_lift``.
+
+    Returns
+    -------
+    tuple
+        ``(clalpha, clf_delta, cld_omega, cant, has_roll)``. Surfaces other
+        than fins have zero roll coefficients and ``has_roll`` False.
+    """
+    functions = [surface.cl, surface.clalpha]
+    if isinstance(surface, Fins):
+        functions += surface.roll_parameters[:2]
+    return lowered(
+        "surface", functions, (mach_grid,), lambda: _surface_table(surface, mach_grid)
+    )
+
+
+def _surface_table(surface, mach_grid):
+    # cl is clalpha(mach) * alpha for every Barrowman surface; the 1-D
+    # clalpha is cheaper to sample when it is the same curve
+    if all(
+        np.isclose(surface.cl.get_value_opt(1.0, mach), surface.clalpha(mach))
+        for mach in (0.3, 0.9, 2.0)
+    ):
+        clalpha = sample(surface.clalpha, mach_grid)
+    else:
+        clalpha = sample(surface.cl, np.array([1.0]), mach_grid)[0]
+    if isinstance(surface, Fins):
+        clf, cld, cant_angle_rad = surface.roll_parameters
+        clf_delta, cld_omega = sample(clf, mach_grid), sample(cld, mach_grid)
+        return clalpha, clf_delta, cld_omega, cant_angle_rad, True
+    zeros = np.zeros(len(mach_grid))
+    return clalpha, zeros, zeros, 0.0, False
+
+
+def surface_tables(rocket, mach_grid):
+    """Per-surface position, reference dimensions and coefficient derivative
+    tables over ``mach_grid``, for rockets whose surfaces all have linear
+    lift.
+
+    Returns
+    -------
+    tuple
+        ``(cp, ref_area, ref_len, clalpha, clf_delta, cld_omega, cant,
+        has_roll)``, indexed by surface along the first axis.
+    """
+    surfaces = rocket.aerodynamic_surfaces
+    n = len(surfaces)
+    cp = np.zeros((n, 3))
+    ref_area = np.zeros(n)
+    ref_len = np.zeros(n)
+    clalpha = np.zeros((n, len(mach_grid)))
+    clf_delta = np.zeros((n, len(mach_grid)))
+    cld_omega = np.zeros((n, len(mach_grid)))
+    cant = np.zeros(n)
+    has_roll = np.zeros(n, dtype=np.bool_)
+    for k, (surface, _) in enumerate(surfaces):
+        position = rocket.surfaces_cp_to_cdm[surface]
+        cp[k] = [position[0], position[1], position[2]]
+        ref_area[k] = surface.reference_area
+        ref_len[k] = surface.reference_length
+        (
+            clalpha[k],
+            clf_delta[k],
+            cld_omega[k],
+            cant[k],
+            has_roll[k],
+        ) = surface_table(surface, mach_grid)
+    return cp, ref_area, ref_len, clalpha, clf_delta, cld_omega, cant, has_roll
+
+
+def rocket_constants(rocket):
+    """Scalar rocket and motor data as a float array, indexed by the rocket
+    constants layout (``BURN_START``, ..., ``THRUST_ECC_Y``)."""
+    motor = rocket.motor
+    c = np.zeros(N_CONSTANTS)
+    c[BURN_START] = motor.burn_start_time
+    c[BURN_OUT] = motor.burn_out_time
+    c[REF_PRESSURE] = (
+        np.nan if motor.reference_pressure is None else motor.reference_pressure
+    )
+    c[NOZZLE_AREA] = motor.nozzle_area
+    c[NOZZLE_RADIUS] = motor.nozzle_radius
+    c[DRY_I_11] = rocket.dry_I_11
+    c[DRY_I_33] = rocket.dry_I_33
+    c[DRY_MASS] = rocket.dry_mass
+    c[AREA] = rocket.area
+    c[B] = (
+        -(
+            rocket.center_of_propellant_position.get_value_opt(0)
+            - rocket.center_of_dry_mass_position
+        )
+        * rocket._csys
+    )
+    c[C] = rocket.nozzle_to_cdm
+    c[CP_ECC_X] = rocket.cp_eccentricity_x
+    c[CP_ECC_Y] = rocket.cp_eccentricity_y
+    c[THRUST_ECC_X] = rocket.thrust_eccentricity_x
+    c[THRUST_ECC_Y] = rocket.thrust_eccentricity_y
+    return c
+
+
+def is_lowerable(rocket):
+    """Checks the rocket only uses features that the table based equations
+    of ``JitFlightKernel`` and ``EnsembleFlight`` model: no air brakes and
+    only surfaces with linear lift."""
+    if rocket.air_brakes:
+        return False
+    return all(has_linear_lift(surface) for surface, _ in rocket.aerodynamic_surfaces)
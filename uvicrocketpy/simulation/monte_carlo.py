@@ -15,6 +15,7 @@ latest documentation.
 
 import json
 import os
+import queue
 import traceback
 import warnings
 from pathlib import Path
@@ -23,10 +24,19 @@ from time import time
 import numpy as np
 import simplekml
 
-from uvicrocketpy._encoders import RocketPyEncoder
 from uvicrocketpy.plots.monte_carlo_plots import _MonteCarloPlots
 from uvicrocketpy.prints.monte_carlo_prints import _MonteCarloPrints
 from uvicrocketpy.simulation.flight import Flight
+from uvicrocketpy.simulation.flight_outputs import STREAMING_OUTPUTS
+from uvicrocketpy.simulation.monte_carlo_broker import MonteCarloBroker, run_worker
+from uvicrocketpy.simulation.monte_carlo_statistics import (
+    CONVERGENCE_STATISTICS,
+    ELLIPSE_COORDINATES,
+    MonteCarloStatistics,
+)
+from uvicrocketpy.simulation.monte_carlo_storage import create_storage
+from uvicrocketpy.simulation.shared_arrays import SharedArrays
+from uvicrocketpy.stochastic.qmc_sampler import QMCSampler
 from uvicrocketpy.tools import (
     generate_monte_carlo_ellipses,
     generate_monte_carlo_ellipses_coordinates,
@@ -55,6 +65,12 @@ class MonteCarlo:
     data_collector : dict
         A dictionary whose keys are the names of the additional
         exported variables and the values are callback functions.
+    storage : MonteCarloStorage
+        Backend storing the inputs, outputs and errors of the simulations.
+    flight_kwargs : dict
+        Additional keyword arguments of every simulated Flight.
+    checkpoint_file : Path
+        File with the seed and size of the last campaign, used to resume it.
     inputs_log : list
         List of dictionaries with the inputs used in each simulation.
     outputs_log : list
@@ -68,8 +84,12 @@ class MonteCarlo:
         are the names of the saved attributes, and the values are lists with all
         the result numbers of the respective attributes.
     processed_results : dict
-        Dictionary with the mean and standard deviation of each parameter
-        available in the results.
+        Dictionary with the mean, median, standard deviation and 95%
+        prediction interval of each parameter available in the results.
+    statistics : MonteCarloStatistics
+        Streaming statistics of the outputs. During a simulation they are
+        updated as simulations finish, and can be read while it runs; they
+        are rebuilt from the results once it ends.
     prints : _MonteCarloPrints
         Object with methods to print information about the Monte Carlo simulation.
         Use help(MonteCarlo.prints) for more information.
@@ -94,6 +114,8 @@ class MonteCarlo:
         flight,
         export_list=None,
         data_collector=None,
+        storage="txt",
+        flight_kwargs=None,
     ):  # pylint: disable=too-many-statements
         """
         Initialize a MonteCarlo object.
@@ -129,6 +151,30 @@ class MonteCarlo:
                     "max_acceleration": lambda flight: max(flight.acceleration(flight.time)),
                     "date": lambda flight: flight.env.date,
                 }
+        storage : str, MonteCarloStorage, optional
+            How inputs, outputs and errors are stored. Options are:
+
+                * ``"txt"``: one JSON document per simulation and line, in
+                  ``filename.inputs.txt``, ``.outputs.txt`` and ``.errors.txt``.
+
+                * ``"columnar"``: binary column files in the
+                  ``filename.inputs``, ``.outputs`` and ``.errors`` directories.
+                  Numeric results are loaded memory-mapped as numpy arrays.
+
+                * ``"parquet"``: Parquet files in the ``filename.inputs.parquet``,
+                  ``.outputs.parquet`` and ``.errors.parquet`` directories.
+                  Requires ``pyarrow``.
+
+            A ``MonteCarloStorage`` instance can also be given, e.g. to change
+            the number of simulations written per chunk. Default is ``"txt"``.
+        flight_kwargs : dict, optional
+            Additional keyword arguments of every simulated ``Flight``, e.g.
+            ``{"rtol": 1e-3, "equations_of_motion": "jit"}`` for faster, less
+            accurate flights. Unless ``outputs`` is given here, flights
+            without controllers are simulated with ``outputs=export_list``
+            when there is no ``data_collector`` and every exported variable
+            can be computed without the trajectory (e.g. the default list),
+            so they do not keep their trajectory. Default is None.
 
         Returns
         -------
@@ -151,16 +197,24 @@ class MonteCarlo:
         self.num_of_loaded_sims = 0
         self.results = {}
         self.processed_results = {}
+        self.statistics = None
         self.prints = _MonteCarloPrints(self)
         self.plots = _MonteCarloPlots(self)
 
         self.export_list = self.__check_export_list(export_list)
         self._check_data_collector(data_collector)
         self.data_collector = data_collector
-
-        self.import_inputs(self.filename.with_suffix(".inputs.txt"))
-        self.import_outputs(self.filename.with_suffix(".outputs.txt"))
-        self.import_errors(self.filename.with_suffix(".errors.txt"))
+        self.storage = create_storage(storage, self.filename)
+        self.flight_kwargs = flight_kwargs or {}
+        self.checkpoint_file = self.filename.with_suffix(".checkpoint.json")
+        self._shared_arrays = None
+        self._sampler = None
+        self._tolerances = None
+        self._min_simulations = 0
+
+        self.import_inputs(self.storage.path("inputs"))
+        self.import_outputs(self.storage.path("outputs"))
+        self.import_errors(self.storage.path("errors"))
 
     def simulate(
         self,
@@ -168,6 +222,12 @@ class MonteCarlo:
         append=False,
         parallel=False,
         n_workers=None,
+        batch_size=10,
+        seed=None,
+        sampler=None,
+        share_memory=True,
+        tolerances=None,
+        min_simulations=30,
         **kwargs,
     ):  # pylint: disable=too-many-statements
         """
@@ -176,7 +236,8 @@ class MonteCarlo:
         Parameters
         ----------
         number_of_simulations : int
-            Number of simulations to be run, must be non-negative.
+            Number of simulations to be run, must be non-negative. With
+            ``tolerances``, the largest number of simulations.
         append : bool, optional
             If True, the results will be appended to the existing files. If
             False, the files will be overwritten. Default is False.
@@ -187,6 +248,44 @@ class MonteCarlo:
             number of workers will be equal to the number of CPUs available.
             A minimum of 2 workers is required for parallel mode.
             Default is None.
+        batch_size : int, optional
+            Number of simulations a worker claims and sends to the writer at
+            once if ``parallel=True``. Larger batches mean fewer inter-process
+            round trips and less frequent progress updates. Default is 10.
+        seed : int, optional
+            Entropy of the campaign. Simulation ``i`` is always run with the
+            seed derived from ``(seed, i)``, whatever the mode and number of
+            workers. If None, the seed of the checkpoint is reused when
+            ``append=True``, and a random one is drawn otherwise.
+            Default is None.
+        sampler : str, QMCSampler, optional
+            Sampling design of the random inputs: ``"sobol"``, ``"halton"``,
+            ``"lhs"`` (Latin hypercube) or a ``QMCSampler``. The environment,
+            rocket and flight models then draw from one joint space-filling
+            point per simulation, which makes statistics such as percentiles
+            and dispersion ellipses converge with fewer simulations. If None,
+            the sampler of the checkpoint is reused when ``append=True``, and
+            independent pseudo-random draws are used otherwise.
+            Default is None.
+        share_memory : bool, optional
+            If True and ``parallel=True``, the large arrays of the stochastic
+            models (drag, thrust and atmospheric tables...) are moved once
+            into shared memory and attached by the workers instead of copied
+            into each of them. They become read-only. Default is True.
+        tolerances : dict, optional
+            Convergence targets. If given, the simulations stop as soon as
+            every listed statistic is estimated within its tolerance: the
+            half-width of its 95% confidence interval. Keys are
+            ``(name, statistic)`` tuples, where ``statistic`` is ``"mean"``,
+            ``"std"``, ``"interval"`` (width of the 95% prediction interval)
+            or ``"ellipse"`` (semi-major axis of the one standard deviation
+            ``"apogee"`` or ``"impact"`` ellipse), or output names for their
+            mean. For instance, ``{("apogee", "interval"): 20, ("impact",
+            "ellipse"): 10}``. In parallel mode, the batches already claimed
+            by the workers are completed. Default is None.
+        min_simulations : int, optional
+            Number of simulations, including appended ones, before the
+            ``tolerances`` are checked. Default is 30.
         kwargs : dict
             Custom arguments for simulation export of the ``inputs`` file. Options
             are:
@@ -211,26 +310,370 @@ class MonteCarlo:
         the simulation by running the ``simulate`` method again with the
         same number of simulations and setting `append=True`.
 
+        The campaign seed is saved in ``filename.checkpoint.json``. With
+        `append=True`, only the indices missing from the outputs are run, with
+        their original seeds, so an interrupted campaign resumed any number of
+        times gives the same samples as an uninterrupted one.
+
         Important
         ---------
         If you use `append=False` and the files already exist, they will be
         overwritten. Make sure to save the files with the results before
         running the simulation again with `append=False`.
         """
-        self._export_config = kwargs
+        self._tolerances = self.__check_tolerances(tolerances)
+        self._min_simulations = min_simulations
+        self.__start_campaign(number_of_simulations, append, seed, sampler, kwargs)
+
+        if parallel:
+            if share_memory:
+                self.__share_prototypes()
+            self.__run_in_parallel(n_workers, batch_size)
+        else:
+            self.__run_in_serial()
+
+        if self._tolerances is not None:
+            if self.__converged():
+                _SimMonitor.reprint(
+                    f"Convergence targets met after {self.statistics.count} "
+                    "simulations."
+                )
+            else:
+                _SimMonitor.reprint(
+                    "Convergence targets not met after "
+                    f"{self.statistics.count} simulations."
+                )
+        self._tolerances = None
+        self.__terminate_simulation()
+
+    def __check_tolerances(self, tolerances):
+        """Validates the convergence targets of ``simulate``.
+
+        Returns
+        -------
+        dict or None
+            The tolerances, keyed by ``(name, statistic)`` tuples.
+        """
+        if tolerances is None:
+            return None
+        outputs = set(self.export_list) | set(self.data_collector or {})
+        checked = {}
+        for target, tolerance in tolerances.items():
+            name, statistic = (target, "mean") if isinstance(target, str) else target
+            if statistic not in CONVERGENCE_STATISTICS:
+                raise ValueError(
+                    f"Unknown statistic '{statistic}'. Options are "
+                    f"{', '.join(CONVERGENCE_STATISTICS)}."
+                )
+            names = ELLIPSE_COORDINATES if statistic == "ellipse" else outputs
+            if name not in names:
+                raise ValueError(
+                    f"Cannot set a '{statistic}' tolerance on '{name}'. "
+                    f"Options are {', '.join(sorted(names))}."
+                )
+            if statistic == "ellipse" and not set(ELLIPSE_COORDINATES[name]) <= outputs:
+                raise ValueError(
+                    f"The '{name}' ellipse requires exporting "
+                    f"{' and '.join(ELLIPSE_COORDINATES[name])}."
+                )
+            checked[(name, statistic)] = tolerance
+        return checked
+
+    def __converged(self):
+        """Whether the convergence targets of the running campaign are met."""
+        return self._tolerances is not None and self.statistics.converged(
+            self._tolerances, min_count=self._min_simulations
+        )
+
+    def simulate_distributed(
+        self,
+        number_of_simulations,
+        host="127.0.0.1",
+        port=0,
+        append=False,
+        range_size=10,
+        lease_timeout=600,
+        local_workers=0,
+        seed=None,
+        sampler=None,
+        **kwargs,
+    ):  # pylint: disable=too-many-statements
+        """
+        Runs the Monte Carlo simulation on workers connected to a broker
+        served by this process, and saves all data.
+
+        The broker hands out ranges of simulation indices to the workers and
+        stores the results they send back. Workers are started on any machine
+        with ``MonteCarlo.run_worker`` on a ``MonteCarlo`` built with the
+        same stochastic models, e.g. by running the same script. A range
+        whose worker disconnects, or that is not submitted within
+        ``lease_timeout``, is handed out again; simulations are seeded by
+        index, so it reproduces the same samples.
+
+        Parameters
+        ----------
+        number_of_simulations : int
+            Number of simulations to be run, must be non-negative.
+        host : str, optional
+            Address the broker listens on. Use ``"0.0.0.0"`` to accept
+            workers from other machines. Default is ``"127.0.0.1"``.
+        port : int, optional
+            Port the broker listens on, 0 for any free port. Default is 0.
+        append : bool, optional
+            If True, the results will be appended to the existing files. If
+            False, the files will be overwritten. Default is False.
+        range_size : int, optional
+            Number of simulations per range handed out. Default is 10.
+        lease_timeout : float, optional
+            Seconds after which a range not yet submitted is handed out
+            again. Should be well above the time a worker takes to run one
+            range. Default is 600.
+        local_workers : int, optional
+            Number of worker processes started on this machine. Requires
+            the ``multiprocess`` library. Default is 0.
+        seed : int, optional
+            Entropy of the campaign, see ``simulate``. Default is None.
+        sampler : str, QMCSampler, optional
+            Sampling design of the random inputs, see ``simulate``.
+            Default is None.
+        kwargs : dict
+            Custom arguments for simulation export, see ``simulate``.
+
+        Returns
+        -------
+        None
+        """
+        self.__start_campaign(number_of_simulations, append, seed, sampler, kwargs)
+
+        sim_monitor = _SimMonitor(
+            initial_count=self._initial_sim_idx,
+            n_simulations=self.number_of_simulations,
+            start_time=time(),
+            statistics=self.statistics,
+        )
+
+        def on_records(outputs):
+            sim_monitor.update(outputs)
+            sim_monitor.print_update_status(outputs[-1]["index"])
+
+        broker = MonteCarloBroker(
+            self,
+            self._pending_indices,
+            self._campaign,
+            host=host,
+            port=port,
+            range_size=range_size,
+            lease_timeout=lease_timeout,
+            export_config=kwargs,
+            on_records=on_records,
+        )
+        broker.start()
+        _SimMonitor.reprint(
+            "Broker listening on {}:{}, waiting for workers.".format(*broker.address)
+        )
+
+        processes = []
+        if local_workers:
+            self.__share_prototypes()
+            multiprocess = _import_multiprocess()
+            for _ in range(local_workers):
+                worker = multiprocess.Process(
+                    target=self.run_worker, args=(broker.address,)
+                )
+                processes.append(worker)
+                worker.start()
+
+        try:
+            broker.wait()
+            for worker in processes:
+                worker.join()
+
+            if broker.errors:
+                for message in broker.errors:
+                    _SimMonitor.reprint(message)
+                raise RuntimeError(
+                    "An error occurred during the simulation. \n"
+                    f"Check the logs and error file {self.error_file} "
+                    "for more information."
+                )
+
+            sim_monitor.print_final_status()
+
+        except KeyboardInterrupt:
+            _SimMonitor.reprint("Keyboard Interrupt, files saved.")
+
+        finally:
+            broker.shutdown()
+            for worker in processes:
+                if worker.is_alive():
+                    worker.terminate()
+                worker.join()
+
+        self.__terminate_simulation()
+
+    def run_worker(self, address, connect_timeout=60):
+        """
+        Runs simulations handed out by a ``simulate_distributed`` broker
+        until the campaign is done.
+
+        Parameters
+        ----------
+        address : tuple
+            ``(host, port)`` of the broker.
+        connect_timeout : float, optional
+            Seconds to keep trying to connect to the broker. Default is 60.
+
+        Returns
+        -------
+        int
+            Number of simulation ranges run by this worker.
+        """
+        return run_worker(
+            self.__simulate_range, address, connect_timeout=connect_timeout
+        )
+
+    def __simulate_range(self, indices, campaign):
+        """Runs the simulations of ``indices`` for a distributed campaign.
+        Stops at the first failed simulation.
+
+        Returns
+        -------
+        tuple
+            Lists of the inputs, outputs and errors records, and the error
+            message or None.
+        """
+        if campaign != getattr(self, "_campaign", None):
+            self.__set_campaign(campaign)
+
+        inputs, outputs = [], []
+        for sim_idx in indices:
+            try:
+                self.__seed_simulation(sim_idx)
+                flight = self.__run_single_simulation()
+                outputs_dict = self.__evaluate_flight_outputs(flight, sim_idx)
+            except Exception:  # pylint: disable=broad-except
+                message = f"Error on iteration {sim_idx}:\n{traceback.format_exc()}"
+                return inputs, outputs, [self.__evaluate_flight_inputs(sim_idx)], message
+            inputs.append(self.__evaluate_flight_inputs(sim_idx))
+            outputs.append(outputs_dict)
+        return inputs, outputs, [], None
+
+    def __start_campaign(
+        self, number_of_simulations, append, seed, sampler, export_config
+    ):
+        """Sets up the files, the checkpoint, the sampler and the indices
+        still to run."""
+        self._export_config = export_config
         self.number_of_simulations = number_of_simulations
-        self._initial_sim_idx = self.num_of_loaded_sims if append else 0
 
         _SimMonitor.reprint("Starting Monte Carlo analysis")
 
         self.__setup_files(append)
+        self.__set_campaign(self.__load_checkpoint(append, seed, sampler))
+
+        # The statistics of a resumed campaign start from the stored outputs
+        done_columns = self.storage.read_columns(self._output_file)
+        self.statistics = MonteCarloStatistics()
+        self.statistics.update_columns(done_columns)
+        done = done_columns.get("index", [])
+        self._pending_indices = np.setdiff1d(
+            np.arange(number_of_simulations), np.asarray(done, dtype=int)
+        ).tolist()
+        self._initial_sim_idx = number_of_simulations - len(self._pending_indices)
+
+    def __load_checkpoint(self, append, seed, sampler):
+        """Reads the campaign entropy and sampler from the checkpoint file when
+        resuming, or sets them, and saves the checkpoint.
 
-        if parallel:
-            self.__run_in_parallel(n_workers)
+        Returns
+        -------
+        dict
+            The campaign: its entropy, number of simulations and sampler.
+        """
+        checkpoint = {}
+        if append and self.checkpoint_file.exists():
+            with open(self.checkpoint_file, encoding="utf-8") as f:
+                checkpoint = json.load(f)
+
+        if seed is not None:
+            if checkpoint and checkpoint["entropy"] != seed:
+                warnings.warn(
+                    "The given seed differs from the seed of the checkpoint. "
+                    "The appended simulations will not match the ones of an "
+                    "uninterrupted campaign.",
+                    UserWarning,
+                )
+            entropy = seed
+        elif checkpoint:
+            entropy = checkpoint["entropy"]
         else:
-            self.__run_in_serial()
+            entropy = np.random.SeedSequence().entropy
 
-        self.__terminate_simulation()
+        if isinstance(sampler, QMCSampler):
+            method, scramble = sampler.method, sampler.scramble
+        elif sampler is not None:
+            method, scramble = sampler, True
+        else:
+            method = checkpoint.get("sampler")
+            scramble = checkpoint.get("scramble", True)
+
+        campaign = {
+            "entropy": entropy,
+            "number_of_simulations": self.number_of_simulations,
+            "sampler": method,
+            "scramble": scramble,
+        }
+        with open(self.checkpoint_file, "w", encoding="utf-8") as f:
+            json.dump(campaign, f)
+        return campaign
+
+    def __set_campaign(self, campaign):
+        """Sets the entropy and, if any, the quasi-random sampler of the
+        campaign on the stochastic models."""
+        self._campaign = campaign
+        self._entropy = campaign["entropy"]
+        models = (self.environment, self.rocket, self.flight)
+        if campaign["sampler"] is None:
+            self._sampler = None
+            QMCSampler.detach(*models)
+            return
+        self._sampler = QMCSampler(campaign["sampler"], campaign["scramble"])
+        self._sampler.attach(*models)
+        # spawn keys of length 2 never collide with the per-simulation ones
+        self._sampler.generate(
+            campaign["number_of_simulations"],
+            self.__draw_inputs,
+            seed=np.random.SeedSequence(self._entropy, spawn_key=(0, 0)),
+        )
+
+    def __draw_inputs(self):
+        """Draws the random inputs of one simulation, as
+        ``__run_single_simulation`` does, without running it."""
+        self.rocket.create_object()
+        self.environment.create_object()
+        self.flight._randomize_rail_length()
+        self.flight._randomize_inclination()
+        self.flight._randomize_heading()
+
+    def __share_prototypes(self):
+        """Publishes the large arrays of the stochastic models into shared
+        memory, once per MonteCarlo, so that local workers attach them."""
+        if self._shared_arrays is None:
+            self._shared_arrays = SharedArrays()
+        self._shared_arrays.publish(self.environment, self.rocket, self.flight)
+
+    def __seed_simulation(self, sim_idx):
+        """Seeds the stochastic models with the seed of simulation
+        ``sim_idx``, derived from the campaign entropy and the index, and
+        selects its point of the quasi-random sampler."""
+        seed = np.random.SeedSequence(self._entropy, spawn_key=(sim_idx,))
+        self.environment._set_stochastic(seed)
+        self.rocket._set_stochastic(seed)
+        self.flight._set_stochastic(seed)
+        if self._sampler is not None:
+            self._sampler.set_sample(
+                sim_idx, np.random.SeedSequence(self._entropy, spawn_key=(sim_idx, 1))
+            )
 
     def __setup_files(self, append):
         """
@@ -247,16 +690,12 @@ class MonteCarlo:
         None
         """
         # Create data files for inputs, outputs and error logging
-        open_mode = "r+" if append else "w+"
-
         try:
-            with open(self._input_file, open_mode, encoding="utf-8") as input_file:
-                idx_i = len(input_file.readlines())
-            with open(self._output_file, open_mode, encoding="utf-8") as output_file:
-                idx_o = len(output_file.readlines())
-            with open(self._error_file, open_mode, encoding="utf-8"):
-                pass
+            for path in (self._input_file, self._output_file, self._error_file):
+                self.storage.create(path, truncate=not append)
 
+            idx_i = self.storage.count(self._input_file)
+            idx_o = self.storage.count(self._output_file)
             if idx_i != idx_o and not append:
                 warnings.warn(
                     "Input and output files are not synchronized", UserWarning
@@ -265,6 +704,20 @@ class MonteCarlo:
         except OSError as error:
             raise OSError(f"Error creating files: {error}") from error
 
+    def __write_records(self, inputs, outputs):
+        """Appends buffered inputs and outputs records to the storage. Each
+        buffer is cleared once its table is written, so writing again after
+        an interruption does not store the same records twice."""
+        self.storage.write(self._input_file, inputs, self._export_config)
+        inputs.clear()
+        self.storage.write(self._output_file, outputs, self._export_config)
+        outputs.clear()
+
+    def __write_error(self, inputs_dict):
+        """Appends the inputs record of a failed simulation to the storage."""
+        if inputs_dict is not None:
+            self.storage.write(self._error_file, [inputs_dict], self._export_config)
+
     def __run_in_serial(self):
         """
         Runs the monte carlo simulation in serial mode.
@@ -277,45 +730,62 @@ class MonteCarlo:
             initial_count=self._initial_sim_idx,
             n_simulations=self.number_of_simulations,
             start_time=time(),
+            statistics=self.statistics,
         )
+        inputs_buffer, outputs_buffer = [], []
+        inputs_dict = None
+        sim_idx = None
         try:
-            while sim_monitor.keep_simulating():
-                sim_monitor.increment()
-                inputs_json, outputs_json = "", ""
+            for sim_idx in self._pending_indices:
+                inputs_dict = None
+                if self.__converged():
+                    break
 
+                self.__seed_simulation(sim_idx)
                 flight = self.__run_single_simulation()
-                inputs_json = self.__evaluate_flight_inputs(sim_monitor.count)
-                outputs_json = self.__evaluate_flight_outputs(flight, sim_monitor.count)
+                inputs_dict = self.__evaluate_flight_inputs(sim_idx)
+                outputs_dict = self.__evaluate_flight_outputs(flight, sim_idx)
 
-                with open(self.input_file, "a", encoding="utf-8") as f:
-                    f.write(inputs_json)
-                with open(self.output_file, "a", encoding="utf-8") as f:
-                    f.write(outputs_json)
+                inputs_buffer.append(inputs_dict)
+                outputs_buffer.append(outputs_dict)
+                inputs_dict = None
+                if len(outputs_buffer) >= self.storage.chunk_size:
+                    self.__write_records(inputs_buffer, outputs_buffer)
 
-                sim_monitor.print_update_status(sim_monitor.count)
+                sim_monitor.update([outputs_dict])
+                sim_monitor.print_update_status(sim_idx)
 
+            self.__write_records(inputs_buffer, outputs_buffer)
             sim_monitor.print_final_status()
 
         except KeyboardInterrupt:
+            self.__write_records(inputs_buffer, outputs_buffer)
             _SimMonitor.reprint("Keyboard Interrupt, files saved.")
-            with open(self._error_file, "a", encoding="utf-8") as f:
-                f.write(inputs_json)
+            self.__write_error(inputs_dict)
 
         except Exception as error:
-            _SimMonitor.reprint(f"Error on iteration {sim_monitor.count}: {error}")
-            with open(self._error_file, "a", encoding="utf-8") as f:
-                f.write(inputs_json)
+            self.__write_records(inputs_buffer, outputs_buffer)
+            _SimMonitor.reprint(f"Error on iteration {sim_idx}: {error}")
+            self.__write_error(inputs_dict)
             raise error
 
-    def __run_in_parallel(self, n_workers=None):
+    def __run_in_parallel(self, n_workers=None, batch_size=10):
         """
         Runs the monte carlo simulation in parallel.
 
+        Workers claim batches of the pending simulation indices through a
+        shared counter and send the records of each batch through a queue.
+        The main process is the only writer: it stores the records and
+        prints the progress.
+
         Parameters
         ----------
         n_workers: int, optional
             Number of workers to be used. If None, the number of workers
             will be equal to the number of CPUs available. Default is None.
+        batch_size : int, optional
+            Number of simulations claimed and sent at once by each worker.
+            Default is 10.
 
         Returns
         -------
@@ -325,57 +795,108 @@ class MonteCarlo:
 
         _SimMonitor.reprint(f"Running Monte Carlo simulation with {n_workers} workers.")
 
-        multiprocess, managers = _import_multiprocess()
+        multiprocess = _import_multiprocess()
 
-        with _create_multiprocess_manager(multiprocess, managers) as manager:
-            mutex = manager.Lock()
-            simulation_error_event = manager.Event()
-            sim_monitor = manager._SimMonitor(
-                initial_count=self._initial_sim_idx,
-                n_simulations=self.number_of_simulations,
-                start_time=time(),
+        # Claiming is over once the convergence targets are met
+        exhausted = len(self._pending_indices)
+        next_idx = multiprocess.Value("q", exhausted if self.__converged() else 0)
+        stop_event = multiprocess.Event()
+        records_queue = multiprocess.Queue()
+        sim_monitor = _SimMonitor(
+            initial_count=self._initial_sim_idx,
+            n_simulations=self.number_of_simulations,
+            start_time=time(),
+            statistics=self.statistics,
+        )
+
+        processes = []
+        for _ in range(n_workers):
+            sim_producer = multiprocess.Process(
+                target=self.__sim_producer,
+                args=(next_idx, batch_size, records_queue, stop_event),
             )
+            processes.append(sim_producer)
+            sim_producer.start()
 
-            processes = []
-            seeds = np.random.SeedSequence().spawn(n_workers)
-
-            for seed in seeds:
-                sim_producer = multiprocess.Process(
-                    target=self.__sim_producer,
-                    args=(
-                        seed,
-                        sim_monitor,
-                        mutex,
-                        simulation_error_event,
-                    ),
+        try:
+            failed = self.__write_worker_records(
+                records_queue, processes, sim_monitor, next_idx
+            )
+            for sim_producer in processes:
+                sim_producer.join()
+
+            # Handle error from the child processes
+            if failed:
+                raise RuntimeError(
+                    "An error occurred during the simulation. \n"
+                    f"Check the logs and error file {self.error_file} "
+                    "for more information."
                 )
-                processes.append(sim_producer)
-                sim_producer.start()
 
-            try:
+            sim_monitor.print_final_status()
+
+        # Handle error from the main process
+        # pylint: disable=broad-except
+        except (Exception, KeyboardInterrupt) as error:
+            stop_event.set()
+            if isinstance(error, KeyboardInterrupt):
+                # Workers still flush their records after the stop
+                self.__write_worker_records(
+                    records_queue, processes, sim_monitor, next_idx
+                )
+            else:
                 for sim_producer in processes:
-                    sim_producer.join()
-
-                # Handle error from the child processes
-                if simulation_error_event.is_set():
-                    raise RuntimeError(
-                        "An error occurred during the simulation. \n"
-                        f"Check the logs and error file {self.error_file} "
-                        "for more information."
-                    )
+                    sim_producer.terminate()
+            for sim_producer in processes:
+                sim_producer.join()
 
-                sim_monitor.print_final_status()
+            if not isinstance(error, KeyboardInterrupt):
+                raise error
 
-            # Handle error from the main process
-            # pylint: disable=broad-except
-            except (Exception, KeyboardInterrupt) as error:
-                simulation_error_event.set()
+    def __write_worker_records(self, records_queue, processes, sim_monitor, next_idx):
+        """Single writer of the parallel mode. Stores the messages of the
+        workers until all of them are done, and ends the claiming of new
+        batches once the convergence targets are met.
 
-                for sim_producer in processes:
-                    sim_producer.join()
-
-                if not isinstance(error, KeyboardInterrupt):
-                    raise error
+        Returns
+        -------
+        bool
+            True if a worker failed.
+        """
+        inputs_buffer, outputs_buffer = [], []
+        running = len(processes)
+        failed = False
+        try:
+            while running:
+                try:
+                    kind, inputs, outputs = records_queue.get(timeout=1)
+                except queue.Empty:
+                    # A worker that died without saying goodbye is a failure
+                    if not any(p.is_alive() for p in processes):
+                        failed = failed or any(p.exitcode for p in processes)
+                        break
+                    continue
+
+                if kind == "records":
+                    inputs_buffer.extend(inputs)
+                    outputs_buffer.extend(outputs)
+                    if len(outputs_buffer) >= self.storage.chunk_size:
+                        self.__write_records(inputs_buffer, outputs_buffer)
+                    sim_monitor.update(outputs)
+                    sim_monitor.print_update_status(outputs[-1]["index"])
+                    if self.__converged():
+                        with next_idx.get_lock():
+                            next_idx.value = len(self._pending_indices)
+                elif kind == "error":
+                    self.__write_error(inputs)
+                    if outputs is not None:
+                        _SimMonitor.reprint(outputs)
+                        failed = True
+                else:  # done
+                    running -= 1
+        finally:
+            self.__write_records(inputs_buffer, outputs_buffer)
+        return failed
 
     def __validate_number_of_workers(self, n_workers):
         if n_workers is None or n_workers > os.cpu_count():
@@ -385,64 +906,69 @@ class MonteCarlo:
             raise ValueError("Number of workers must be at least 2 for parallel mode.")
         return n_workers
 
-    def __sim_producer(self, seed, sim_monitor, mutex, error_event):  # pylint: disable=too-many-statements
+    def __sim_producer(self, next_idx, batch_size, records_queue, stop_event):  # pylint: disable=too-many-statements
         """Simulation producer to be used in parallel by multiprocessing.
 
         Parameters
         ----------
-        seed : int
-            The seed to set the random number generator.
-        sim_monitor : _SimMonitor
-            The simulation monitor object to keep track of the simulations.
-        mutex : multiprocess.Lock
-            The mutex to lock access to critical regions.
-        error_event : multiprocess.Event
-            Event signaling an error occurred during the simulation.
+        next_idx : multiprocess.Value
+            Position in the pending indices of the next simulation not yet
+            claimed by a worker.
+        batch_size : int
+            Number of simulations claimed and sent at once.
+        records_queue : multiprocess.Queue
+            Queue to the writer. Messages are ``("records", inputs, outputs)``
+            lists, ``("error", inputs, message)`` and ``("done", None, None)``.
+        stop_event : multiprocess.Event
+            Event signaling that the simulation must stop.
         """
+        inputs_dict = None
+        sim_idx = None
+        pending = self._pending_indices
         try:
-            # Ensure Processes generate different random numbers
-            self.environment._set_stochastic(seed)
-            self.rocket._set_stochastic(seed)
-            self.flight._set_stochastic(seed)
-
-            while sim_monitor.keep_simulating():
-                sim_idx = sim_monitor.increment() - 1
-                inputs_json, outputs_json = "", ""
-
-                flight = self.__run_single_simulation()
-                inputs_json = self.__evaluate_flight_inputs(sim_idx)
-                outputs_json = self.__evaluate_flight_outputs(flight, sim_idx)
-
-                try:
-                    mutex.acquire()
-                    if error_event.is_set():
-                        sim_monitor.reprint(
+            while not stop_event.is_set():
+                with next_idx.get_lock():
+                    start = next_idx.value
+                    stop = min(start + batch_size, len(pending))
+                    next_idx.value = max(start, stop)
+                if start >= stop:
+                    break
+
+                inputs_batch, outputs_batch = [], []
+                for sim_idx in pending[start:stop]:
+                    inputs_dict = None
+                    self.__seed_simulation(sim_idx)
+                    flight = self.__run_single_simulation()
+                    inputs_dict = self.__evaluate_flight_inputs(sim_idx)
+                    outputs_dict = self.__evaluate_flight_outputs(flight, sim_idx)
+
+                    if stop_event.is_set():
+                        records_queue.put(("error", inputs_dict, None))
+                        _SimMonitor.reprint(
                             "Simulation Interrupt, files from simulation "
                             f"{sim_idx} saved."
                         )
-                        with open(self.error_file, "a", encoding="utf-8") as f:
-                            f.write(inputs_json)
-
+                        inputs_dict = None
                         break
 
-                    with open(self.input_file, "a", encoding="utf-8") as f:
-                        f.write(inputs_json)
-                    with open(self.output_file, "a", encoding="utf-8") as f:
-                        f.write(outputs_json)
+                    inputs_batch.append(inputs_dict)
+                    outputs_batch.append(outputs_dict)
+                    inputs_dict = None
 
-                    sim_monitor.print_update_status(sim_idx)
-                finally:
-                    mutex.release()
+                if outputs_batch:
+                    records_queue.put(("records", inputs_batch, outputs_batch))
+
+        except KeyboardInterrupt:
+            records_queue.put(("error", inputs_dict, None))
+            stop_event.set()
 
         except Exception:  # pylint: disable=broad-except
-            mutex.acquire()
-            with open(self.error_file, "a", encoding="utf-8") as f:
-                f.write(inputs_json)
+            message = f"Error on iteration {sim_idx}:\n{traceback.format_exc()}"
+            records_queue.put(("error", inputs_dict, message))
+            stop_event.set()
 
-            sim_monitor.reprint(f"Error on iteration {sim_idx}:")
-            sim_monitor.reprint(traceback.format_exc())
-            error_event.set()
-            mutex.release()
+        finally:
+            records_queue.put(("done", None, None))
 
     def __run_single_simulation(self):
         """Runs a single simulation and returns the inputs and outputs.
@@ -452,8 +978,19 @@ class MonteCarlo:
         Flight
             The flight object of the simulation.
         """
+        rocket = self.rocket.create_object()
+        flight_kwargs = self.flight_kwargs
+        # Flights reduce their outputs while integrating when nothing else is
+        # read from them. Controllers may need the whole state history
+        if (
+            self.data_collector is None
+            and "outputs" not in flight_kwargs
+            and not rocket._controllers
+            and set(self.export_list) <= STREAMING_OUTPUTS
+        ):
+            flight_kwargs = {"outputs": self.export_list, **flight_kwargs}
         return Flight(
-            rocket=self.rocket.create_object(),
+            rocket=rocket,
             environment=self.environment.create_object(),
             rail_length=self.flight._randomize_rail_length(),
             inclination=self.flight._randomize_inclination(),
@@ -461,6 +998,7 @@ class MonteCarlo:
             initial_solution=self.flight.initial_solution,
             terminate_on_apogee=self.flight.terminate_on_apogee,
             time_overshoot=self.flight.time_overshoot,
+            **flight_kwargs,
         )
 
     def __evaluate_flight_inputs(self, sim_idx):
@@ -473,8 +1011,8 @@ class MonteCarlo:
 
         Returns
         -------
-        str
-            A JSON compatible dictionary with the inputs of the simulation.
+        dict
+            The inputs of the simulation.
         """
         inputs_dict = dict(
             item
@@ -486,9 +1024,7 @@ class MonteCarlo:
             for item in d.items()
         )
         inputs_dict["index"] = sim_idx
-        return (
-            json.dumps(inputs_dict, cls=RocketPyEncoder, **self._export_config) + "\n"
-        )
+        return inputs_dict
 
     def __evaluate_flight_outputs(self, flight, sim_idx):
         """Evaluates the outputs of a single flight simulation.
@@ -502,8 +1038,8 @@ class MonteCarlo:
 
         Returns
         -------
-        str
-            A JSON compatible dictionary with the outputs of the simulation.
+        dict
+            The outputs of the simulation.
         """
         outputs_dict = {
             export_item: getattr(flight, export_item)
@@ -522,9 +1058,7 @@ class MonteCarlo:
                     ) from e
             outputs_dict = outputs_dict | additional_exports
 
-        return (
-            json.dumps(outputs_dict, cls=RocketPyEncoder, **self._export_config) + "\n"
-        )
+        return outputs_dict
 
     def __terminate_simulation(self):
         """
@@ -755,10 +1289,7 @@ class MonteCarlo:
         -------
         None
         """
-        self.inputs_log = []
-        with open(self.input_file, mode="r", encoding="utf-8") as rows:
-            for line in rows:
-                self.inputs_log.append(json.loads(line))
+        self.inputs_log = self.storage.read_rows(self.input_file)
 
     def set_outputs_log(self):
         """
@@ -768,10 +1299,7 @@ class MonteCarlo:
         -------
         None
         """
-        self.outputs_log = []
-        with open(self.output_file, mode="r", encoding="utf-8") as rows:
-            for line in rows:
-                self.outputs_log.append(json.loads(line))
+        self.outputs_log = self.storage.read_rows(self.output_file)
 
     def set_errors_log(self):
         """
@@ -781,10 +1309,7 @@ class MonteCarlo:
         -------
         None
         """
-        self.errors_log = []
-        with open(self.error_file, mode="r", encoding="utf-8") as errors:
-            for line in errors:
-                self.errors_log.append(json.loads(line))
+        self.errors_log = self.storage.read_rows(self.error_file)
 
     def set_num_of_loaded_sims(self):
         """
@@ -795,8 +1320,7 @@ class MonteCarlo:
         -------
         None
         """
-        with open(self.output_file, mode="r", encoding="utf-8") as outputs:
-            self.num_of_loaded_sims = sum(1 for _ in outputs)
+        self.num_of_loaded_sims = self.storage.count(self.output_file)
 
     def set_results(self):
         """
@@ -811,43 +1335,31 @@ class MonteCarlo:
                     'max_speed': [100, 101, 102, ...],
                 }
 
+        With binary storages, numeric results are read-only numpy arrays
+        mapped from the stored columns instead of lists.
+
         Returns
         -------
         None
         """
-        self.results = {}
-        for result in self.outputs_log:
-            for key, value in result.items():
-                if key in self.results:
-                    self.results[key].append(value)
-                else:
-                    self.results[key] = [value]
+        self.results = self.storage.read_columns(self.output_file)
 
     def set_processed_results(self):
         """
-        Creates a dictionary with the mean and standard deviation of each
-        parameter available in the results.
+        Creates a dictionary with the mean, median, standard deviation and
+        95% prediction interval of each parameter available in the results.
+
+        The ``statistics`` are rebuilt from the results, so that quantiles
+        are exact. Only the statistics read while a simulation runs hold P²
+        estimates of the quantiles, which are exact up to five simulations.
 
         Returns
         -------
         None
         """
-        self.processed_results = {}
-        for result, values in self.results.items():
-            try:
-                mean = np.mean(values)
-                stdev = np.std(values)
-                self.processed_results[result] = (mean, stdev)
-                pi_low = np.quantile(values, 0.025)
-                pi_high = np.quantile(values, 0.975)
-                median = np.median(values)
-            except TypeError:
-                mean = None
-                stdev = None
-                pi_low = None
-                pi_high = None
-                median = None
-            self.processed_results[result] = (mean, median, stdev, pi_low, pi_high)
+        self.statistics = MonteCarloStatistics()
+        self.statistics.update_columns(self.results)
+        self.processed_results = self.statistics.processed_results()
 
     # Import methods
 
@@ -871,14 +1383,10 @@ class MonteCarlo:
         file without the need to run simulations. You can use previously saved
         files to process analyze the results or to continue a simulation.
         """
-        filepath = filename if filename else self.filename.with_suffix(".outputs.txt")
+        filepath = filename if filename else self.storage.path("outputs")
 
-        try:
-            with open(filepath, "r+", encoding="utf-8"):
-                self.output_file = filepath
-        except FileNotFoundError:
-            with open(filepath, "w+", encoding="utf-8"):
-                self.output_file = filepath
+        self.storage.create(filepath)
+        self.output_file = filepath
 
         _SimMonitor.reprint(
             f"A total of {self.num_of_loaded_sims} simulations results were "
@@ -899,14 +1407,10 @@ class MonteCarlo:
         -------
         None
         """
-        filepath = filename if filename else self.filename.with_suffix(".inputs.txt")
+        filepath = filename if filename else self.storage.path("inputs")
 
-        try:
-            with open(filepath, "r+", encoding="utf-8"):
-                self.input_file = filepath
-        except FileNotFoundError:
-            with open(filepath, "w+", encoding="utf-8"):
-                self.input_file = filepath
+        self.storage.create(filepath)
+        self.input_file = filepath
 
         _SimMonitor.reprint(f"The following input file was imported: {self.input_file}")
 
@@ -924,14 +1428,10 @@ class MonteCarlo:
         -------
         None
         """
-        filepath = filename if filename else self.filename.with_suffix(".errors.txt")
+        filepath = filename if filename else self.storage.path("errors")
 
-        try:
-            with open(filepath, "r+", encoding="utf-8"):
-                self.error_file = filepath
-        except FileNotFoundError:
-            with open(filepath, "w+", encoding="utf-8"):
-                self.error_file = filepath
+        self.storage.create(filepath)
+        self.error_file = filepath
 
         _SimMonitor.reprint(f"The following error file was imported: {self.error_file}")
 
@@ -1154,48 +1654,14 @@ class MonteCarlo:
 
 
 def _import_multiprocess():
-    """Import the necessary modules and submodules for the
-    multiprocess library.
+    """Import the multiprocess library.
 
     Returns
     -------
-    tuple
-        Tuple containing the imported modules.
+    module
+        The imported module.
     """
-    multiprocess = import_optional_dependency("multiprocess")
-    managers = import_optional_dependency("multiprocess.managers")
-
-    return multiprocess, managers
-
-
-def _create_multiprocess_manager(multiprocess, managers):
-    """Creates a manager for the multiprocess control of the
-    Monte Carlo simulation.
-
-    Parameters
-    ----------
-    multiprocess : module
-        Multiprocess module.
-    managers : module
-        Managing submodules of the multiprocess module.
-
-    Returns
-    -------
-    MonteCarloManager
-        Subclass of BaseManager with the necessary classes registered.
-    """
-
-    class MonteCarloManager(managers.BaseManager):
-        """Custom manager for shared objects in the Monte Carlo simulation."""
-
-        def __init__(self):
-            super().__init__()
-            self.register("Lock", multiprocess.Lock)
-            self.register("Queue", multiprocess.Queue)
-            self.register("Event", multiprocess.Event)
-            self.register("_SimMonitor", _SimMonitor)
-
-    return MonteCarloManager()
+    return import_optional_dependency("multiprocess")
 
 
 class _SimMonitor:
@@ -1203,19 +1669,38 @@ class _SimMonitor:
 
     _last_print_len = 0
 
-    def __init__(self, initial_count, n_simulations, start_time):
+    def __init__(self, initial_count, n_simulations, start_time, statistics=None):
         self.initial_count = initial_count
         self.count = initial_count
         self.n_simulations = n_simulations
         self.start_time = start_time
+        self.statistics = statistics
 
     def keep_simulating(self):
         return self.count < self.n_simulations
 
-    def increment(self):
-        self.count += 1
+    def increment(self, n=1):
+        self.count += n
         return self.count
 
+    def update(self, outputs):
+        """Counts finished simulations and adds their outputs records to the
+        streaming statistics, if any.
+
+        Parameters
+        ----------
+        outputs : list
+            Outputs dictionaries of the finished simulations.
+
+        Returns
+        -------
+        int
+            The updated count of simulations.
+        """
+        if self.statistics is not None:
+            self.statistics.update(outputs)
+        return self.increment(len(outputs))
+
     def print_update_status(self, sim_idx):
         """Prints a message on the same line as the previous one and replaces
         the previous message with the new one, deleting the extra characters
@@ -0,0 +1,300 @@
+"""Work queue for running ``MonteCarlo`` simulations on several machines.
+
+A broker hands out ranges of simulation indices to workers over TCP and
+stores the records they send back. Every simulation is seeded from the
+campaign entropy and its index, so a range handed out again after its worker
+was lost reproduces the same samples.
+
+Messages are JSON documents, one per line. Workers send::
+
+    {"op": "claim"}
+    {"op": "submit", "lease": 3, "inputs": [...], "outputs": [...],
+     "errors": [...], "message": null}
+
+and the broker replies to a claim with ``{"lease": 3, "indices": [20, 21,
+...], "campaign": {"entropy": ..., ...}, "export_config": {...}}``, ``{"wait": 1.0}``
+while all remaining ranges are leased, or ``{"done": true}``.
+"""
+
+import json
+import socket
+import socketserver
+import threading
+import time
+from collections import deque
+
+from uvicrocketpy._encoders import RocketPyEncoder
+
+
+def _send(stream, message, **encoder_kwargs):
+    line = json.dumps(message, cls=RocketPyEncoder, **encoder_kwargs) + "\n"
+    stream.write(line.encode())
+    stream.flush()
+
+
+def _receive(stream):
+    line = stream.readline()
+    if not line:
+        raise ConnectionError("Connection closed by the other end.")
+    return json.loads(line)
+
+
+class _WorkQueue:
+    """Ranges of simulation indices and their leases. Ranges whose lease
+    expired, or whose worker disconnected, are handed out again."""
+
+    def __init__(self, indices, range_size, lease_timeout):
+        self.pending = deque(
+            tuple(indices[i : i + range_size])
+            for i in range(0, len(indices), range_size)
+        )
+        self.leases = {}
+        self.lease_timeout = lease_timeout
+        self.n_ranges = len(self.pending)
+        self.n_completed = 0
+        self._next_lease = 0
+        self.lock = threading.Lock()
+        self.finished = threading.Event()
+        if not self.n_ranges:
+            self.finished.set()
+
+    def _expire(self):
+        now = time.monotonic()
+        for lease, (indices, deadline, _) in list(self.leases.items()):
+            if deadline < now:
+                del self.leases[lease]
+                self.pending.appendleft(indices)
+
+    def claim(self, owner):
+        """Returns ``(lease, indices)``, None while every remaining range
+        is leased, or raises StopIteration when every range is completed."""
+        with self.lock:
+            if self.finished.is_set():
+                raise StopIteration
+            self._expire()
+            if not self.pending:
+                return None
+            indices = self.pending.popleft()
+            lease = self._next_lease
+            self._next_lease += 1
+            deadline = time.monotonic() + self.lease_timeout
+            self.leases[lease] = (indices, deadline, owner)
+            return lease, indices
+
+    def complete(self, lease):
+        """Ends a lease. Returns False if it had expired or was released.
+        Call with ``lock`` held, and ``mark_stored`` once its records are
+        stored."""
+        if lease not in self.leases:
+            return False
+        del self.leases[lease]
+        self.n_completed += 1
+        return True
+
+    def mark_stored(self):
+        """Sets ``finished`` once the records of every range are stored.
+        Call with ``lock`` held."""
+        if self.n_completed == self.n_ranges:
+            self.finished.set()
+
+    def release(self, owner):
+        """Hands out again the ranges leased to a disconnected worker."""
+        with self.lock:
+            for lease, (indices, _, lease_owner) in list(self.leases.items()):
+                if lease_owner == owner:
+                    del self.leases[lease]
+                    self.pending.appendleft(indices)
+
+
+class _BrokerHandler(socketserver.StreamRequestHandler):
+    """Serves the messages of one worker connection."""
+
+    def handle(self):
+        broker = self.server.broker
+        owner = self.client_address
+        try:
+            while True:
+                try:
+                    message = _receive(self.rfile)
+                except (ConnectionError, OSError, ValueError):
+                    return
+                if message["op"] == "claim":
+                    _send(self.wfile, broker.claim(owner))
+                elif message["op"] == "submit":
+                    _send(self.wfile, {"ok": broker.submit(message)})
+        finally:
+            broker.queue.release(owner)
+
+
+class MonteCarloBroker:
+    """TCP server handing out simulation ranges of a ``MonteCarlo`` to
+    workers and storing their results.
+
+    Parameters
+    ----------
+    monte_carlo : MonteCarlo
+        Campaign whose storage receives the results. Its input, output and
+        error files must already be set up.
+    indices : list of int
+        Indices of the simulations to run.
+    campaign : dict
+        Settings workers need to reproduce the simulations, such as the
+        campaign entropy from which the seed of each simulation is derived.
+    host : str, optional
+        Address to listen on. Default is ``"127.0.0.1"``.
+    port : int, optional
+        Port to listen on, 0 for any free port. Default is 0.
+    range_size : int, optional
+        Number of simulations per handed out range. Default is 10.
+    lease_timeout : float, optional
+        Seconds after which a range not yet submitted is handed out again.
+        Default is 600.
+    export_config : dict, optional
+        Export arguments of ``MonteCarlo.simulate`` sent to the workers.
+    on_records : callable, optional
+        Called with the outputs of each stored range, e.g. to print progress.
+    """
+
+    def __init__(
+        self,
+        monte_carlo,
+        indices,
+        campaign,
+        host="127.0.0.1",
+        port=0,
+        range_size=10,
+        lease_timeout=600,
+        export_config=None,
+        on_records=None,
+    ):
+        self.monte_carlo = monte_carlo
+        self.queue = _WorkQueue(indices, range_size, lease_timeout)
+        self.export_config = export_config or {}
+        self.campaign = campaign
+        self.on_records = on_records
+        self.errors = []
+        self._server = socketserver.ThreadingTCPServer(
+            (host, port), _BrokerHandler, bind_and_activate=True
+        )
+        self._server.daemon_threads = True
+        self._server.broker = self
+        self._thread = None
+
+    @property
+    def address(self):
+        """``(host, port)`` the broker listens on."""
+        return self._server.server_address
+
+    def claim(self, owner):
+        """Reply to a claim message."""
+        try:
+            claimed = self.queue.claim(owner)
+        except StopIteration:
+            return {"done": True}
+        if claimed is None:
+            return {"wait": 1.0}
+        lease, indices = claimed
+        return {
+            "lease": lease,
+            "indices": indices,
+            "campaign": self.campaign,
+            "export_config": self.export_config,
+        }
+
+    def submit(self, message):
+        """Stores the records of a completed range, unless its lease expired
+        and it was handed out again."""
+        storage = self.monte_carlo.storage
+        with self.queue.lock:
+            if not self.queue.complete(message["lease"]):
+                return False
+            storage.write(self.monte_carlo.input_file, message["inputs"])
+            storage.write(self.monte_carlo.output_file, message["outputs"])
+            storage.write(self.monte_carlo.error_file, message["errors"])
+            if self.on_records is not None and message["outputs"]:
+                self.on_records(message["outputs"])
+            if message.get("message"):
+                # A failed simulation stops the campaign, as in MonteCarlo
+                self.errors.append(message["message"])
+                self.queue.finished.set()
+            # Only now, so that ``wait`` returns after the last write
+            self.queue.mark_stored()
+        return True
+
+    def start(self):
+        """Starts serving in a background thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def wait(self, timeout=None):
+        """Blocks until every range is completed. Returns False on timeout."""
+        return self.queue.finished.wait(timeout)
+
+    def shutdown(self):
+        """Stops serving and closes the socket."""
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def run_worker(simulate_range, address, retry_interval=1.0, connect_timeout=60):
+    """Claims and simulates ranges from a broker until the campaign is done.
+
+    Parameters
+    ----------
+    simulate_range : callable
+        ``simulate_range(indices, campaign)`` returning the ``(inputs,
+        outputs, errors, message)`` of the range: lists of records and the
+        error message of a failed simulation, or None.
+    address : tuple
+        ``(host, port)`` of the broker.
+    retry_interval : float, optional
+        Seconds between connection attempts. Default is 1.
+    connect_timeout : float, optional
+        Seconds to keep trying to connect to the broker. Default is 60.
+
+    Returns
+    -------
+    int
+        Number of ranges simulated by this worker. The worker stops when the
+        campaign is done or the broker is gone.
+    """
+    deadline = time.monotonic() + connect_timeout
+    while True:
+        try:
+            connection = socket.create_connection(tuple(address))
+            break
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(retry_interval)
+
+    n_ranges = 0
+    with connection, connection.makefile("rwb") as stream:
+        try:
+            while True:
+                _send(stream, {"op": "claim"})
+                reply = _receive(stream)
+                if reply.get("done"):
+                    return n_ranges
+                if "wait" in reply:
+                    time.sleep(reply["wait"])
+                    continue
+                inputs, outputs, errors, message = simulate_range(
+                    reply["indices"], reply["campaign"]
+                )
+                _send(
+                    stream,
+                    {
+                        "op": "submit",
+                        "lease": reply["lease"],
+                        "inputs": inputs,
+                        "outputs": outputs,
+                        "errors": errors,
+                        "message": message,
+                    },
+                    **reply["export_config"],
+                )
+                _receive(stream)
+                n_ranges += 1
+        except (ConnectionError, OSError):
+            return n_ranges
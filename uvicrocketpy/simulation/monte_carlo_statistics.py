@@ -0,0 +1,510 @@
+"""Streaming statistics of ``MonteCarlo`` outputs.
+
+The accumulators of this module are updated as simulations finish and keep a
+fixed amount of memory whatever the number of simulations: running moments
+(Welford's algorithm), P² quantile estimates (Jain and Chlamtac, 1985) and
+running covariances of the apogee and impact positions, from which the
+dispersion ellipses are drawn.
+"""
+
+import math
+from numbers import Real
+from statistics import NormalDist
+
+import numpy as np
+
+from uvicrocketpy.tools import sort_eigenvalues
+
+# Quantiles of ``MonteCarlo.processed_results``: the 95% prediction interval
+# and the median
+QUANTILES = (0.025, 0.5, 0.975)
+
+# Outputs whose joint dispersion is tracked, as ``name: (x_key, y_key)``
+ELLIPSE_COORDINATES = {
+    "apogee": ("apogee_x", "apogee_y"),
+    "impact": ("x_impact", "y_impact"),
+}
+
+# Statistics that convergence tolerances can be set on
+CONVERGENCE_STATISTICS = ("mean", "std", "interval", "ellipse")
+
+
+def _as_float(value):
+    """``value`` as a float, or None if it is not a real number."""
+    if isinstance(value, (Real, np.integer, np.floating)):
+        return float(value)
+    return None
+
+
+class RunningMoments:
+    """Count, mean and variance of a stream of samples (Welford's algorithm).
+
+    Attributes
+    ----------
+    count : int
+        Number of samples.
+    mean : float
+        Mean of the samples, nan if there are none.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = math.nan
+        self._m2 = 0.0
+
+    def update(self, value):
+        """Adds one sample."""
+        self.count += 1
+        if self.count == 1:
+            self.mean = value
+            return
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+    def update_many(self, values):
+        """Adds an array of samples at once, merging their moments (Chan et
+        al. parallel algorithm)."""
+        values = np.asarray(values, dtype=float)
+        count = values.size
+        if not count:
+            return
+        mean = values.mean()
+        m2 = np.sum((values - mean) ** 2)
+        if not self.count:
+            self.count, self.mean, self._m2 = count, mean, m2
+            return
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self._m2 += m2 + delta**2 * self.count * count / total
+        self.count = total
+
+    def variance(self, ddof=0):
+        """Variance of the samples, with ``ddof`` delta degrees of freedom as
+        ``np.var``."""
+        if self.count <= ddof:
+            return math.nan
+        return self._m2 / (self.count - ddof)
+
+    def std(self, ddof=0):
+        """Standard deviation of the samples, see ``variance``."""
+        return math.sqrt(self.variance(ddof))
+
+
+class P2Quantile:
+    """Estimate of one quantile of a stream of samples with the P² algorithm.
+
+    Five markers track the minimum, the maximum, the quantile and two
+    intermediate quantiles. Their heights are corrected with a piecewise
+    parabolic interpolation as samples arrive, so no sample is stored. The
+    quantile is exact up to five samples, and after ``seed`` until the next
+    update.
+
+    Parameters
+    ----------
+    probability : float
+        Probability of the quantile, between 0 and 1.
+    """
+
+    def __init__(self, probability):
+        self.probability = probability
+        self.count = 0
+        self._heights = []
+        self._exact = None
+        p = probability
+        self._positions = [1.0, 2.0, 3.0, 4.0, 5.0]
+        self._desired = [1.0, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5.0]
+        self._increments = [0.0, p / 2, p, (1 + p) / 2, 1.0]
+
+    @property
+    def value(self):
+        """Current estimate of the quantile, nan if there are no samples."""
+        if not self.count:
+            return math.nan
+        if self._exact is not None:
+            return self._exact
+        if self.count <= 5:
+            return float(np.quantile(self._heights, self.probability))
+        return self._heights[2]
+
+    def seed(self, values):
+        """Starts the estimate from a whole array of samples, replacing any
+        previous one. The markers are placed on the order statistics of the
+        samples, and the quantile is exact (as ``np.quantile``) until the
+        next ``update``.
+
+        Parameters
+        ----------
+        values : np.ndarray
+            Samples, sorted in ascending order.
+        """
+        values = np.asarray(values, dtype=float)
+        n = len(values)
+        self.count = n
+        self._exact = None
+        if n <= 5:
+            self._heights = values.tolist()
+            return
+        p = self.probability
+        desired = 1 + (n - 1) * np.array([0, p / 2, p, (1 + p) / 2, 1])
+        # Markers sit on distinct ranks, as the P² algorithm requires
+        ranks = np.round(desired).astype(int)
+        for i in range(1, 4):
+            ranks[i] = max(ranks[i], ranks[i - 1] + 1)
+        for i in range(3, 0, -1):
+            ranks[i] = min(ranks[i], ranks[i + 1] - 1)
+        self._positions = ranks.astype(float).tolist()
+        self._desired = desired.tolist()
+        self._heights = values[ranks - 1].tolist()
+        self._exact = float(np.quantile(values, p))
+
+    def update(self, value):
+        """Adds one sample."""
+        self.count += 1
+        self._exact = None
+        heights = self._heights
+        if self.count <= 5:
+            heights.append(value)
+            heights.sort()
+            return
+
+        positions, desired = self._positions, self._desired
+        if value < heights[0]:
+            heights[0] = value
+            cell = 0
+        elif value >= heights[4]:
+            heights[4] = value
+            cell = 3
+        else:
+            cell = 0
+            while value >= heights[cell + 1]:
+                cell += 1
+        for i in range(cell + 1, 5):
+            positions[i] += 1
+        for i in range(5):
+            desired[i] += self._increments[i]
+
+        for i in range(1, 4):
+            offset = desired[i] - positions[i]
+            if (offset >= 1 and positions[i + 1] - positions[i] > 1) or (
+                offset <= -1 and positions[i - 1] - positions[i] < -1
+            ):
+                step = 1 if offset > 0 else -1
+                height = self._parabolic(i, step)
+                if not heights[i - 1] < height < heights[i + 1]:
+                    height = self._linear(i, step)
+                heights[i] = height
+                positions[i] += step
+
+    def _parabolic(self, i, step):
+        q, n = self._heights, self._positions
+        return q[i] + step / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + step) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - step) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    def _linear(self, i, step):
+        q, n = self._heights, self._positions
+        return q[i] + step * (q[i + step] - q[i]) / (n[i + step] - n[i])
+
+
+class RunningCovariance:
+    """Mean and covariance of a stream of 2D points.
+
+    Attributes
+    ----------
+    count : int
+        Number of points.
+    mean : np.ndarray
+        Mean point.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = np.zeros(2)
+        self._comoment = np.zeros((2, 2))
+
+    def update(self, x, y):
+        """Adds the point ``(x, y)``."""
+        point = np.array((x, y))
+        self.count += 1
+        delta = point - self.mean
+        self.mean += delta / self.count
+        self._comoment += np.outer(delta, point - self.mean)
+
+    def update_many(self, x, y):
+        """Adds arrays of points at once, merging their moments."""
+        points = np.column_stack((x, y)).astype(float)
+        count = len(points)
+        if not count:
+            return
+        mean = points.mean(axis=0)
+        centered = points - mean
+        comoment = centered.T @ centered
+        total = self.count + count
+        delta = mean - self.mean
+        self._comoment += comoment + np.outer(delta, delta) * self.count * count / total
+        self.mean += delta * count / total
+        self.count = total
+
+    @property
+    def covariance(self):
+        """Sample covariance matrix, as ``np.cov``. Nan with less than two
+        points."""
+        if self.count < 2:
+            return np.full((2, 2), math.nan)
+        return self._comoment / (self.count - 1)
+
+    def ellipse(self, n_std=3):
+        """Confidence ellipse of the points, as
+        ``tools.calculate_confidence_ellipse``.
+
+        Parameters
+        ----------
+        n_std : float, optional
+            Number of standard deviations of the ellipse. Default is 3.
+
+        Returns
+        -------
+        tuple
+            ``(theta, width, height)``: angle in degrees and axes lengths.
+        """
+        eigenvalues, eigenvectors = sort_eigenvalues(self.covariance)
+        theta = np.degrees(np.arctan2(*eigenvectors[:, 0][::-1]))
+        width, height = 2 * n_std * np.sqrt(eigenvalues)
+        return theta, width, height
+
+
+class MonteCarloStatistics:
+    """Streaming statistics of the outputs of a Monte Carlo campaign.
+
+    Each output holding real numbers gets running moments and the quantile
+    estimates of ``QUANTILES``; outputs holding anything else are only
+    listed. Non-finite values are left out of the statistics. The apogee and
+    impact positions of ``ELLIPSE_COORDINATES`` also get a running
+    covariance.
+
+    Attributes
+    ----------
+    count : int
+        Number of output records added.
+    moments : dict
+        ``RunningMoments`` of each numeric output.
+    quantiles : dict
+        ``P2Quantile`` estimates of each numeric output, by probability.
+    ellipses : dict
+        ``RunningCovariance`` of the ``"apogee"`` and ``"impact"`` positions.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.moments = {}
+        self.quantiles = {}
+        self.ellipses = {name: RunningCovariance() for name in ELLIPSE_COORDINATES}
+        self._keys = {}
+
+    def __add_key(self, key, numeric):
+        if key not in self._keys:
+            self._keys[key] = numeric
+            if numeric:
+                self.moments[key] = RunningMoments()
+                self.quantiles[key] = {p: P2Quantile(p) for p in QUANTILES}
+        elif self._keys[key] and not numeric:
+            self._keys[key] = False
+            del self.moments[key], self.quantiles[key]
+        return self._keys[key]
+
+    def update(self, outputs):
+        """Adds output records, i.e. the ``outputs`` dictionaries of some
+        simulations."""
+        for record in outputs:
+            self.count += 1
+            for key, value in record.items():
+                number = _as_float(value)
+                if not self.__add_key(key, number is not None):
+                    continue
+                if math.isfinite(number):
+                    self.moments[key].update(number)
+                    for quantile in self.quantiles[key].values():
+                        quantile.update(number)
+            for name, (x_key, y_key) in ELLIPSE_COORDINATES.items():
+                x = _as_float(record.get(x_key))
+                y = _as_float(record.get(y_key))
+                if x is not None and y is not None and math.isfinite(x + y):
+                    self.ellipses[name].update(x, y)
+
+    def update_columns(self, columns):
+        """Adds output records given by columns, as ``MonteCarlo.results``.
+        Quantiles of outputs with no samples yet are computed exactly from
+        the columns; later ``update`` calls continue them as P² estimates.
+
+        Parameters
+        ----------
+        columns : dict
+            Lists or arrays of values of each output, all of the same length.
+        """
+        numbers = {}
+        for key, values in columns.items():
+            try:
+                numbers[key] = np.asarray(values, dtype=float)
+            except (TypeError, ValueError):
+                self.__add_key(key, False)
+                continue
+            if numbers[key].ndim != 1 or not self.__add_key(key, True):
+                self.__add_key(key, False)
+                del numbers[key]
+                continue
+            finite = numbers[key][np.isfinite(numbers[key])]
+            self.moments[key].update_many(finite)
+            quantiles = self.quantiles[key].values()
+            if any(quantile.count for quantile in quantiles):
+                for quantile in quantiles:
+                    for number in finite.tolist():
+                        quantile.update(number)
+            else:
+                # All the samples are at hand: exact quantiles, which the
+                # P² estimates continue from
+                finite = np.sort(finite)
+                for quantile in quantiles:
+                    quantile.seed(finite)
+        self.count += max((len(values) for values in columns.values()), default=0)
+
+        for name, (x_key, y_key) in ELLIPSE_COORDINATES.items():
+            if x_key in numbers and y_key in numbers:
+                x, y = numbers[x_key], numbers[y_key]
+                finite = np.isfinite(x) & np.isfinite(y)
+                self.ellipses[name].update_many(x[finite], y[finite])
+
+    def processed_results(self):
+        """Statistics of each output, as ``MonteCarlo.processed_results``.
+
+        Returns
+        -------
+        dict
+            ``(mean, median, std, pi_low, pi_high)`` of each output, where
+            ``pi_low`` and ``pi_high`` bound the 95% prediction interval.
+            Outputs that are not numeric get a tuple of None.
+        """
+        processed = {}
+        for key, numeric in self._keys.items():
+            if not numeric:
+                processed[key] = (None, None, None, None, None)
+                continue
+            moments, quantiles = self.moments[key], self.quantiles[key]
+            processed[key] = (
+                moments.mean,
+                quantiles[0.5].value,
+                moments.std(),
+                quantiles[0.025].value,
+                quantiles[0.975].value,
+            )
+        return processed
+
+    def confidence_half_width(self, name, statistic="mean", level=0.95):
+        """Half-width of the confidence interval of a statistic, i.e. the
+        precision with which the simulations estimate it.
+
+        The standard errors are large-sample approximations that assume
+        roughly normal outputs.
+
+        Parameters
+        ----------
+        name : str
+            Output, or ``"apogee"``/``"impact"`` for ellipses.
+        statistic : str, optional
+            One of ``CONVERGENCE_STATISTICS``:
+
+                * ``"mean"``: mean of the output.
+
+                * ``"std"``: standard deviation of the output.
+
+                * ``"interval"``: width of the 95% prediction interval of
+                  the output, as in ``processed_results``.
+
+                * ``"ellipse"``: semi-major axis of the one standard
+                  deviation dispersion ellipse of ``name``.
+
+            Default is ``"mean"``.
+        level : float, optional
+            Confidence level. Default is 0.95.
+
+        Returns
+        -------
+        float
+            The half-width, inf while there are fewer than two samples.
+        """
+        if statistic not in CONVERGENCE_STATISTICS:
+            raise ValueError(
+                f"Unknown statistic '{statistic}'. Options are "
+                f"{', '.join(CONVERGENCE_STATISTICS)}."
+            )
+        normal = NormalDist()
+        z = normal.inv_cdf((1 + level) / 2)
+
+        if statistic == "ellipse":
+            if name not in self.ellipses:
+                raise KeyError(
+                    f"No ellipse '{name}'. Options are {', '.join(self.ellipses)}."
+                )
+            ellipse = self.ellipses[name]
+            if ellipse.count < 2:
+                return math.inf
+            semi_axis = math.sqrt(max(np.linalg.eigvalsh(ellipse.covariance)))
+            return z * semi_axis / math.sqrt(2 * (ellipse.count - 1))
+
+        moments = self.moments.get(name)
+        if moments is None:
+            raise KeyError(f"No numeric output '{name}'.")
+        n = moments.count
+        if n < 2:
+            return math.inf
+        std = moments.std(ddof=1)
+        if statistic == "mean":
+            return z * std / math.sqrt(n)
+        if statistic == "std":
+            return z * std / math.sqrt(2 * (n - 1))
+
+        # Asymptotic covariance of sample quantiles, with a normal density
+        low, high = QUANTILES[0], QUANTILES[-1]
+        pdf_low = normal.pdf(normal.inv_cdf(low))
+        pdf_high = normal.pdf(normal.inv_cdf(high))
+        variance = (
+            low * (1 - low) / pdf_low**2
+            + high * (1 - high) / pdf_high**2
+            - 2 * low * (1 - high) / (pdf_low * pdf_high)
+        )
+        return z * std * math.sqrt(variance / n)
+
+    def converged(self, tolerances, min_count=30, level=0.95):
+        """Whether every statistic of ``tolerances`` is estimated precisely
+        enough.
+
+        Parameters
+        ----------
+        tolerances : dict
+            Largest confidence half-width of each statistic, see
+            ``confidence_half_width``. Keys are ``(name, statistic)`` tuples,
+            or output names for their mean. For instance, ``{"apogee": 5,
+            ("apogee", "interval"): 20, ("impact", "ellipse"): 10}``.
+        min_count : int, optional
+            Number of samples below which statistics are never considered
+            converged. Default is 30.
+        level : float, optional
+            Confidence level. Default is 0.95.
+
+        Returns
+        -------
+        bool
+        """
+        if self.count < min_count:
+            return False
+        for target, tolerance in tolerances.items():
+            name, statistic = (target, "mean") if isinstance(target, str) else target
+            try:
+                half_width = self.confidence_half_width(name, statistic, level)
+            except KeyError:  # not simulated yet
+                return False
+            if not half_width <= tolerance:
+                return False
+        return True
@@ -0,0 +1,574 @@
+"""Storage backends for ``MonteCarlo`` inputs, outputs and errors.
+
+Every backend stores one table per kind of record (inputs, outputs, errors),
+appended in chunks of records, and reads it back either row by row (the
+``inputs_log``/``outputs_log`` lists) or column by column (``results``).
+
+- ``JSONLinesStorage``: the original one JSON document per line ``.txt``
+  files. Default, human readable.
+- ``ColumnarStorage``: one raw float64 file per numeric column plus
+  deduplicated JSON values for anything else, in a directory per table.
+  Numeric columns are read back memory-mapped, without parsing.
+- ``ParquetStorage``: one Parquet file per written chunk, in a directory per
+  table. Requires ``pyarrow``.
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+from pathlib import Path
+
+import numpy as np
+
+from uvicrocketpy._encoders import RocketPyEncoder
+from uvicrocketpy.tools import import_optional_dependency
+
+KINDS = ("inputs", "outputs", "errors")
+
+_NUMERIC_TYPES = (bool, int, float, np.integer, np.floating, np.bool_)
+
+# Columns of simulation indices, stored as int64 so that they read back as
+# ints, as from the text backend
+_INTEGER_COLUMNS = ("index",)
+
+
+def _to_plain(value, encoder_kwargs):
+    """Numbers as floats, everything else as the JSON compatible value the
+    text backend would have written."""
+    if isinstance(value, _NUMERIC_TYPES):
+        return float(value)
+    return json.loads(json.dumps(value, cls=RocketPyEncoder, **encoder_kwargs))
+
+
+def _infer_spec(name, value):
+    """Column spec of a plain value: integer for the index columns, numeric
+    with a fixed shape, or json."""
+    if name in _INTEGER_COLUMNS and isinstance(value, float):
+        return {"type": "integer", "shape": []}
+    if isinstance(value, float):
+        return {"type": "numeric", "shape": []}
+    if isinstance(value, list) and value:
+        try:
+            array = np.asarray(value, dtype=float)
+        except (TypeError, ValueError):
+            return {"type": "json"}
+        return {"type": "numeric", "shape": list(array.shape)}
+    return {"type": "json"}
+
+
+def _numeric_block(name, spec, values):
+    """Stacks a chunk of values of a numeric column, NaN for missing ones."""
+    shape = tuple(spec["shape"])
+    block = np.full((len(values), *shape), np.nan)
+    for i, value in enumerate(values):
+        if value is None:
+            continue
+        try:
+            block[i] = np.asarray(value, dtype=float).reshape(shape)
+        except (TypeError, ValueError) as error:
+            raise ValueError(
+                f"Value {value!r} of column '{name}' does not match its stored "
+                f"schema (numeric, shape {shape}). Use the 'txt' storage for "
+                "outputs whose type changes between simulations."
+            ) from error
+    return block
+
+
+class MonteCarloStorage:
+    """Base class of the ``MonteCarlo`` storage backends.
+
+    Parameters
+    ----------
+    filename : str, Path
+        Initial part of the paths of the stored tables.
+    chunk_size : int, optional
+        Number of simulations buffered before they are written. If None,
+        the backend default ``default_chunk_size`` is used.
+    """
+
+    default_chunk_size = 1
+
+    def __init__(self, filename, chunk_size=None):
+        self.filename = Path(filename)
+        self.chunk_size = chunk_size or self.default_chunk_size
+
+    def path(self, kind):
+        """Default path of the table of ``kind`` (inputs, outputs, errors)."""
+        raise NotImplementedError
+
+    def create(self, path, truncate=False):
+        """Creates an empty table at ``path``, or empties an existing one if
+        ``truncate`` is True."""
+        raise NotImplementedError
+
+    def write(self, path, records, encoder_kwargs=None):
+        """Appends ``records``, a list of dictionaries, to the table."""
+        raise NotImplementedError
+
+    def count(self, path):
+        """Number of records in the table."""
+        raise NotImplementedError
+
+    def read_rows(self, path):
+        """Records of the table as a sequence of dictionaries."""
+        raise NotImplementedError
+
+    def read_columns(self, path, columns=None):
+        """Records of the table as ``{column: values}``. Only ``columns``
+        are read when given."""
+        raise NotImplementedError
+
+    def columns(self, path):
+        """Names of the columns of the table."""
+        raise NotImplementedError
+
+
+class JSONLinesStorage(MonteCarloStorage):
+    """One JSON document per line, in ``<filename>.<kind>.txt``."""
+
+    def __init__(self, filename, chunk_size=None):
+        super().__init__(filename, chunk_size)
+        self._parsed = {}
+
+    def path(self, kind):
+        return self.filename.with_suffix(f".{kind}.txt")
+
+    def create(self, path, truncate=False):
+        with open(path, "w" if truncate else "a", encoding="utf-8"):
+            pass
+
+    def write(self, path, records, encoder_kwargs=None):
+        encoder_kwargs = encoder_kwargs or {}
+        lines = "".join(
+            json.dumps(record, cls=RocketPyEncoder, **encoder_kwargs) + "\n"
+            for record in records
+        )
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(lines)
+
+    def count(self, path):
+        with open(path, mode="r", encoding="utf-8") as rows:
+            return sum(1 for _ in rows)
+
+    def read_rows(self, path):
+        # Rows are parsed once per file version, read_columns reuses them
+        stat = os.stat(path)
+        key = (str(path), stat.st_mtime_ns, stat.st_size)
+        if key not in self._parsed:
+            with open(path, mode="r", encoding="utf-8") as rows:
+                self._parsed = {key: [json.loads(line) for line in rows]}
+        return self._parsed[key]
+
+    def read_columns(self, path, columns=None):
+        results = {}
+        for row in self.read_rows(path):
+            for key, value in row.items():
+                if columns is None or key in columns:
+                    results.setdefault(key, []).append(value)
+        return results
+
+    def columns(self, path):
+        return list(dict.fromkeys(key for row in self.read_rows(path) for key in row))
+
+
+class _RowView:
+    """Read-only sequence of the records of a columnar table. Rows are
+    assembled on access, so large tables are never expanded at once."""
+
+    def __init__(self, storage, path):
+        self._columns = storage.read_columns(path)
+        self._length = storage.count(path)
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("row index out of range")
+        row = {}
+        for name, values in self._columns.items():
+            value = values[index]
+            row[name] = value.tolist() if isinstance(value, np.ndarray) else value
+        return row
+
+    def __iter__(self):
+        return (self[i] for i in range(self._length))
+
+
+class ColumnarStorage(MonteCarloStorage):
+    """Fixed-schema column files in a ``<filename>.<kind>`` directory.
+
+    ``schema.json`` holds the number of rows and, per column, its type and
+    file. Numeric columns (numbers and fixed-shape numeric lists) are raw
+    little-endian float64 files, read back with ``numpy.memmap``, and the
+    ``index`` column a raw int64 file. Other
+    values are stored once per distinct value, as JSON lines in the column's
+    ``values`` file, and each row holds the int64 index of its value (-1 for
+    null) in the column's ``file``. Values repeated across simulations, such
+    as the ``Function`` data of the rocket's drag curves, motor and
+    aerodynamic surfaces, therefore take space only once, and rows sharing a
+    value share the same object when read back. Columns that appear after
+    the first chunk are back-filled with NaN (numeric) or null (json).
+    Tables written before values were deduplicated, with one JSON line per
+    row, are still read.
+    """
+
+    default_chunk_size = 100
+
+    def __init__(self, filename, chunk_size=None):
+        super().__init__(filename, chunk_size)
+        # Hashes of the stored values of each json column, valid while the
+        # values file keeps the size they were computed at
+        self._value_index = {}
+
+    def path(self, kind):
+        return self.filename.with_suffix(f".{kind}")
+
+    @staticmethod
+    def _schema_path(path):
+        return Path(path) / "schema.json"
+
+    def _load_schema(self, path):
+        with open(self._schema_path(path), encoding="utf-8") as f:
+            return json.load(f)
+
+    def _save_schema(self, path, schema):
+        tmp = Path(path) / "schema.json.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(schema, f)
+        os.replace(tmp, self._schema_path(path))
+
+    def create(self, path, truncate=False):
+        path = Path(path)
+        if truncate and path.exists():
+            shutil.rmtree(path)
+        if not self._schema_path(path).exists():
+            path.mkdir(parents=True, exist_ok=True)
+            self._save_schema(path, {"n_rows": 0, "columns": {}})
+
+    def _add_column(self, path, schema, name, spec):
+        stem = re.sub(r"[^\w.-]", "_", name)
+        taken = {c["file"] for c in schema["columns"].values()}
+        suffix = ".f64" if spec["type"] == "numeric" else ".i64"
+        file, i = stem + suffix, 1
+        while file in taken:
+            file, i = f"{stem}_{i}{suffix}", i + 1
+        spec = {**spec, "file": file}
+        n_rows = schema["n_rows"]
+        with open(Path(path) / file, "wb") as f:
+            if spec["type"] == "numeric":
+                np.full((n_rows, *spec["shape"]), np.nan, dtype="<f8").tofile(f)
+            else:
+                np.full(n_rows, -1, dtype="<i8").tofile(f)
+        if spec["type"] == "json":
+            spec["values"] = file[: -len(suffix)] + ".jsonl"
+            open(Path(path) / spec["values"], "wb").close()
+        schema["columns"][name] = spec
+
+    def _value_hashes(self, file):
+        """Index of each value stored in the values ``file`` of a json
+        column, by the hash of its JSON line."""
+        size = file.stat().st_size
+        cached = self._value_index.get(file)
+        if cached is None or cached[0] != size:
+            with open(file, "rb") as f:
+                hashes = {hashlib.sha1(line).digest(): i for i, line in enumerate(f)}
+            cached = self._value_index[file] = (size, hashes)
+        return cached[1]
+
+    def _write_references(self, path, spec, values):
+        """Appends the values of a json column, storing the ones not seen
+        before in its values file and a reference to them per row."""
+        values_file = Path(path) / spec["values"]
+        hashes = self._value_hashes(values_file)
+        indices = np.full(len(values), -1, dtype="<i8")
+        new_lines = []
+        for i, value in enumerate(values):
+            if value is None:
+                continue
+            line = (json.dumps(value) + "\n").encode("utf-8")
+            digest = hashlib.sha1(line).digest()
+            if digest not in hashes:
+                hashes[digest] = len(hashes)
+                new_lines.append(line)
+            indices[i] = hashes[digest]
+        with open(values_file, "ab") as f:
+            f.write(b"".join(new_lines))
+        self._value_index[values_file] = (values_file.stat().st_size, hashes)
+        with open(Path(path) / spec["file"], "ab") as f:
+            indices.tofile(f)
+
+    @staticmethod
+    def _discard_uncommitted(path, schema):
+        """Truncates every column file to the rows counted by the schema.
+
+        Column files are appended one after the other and the schema is saved
+        last, so a write interrupted partway leaves some columns with rows
+        the schema does not count. Dropping them before appending keeps the
+        columns aligned. Values files lose any partial last line; values
+        stored but not referenced by a committed row are harmless.
+        """
+        n_rows = schema["n_rows"]
+        for spec in schema["columns"].values():
+            file = Path(path) / spec["file"]
+            if spec["type"] == "numeric":
+                size = n_rows * int(np.prod(spec["shape"], dtype=int)) * 8
+            elif spec["type"] == "integer":
+                size = n_rows * 8
+            elif "values" in spec:
+                size = n_rows * 8
+                values_file = Path(path) / spec["values"]
+                end = values_file.stat().st_size
+                with open(values_file, "rb") as f:
+                    f.seek(max(end - 1, 0))
+                    complete = end == 0 or f.read(1) == b"\n"
+                    if not complete:
+                        f.seek(0)
+                        end = f.read().rfind(b"\n") + 1
+                if not complete:
+                    os.truncate(values_file, end)
+            else:
+                with open(file, "rb") as f:
+                    size = sum(len(line) for _, line in zip(range(n_rows), f))
+            if file.stat().st_size > size:
+                os.truncate(file, size)
+
+    def write(self, path, records, encoder_kwargs=None):
+        if not records:
+            return
+        encoder_kwargs = encoder_kwargs or {}
+        schema = self._load_schema(path)
+        self._discard_uncommitted(path, schema)
+        plain = [
+            {key: _to_plain(value, encoder_kwargs) for key, value in record.items()}
+            for record in records
+        ]
+        names = list(dict.fromkeys(key for record in plain for key in record))
+        for name in names:
+            if name not in schema["columns"]:
+                first = next(
+                    (r[name] for r in plain if r.get(name) is not None), None
+                )
+                self._add_column(path, schema, name, _infer_spec(name, first))
+
+        for name, spec in schema["columns"].items():
+            values = [record.get(name) for record in plain]
+            file = Path(path) / spec["file"]
+            if spec["type"] == "numeric":
+                block = _numeric_block(name, spec, values)
+                with open(file, "ab") as f:
+                    block.astype("<f8").tofile(f)
+            elif spec["type"] == "integer":
+                block = [-1 if value is None else value for value in values]
+                with open(file, "ab") as f:
+                    np.asarray(block, dtype="<i8").tofile(f)
+            elif "values" in spec:
+                self._write_references(path, spec, values)
+            else:
+                with open(file, "a", encoding="utf-8") as f:
+                    f.write("".join(json.dumps(v) + "\n" for v in values))
+
+        schema["n_rows"] += len(records)
+        self._save_schema(path, schema)
+
+    def count(self, path):
+        return self._load_schema(path)["n_rows"]
+
+    def read_rows(self, path):
+        return _RowView(self, path)
+
+    def read_columns(self, path, columns=None):
+        schema = self._load_schema(path)
+        n_rows = schema["n_rows"]
+        results = {}
+        for name, spec in schema["columns"].items():
+            if columns is not None and name not in columns:
+                continue
+            file = Path(path) / spec["file"]
+            if spec["type"] == "numeric":
+                shape = (n_rows, *spec["shape"])
+                if n_rows == 0:
+                    results[name] = np.empty(shape)
+                else:
+                    results[name] = np.memmap(file, dtype="<f8", mode="r", shape=shape)
+            elif spec["type"] == "integer":
+                results[name] = np.fromfile(file, dtype="<i8", count=n_rows)
+            elif "values" in spec:
+                with open(Path(path) / spec["values"], encoding="utf-8") as f:
+                    stored = [json.loads(line) for line in f]
+                indices = np.fromfile(file, dtype="<i8", count=n_rows)
+                results[name] = [stored[i] if i >= 0 else None for i in indices]
+            else:
+                with open(file, encoding="utf-8") as f:
+                    results[name] = [json.loads(line) for _, line in zip(range(n_rows), f)]
+        return results
+
+    def columns(self, path):
+        return list(self._load_schema(path)["columns"])
+
+
+class ParquetStorage(MonteCarloStorage):
+    """One Parquet file per written chunk, in a ``<filename>.<kind>.parquet``
+    directory. Numeric columns are float64 (lists of float64 for arrays,
+    flattened), the ``index`` column int64 and other values JSON strings.
+    Requires ``pyarrow``."""
+
+    default_chunk_size = 1000
+
+    def __init__(self, filename, chunk_size=None):
+        super().__init__(filename, chunk_size)
+        self._pa = import_optional_dependency("pyarrow")
+        self._pq = import_optional_dependency("pyarrow.parquet")
+
+    def path(self, kind):
+        return self.filename.with_suffix(f".{kind}.parquet")
+
+    @staticmethod
+    def _parts(path):
+        return sorted(Path(path).glob("part-*.parquet"))
+
+    def create(self, path, truncate=False):
+        path = Path(path)
+        if truncate and path.exists():
+            shutil.rmtree(path)
+        path.mkdir(parents=True, exist_ok=True)
+
+    def write(self, path, records, encoder_kwargs=None):
+        if not records:
+            return
+        encoder_kwargs = encoder_kwargs or {}
+        plain = [
+            {key: _to_plain(value, encoder_kwargs) for key, value in record.items()}
+            for record in records
+        ]
+        names = list(dict.fromkeys(key for record in plain for key in record))
+        arrays, shapes = {}, {}
+        for name in names:
+            values = [record.get(name) for record in plain]
+            first = next((v for v in values if v is not None), None)
+            spec = _infer_spec(name, first)
+            if spec["type"] == "integer":
+                arrays[name] = self._pa.array(
+                    [None if v is None else int(v) for v in values],
+                    type=self._pa.int64(),
+                )
+            elif spec["type"] == "numeric":
+                block = _numeric_block(name, spec, values)
+                if spec["shape"]:
+                    arrays[name] = self._pa.array(
+                        list(block.reshape(len(values), -1)),
+                        type=self._pa.list_(self._pa.float64()),
+                    )
+                    shapes[name] = spec["shape"]
+                else:
+                    arrays[name] = self._pa.array(block, type=self._pa.float64())
+            else:
+                arrays[name] = self._pa.array(
+                    [json.dumps(v) for v in values], type=self._pa.string()
+                )
+        table = self._pa.table(arrays).replace_schema_metadata(
+            {"shapes": json.dumps(shapes)}
+        )
+        index = len(self._parts(path))
+        self._pq.write_table(table, Path(path) / f"part-{index:06d}.parquet")
+
+    def count(self, path):
+        return sum(self._pq.read_metadata(part).num_rows for part in self._parts(path))
+
+    def read_rows(self, path):
+        return _RowView(self, path)
+
+    def read_columns(self, path, columns=None):
+        pieces = {}
+        lengths = []
+        for part in self._parts(path):
+            schema = self._pq.read_schema(part)
+            metadata = schema.metadata or {}
+            shapes = json.loads(metadata.get(b"shapes", b"{}"))
+            names = [
+                name for name in schema.names if columns is None or name in columns
+            ]
+            table = self._pq.read_table(part, columns=names, memory_map=True)
+            for name in names:
+                column = table.column(name)
+                if self._pa.types.is_string(column.type):
+                    values = [json.loads(v) for v in column.to_pylist()]
+                elif name in shapes:
+                    values = np.array(column.to_pylist(), dtype=float).reshape(
+                        (len(table), *shapes[name])
+                    )
+                else:
+                    values = column.to_numpy(zero_copy_only=False)
+                pieces.setdefault(name, [None] * len(lengths)).append(values)
+            lengths.append(len(table))
+            for parts in pieces.values():  # column missing from this part
+                if len(parts) < len(lengths):
+                    parts.append(None)
+        return {
+            name: _concatenate(parts, lengths) for name, parts in pieces.items()
+        }
+
+    def columns(self, path):
+        return list(
+            dict.fromkeys(
+                name
+                for part in self._parts(path)
+                for name in self._pq.read_schema(part).names
+            )
+        )
+
+
+def _concatenate(parts, lengths):
+    """Joins per-part column values. Parts where the column is missing
+    (None) are filled with NaN for numeric columns and None otherwise."""
+    present = [p for p in parts if p is not None]
+    if all(isinstance(p, np.ndarray) for p in present):
+        shape = present[0].shape[1:]
+        return np.concatenate(
+            [
+                p if p is not None else np.full((n, *shape), np.nan)
+                for p, n in zip(parts, lengths)
+            ]
+        )
+    joined = []
+    for part, n in zip(parts, lengths):
+        joined.extend(part if part is not None else [None] * n)
+    return joined
+
+
+STORAGE_BACKENDS = {
+    "txt": JSONLinesStorage,
+    "columnar": ColumnarStorage,
+    "parquet": ParquetStorage,
+}
+
+
+def create_storage(storage, filename):
+    """Returns the storage backend for ``MonteCarlo``.
+
+    Parameters
+    ----------
+    storage : str, MonteCarloStorage
+        A key of ``STORAGE_BACKENDS`` or a backend instance.
+    filename : str, Path
+        Initial part of the paths of the stored tables.
+
+    Returns
+    -------
+    MonteCarloStorage
+    """
+    if isinstance(storage, MonteCarloStorage):
+        return storage
+    try:
+        return STORAGE_BACKENDS[storage](filename)
+    except KeyError as error:
+        raise ValueError(
+            f"Unknown storage '{storage}'. Options are "
+            f"{', '.join(STORAGE_BACKENDS)} or a MonteCarloStorage instance."
+        ) from error
@@ -0,0 +1,233 @@
+"""Shared memory for the large arrays of the objects sent to ``MonteCarlo``
+workers.
+
+``SharedArrays.publish`` copies the large numpy arrays reachable from some
+objects (``Function`` sources and their views, atmospheric profiles, drag
+and thrust tables...) into one shared memory block and rebinds the objects'
+attributes to read-only ``SharedArray`` views of it. A ``SharedArray`` is
+pickled as the name of its block and its position, so workers attach the
+block instead of receiving and holding a copy of every array.
+"""
+
+import os
+import weakref
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+_ALIGNMENT = 64
+
+# Blocks attached by this process, kept open while the process lives
+_ATTACHED = {}
+
+
+def _address(array):
+    return array.__array_interface__["data"][0]
+
+
+def _root(array):
+    """Array owning the memory ``array`` is a view of."""
+    while isinstance(array.base, np.ndarray):
+        array = array.base
+    return array
+
+
+def _open_block(name, creator):
+    block = _ATTACHED.get(name)
+    if block is None:
+        try:
+            block = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:  # Python < 3.13, attaching also registers the block
+            block = shared_memory.SharedMemory(name=name)
+            # The publisher and its children share one resource tracker, which
+            # must keep the publisher's registration to report and clean up
+            # the block. Other processes have their own tracker, which would
+            # unlink the block when they exit.
+            if creator not in (os.getpid(), os.getppid()):
+                resource_tracker.unregister(block._name, "shared_memory")  # pylint: disable=protected-access
+        _ATTACHED[name] = block
+    return block
+
+
+def _view(block, offset, shape, dtype, strides, creator):
+    base = np.frombuffer(block.buf, dtype=np.uint8)
+    array = np.ndarray(
+        shape, dtype, buffer=block.buf, offset=offset, strides=strides
+    ).view(SharedArray)
+    array._block = (block.name, _address(base), block.size, creator)
+    array.flags.writeable = False
+    return array
+
+
+def _attach(name, offset, shape, dtype, strides, creator):
+    """Unpickles a ``SharedArray`` by attaching its shared memory block."""
+    return _view(_open_block(name, creator), offset, shape, dtype, strides, creator)
+
+
+class SharedArray(np.ndarray):
+    """Read-only view into a shared memory block, pickled by reference."""
+
+    _block = None
+
+    def __array_finalize__(self, obj):
+        self._block = getattr(obj, "_block", None)
+
+    def __reduce__(self):
+        if self._block is not None:
+            name, start, size, creator = self._block
+            offset = _address(self) - start
+            if 0 <= offset and offset + self.nbytes <= size:
+                return (
+                    _attach,
+                    (name, offset, self.shape, self.dtype, self.strides, creator),
+                )
+        # Results of operations on shared arrays live in private memory
+        return np.asarray(self).__reduce__()
+
+    def __reduce_ex__(self, protocol):
+        return self.__reduce__()
+
+
+class SharedArrays:
+    """Publishes the large arrays of objects into shared memory.
+
+    Parameters
+    ----------
+    min_bytes : int, optional
+        Arrays smaller than this are left alone. Default is 64 kB.
+
+    Notes
+    -----
+    The block is unlinked by ``close``, or when this object is garbage
+    collected. Workers must have attached it before that, i.e. the objects
+    must be sent to the workers while it is open.
+    """
+
+    def __init__(self, min_bytes=64 * 1024):
+        self.min_bytes = min_bytes
+        self.blocks = []
+        self._finalizer = weakref.finalize(self, SharedArrays._unlink, self.blocks)
+
+    @staticmethod
+    def _unlink(blocks):
+        for block in blocks:
+            try:
+                block.unlink()
+            except FileNotFoundError:
+                pass
+            try:
+                block.close()
+            except BufferError:  # published views still in use
+                pass
+        blocks.clear()
+
+    def close(self):
+        """Unlinks the shared memory blocks. Published views stay valid in
+        this process, but new workers can no longer attach them."""
+        self._finalizer()
+
+    def __getstate__(self):
+        # Copies sent to workers do not own, and never unlink, the blocks
+        return {"min_bytes": self.min_bytes}
+
+    def __setstate__(self, state):
+        self.__init__(state["min_bytes"])
+
+    def _walk(self, value, visit, seen):
+        """Calls ``visit`` on every array reachable from ``value`` and replaces
+        it by the returned value. Containers are updated in place, tuples are
+        rebuilt."""
+        if isinstance(value, np.ndarray):
+            return visit(value)
+        if isinstance(value, (str, bytes, int, float, complex, type(None))):
+            return value
+        if id(value) in seen:
+            return value
+        seen.add(id(value))
+        if isinstance(value, list):
+            for i, item in enumerate(value):
+                value[i] = self._walk(item, visit, seen)
+        elif isinstance(value, dict):
+            for key, item in value.items():
+                value[key] = self._walk(item, visit, seen)
+        elif type(value) is tuple:  # pylint: disable=unidiomatic-typecheck
+            items = tuple(self._walk(item, visit, seen) for item in value)
+            if any(a is not b for a, b in zip(items, value)):
+                return items
+        elif hasattr(value, "__dict__") and not isinstance(value, type):
+            if not type(value).__module__.startswith(("uvicrocketpy", "scipy")):
+                return value
+            attributes = vars(value)
+            for key, item in list(attributes.items()):
+                attributes[key] = self._walk(item, visit, seen)
+        return value
+
+    def _is_candidate(self, array):
+        root = _root(array)
+        return (
+            not isinstance(array, SharedArray)
+            and root.dtype != object
+            and root.nbytes >= self.min_bytes
+            and (root.flags.c_contiguous or root.flags.f_contiguous)
+        )
+
+    def publish(self, *objects):
+        """Moves the large arrays reachable from ``objects`` into a new shared
+        memory block.
+
+        Parameters
+        ----------
+        *objects
+            Objects whose attributes, lists, dicts and tuples are searched,
+            recursively, for arrays. Only ``uvicrocketpy`` and ``scipy``
+            objects are entered.
+
+        Returns
+        -------
+        int
+            Number of bytes published.
+        """
+        roots = {}
+
+        def collect(array):
+            if self._is_candidate(array):
+                root = _root(array)
+                roots.setdefault(id(root), root)
+            return array
+
+        for obj in objects:
+            self._walk(obj, collect, set())
+        if not roots:
+            return 0
+
+        offsets, size = {}, 0
+        for key, root in roots.items():
+            offsets[key] = size
+            size += -(-root.nbytes // _ALIGNMENT) * _ALIGNMENT
+
+        block = shared_memory.SharedMemory(create=True, size=size)
+        self.blocks.append(block)
+        creator = os.getpid()
+        for key, root in roots.items():
+            np.ndarray(
+                root.shape,
+                root.dtype,
+                buffer=block.buf,
+                offset=offsets[key],
+                strides=root.strides,
+            )[...] = root
+
+        def replace(array):
+            if isinstance(array, SharedArray):
+                return array
+            root = _root(array)
+            if id(root) not in roots:
+                return array
+            offset = offsets[id(root)] + _address(array) - _address(root)
+            return _view(
+                block, offset, array.shape, array.dtype, array.strides, creator
+            )
+
+        for obj in objects:
+            self._walk(obj, replace, set())
+        return size
@@ -18,6 +18,7 @@ from .stochastic_environment import StochasticEnvironment
 from .stochastic_flight import StochasticFlight
 from .stochastic_generic_motor import StochasticGenericMotor
 from .stochastic_model import StochasticModel
+from .qmc_sampler import QMCSampler
 from .stochastic_parachute import StochasticParachute
 from .stochastic_rocket import StochasticRocket
 from .stochastic_solid_motor import StochasticSolidMotor
@@ -0,0 +1,208 @@
+"""
+Defines the `QMCSampler` class, which makes stochastic models draw their
+random attributes from one joint low-discrepancy (Sobol, Halton) or Latin
+hypercube point per simulation instead of independent pseudo-random numbers.
+"""
+
+import numpy as np
+from scipy import special, stats
+from scipy.stats import qmc
+
+from uvicrocketpy.rocket.components import Components
+
+# Distributions of ``get_distribution`` that can be sampled by inversion, as
+# functions of the uniform ``u`` and the two parameters of the stochastic tuple
+_INVERSE_CDFS = {
+    "uniform": lambda u, low, high: low + (high - low) * u,
+    "normal": lambda u, loc, scale: loc + scale * special.ndtri(u),
+    "laplace": lambda u, loc, scale: stats.laplace.ppf(u, loc=loc, scale=scale),
+    "logistic": lambda u, loc, scale: stats.logistic.ppf(u, loc=loc, scale=scale),
+    "gumbel": lambda u, loc, scale: stats.gumbel_r.ppf(u, loc=loc, scale=scale),
+    "gamma": lambda u, shape, scale: stats.gamma.ppf(u, shape, scale=scale),
+    "wald": lambda u, mean, scale: stats.invgauss.ppf(u, mean / scale, scale=scale),
+    "binomial": lambda u, n, p: int(stats.binom.ppf(u, n, p)),
+}
+
+# Distributions whose draws are their first parameter when the second is zero
+_LOCATION_SCALE = ("normal", "laplace", "logistic", "gumbel")
+
+_EPSILON = 1e-12
+
+
+def _constant(value):
+    """Whether a stochastic tuple or list attribute always draws ``value[0]``:
+    one element lists and tuples of zero scale or zero width."""
+    if isinstance(value, list):
+        return len(value) == 1
+    name = getattr(value[-1], "__name__", None)
+    if name == "uniform":
+        return value[0] == value[1]
+    return name in _LOCATION_SCALE and value[1] == 0
+
+
+class QMCSampler:
+    """Joint quasi-random sampler for stochastic models.
+
+    Each simulation is given one point of a ``d``-dimensional Sobol, Halton or
+    Latin hypercube design, and the attached models draw their random
+    attributes from its consecutive coordinates: tuple attributes by
+    inverting the cumulative distribution of their distribution and list
+    attributes by picking the element of the coordinate's stratum. The joint
+    sample of all attached models is therefore space-filling, not only each
+    attribute. ``d`` is found by counting the draws of one simulation;
+    constant attributes, such as one element lists and normal tuples of zero
+    standard deviation, take no coordinate.
+
+    Attributes drawn with distributions that cannot be inverted (e.g.
+    ``poisson``) and custom samplers keep using the pseudo-random generators
+    of the models. Draws beyond ``d``, if a simulation draws more than the
+    counted one, get pseudo-random uniforms.
+
+    Parameters
+    ----------
+    method : str, optional
+        ``"sobol"``, ``"halton"`` or ``"lhs"``. Default is ``"sobol"``.
+    scramble : bool, optional
+        Whether Sobol and Halton points are randomly scrambled. Default True.
+
+    Notes
+    -----
+    Sobol and Halton designs are sequences: growing a campaign keeps its first
+    points. A Latin hypercube depends on the number of simulations, so a
+    campaign appended with more simulations gets a different design.
+    """
+
+    methods = ("sobol", "halton", "lhs")
+
+    def __init__(self, method="sobol", scramble=True):
+        if method not in self.methods:
+            raise ValueError(
+                f"Unknown method '{method}'. Options are {', '.join(self.methods)}."
+            )
+        self.method = method
+        self.scramble = scramble
+        self.dimension = None
+        self.points = None
+        self._point = None
+        self._cursor = 0
+        self._counting = False
+        self._extra = None
+
+    def __repr__(self):
+        return (
+            f"QMCSampler(method='{self.method}', scramble={self.scramble}, "
+            f"dimension={self.dimension})"
+        )
+
+    @staticmethod
+    def _models(objects):
+        """Stochastic models reachable from ``objects``, including the motors,
+        surfaces and parachutes of stochastic rockets."""
+        # pylint: disable=import-outside-toplevel
+        from uvicrocketpy.stochastic.stochastic_model import StochasticModel
+
+        found, stack, seen = [], list(objects), set()
+        while stack:
+            value = stack.pop()
+            if id(value) in seen:
+                continue
+            seen.add(id(value))
+            if isinstance(value, StochasticModel):
+                found.append(value)
+                stack.extend(vars(value).values())
+            elif isinstance(value, (list, tuple)):
+                stack.extend(value)
+            elif isinstance(value, dict):
+                stack.extend(value.values())
+            elif isinstance(value, Components):
+                stack.extend(component for component, _ in value)
+        return found
+
+    def attach(self, *objects):
+        """Makes the stochastic models in ``objects`` draw from this sampler."""
+        for model in self._models(objects):
+            model._qmc_sampler = self
+
+    @classmethod
+    def detach(cls, *objects):
+        """Makes the stochastic models in ``objects`` draw pseudo-random
+        values again."""
+        for model in cls._models(objects):
+            model._qmc_sampler = None
+
+    def generate(self, n_samples, draw, seed=None):
+        """Finds the dimension of the design and generates its points.
+
+        Parameters
+        ----------
+        n_samples : int
+            Number of points, i.e. simulations.
+        draw : callable
+            Draws the random inputs of one simulation from the attached
+            models, e.g. by calling their ``create_object``.
+        seed : int, SeedSequence, optional
+            Seed of the scrambling and of the Latin hypercube permutations.
+        """
+        self._counting, self._cursor = True, 0
+        try:
+            draw()
+        finally:
+            self._counting = False
+        self.dimension = max(self._cursor, 1)
+
+        rng = np.random.default_rng(seed)
+        if self.method == "sobol":
+            engine = qmc.Sobol(self.dimension, scramble=self.scramble, seed=rng)
+        elif self.method == "halton":
+            engine = qmc.Halton(self.dimension, scramble=self.scramble, seed=rng)
+        else:
+            engine = qmc.LatinHypercube(self.dimension, seed=rng)
+        n_points = max(n_samples, 1)
+        if self.method == "sobol":
+            # Sobol balance properties hold for powers of two
+            n_points = 1 << (n_points - 1).bit_length()
+        self.points = np.clip(engine.random(n_points), _EPSILON, 1 - _EPSILON)
+        self.set_sample(0)
+
+    def set_sample(self, index, seed=None):
+        """Selects the point of simulation ``index``.
+
+        Parameters
+        ----------
+        index : int
+            Index of the simulation.
+        seed : int, SeedSequence, optional
+            Seed of the uniforms drawn beyond the design's dimension.
+        """
+        self._point = self.points[index]
+        self._cursor = 0
+        self._extra = np.random.default_rng(seed)
+
+    def uniform(self):
+        """Next coordinate of the current point."""
+        cursor = self._cursor
+        self._cursor += 1
+        if self._counting:
+            return 0.5
+        if cursor < len(self._point):
+            return self._point[cursor]
+        return self._extra.uniform(_EPSILON, 1 - _EPSILON)
+
+    def draw(self, value):
+        """Draws a stochastic tuple ``(a, b, distribution)`` or list attribute.
+
+        Returns
+        -------
+        tuple
+            ``(True, value)``, or ``(False, None)`` if the distribution cannot
+            be sampled by inversion.
+        """
+        if _constant(value):
+            return True, value[0]
+        if isinstance(value, tuple):
+            inverse_cdf = _INVERSE_CDFS.get(getattr(value[-1], "__name__", None))
+            if inverse_cdf is None:
+                return False, None
+            return True, inverse_cdf(self.uniform(), value[0], value[1])
+        index = min(int(self.uniform() * len(value)), len(value) - 1)
+        return True, value[index]
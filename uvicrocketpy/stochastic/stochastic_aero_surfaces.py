@@ -542,5 +542,8 @@ class StochasticAirBrakes(StochasticModel):
             override_rocket_drag=generated_dict["override_rocket_drag"],
             deployment_level=generated_dict["deployment_level"],
         )
-        air_brakes.drag_coefficient *= generated_dict["drag_coefficient_curve_factor"]
+        if generated_dict["drag_coefficient_curve_factor"] != 1:
+            air_brakes.drag_coefficient *= generated_dict[
+                "drag_coefficient_curve_factor"
+            ]
         return air_brakes
@@ -3,8 +3,6 @@ Defines the `StochasticModel` class, which is used as a base class for all other
 Stochastic classes.
 """
 
-from random import choice
-
 import numpy as np
 
 from uvicrocketpy.mathutils.function import Function
@@ -41,6 +39,9 @@ class StochasticModel:
         "ensemble_member",
     ]
 
+    # QMCSampler the random attributes are drawn from, see QMCSampler.attach
+    _qmc_sampler = None
+
     def __init__(self, obj, seed=None, **kwargs):
         """
         Initialize the StochasticModel class with validated input arguments.
@@ -528,11 +529,8 @@ class StochasticModel:
         """
         generated_dict = {}
         for arg, value in self.__dict__.items():
-            if isinstance(value, tuple):
-                dist_sampler = value[-1]
-                generated_dict[arg] = dist_sampler(value[0], value[1])
-            elif isinstance(value, list):
-                generated_dict[arg] = choice(value) if value else value
+            if isinstance(value, (tuple, list)):
+                generated_dict[arg] = self._sample_value(value)
             elif isinstance(value, CustomSampler):
                 try:
                     generated_dict[arg] = value.sample(n_samples=1)[0]
@@ -543,6 +541,24 @@ class StochasticModel:
         self.last_rnd_dict = generated_dict
         yield generated_dict
 
+    def _sample_value(self, value):
+        """Draws a value of a tuple ``(a, b, distribution)`` or list
+        attribute, from the attached ``QMCSampler`` if there is one. List
+        choices use the seeded random number generator of the model, as the
+        distributions of tuples do. One element lists are constants and
+        draw nothing."""
+        if isinstance(value, list) and len(value) == 1:
+            return value[0]
+        if self._qmc_sampler is not None and value:
+            sampled, drawn = self._qmc_sampler.draw(value)
+            if sampled:
+                return drawn
+        if isinstance(value, tuple):
+            return value[-1](value[0], value[1])
+        if not value:
+            return value
+        return value[self.__random_number_generator.integers(len(value))]
+
     # pylint: disable=too-many-statements
     def visualize_attributes(self):
         """
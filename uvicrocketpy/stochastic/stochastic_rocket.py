@@ -1,7 +1,6 @@
 """Defines the StochasticRocket class."""
 
 import warnings
-from random import choice
 
 from uvicrocketpy.control import _Controller
 from uvicrocketpy.mathutils.vector_matrix import Vector
@@ -625,10 +624,10 @@ class StochasticRocket(StochasticModel):
         if isinstance(position, tuple):
             if isinstance(position[0], Vector):
                 # TODO implement randomization for X and Y positions
-                return position[-1](position[0].z, position[1])
-            return position[-1](position[0], position[1])
+                return self._sample_value((position[0].z, *position[1:]))
+            return self._sample_value(position)
         elif isinstance(position, list):
-            return choice(position) if position else position
+            return self._sample_value(position)
 
     # pylint: disable=stop-iteration-return
     def dict_generator(self):
@@ -638,8 +637,8 @@ class StochasticRocket(StochasticModel):
         all attributes of the class and generating a random value for each
         attribute. The random values are generated according to the format of
         each attribute. Tuples are generated using the distribution function
-        specified in the tuple. Lists are generated using the random.choice
-        function.
+        specified in the tuple. Lists are sampled with the seeded random
+        number generator of the model.
 
         Parameters
         ----------
@@ -742,8 +741,11 @@ class StochasticRocket(StochasticModel):
                 "coordinate_system_orientation"
             ],
         )
-        rocket.power_off_drag *= generated_dict["power_off_drag_factor"]
-        rocket.power_on_drag *= generated_dict["power_on_drag_factor"]
+        # Drag tables are only rebuilt when their factor actually varies
+        if generated_dict["power_off_drag_factor"] != 1:
+            rocket.power_off_drag *= generated_dict["power_off_drag_factor"]
+        if generated_dict["power_on_drag_factor"] != 1:
+            rocket.power_on_drag *= generated_dict["power_on_drag_factor"]
 
         if hasattr(self, "cp_eccentricity_x") and hasattr(self, "cp_eccentricity_y"):
             cp_ecc_x, cp_ecc_y = self._create_eccentricities(
@@ -10,11 +10,13 @@ import base64
 import functools
 import importlib
 import importlib.metadata
+import itertools
 import json
 import math
 import re
 import time
 from bisect import bisect_left
+from pathlib import Path
 
 import dill
 import matplotlib.pyplot as plt
@@ -618,86 +620,142 @@ def load_monte_carlo_data(
     output_filename,
     parameters_list,
     target_variables_list,
-):  # pylint: disable=too-many-statements
-    """Reads MonteCarlo simulation data file and builds parameters and flight
+    chunk_size=1000,
+):
+    """Reads MonteCarlo simulation data files and builds parameters and flight
     variables matrices
 
+    Only the requested columns are kept in memory. Text files are streamed
+    in chunks of lines, but each line is still decoded in full, including
+    the ``Function`` data of the inputs records. Only the binary storages
+    (``"columnar"`` and ``"parquet"`` directories) read selectively: they
+    are read column by column through their schema, without parsing the
+    other columns, and should be preferred for large analyses.
+
     Parameters
     ----------
     input_filename : str
         Input file exported by MonteCarlo class. Each line is a
         sample unit described by a dictionary where keys are parameters names
-        and the values are the sampled parameters values.
+        and the values are the sampled parameters values. The inputs
+        directory of a binary MonteCarlo storage is also accepted.
     output_filename : str
         Output file exported by MonteCarlo.simulate function. Each line is a
         sample unit described by a dictionary where keys are target variables
         names and the values are the obtained values from the flight simulation.
+        The outputs directory of a binary MonteCarlo storage is also accepted.
     parameters_list : list[str]
-        List of parameters whose values will be extracted.
+        List of parameters whose values will be extracted. Nested parameters
+        are named as in ``flatten_dict``.
     target_variables_list : list[str]
         List of target variables whose values will be extracted.
+    chunk_size : int, optional
+        Number of lines of text files parsed at once. Default is 1000.
 
     Returns
     -------
-    parameters_matrix: np.matrix
-        Numpy matrix containing input parameters values. Each column correspond
+    parameters_matrix: np.ndarray
+        Numpy array containing input parameters values. Each column correspond
         to a parameter in the same order specified by 'parameters_list' input.
-    target_variables_matrix: np.matrix
-        Numpy matrix containing target variables values. Each column correspond
+    target_variables_matrix: np.ndarray
+        Numpy array containing target variables values. Each column correspond
         to a target variable in the same order specified by 'target_variables_list'
         input.
     """
-    number_of_samples_parameters = 0
-    number_of_samples_variables = 0
-
-    parameters_samples = {parameter: [] for parameter in parameters_list}
-    with open(input_filename, "r") as parameters_file:
-        for line in parameters_file.readlines():
-            number_of_samples_parameters += 1
+    parameters_matrix = _load_monte_carlo_columns(
+        input_filename, parameters_list, "Parameter", chunk_size
+    )
+    target_variables_matrix = _load_monte_carlo_columns(
+        output_filename, target_variables_list, "Variable", chunk_size
+    )
 
-            parameters_dict = json.loads(line)
-            parameters_dict = flatten_dict(parameters_dict)
-            for parameter in parameters_list:
-                try:
-                    value = parameters_dict[parameter]
-                except KeyError as e:
-                    raise KeyError(
-                        f"Parameter {parameter} was not found in {input_filename}!"
-                    ) from e
-                parameters_samples[parameter].append(value)
-
-    target_variables_samples = {variable: [] for variable in target_variables_list}
-    with open(output_filename, "r") as target_variables_file:
-        for line in target_variables_file.readlines():
-            number_of_samples_variables += 1
-            target_variables_dict = json.loads(line)
-            for variable in target_variables_list:
-                try:
-                    value = target_variables_dict[variable]
-                except KeyError as e:
-                    raise KeyError(
-                        f"Variable {variable} was not found in {output_filename}!"
-                    ) from e
-                target_variables_samples[variable].append(value)
-
-    if number_of_samples_parameters != number_of_samples_variables:
+    if len(parameters_matrix) != len(target_variables_matrix):
         raise ValueError(
             "Number of samples for parameters does not match the number of samples for target variables!"
         )
 
-    n_samples = number_of_samples_variables
-    n_parameters = len(parameters_list)
-    n_variables = len(target_variables_list)
-    parameters_matrix = np.empty((n_samples, n_parameters))
-    target_variables_matrix = np.empty((n_samples, n_variables))
+    return parameters_matrix, target_variables_matrix
 
-    for i, parameter in enumerate(parameters_list):
-        parameters_matrix[:, i] = parameters_samples[parameter]
 
-    for i, target_variable in enumerate(target_variables_list):
-        target_variables_matrix[:, i] = target_variables_samples[target_variable]
+def _load_monte_carlo_columns(filename, names, label, chunk_size):
+    """Reads the ``names`` columns of a MonteCarlo inputs or outputs table
+    into a ``(n_samples, len(names))`` array."""
+    path = Path(filename)
+    if path.is_dir():
+        return _load_monte_carlo_storage_columns(path, names, label)
 
-    return parameters_matrix, target_variables_matrix
+    def missing(name):
+        return KeyError(f"{label} {name} was not found in {filename}!")
+
+    blocks = []
+    with open(path, "r", encoding="utf-8") as rows:
+        while True:
+            lines = list(itertools.islice(rows, chunk_size))
+            if not lines:
+                break
+            block = np.empty((len(lines), len(names)))
+            for i, line in enumerate(lines):
+                record = json.loads(line)
+                flatted_record = None
+                for j, name in enumerate(names):
+                    try:
+                        block[i, j] = record[name]
+                        continue
+                    except KeyError:
+                        pass
+                    # Nested parameters need the flatted record
+                    if flatted_record is None:
+                        flatted_record = flatten_dict(record)
+                    try:
+                        block[i, j] = flatted_record[name]
+                    except KeyError as e:
+                        raise missing(name) from e
+            blocks.append(block)
+    if not blocks:
+        return np.empty((0, len(names)))
+    return np.concatenate(blocks)
+
+
+def _load_monte_carlo_storage_columns(path, names, label):
+    """Reads the ``names`` columns of a binary MonteCarlo storage table."""
+    # pylint: disable=import-outside-toplevel
+    from uvicrocketpy.simulation.monte_carlo_storage import (
+        ColumnarStorage,
+        ParquetStorage,
+    )
+
+    storage_class = (
+        ColumnarStorage if (path / "schema.json").exists() else ParquetStorage
+    )
+    storage = storage_class(path)
+    stored = storage.columns(path)
+
+    # Nested parameters are read from their outer column and flatted
+    sources = {}
+    for name in names:
+        if name in stored:
+            sources[name] = name
+            continue
+        outer = [c for c in stored if name.startswith(f"{c}_")]
+        if not outer:
+            raise KeyError(f"{label} {name} was not found in {path}!")
+        sources[name] = max(outer, key=len)
+
+    columns = storage.read_columns(path, set(sources.values()))
+    n_samples = storage.count(path)
+    matrix = np.empty((n_samples, len(names)))
+    for j, name in enumerate(names):
+        source = sources[name]
+        values = columns[source]
+        if source == name:
+            matrix[:, j] = np.asarray(values, dtype=float)
+            continue
+        for i, value in enumerate(values):
+            try:
+                matrix[i, j] = flatten_dict({source: value})[name]
+            except KeyError as e:
+                raise KeyError(f"{label} {name} was not found in {path}!") from e
+    return matrix
 
 
 def find_two_closest_integers(number):